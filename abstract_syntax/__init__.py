@@ -4,8 +4,9 @@ Scope: re-export every public name from the cohesive submodules so that
 callers can keep writing ``import abstract_syntax as ast`` or
 ``from abstract_syntax import Var, Env, uniquify_deduce`` even though the
 implementation is spread across ``core``, ``terms``, ``proofs``,
-``declarations``, ``env``, ``literals``, ``rewrite``, ``ops``, and
-``theorems``.
+``declarations``, ``env``, ``literals``, ``hashcons``, ``rewrite``,
+``reduction_cache``, ``lazy_eval``, ``ops``, ``theorems``, and
+``interfaces``.
 
 Also seeds each submodule's ``globals()`` with the union of public names,
 matching the lookup behaviour of the previous single-file module so that
@@ -35,9 +36,13 @@ _MODULE_NAMES = (
     "declarations",
     "env",
     "literals",
+    "hashcons",
     "rewrite",
+    "reduction_cache",
+    "lazy_eval",
     "ops",
     "theorems",
+    "interfaces",
 )
 
 _MODULES: tuple[ModuleType, ...] = tuple(
@@ -50,9 +55,13 @@ _MODULES: tuple[ModuleType, ...] = tuple(
     declarations,
     env,
     literals,
+    hashcons,
     rewrite,
+    reduction_cache,
+    lazy_eval,
     ops,
     theorems,
+    interfaces,
 ) = _MODULES
 
 _DYNAMIC_NAMES = {
@@ -64,6 +73,7 @@ _DYNAMIC_NAMES = {
     "reduced_defs",
     "uniquified_modules",
     "collected_imports",
+    "module_interface_keys",
     "default_mark_LHS",
     "num_rewrites",
 }
@@ -110,6 +120,7 @@ _DYNAMIC_OWNERS = {
     "reduced_defs": terms,
     "uniquified_modules": declarations,
     "collected_imports": theorems,
+    "module_interface_keys": interfaces,
     "default_mark_LHS": rewrite,
     "num_rewrites": rewrite,
 }
@@ -38,6 +38,9 @@ from .proofs import *
 
 if TYPE_CHECKING:
     from .env import Env
+    from .interfaces import (
+        load_module_interface, module_scope, write_module_interface,
+    )
     from .ops import uniquify_deduce
 
 @dataclass
@@ -494,6 +497,12 @@ class ProcProofEntry(AST):
   def __str__(self) -> str:
     return self.pretty_print(0)
 
+def access_key(loc: Meta) -> Tuple[int, int]:
+  # Identifies a mutable-array read or write within its procedure by source
+  # span. The verifier and the compiler each type-check the body separately,
+  # so their nodes differ but carry the same locations.
+  return (getattr(loc, 'start_pos', -1), getattr(loc, 'end_pos', -1))
+
 @dataclass
 class ProcDecl(Declaration):
   type_params: List[str]
@@ -506,6 +515,14 @@ class ProcDecl(Declaration):
   # `uniquify` for procedures with a return type (None otherwise), so the
   # signature type-checker knows which name to give the declared return type.
   result_name: Optional[str] = None
+  # The body with its terms type-checked (overloads resolved), filled in by
+  # `type_check_stmt` when the body is type-modeled (None otherwise). The
+  # compiler lowers this rather than the surface `body`.
+  checked_body: Optional[List[ImpStmt]] = None
+  # Source positions (`access_key`) of the mutable-array reads and writes
+  # whose in-bounds obligation `verify_proc` discharged, so the compiled
+  # access can skip its runtime bounds check.
+  proven_in_bounds: Set[Tuple[int, int]] = field(default_factory=set)
 
   def __str__(self) -> str:
     return self.pretty_print(0)
@@ -1613,6 +1630,56 @@ class Print(Statement):
     pass
 
 
+def load_module(loc: Meta, name: str, ctx: UniquifyContext) -> List[Statement]:
+  """Return the post-uniquify statement list of module ``name``.
+
+  Served from ``uniquified_modules`` when already loaded, else from the
+  module's ``.pfi`` interface when it is up to date (see
+  ``interfaces``), else by parsing and uniquifying the ``.pf`` source,
+  which also (re)writes the interface.  The module's names are generated
+  under ``module_scope(name)`` so they do not depend on the importer."""
+  global uniquified_modules
+  if name in uniquified_modules.keys():
+    return uniquified_modules[name]
+  filename = find_file(loc, name)
+  importing_module = get_current_module()
+  set_current_module(name)
+  try:
+    def resolve(dep: str) -> List[Statement]:
+      saved_module = get_current_module()
+      try:
+        return load_module(loc, dep, ctx)
+      finally:
+        set_current_module(saved_module)
+
+    new_ast = load_module_interface(name, filename, resolve)
+    if new_ast is not None:
+      for stmt in new_ast:
+        if isinstance(stmt, Predicate):
+          _predicate_decls_by_unique_name[stmt.name] = stmt
+    else:
+      with open(filename, 'r', encoding="utf-8") as file:
+        src = file.read()
+      if get_recursive_descent():
+        from rec_desc_parser import get_filename, set_filename, parse
+      else:
+        from parser import get_filename, set_filename, parse
+      old_filename = get_filename()
+      set_filename(filename)
+      parsed_ast = parse(src, trace=False)
+      set_filename(old_filename)
+      saved_scope = ctx.scope
+      ctx.scope = module_scope(name)
+      try:
+        new_ast = uniquify_deduce(parsed_ast, ctx)
+      finally:
+        ctx.scope = saved_scope
+      write_module_interface(name, filename, new_ast, uniquified_modules)
+  finally:
+    set_current_module(importing_module)
+  uniquified_modules[name] = new_ast
+  return new_ast
+
 def find_file(loc: Meta, name: str) -> str:
   for dir in get_import_directories():
     filename = os.path.join(dir, name + ".pf")
@@ -1720,25 +1787,7 @@ class Import(Declaration):
     # using/hiding filter) aborts the import, so a later top-level check
     # sharing this process does not inherit a stale current module.
     try:
-      global uniquified_modules
-      if self.name in uniquified_modules.keys():
-        new_ast = uniquified_modules[self.name]
-      else:
-        filename = find_file(self.location, self.name)
-        file = open(filename, 'r', encoding="utf-8")
-        src = file.read()
-        file.close()
-        if get_recursive_descent():
-          from rec_desc_parser import get_filename, set_filename, parse
-        else:
-          from parser import get_filename, set_filename, parse
-        old_filename = get_filename()
-        set_filename(filename)
-        parsed_ast = parse(src, trace=False)
-        set_filename(old_filename)
-        new_ast = uniquify_deduce(parsed_ast, ctx)
-        uniquified_modules[self.name] = new_ast
-
+      new_ast = load_module(self.location, self.name, ctx)
       env['__module__' + self.name] = None
       if get_verbose():
           print('collecting exports from ' + self.name + ' for import to ' + importing_module + '\n')
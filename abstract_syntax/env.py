@@ -4,8 +4,9 @@ Scope: the immutable, functionally-updated name environment that the type
 checker and proof checker thread through their recursive walks, plus the
 ``Binding`` variants it stores: ``TypeBinding``, ``TermBinding``,
 ``ProofBinding``, ``AutoEquationBinding``, ``ViewBinding``,
-``AssociativeBinding``. Also includes small environment-shape helpers
-such as ``type_params_str``.
+``AssociativeBinding``, and the persistent ``BindingMap`` behind
+``Env.dict``. Also includes small environment-shape helpers such as
+``type_params_str``.
 
 Goes here:
   * a new kind of static binding the checker needs to track
@@ -19,6 +20,8 @@ Does NOT go here:
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping, MutableMapping
+from math import isqrt
 from typing import TYPE_CHECKING
 
 from .core import *
@@ -28,7 +31,7 @@ from .declarations import *
 
 if TYPE_CHECKING:
     from .literals import AutoRewriteRule, split_auto_rule
-    from .rewrite import call_head_name
+    from .rewrite import AutoRewriteIndex, call_head_name
 
 @dataclass(kw_only=True)
 class Binding(AST):
@@ -63,11 +66,22 @@ class ProofBinding(Binding):
 class AutoEquationBinding(Binding):
   equations : dict[str, list[AutoRewriteRule]]
   fallback_equations : list[AutoRewriteRule] = field(default_factory=list)
+  # ``equations`` as a discrimination tree; built on first use when the
+  # binding was not made by ``Env.declare_auto_rewrite``.
+  index : Optional[AutoRewriteIndex] = field(default=None, compare=False,
+                                             repr=False)
   
   def __str__(self) -> str:
     head_equations = [e for equations in self.equations.values() for e in equations]
     return ', '.join([str(e.equation) for e in head_equations + self.fallback_equations])
 
+  def get_index(self) -> AutoRewriteIndex:
+    from .rewrite import AutoRewriteIndex
+
+    if self.index is None:
+      self.index = AutoRewriteIndex.build(self.equations)
+    return self.index
+
 @dataclass
 class ViewBinding(Binding):
   view: ViewDecl
@@ -118,42 +132,154 @@ class AssociativeBinding(Binding):
       + ' ' + ', '.join(type_params_str(type_params) + str(t) \
                         for (type_params, t) in self.types)
 
+_MISSING = object()
+
+
+class BindingMap(MutableMapping[str, object]):
+  """The name -> binding map behind ``Env.dict``: an insertion-ordered
+  mapping that can be extended in (amortised) sub-linear time while
+  sharing structure with the map it was extended from.
+
+  It is split in two: a large ``base`` dict shared, read-only, by every
+  map extended from it, and a small ``delta`` dict owned by this map
+  that holds bindings added since the base was built.  Extending an
+  ``Env`` copies only the delta; once the delta outgrows
+  ``sqrt(len(base))`` it is folded into a fresh base.  Lookups are two
+  dict probes.
+
+  A ``base_name -> unique names`` index is kept alongside both halves,
+  so ``Env.base_to_overloads`` does not have to scan every binding.
+  Iteration order is that of a plain dict built by the same sequence of
+  assignments: re-binding a name keeps its original position.
+  """
+
+  __slots__ = ('_base', '_base_index', '_delta', '_delta_index', '_fresh')
+
+  # Never fold a delta smaller than this; keeps small envs copy-only.
+  MIN_DELTA = 64
+
+  def __init__(self, bindings: Optional[Mapping[str, object]] = None):
+    self._base: dict[str, object] = {}
+    self._base_index: dict[str, tuple[str, ...]] = {}
+    # Bindings added after the base was built; owned by this map.
+    self._delta: dict[str, object] = {}
+    # Index of the ``_delta`` names that are not in ``_base``, and how
+    # many there are.
+    self._delta_index: dict[str, tuple[str, ...]] = {}
+    self._fresh = 0
+    if bindings:
+      self._base = dict(bindings)
+      for name in self._base:
+        key = base_name(name)
+        self._base_index[key] = self._base_index.get(key, ()) + (name,)
+
+  def extend(self) -> BindingMap:
+    """A copy of this map that can be updated independently of it."""
+    new = BindingMap.__new__(BindingMap)
+    new._base = self._base
+    new._base_index = self._base_index
+    new._delta = self._delta.copy()
+    new._delta_index = self._delta_index.copy()
+    new._fresh = self._fresh
+    return new
+
+  def _fold(self) -> None:
+    base = dict(self._base)
+    base.update(self._delta)
+    index = dict(self._base_index)
+    for key, names in self._delta_index.items():
+      index[key] = index.get(key, ()) + names
+    self._base, self._base_index = base, index
+    self._delta, self._delta_index, self._fresh = {}, {}, 0
+
+  def names_with_base(self, key: str) -> tuple[str, ...]:
+    """Every bound name whose ``base_name`` is ``key``, in binding order."""
+    return self._base_index.get(key, ()) + self._delta_index.get(key, ())
+
+  def __getitem__(self, name: str) -> object:
+    value = self._delta.get(name, _MISSING)
+    if value is _MISSING:
+      return self._base[name]
+    return value
+
+  def get(self, name: str, default: object = None) -> object:
+    value = self._delta.get(name, _MISSING)
+    if value is _MISSING:
+      return self._base.get(name, default)
+    return value
+
+  def __contains__(self, name: object) -> bool:
+    return name in self._delta or name in self._base
+
+  def __setitem__(self, name: str, value: object) -> None:
+    if name not in self._delta and name not in self._base:
+      key = base_name(name)
+      self._delta_index[key] = self._delta_index.get(key, ()) + (name,)
+      self._fresh += 1
+    self._delta[name] = value
+    if len(self._delta) > max(self.MIN_DELTA, isqrt(len(self._base))):
+      self._fold()
+
+  def __delitem__(self, name: str) -> None:
+    if name not in self:
+      raise KeyError(name)
+    # Rare (tests and error recovery): fold so ``_base`` is private to
+    # this map, then drop the name from it.
+    self._fold()
+    del self._base[name]
+    key = base_name(name)
+    names = tuple(n for n in self._base_index[key] if n != name)
+    if names:
+      self._base_index[key] = names
+    else:
+      del self._base_index[key]
+
+  def __iter__(self) -> Iterator[str]:
+    yield from self._base
+    if self._fresh:
+      for name in self._delta:
+        if name not in self._base:
+          yield name
+
+  def __reversed__(self) -> Iterator[str]:
+    return reversed(list(self))
+
+  def __len__(self) -> int:
+    return len(self._base) + self._fresh
+
+
 class Env:
-  def __init__(self, env: Optional[dict[str, object]] = None) -> None:
-    if env:
-      self.dict: dict[str, object] = copy_dict(env)
+  def __init__(self, env: Optional[Mapping[str, object]] = None) -> None:
+    # Extending an ``Env`` shares structure with it (see ``BindingMap``);
+    # any other mapping is copied.
+    if isinstance(env, BindingMap):
+      self.dict: BindingMap = env.extend()
     else:
-      self.dict = {}
+      self.dict = BindingMap(env)
 
   # This is a hack. Not reliable. Added for GenRecFun.
   def base_to_unique(self, name: str) -> str | None:
-    for k in self.dict.keys():
-      if base_name(k) == name:
-        return k
-    return None
+    overloads = self.dict.names_with_base(name)
+    return overloads[0] if overloads else None
 
   def base_to_overloads(self, name: str) -> list[str]:
-    overloads = []
-    for k in self.dict.keys():
-      if base_name(k) == name:
-        overloads.append(k)
-    return overloads
+    return list(self.dict.names_with_base(name))
 
   def __str__(self) -> str:
-    return ',\n'.join(['\t' + name2str(k) + ': ' + str(v) \
-                       for (k,v) in reversed(self.dict.items())])
+    return ',\n'.join(['\t' + name2str(k) + ': ' + str(self.dict[k]) \
+                       for k in reversed(self.dict)])
 
   def __contains__(self, item: str) -> bool:
-    return item in self.dict.keys()
+    return item in self.dict
     
   def proofs_str(self) -> str:
     return ',\n'.join(['\t' + name2str(k) + ': ' + str(v) \
-                       for (k,v) in reversed(self.dict.items()) \
+                       for (k,v) in ((k, self.dict[k]) for k in reversed(self.dict)) \
                        if isinstance(v,ProofBinding) and (v.local or get_verbose() == VerboseLevel.FULL)])
 
   def term_vars_str(self) -> str:
     return ',\n'.join(['\t' + base_name(k) + ': ' + str(v.typ) \
-                       for (k,v) in reversed(self.dict.items()) \
+                       for (k,v) in ((k, self.dict[k]) for k in reversed(self.dict)) \
                        if isinstance(v,TermBinding) and v.local])
   
   def _with_binding(self, name: str, binding: object) -> Env:
@@ -226,7 +352,7 @@ class Env:
 
   def declare_auto_rewrite(self, loc: Meta, equation: Formula) -> Env:
     from .literals import split_auto_rule
-    from .rewrite import call_head_name
+    from .rewrite import AutoRewriteIndex, call_head_name
 
     new_env = Env(self.dict)
     full_name = '__auto__'
@@ -235,24 +361,29 @@ class Env:
     #print('declare auto: ' + head_lhs + '\n\t' + str(equation))
     if full_name in self.dict:
         old = cast(AutoEquationBinding, self.dict[full_name])
-        new_equations = {head: [*equations]
-                         for (head, equations) in old.equations.items()}
-        new_fallback_equations = [*old.fallback_equations]
+        # The per-head lists are never mutated, so only the list that
+        # gains the rule is copied.
+        new_equations = dict(old.equations)
+        new_fallback_equations = old.fallback_equations
+        index = old.get_index()
     else:
         new_equations = {}
         new_fallback_equations = []
+        index = AutoRewriteIndex()
     if head_lhs is None:
-        new_fallback_equations.append(rule)
+        new_fallback_equations = new_fallback_equations + [rule]
     else:
-        new_equations.setdefault(head_lhs, []).append(rule)
+        new_equations[head_lhs] = new_equations.get(head_lhs, []) + [rule]
+        index = index.insert(head_lhs, rule)
     new_env.dict[full_name] = AutoEquationBinding(loc, new_equations,
                                                   new_fallback_equations,
+                                                  index,
                                                   module=self.get_current_module())
     return new_env
 
   def get_auto_rewrites(self, head: str | None) -> list[AutoRewriteRule]:
     full_name = '__auto__'
-    if full_name in self.dict.keys():
+    if full_name in self.dict:
         binding = cast(AutoEquationBinding, self.dict[full_name])
         if head is None:
             return binding.fallback_equations
@@ -260,6 +391,21 @@ class Env:
     else:
       return []
 
+  def get_auto_rewrite_candidates(self, term: Term) -> list[AutoRewriteRule]:
+    """``get_auto_rewrites(call_head_name(term))`` without the rules whose
+    left-hand side the binding's ``AutoRewriteIndex`` shows cannot match
+    ``term``."""
+    from .rewrite import call_head_name
+
+    full_name = '__auto__'
+    if full_name not in self.dict:
+      return []
+    binding = cast(AutoEquationBinding, self.dict[full_name])
+    head = call_head_name(term)
+    if head is None or head not in binding.equations:
+      return binding.fallback_equations
+    return binding.get_index().candidates(head, term)
+
   def declare_inductive(self, loc: Meta, ind_dict: InductiveInfo,
                         thm: Proof | Term) -> Env:
     new_env = Env(self.dict)
@@ -337,9 +483,9 @@ class Env:
   def get_current_module(self) -> str:
       return cast(str, self.dict['__current_module__'])
   
-  def _def_of_type_var(self, curr: dict[str, object],
+  def _def_of_type_var(self, curr: Mapping[str, object],
                        name: str) -> AST | None:
-    if name in curr.keys():
+    if name in curr:
       binding = curr[name]
       if isinstance(binding, ViewBinding):
         return binding.view.source
@@ -352,9 +498,9 @@ class Env:
       raise Exception('variable not in env: ' + name)
   
 
-  def _type_of_term_var(self, curr: dict[str, object],
+  def _type_of_term_var(self, curr: Mapping[str, object],
                         name: str) -> Type | None:
-    if name in curr.keys():
+    if name in curr:
       binding = curr[name]
       if isinstance(binding, TermBinding):
         return binding.typ
@@ -371,15 +517,15 @@ class Env:
     else:
       return None
 
-  def _term_var_defined(self, curr: dict[str, object], name: str) -> bool:
-    if name in curr.keys():
+  def _term_var_defined(self, curr: Mapping[str, object], name: str) -> bool:
+    if name in curr:
       binding = curr[name]
       if isinstance(binding, TermBinding) or isinstance(binding, TypeBinding):
         return True
     return False
 
-  def _value_of_term_var(self, curr: dict[str, object], name: str) -> Term | RecFun | GenRecFun | None:
-    if name in curr.keys(): # the name '=' is not in the env
+  def _value_of_term_var(self, curr: Mapping[str, object], name: str) -> Term | RecFun | GenRecFun | None:
+    if name in curr: # the name '=' is not in the env
       binding = curr[name]
       if isinstance(binding, TermBinding):
         return cast(Term | RecFun | GenRecFun | None, binding.defn)
@@ -389,9 +535,9 @@ class Env:
     else:
       return None
   
-  def _formula_of_proof_var(self, curr: dict[str, object],
+  def _formula_of_proof_var(self, curr: Mapping[str, object],
                             name: str) -> Formula | None:
-    if name in curr.keys():
+    if name in curr:
       match curr[name]:
         case ProofBinding(_, formula):
           return formula
@@ -417,7 +563,7 @@ class Env:
       # silently type-checking or hitting the bare-Exception fallback in
       # `_def_of_type_var` (which would escape the error sink and abort LSP
       # checking).
-      return name in self.dict.keys() \
+      return name in self.dict \
         and not isinstance(self.dict[name], ProcBinding)
     raise Exception('expected a type name, not ' + str(tyname))
 
@@ -444,7 +590,7 @@ class Env:
 
   def get_assoc_types(self, opname: str) -> list[Tuple[List[str], Type]]:
     full_name = '__associative_' + opname
-    if full_name in self.dict.keys():
+    if full_name in self.dict:
       return cast(AssociativeBinding, self.dict[full_name]).types
     else:
       return []
@@ -0,0 +1,202 @@
+"""Hash-consing of ground ``Nat`` and ``UInt`` literal values.
+
+Scope: an optional intern table under which every post-uniquify
+``zero``/``suc`` or ``bzero``/``inc_dub``/``dub_inc`` tower is a single
+shared node.  The literal builders (``mkZero``, ``mkSuc``, ``intToNat``,
+``intToUInt``, ...), the constructor arm of ``Call.reduce`` and the
+``Call`` rebuild in ``rewrite_aux`` go through
+``intern_leaf`` / ``intern_unary`` / ``intern_call`` / ``intern_nat``,
+so a check that computes ``ℕ12`` a thousand times allocates it once, and
+two interned values compare by identity in ``Call.__eq__`` instead of by
+walking both towers.
+
+Only values that are computed are interned.  An interned node keeps the
+``Meta`` of the first occurrence that built it, so a literal written in
+the source is type-checked into a fresh ``NatLit`` that keeps its own
+location, and ``NatLit.peel`` and ``_map_children`` re-intern only a
+literal that was interned to begin with.
+
+A ``Nat`` tower is a single ``NatLit`` node: ``intern_unary`` and
+``intern_call`` turn ``suc`` applied to ``zero`` or to a ``NatLit`` into
+the ``NatLit`` one larger, whether or not hash-consing is on, so no
+``suc`` chain is ever interned next to the literal of the same value.
+
+Only these towers are interned.  They have no binders, type arguments,
+or free variables, so two of them are equal exactly when their
+constructor names and children are, and ``(constructor, id(child))`` is a
+sound key once the child is itself interned.  Interned nodes are shared
+and must not be mutated; the one field filled in after the fact,
+``typeof``, is only ever upgraded from ``None`` (see ``_adopt_type``).
+
+The table is cleared at the start of every ``check_deduce`` run, which
+keeps it bounded over a long-lived LSP or MCP session.
+
+Goes here:
+  * the intern table and the queries over it
+
+Does NOT go here:
+  * the literal builders and recognizers themselves (``literals``)
+  * structural hashing for the proof-check cache (``checker_cache``)
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Optional
+
+from flags import get_hash_consing
+
+from .core import *
+from .terms import *
+
+if TYPE_CHECKING:
+    from .literals import NatLit, _is_named_var
+
+_LEAF_CONSTRUCTORS = frozenset({'zero', 'bzero'})
+_UNARY_CONSTRUCTORS = frozenset({'suc', 'inc_dub', 'dub_inc'})
+
+# Past this many interned values, new ones are built unshared.
+MAX_INTERNED = 1 << 18
+
+# ``(constructor name, id(child))`` -> interned node, with ``-1`` as the
+# child of a leaf, and ``(suc name, id(zero), value)`` -> ``NatLit``.  The
+# child is itself interned and kept alive by this table, so its ``id``
+# cannot be reused while the entry exists.
+_interned: dict[tuple[str, int] | tuple[str, int, int], Term] = {}
+
+# ``id`` of every interned node, for the identity tests in ``Call``.
+_interned_ids: set[int] = set()
+
+
+def is_interned(t: object) -> bool:
+  return id(t) in _interned_ids
+
+
+def interned_term_count() -> int:
+  return len(_interned)
+
+
+def reset_interned_terms() -> None:
+  _interned.clear()
+  _interned_ids.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _is_leaf_constructor(name: str) -> bool:
+  return base_name(name) in _LEAF_CONSTRUCTORS
+
+
+@functools.lru_cache(maxsize=None)
+def _is_unary_constructor(name: str) -> bool:
+  return base_name(name) in _UNARY_CONSTRUCTORS
+
+
+def _register(key: tuple[str, int] | tuple[str, int, int], node: Term) -> Term:
+  if len(_interned) < MAX_INTERNED:
+    _interned[key] = node
+    _interned_ids.add(id(node))
+  return node
+
+
+def _adopt_type(node: Term, ty: Optional[Type]) -> bool:
+  """Whether the interned ``node`` may stand for a value of type ``ty``.
+  An untyped interned node takes on ``ty``; two different known types
+  (a view and its source type, say) keep their values apart."""
+  if ty is None or node.typeof is ty:
+    return True
+  if node.typeof is None:
+    node.typeof = ty
+    return True
+  return node.typeof == ty
+
+
+def _leaf(t: Term) -> Term:
+  # Interned stand-in for a ``zero``/``bzero`` reference that reduction
+  # returned as-is, so the tower above it can be interned too.
+  if isinstance(t, ResolvedVar) and _is_leaf_constructor(t.name) \
+     and not is_interned(t):
+    return intern_leaf(t.location, t.typeof, t.name)
+  return t
+
+
+def intern_leaf(loc: Meta, ty: Optional[Type], name: str) -> ResolvedVar:
+  """``ResolvedVar(loc, ty, name)``, shared when ``name`` is ``zero``
+  or ``bzero``."""
+  if get_hash_consing() and _is_leaf_constructor(name):
+    node = _interned.get((name, -1))
+    if node is None:
+      return cast(ResolvedVar, _register((name, -1), ResolvedVar(loc, ty, name)))
+    if _adopt_type(node, ty):
+      return cast(ResolvedVar, node)
+  return ResolvedVar(loc, ty, name)
+
+
+def intern_nat(loc: Meta, ty: Optional[Type], rator: Term, zero: Term,
+               value: int) -> NatLit:
+  """``NatLit(loc, ty, rator, zero, value)``, shared when ``rator`` is a
+  resolved ``suc`` and ``zero`` is interned."""
+  if get_hash_consing() and isinstance(rator, ResolvedVar) \
+     and _is_unary_constructor(rator.name):
+    zero = _leaf(zero)
+    if is_interned(zero):
+      key = (rator.name, id(zero), value)
+      node = _interned.get(key)
+      if node is None:
+        return cast(NatLit, _register(key, NatLit(loc, ty, rator, zero, value)))
+      if _adopt_type(node, ty):
+        return cast(NatLit, node)
+  return NatLit(loc, ty, rator, zero, value)
+
+
+def _successor(loc: Meta, ty: Optional[Type], rator: Term,
+               arg: Term) -> Optional[NatLit]:
+  # `suc(zero)` or `suc(NatLit)` as the literal one larger.
+  if not _is_named_var(rator, 'suc'):
+    return None
+  if isinstance(arg, NatLit) and arg.rator == rator:
+    return intern_nat(loc, ty, rator, arg.zero, arg.value + 1)
+  if _is_named_var(arg, 'zero'):
+    return intern_nat(loc, ty, rator, arg, 1)
+  return None
+
+
+def intern_unary(loc: Meta, ty: Optional[Type], name: str, arg: Term) -> Call:
+  """``Call(loc, ty, ResolvedVar(name), [arg])``, shared when ``name``
+  is a literal constructor and ``arg`` is interned.  The rator is only
+  built when the value is new."""
+  if base_name(name) == 'suc':
+    lit = _successor(loc, ty, ResolvedVar(loc, None, name), arg)
+    if lit is not None:
+      return lit
+  if get_hash_consing() and _is_unary_constructor(name):
+    arg = _leaf(arg)
+    if is_interned(arg):
+      key = (name, id(arg))
+      node = _interned.get(key)
+      if node is None:
+        return cast(Call, _register(
+          key, Call(loc, ty, ResolvedVar(loc, None, name), [arg])))
+      if _adopt_type(node, ty):
+        return cast(Call, node)
+  return Call(loc, ty, ResolvedVar(loc, None, name), [arg])
+
+
+def intern_call(loc: Meta, ty: Optional[Type], rator: Term,
+                args: list[Term]) -> Call:
+  """``Call(loc, ty, rator, args)``, shared when it is a literal
+  constructor applied to an interned value."""
+  if len(args) == 1:
+    lit = _successor(loc, ty, rator, args[0])
+    if lit is not None:
+      return lit
+  if get_hash_consing() and len(args) == 1 and isinstance(rator, ResolvedVar) \
+     and _is_unary_constructor(rator.name):
+    arg = _leaf(args[0])
+    if is_interned(arg):
+      key = (rator.name, id(arg))
+      node = _interned.get(key)
+      if node is None:
+        return cast(Call, _register(key, Call(loc, ty, rator, [arg])))
+      if _adopt_type(node, ty):
+        return cast(Call, node)
+  return Call(loc, ty, rator, args)
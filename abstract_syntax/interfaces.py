@@ -0,0 +1,293 @@
+"""``.pfi`` module-interface artifacts for imported modules.
+
+Scope: serialising a module's post-uniquify statement list (its
+declarations, exported theorems, ``auto`` rules, unions, views, ...) to a
+binary ``.pfi`` file, and loading it back so ``Import`` resolution can
+skip parsing and uniquifying unchanged modules.  Owns the file format,
+its versioning, the staleness rules, and where the files are kept.
+
+Interfaces are pickles, and unpickling a file can run arbitrary code, so
+they are never read from (or written next to) the sources.  They live in
+a per-user cache directory (``interface_cache_dir``), named by the
+module and a digest of its source text, and neither the directory nor a
+file in it is read unless it belongs to the current user and nobody else
+can write to it.  Interfaces are only used when asked for
+(``deduce.py --module-interfaces``).
+
+An interface records, in a small header pickled ahead of the body:
+
+  * ``INTERFACE_FORMAT`` and a digest of the front-end sources (parsers,
+    grammar, ``abstract_syntax``), so any change to how ASTs are built
+    invalidates every interface;
+  * the parser that produced it and the experimental-syntax flag;
+  * a digest of the module's own source text;
+  * the interface key of every module it imports.
+
+Imported modules are not inlined into the body.  Each nested
+``Import.ast`` list is written as a reference to the dependency's name and
+resolved at load time to the dependency's own (shared) statement list, so
+loading ``Int`` does not duplicate ``Nat``.  A module's interface key folds
+in its dependencies' keys, so editing ``NatDefs.pf`` makes every interface
+that (transitively) imports it stale.
+
+Goes here:
+  * anything about the ``.pfi`` format or deciding whether one is reusable
+
+Does NOT go here:
+  * the import resolution itself (``Import.uniquify`` in ``declarations``)
+  * ``.thm`` summaries (``theorems``)
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import os
+import pickle
+import stat
+import tempfile
+from pathlib import Path
+from typing import IO, Callable, List, Optional
+
+from flags import (
+  get_experimental_imperative,
+  get_module_interface_dir,
+  get_module_interfaces,
+  get_recursive_descent,
+)
+
+from .core import *
+from .declarations import *
+
+INTERFACE_SUFFIX = '.pfi'
+
+# Bump when the header layout or the body encoding changes.
+INTERFACE_FORMAT = 2
+
+# Sources that decide what post-uniquify AST a ``.pf`` file produces.
+_FRONTEND_SOURCES = (
+  'Deduce.lark',
+  'abstract_syntax/*.py',
+  'flags.py',
+  'parser.py',
+  'parser_common.py',
+  'rec_desc_parser.py',
+)
+
+# Interface key of the statement list currently registered for each
+# module in ``uniquified_modules``.  A module whose AST did not come from
+# ``load_module_interface`` / ``write_module_interface`` (an editor
+# buffer, say) has no key, and interfaces that depend on it are not
+# reused or written.
+module_interface_keys: dict[str, str] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _frontend_version() -> str:
+  root = Path(__file__).resolve().parent.parent
+  digest = hashlib.sha256()
+  for pattern in _FRONTEND_SOURCES:
+    for path in sorted(root.glob(pattern)):
+      digest.update(path.name.encode('utf-8'))
+      digest.update(path.read_bytes())
+  return digest.hexdigest()
+
+
+def _frontend_tag() -> tuple[str, bool]:
+  parser = 'recursive-descent' if get_recursive_descent() else 'lalr'
+  return (parser, bool(get_experimental_imperative()))
+
+
+def interface_cache_dir() -> Path:
+  directory = get_module_interface_dir()
+  if directory is None:
+    cache_home = os.environ.get('XDG_CACHE_HOME') \
+        or os.path.expanduser('~/.cache')
+    directory = os.path.join(cache_home, 'deduce', 'interfaces')
+  return Path(directory)
+
+
+def _interface_file(name: str, source_digest: str) -> Path:
+  digest = hashlib.sha256(repr((name, source_digest)).encode('utf-8'))
+  return interface_cache_dir() / (digest.hexdigest() + INTERFACE_SUFFIX)
+
+
+def interface_path(name: str, filename: str) -> Path:
+  """Where the interface of module ``name``, read from ``filename``, is
+  kept for the source's current contents."""
+  return _interface_file(name, _source_digest(filename))
+
+
+def _trusted(st: os.stat_result) -> bool:
+  """Whether the file or directory ``st`` describes can only have been
+  written by the current user."""
+  if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+    return False
+  getuid = getattr(os, 'getuid', None)
+  return getuid is None or st.st_uid == getuid()
+
+
+def module_scope(name: str) -> str:
+  """The uniquify scope an imported module's names are generated under.
+
+  Fixing the scope per module (rather than inheriting the importer's
+  statement scope) makes a module's uniquified names independent of
+  which file happened to import it first, which is what lets one
+  interface serve every importer.  The ``m`` prefix keeps it disjoint
+  from the ``s<N>_`` statement scopes of the file being checked."""
+  return 'm' + name + '_'
+
+
+class _InterfacePickler(pickle.Pickler):
+  """Writes dependency statement lists as references by module name, and
+  the module's own source path (every ``Meta.filename``) as a reference
+  to whatever path the module is found under when the interface is read,
+  so ``deduce.py --dir lib`` and ``--dir ./lib`` report the same paths
+  they would have without an interface."""
+
+  def __init__(self, file: IO[bytes], filename: str,
+               dependencies: dict[int, str]):
+    super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+    self._filename = filename
+    self._dependencies = dependencies
+    self.referenced: list[str] = []
+
+  def persistent_id(self, obj: object) -> Optional[tuple[str, ...]]:
+    if type(obj) is str:
+      return ('source',) if obj == self._filename else None
+    if type(obj) is not list:
+      return None
+    name = self._dependencies.get(id(obj))
+    if name is None:
+      return None
+    if name not in self.referenced:
+      self.referenced.append(name)
+    return ('module', name)
+
+
+class _InterfaceUnpickler(pickle.Unpickler):
+  def __init__(self, file: IO[bytes], filename: str,
+               resolve: Callable[[str], List[Statement]]):
+    super().__init__(file)
+    self._filename = filename
+    self._resolve = resolve
+
+  def persistent_load(self, pid: object) -> object:
+    match pid:
+      case ('source',):
+        return self._filename
+      case ('module', str(name)):
+        return self._resolve(name)
+    raise pickle.UnpicklingError('unknown interface reference ' + repr(pid))
+
+
+def _interface_key(source_digest: str, deps: dict[str, str]) -> str:
+  return hashlib.sha256(repr((
+    INTERFACE_FORMAT, _frontend_version(), _frontend_tag(), source_digest,
+    sorted(deps.items()),
+  )).encode('utf-8')).hexdigest()
+
+
+def _source_digest(filename: str) -> str:
+  with open(filename, 'rb') as f:
+    return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_module_interface(
+    name: str, filename: str,
+    resolve: Callable[[str], List[Statement]],
+) -> Optional[List[Statement]]:
+  """Return the statement list stored in ``name``'s interface, or ``None``
+  when there is no usable interface (missing, unreadable, or stale).
+
+  ``resolve`` maps a dependency's module name to its statement list,
+  loading it if needed; it is called for every module the interface
+  imports before the body is read."""
+  if not get_module_interfaces():
+    return None
+  try:
+    if not _trusted(os.stat(interface_cache_dir())):
+      return None
+    with open(interface_path(name, filename), 'rb') as f:
+      if not _trusted(os.fstat(f.fileno())):
+        return None
+      header = pickle.load(f)
+      if not isinstance(header, dict) \
+         or header.get('format') != INTERFACE_FORMAT \
+         or header.get('frontend') != _frontend_version() \
+         or header.get('tag') != _frontend_tag() \
+         or header.get('source') != _source_digest(filename):
+        return None
+      deps: dict[str, str] = header['deps']
+      for dep, dep_key in deps.items():
+        resolve(dep)
+        if module_interface_keys.get(dep) != dep_key:
+          return None
+      module_ast = _InterfaceUnpickler(f, filename, resolve).load()
+  except (OSError, EOFError, KeyError, AttributeError,
+          ImportError, TypeError, ValueError, pickle.UnpicklingError):
+    return None
+  if not isinstance(module_ast, list):
+    return None
+  module_interface_keys[name] = header['key']
+  return module_ast
+
+
+def write_module_interface(
+    name: str, filename: str, module_ast: List[Statement],
+    loaded_modules: dict[str, List[Statement]],
+) -> None:
+  """Write ``name``'s ``.pfi`` file and record its interface key.
+  ``loaded_modules`` is the ``uniquified_modules`` registry, used to
+  recognise dependency statement lists.
+
+  Failure to write (an unwritable cache directory, say) is silent: the
+  module is simply re-parsed next time."""
+  if not get_module_interfaces():
+    return
+  dependencies = {id(stmts): dep for dep, stmts in loaded_modules.items()
+                  if dep != name}
+  body = io.BytesIO()
+  pickler = _InterfacePickler(body, filename, dependencies)
+  try:
+    pickler.dump(module_ast)
+  except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+    return
+  deps: dict[str, str] = {}
+  for dep in pickler.referenced:
+    dep_key = module_interface_keys.get(dep)
+    if dep_key is None:
+      return
+    deps[dep] = dep_key
+  try:
+    source_digest = _source_digest(filename)
+  except OSError:
+    return
+  key = _interface_key(source_digest, deps)
+  module_interface_keys[name] = key
+  header = {
+    'format': INTERFACE_FORMAT,
+    'frontend': _frontend_version(),
+    'tag': _frontend_tag(),
+    'source': source_digest,
+    'deps': deps,
+    'key': key,
+  }
+  target = _interface_file(name, source_digest)
+  try:
+    os.makedirs(target.parent, mode=0o700, exist_ok=True)
+    if not _trusted(os.stat(target.parent)):
+      return
+    # Write-then-rename so concurrent checkers never read a torn file.
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=INTERFACE_SUFFIX)
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.write(body.getbuffer())
+      os.replace(tmp, target)
+    except BaseException:
+      os.unlink(tmp)
+      raise
+  except OSError:
+    pass
@@ -0,0 +1,534 @@
+"""Call-by-need evaluation of ``print`` and ``assert`` (``--lazy``).
+
+Scope: ``full_reduce`` evaluates a term bottom-up, so ``print`` and
+``assert`` build every part of the value -- every element of a list,
+every branch of a tree -- before showing or comparing any of it, and
+each level of a long list costs a Python stack frame.  This module is
+the alternative used when ``flags.get_lazy_eval()`` is set:
+
+  * Arguments of function calls, ``define``s inside terms, and the
+    arguments of constructors become shared ``_Thunk``s, evaluated at
+    most once and only when a ``switch``, a pattern, a comparison, or
+    the printer needs them.
+  * ``_Evaluator.whnf`` evaluates a term to its outermost constructor
+    (a ``_Con`` whose arguments are thunks) in a loop, so a function
+    whose body ends in a call or a ``switch`` does not grow the stack.
+  * ``print`` forces the spine of a list first and then computes and
+    writes the elements one at a time (``print_lazily``).  ``assert``
+    compares two values from the top down and stops at the first pair
+    of constructors that differ (``assert_equal_lazily``).
+
+The values produced are exactly those of ``full_reduce``: anything the
+evaluator does not model (arithmetic with a fast path, the logical
+connectives, arrays, ``=`` on values it cannot split) is handed to
+``Term.reduce`` with the variables it mentions forced and bound, and a
+fully forced value (``_Evaluator.reify``) is the term ``full_reduce``
+would have built.  With ``--verbose``, ``--trace``, or the debugger
+attached, the callers use ``full_reduce`` instead so that their output
+is unchanged.
+
+Goes here:
+  * the lazy evaluator and the ``print``/``assert`` drivers built on it
+
+Does NOT go here:
+  * the reduction rules themselves (``terms``)
+  * choosing between lazy and strict evaluation (``checker_pipeline``)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional, cast
+
+from flags import get_debugger, get_verbose
+
+from .core import *
+from .terms import *
+from .declarations import *
+from .env import *
+from .literals import (NatLit, constr_name, constructor_conflict,
+                       is_constr_term, isNodeList, nodeListToList)
+from .hashcons import intern_call
+from .ops import callable_name
+
+# Functions whose calls `Call.reduce` or `do_function_call` compute with
+# Python integers when the arguments are numerals (`fast_nat_call`,
+# `try_fast_uint_arith`).  Calls to them are evaluated strictly.
+_STRICT_OPS = frozenset({'+', '-', '*', '/', '%', '^', '∸', '≤', '<',
+                         'fromNat'})
+
+
+@dataclass
+class _Scope:
+  env: Env
+  locals: dict[str, '_Thunk']
+
+
+@dataclass(eq=False)
+class _Thunk:
+  term: Optional[Term]
+  scope: Optional[_Scope]
+  value: object = None
+  # `do_function_call` and `is_match` mark a `TermInst` bound to a
+  # parameter as explicitly instantiated, which changes how it prints.
+  explicit: bool = False
+
+  @staticmethod
+  def ready(value: object) -> '_Thunk':
+    return _Thunk(None, None, value)
+
+  def mark_explicit(self) -> None:
+    if self.term is None:
+      if isinstance(self.value, TermInst):
+        self.value.inferred = False
+    else:
+      self.explicit = True
+
+
+@dataclass(eq=False)
+class _Con:
+  """A constructor (or another head that does not reduce) applied to
+  arguments that have not been evaluated yet."""
+  location: Meta
+  typeof: Optional[Type]
+  rator: Term
+  args: list[_Thunk]
+  reified: Optional[Term] = None
+
+
+@dataclass(eq=False)
+class _Closure:
+  lam: Lambda
+  scope: _Scope
+  reified: Optional[Term] = None
+
+
+# Equality verdicts of `_Evaluator.compare`, mirroring `Call.reduce` on
+# `=`: the values are equal, a constructor conflict tells them apart,
+# or neither (the call is stuck).
+_EQUAL = 'equal'
+_CONFLICT = 'conflict'
+_UNKNOWN = 'unknown'
+
+
+def _mentioned_names(node: object) -> set[str]:
+  # Every variable name that occurs in `node`, bound or free. Names are
+  # unique after uniquify, so this over-approximates the free names only
+  # by names that are not in scope anyway.
+  names: set[str] = set()
+  seen: set[int] = set()
+  stack: list[object] = [node]
+  while stack:
+    n = stack.pop()
+    if isinstance(n, (list, tuple)):
+      stack.extend(n)
+      continue
+    if isinstance(n, (Env, RecFun, GenRecFun)):
+      continue
+    nid = id(n)
+    if nid in seen:
+      continue
+    seen.add(nid)
+    if isinstance(n, OverloadedVar):
+      names.update(n.resolved_names)
+    elif isinstance(n, VarRef):
+      names.add(n.get_name())
+    if hasattr(n, '__dict__'):
+      for v in vars(n).values():
+        if v is not None and not isinstance(v, (str, int, float, bool)):
+          stack.append(v)
+  return names
+
+
+def _is_list_node(v: object) -> bool:
+  return isinstance(v, _Con) and len(v.args) == 2 \
+    and isinstance(v.rator, TermInst) \
+    and isinstance(v.rator.subject, (OverloadedVar, ResolvedVar)) \
+    and base_name(v.rator.subject.get_name()) == 'node'
+
+
+class _Evaluator:
+  def __init__(self, env: Env) -> None:
+    self.env = env
+    self._globals: dict[int, _Thunk] = {}
+    # id(term) -> (term, the names it mentions); the term is kept so
+    # that its id is not reused.
+    self._names: dict[int, tuple[object, set[str]]] = {}
+
+  # Thunks and values
+
+  def delay(self, term: Term, scope: _Scope) -> _Thunk:
+    if isinstance(term, (ResolvedVar, OverloadedVar)) \
+       and term.get_name() in scope.locals:
+      # Share the variable's thunk rather than wrap it in another, so
+      # passing a variable along does not build a chain of thunks.
+      th = scope.locals[term.get_name()]
+      if th.term is None:
+        return _Thunk.ready(self._variable(term, scope))
+      return th
+    return _Thunk(term, scope)
+
+  def force(self, th: _Thunk) -> object:
+    if th.term is not None:
+      assert th.scope is not None
+      value = self.whnf(th.term, th.scope)
+      if th.explicit and isinstance(value, TermInst):
+        value.inferred = False
+      th.value, th.term, th.scope = value, None, None
+    return th.value
+
+  def reify(self, v: object) -> Term:
+    """The fully evaluated term for the value `v`."""
+    if not isinstance(v, (_Con, _Closure)):
+      return cast(Term, v)
+    stack: list[_Con | _Closure] = [v]
+    while stack:
+      top = stack[-1]
+      if top.reified is not None:
+        stack.pop()
+        continue
+      if isinstance(top, _Closure):
+        env = self._strict_env(top.scope, top.lam)
+        top.reified = Lambda(top.lam.location, top.lam.typeof, top.lam.vars,
+                             top.lam.body, env=env)
+        stack.pop()
+        continue
+      vals = [self.force(th) for th in top.args]
+      pending = [x for x in vals
+                 if isinstance(x, (_Con, _Closure)) and x.reified is None]
+      if pending:
+        stack.extend(pending)
+        continue
+      stack.pop()
+      top.reified = intern_call(top.location, top.typeof, top.rator,
+                                [self.reify(x) for x in vals])
+    assert v.reified is not None
+    return v.reified
+
+  def _strict_env(self, scope: _Scope, term: object) -> Env:
+    """`scope.env` with the local variables that `term` mentions bound
+    to their values, for handing `term` to `Term.reduce`."""
+    known = self._names.get(id(term))
+    if known is None:
+      known = (term, _mentioned_names(term))
+      self._names[id(term)] = known
+    names = known[1]
+    env = scope.env
+    for name in names:
+      th = scope.locals.get(name)
+      if th is not None:
+        val = self.reify(self.force(th))
+        env = env.define_term_var(val.location, name, val.typeof, val)
+    return env
+
+  def strict(self, term: Term, scope: _Scope) -> object:
+    return self._value_of(term.reduce(self._strict_env(scope, term)), scope)
+
+  def _value_of(self, t: object, scope: _Scope) -> object:
+    # A lambda returned by `Term.reduce` becomes a closure so that the
+    # evaluator can call it.
+    if isinstance(t, Lambda):
+      if t.env is not None:
+        return _Closure(t, _Scope(t.env, {}))
+      return _Closure(t, scope)
+    return t
+
+  def _as_term(self, v: object) -> Term:
+    return self.reify(v) if isinstance(v, (_Con, _Closure)) else cast(Term, v)
+
+  # Evaluation
+
+  def whnf(self, term: Term, scope: _Scope) -> object:
+    """Evaluate `term` until its outermost constructor is known."""
+    while True:
+      match term:
+        case TAnnote(_, _, subject, _):
+          term = subject
+        case ResolvedVar() | OverloadedVar():
+          return self._variable(term, scope)
+        case Call() if not isinstance(term, NatLit):
+          step = self._call(term, scope)
+          if isinstance(step, tuple):
+            term, scope = step
+          else:
+            return step
+        case Switch(loc, typeof, subject, cases):
+          subject_val = self.force(self.delay(subject, scope))
+          for c in cases:
+            bound = self._match(c.pattern, subject_val)
+            if bound is not None:
+              term = c.body
+              scope = _Scope(scope.env, {**scope.locals, **bound})
+              break
+          else:
+            return Switch(loc, typeof, self._as_term(subject_val), cases)
+        case Conditional(loc, typeof, cond, thn, els):
+          cond_val = self.force(self.delay(cond, scope))
+          match cond_val:
+            case Bool(_, _, True):
+              term = thn
+            case Bool(_, _, False):
+              term = els
+            case _:
+              return Conditional(loc, typeof, self._as_term(cond_val),
+                                 thn, els)
+        case TLet(_, _, var, rhs, body):
+          scope = _Scope(scope.env,
+                         {**scope.locals, var: self.delay(rhs, scope)})
+          term = body
+        case TermInst(loc, typeof, subject, type_args, inferred):
+          subject_val = self.force(self.delay(subject, scope))
+          type_args_red = [t.reduce(scope.env) for t in type_args]
+          if isinstance(subject_val, Generic):
+            sub = {x: t for (x, t) in zip(subject_val.type_params,
+                                          type_args_red)}
+            return self._value_of(subject_val.body.substitute(sub), scope)
+          return TermInst(loc, typeof, self._as_term(subject_val),
+                          type_args_red, inferred)
+        case Lambda():
+          if term.env is not None:
+            return _Closure(term, _Scope(term.env, {}))
+          return _Closure(term, scope)
+        case _:
+          return self.strict(term, scope)
+
+  def _variable(self, var: VarRef, scope: _Scope) -> object:
+    name = var.get_name()
+    th = scope.locals.get(name)
+    if th is None:
+      # Mirrors `VarRef.reduce` for a name bound in the environment.
+      env = scope.env
+      if get_dont_reduce_opaque() and name in env.dict.keys():
+        binding = env.dict[name]
+        if isinstance(binding, TermBinding) \
+           and binding.visibility == 'opaque' \
+           and binding.module != env.get_current_module():
+          return var
+      res = env.get_value_of_term_var(var)
+      if res is None or isinstance(res, Union):
+        return var
+      if isinstance(res, (RecFun, GenRecFun)):
+        return res
+      th = self._globals.get(id(res))
+      if th is None:
+        th = _Thunk(res, _Scope(env, {}))
+        self._globals[id(res)] = th
+    value = self.force(th)
+    if isinstance(value, TermInst):
+      # `TermInst.reduce` makes a fresh copy at every use, so marking
+      # one use explicit does not affect the others.
+      value = TermInst(value.location, value.typeof, value.subject,
+                       value.type_args, value.inferred)
+    return value
+
+  def _call(self, term: Call, scope: _Scope) \
+      -> object | tuple[Term, _Scope]:
+    """Evaluate the call `term`: a value, or the body and scope to
+    continue with."""
+    loc, typeof, rator, args = term.location, term.typeof, term.rator, \
+      term.args
+    fun = self.force(self.delay(rator, scope))
+    names = [callable_name(rator)]
+    if isinstance(fun, (RecFun, GenRecFun)):
+      names.append(fun.name)
+    elif isinstance(fun, TermInst) \
+         and isinstance(fun.subject, (RecFun, GenRecFun)):
+      names.append(fun.subject.name)
+    if any(n is not None and base_name(n) in _STRICT_OPS for n in names):
+      return self._strict_call(term, fun, scope)
+
+    if isinstance(fun, VarRef) and fun.get_name() == '=' and len(args) == 2:
+      lhs, rhs = self.delay(args[0], scope), self.delay(args[1], scope)
+      verdict = self.compare(lhs, rhs)
+      if verdict == _EQUAL:
+        return Bool(fun.location, BoolType(fun.location), True)
+      if verdict == _CONFLICT:
+        return Bool(fun.location, BoolType(fun.location), False)
+      return Call(loc, typeof, fun, [self.reify(self.force(lhs)),
+                                     self.reify(self.force(rhs))])
+
+    arg_thunks = [self.delay(a, scope) for a in args]
+    match fun:
+      case _Closure(lam, closure_scope):
+        for th in arg_thunks:
+          th.mark_explicit()
+        bound = {x: th for ((x, _), th) in zip(lam.vars, arg_thunks)}
+        return lam.body, _Scope(closure_scope.env,
+                                {**closure_scope.locals, **bound})
+      case GenRecFun(_, _, [], params, _, _, _, body, _):
+        return self._enter(fun.location, [], [], [x for (x, _) in params],
+                           arg_thunks, body, {})
+      case TermInst(_, _, GenRecFun() as gen_fun, type_args):
+        return self._enter(gen_fun.location, gen_fun.type_params, type_args,
+                           [x for (x, _) in gen_fun.vars], arg_thunks,
+                           gen_fun.body, {})
+      case RecFun(_, _, [], params, _, cases):
+        return self._recursive(term, fun, [], [], params, cases, arg_thunks)
+      case TermInst(_, _, RecFun() as rec_fun, type_args):
+        return self._recursive(term, fun, rec_fun.type_params, type_args,
+                               rec_fun.params, rec_fun.cases, arg_thunks)
+      case Generic():
+        internal_error(loc, 'in reduction, call to generic\n\t' + str(term))
+      case _:
+        return _Con(loc, typeof, self._as_term(fun), arg_thunks)
+
+  def _strict_call(self, term: Call, fun: object, scope: _Scope) -> object:
+    # Keep the written rator when it names a global, because
+    # `try_fast_uint_arith` keys on it; otherwise pass the function.
+    rator = term.rator
+    head = rator.subject if isinstance(rator, TermInst) else rator
+    if not isinstance(head, VarRef) or head.get_name() in scope.locals:
+      rator = self._as_term(fun)
+    args = [self.reify(self.force(self.delay(a, scope))) for a in term.args]
+    call = Call(term.location, term.typeof, rator, args)
+    return self._value_of(call.reduce(self._strict_env(scope, rator)), scope)
+
+  def _enter(self, loc: Meta, type_params: list[str], type_args: list[Type],
+             params: list[str], args: list[_Thunk], body: Term,
+             bound: dict[str, _Thunk]) -> tuple[Term, _Scope]:
+    # `do_function_call` under full evaluation.
+    env = self.env
+    for (x, ty) in zip(type_params, type_args):
+      env = env.define_type(loc, x, ty)
+    local = dict(bound)
+    for (x, th) in zip(params, args):
+      local[x] = th
+    for th in local.values():
+      th.mark_explicit()
+    return body, _Scope(env, local)
+
+  def _recursive(self, term: Call, fun: object, type_params: list[str],
+                 type_args: list[Type], params: list[Type],
+                 cases: list[FunCase], args: list[_Thunk]) \
+      -> object | tuple[Term, _Scope]:
+    # `Call.do_recursive_call` under full evaluation.
+    if len(args) == len(params):
+      first = self.force(args[0])
+      for fun_case in cases:
+        bound = self._match(fun_case.pattern, first)
+        if bound is not None:
+          return self._enter(fun_case.location, type_params, type_args,
+                             fun_case.parameters, args[1:], fun_case.body,
+                             bound)
+    return Call(term.location, term.typeof, cast(Term, fun),
+                [self.reify(self.force(th)) for th in args])
+
+  def _match(self, pattern: Pattern, v: object) -> Optional[dict[str, _Thunk]]:
+    """The variables `pattern` binds when it matches the value `v`, or
+    None if it does not match."""
+    if isinstance(v, _Con):
+      # `is_match` on a `Call`, without evaluating the arguments.
+      if not isinstance(pattern, PatternCons):
+        v = self.reify(v)
+      elif not pattern.parameters:
+        return None
+      else:
+        inner = v.rator.subject if isinstance(v.rator, TermInst) else v.rator
+        if isinstance(inner, VarRef) and pattern.constructor == inner \
+           and len(pattern.parameters) == len(v.args):
+          for th in v.args:
+            th.mark_explicit()
+          return dict(zip(pattern.parameters, v.args))
+        return None
+    subst: dict[str, Term] = {}
+    if is_match(pattern, self._as_term(v), subst):
+      return {x: _Thunk.ready(t) for (x, t) in subst.items()}
+    return None
+
+  def compare(self, lhs: _Thunk, rhs: _Thunk) -> str:
+    """How `=` on the two values reduces (`_EQUAL`, `_CONFLICT`, or
+    `_UNKNOWN`), evaluating only as much of them as that takes."""
+    equal = True
+    work = [(lhs, rhs)]
+    while work:
+      (a_th, b_th) = work.pop()
+      a, b = self.force(a_th), self.force(b_th)
+      if isinstance(a, _Con) and isinstance(b, _Con) \
+         and is_constr_term(a.rator, self.env) \
+         and is_constr_term(b.rator, self.env):
+        if constr_name(a.rator) != constr_name(b.rator):
+          return _CONFLICT
+        if not (a.rator == b.rator and len(a.args) == len(b.args)):
+          equal = False
+        work.extend(reversed(list(zip(a.args, b.args))))
+        continue
+      a_term, b_term = self._as_term(a), self._as_term(b)
+      if a_term == b_term:
+        continue
+      if constructor_conflict(a_term, b_term, self.env):
+        return _CONFLICT
+      equal = False
+    return _EQUAL if equal else _UNKNOWN
+
+  def list_elements(self, v: object) -> Optional[list[_Thunk]]:
+    """The elements of `v` if it is a list ending in `empty` (what
+    `isNodeList` accepts), forcing its spine but not its elements."""
+    elements: list[_Thunk] = []
+    while _is_list_node(v):
+      assert isinstance(v, _Con)
+      elements.append(v.args[0])
+      v = self.force(v.args[1])
+    if isinstance(v, (_Con, _Closure)) or not isNodeList(cast(Term, v)):
+      return None
+    elements.extend(_Thunk.ready(t) for t in nodeListToList(cast(Term, v)))
+    return elements
+
+
+def lazy_eval_applies(env: Env) -> bool:
+  """Whether `print` and `assert` may use this module: not with
+  `--verbose`, `--trace`, or the debugger, whose output follows the
+  strict evaluator's steps."""
+  return not get_verbose() and get_debugger() is None \
+    and 'tracing' not in env.dict
+
+
+def _with_full_reduction[T](run: Callable[[], T]) -> T:
+  # The flag settings of `full_reduce`, which the strict fallbacks need.
+  old_reduce_all = get_reduce_all()
+  old_eval_all = get_eval_all()
+  try:
+    set_reduce_all(True)
+    set_eval_all(True)
+    return run()
+  finally:
+    set_eval_all(old_eval_all)
+    set_reduce_all(old_reduce_all)
+
+
+def print_lazily(term: Term, env: Env,
+                 write: Callable[[str], None]) -> None:
+  """Print the value of `term` as `print` does, writing each element of
+  a list as soon as it is computed."""
+  def run() -> None:
+    ev = _Evaluator(env)
+    value = ev.force(_Thunk(term, _Scope(env, {})))
+    elements = ev.list_elements(value) if _is_list_node(value) else None
+    if elements is None:
+      write(str(ev.reify(value)) + '\n')
+      return
+    write('[')
+    for (i, th) in enumerate(elements):
+      write((', ' if i > 0 else '') + str(ev.reify(ev.force(th))))
+    write(']\n')
+  _with_full_reduction(run)
+
+
+def assert_equal_lazily(lhs: Term, rhs: Term, env: Env) \
+    -> tuple[bool, Callable[[], tuple[Term, Term]]]:
+  """Whether `lhs` and `rhs` evaluate to the same value, and a function
+  that finishes evaluating both (for the failure message)."""
+  ev = _Evaluator(env)
+  scope = _Scope(env, {})
+  lhs_th, rhs_th = _Thunk(lhs, scope), _Thunk(rhs, scope)
+  same = _with_full_reduction(lambda: ev.compare(lhs_th, rhs_th)) == _EQUAL
+  def values() -> tuple[Term, Term]:
+    return _with_full_reduction(lambda: (ev.reify(ev.force(lhs_th)),
+                                         ev.reify(ev.force(rhs_th))))
+  return same, values
+
+
+def eval_lazily(term: Term, env: Env) -> Term:
+  """The value of `term`, the same as `full_reduce(term, env)`."""
+  ev = _Evaluator(env)
+  return _with_full_reduction(
+    lambda: ev.reify(ev.force(_Thunk(term, _Scope(env, {})))))
@@ -37,7 +37,10 @@ from .declarations import *
 from .env import *
 
 if TYPE_CHECKING:
+    from .hashcons import (intern_call, intern_leaf, intern_nat, intern_unary,
+                           is_interned)
     from .ops import callable_name
+    from .rewrite import call_head_name, may_rewrite_nat_literal
 
 # ---------------------
 # Auxiliary Functions
@@ -183,15 +186,15 @@ def get_arg(t: Term) -> Term:
       raise InternalError('get_arg')
   
 def mkBZero(loc: Meta, zname: str = 'bzero', ty: Type | None = None) -> ResolvedVar:
-  return ResolvedVar(loc, ty, zname)
+  return intern_leaf(loc, ty, zname)
 
 def mkIncDub(loc: Meta, arg: Term, cname: str = 'inc_dub',
              ty: Type | None = None) -> Call:
-  return Call(loc, ty, ResolvedVar(loc, None, cname), [arg])
+  return intern_unary(loc, ty, cname, arg)
 
 def mkDubInc(loc: Meta, arg: Term, cname: str = 'dub_inc',
              ty: Type | None = None) -> Call:
-  return Call(loc, ty, ResolvedVar(loc, None, cname), [arg])
+  return intern_unary(loc, ty, cname, arg)
 
 def isSuc(t: Term) -> bool:
   match t:
@@ -314,11 +317,121 @@ def _resolved_or_var(loc: Meta, ty: Type | None, name: str) -> VarRef:
 
 def mkZero(loc: Meta, zname: str | bool = 'zero',
            ty: Type | None = None) -> VarRef:
+  if '.' in str(zname):
+    return intern_leaf(loc, ty, str(zname))
   return _resolved_or_var(loc, ty, str(zname))
 
 def mkSuc(loc: Meta, arg: Term, sname: str | bool = 'suc',
           ty: Type | None = None) -> Call:
-  return Call(loc, ty, _resolved_or_var(loc, None, str(sname)), [arg])
+  if '.' in str(sname):
+    return intern_unary(loc, ty, str(sname), arg)
+  return intern_call(loc, ty, _resolved_or_var(loc, None, str(sname)), [arg])
+
+def _is_named_var(t: Term, base: str) -> bool:
+  return isinstance(t, VarRef) and base_name(t.get_name()) == base
+
+class NatLit(Call):
+  """The ``Nat`` value ``suc(suc(...zero))`` with ``value`` layers of
+  ``suc``, stored as one node carrying a Python ``int`` rather than as a
+  chain of ``Call``s whose depth is the value.
+
+  To every other pass it is still a ``Call`` of ``rator`` to one
+  argument: ``args`` materializes the next layer down (``zero`` when
+  ``value`` is 1, otherwise the literal one smaller) each time it is
+  read, so ``is_match`` on a ``suc(x)`` pattern, the matcher, and the
+  recognizers peel one layer in O(1) without building the rest.  The
+  recognizers and conversions in this module, the printer, reduction,
+  equality, and the type checker handle the literal whole.
+
+  Not a dataclass of its own: ``args`` is computed, so the node is
+  rebuilt through ``_map_children`` below rather than the generic
+  field-by-field walker.  Build one with ``intToNat``, ``mkSuc``, or
+  ``intern_nat``, which keep ``rator`` a ``suc`` and ``zero`` a
+  ``zero`` reference.
+  """
+
+  __match_args__ = ('location', 'typeof', 'rator', 'zero', 'value')
+
+  def __init__(self, location: Meta, typeof: Optional[Type], rator: Term,
+               zero: Term, value: int):
+    assert value >= 1
+    self.location = location
+    self.typeof = typeof
+    self.rator = rator
+    self.zero = zero
+    self.value = value
+
+  @property
+  def args(self) -> list[Term]:
+    return [self.peel(1)]
+
+  @args.setter
+  def args(self, args: list[Term]) -> None:
+    raise InternalError('the arguments of a Nat literal are not stored')
+
+  def peel(self, layers: int) -> Term:
+    """This literal with ``layers`` of its ``suc``s removed."""
+    if layers >= self.value:
+      return self.zero
+    return self._rebuild(self.location, self.typeof, self.rator, self.zero,
+                         self.value - layers)
+
+  def _rebuild(self, loc: Meta, ty: Optional[Type], rator: Term, zero: Term,
+               value: int) -> NatLit:
+    # A literal from the source stays unshared, and so keeps its own
+    # location; only a value that was already interned is interned again.
+    if is_interned(self):
+      return intern_nat(loc, ty, rator, zero, value)
+    return NatLit(loc, ty, rator, zero, value)
+
+  def __str__(self) -> str:
+    rator_str = applied_head_str(self.rator) or str(self.rator)
+    return (rator_str + '(') * self.value + str(self.zero) + ')' * self.value
+
+  def __repr__(self) -> str:
+    return 'NatLit(' + repr(self.rator) + ', ' + repr(self.zero) + ', ' \
+      + str(self.value) + ')'
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, NatLit):
+      return self is other or (self.value == other.value
+                               and self.rator == other.rator
+                               and self.zero == other.zero)
+    return super().__eq__(other)
+
+  def _map_children(
+      self,
+      f: Callable[[AST], AST],
+      *,
+      on_typeof: Callable[[Optional[Type]], Optional[Type]] | None = None,
+  ) -> Self:
+    # Every layer has the same `rator` and the same `zero` at the
+    # bottom, so mapping `f` over those two maps it over the whole
+    # chain.  Only a local variable that happens to be named `suc` or
+    # `zero` can map to something else; the chain is then spelled out.
+    typeof = self.typeof if on_typeof is None else on_typeof(self.typeof)
+    rator = cast(Term, f(self.rator))
+    zero = cast(Term, f(self.zero))
+    if _is_named_var(rator, 'suc') and _is_named_var(zero, 'zero'):
+      return cast(Self, self._rebuild(self.location, typeof, rator, zero,
+                                      self.value))
+    ret = zero
+    for _ in range(self.value):
+      ret = Call(self.location, typeof, rator, [ret])
+    return cast(Self, ret)
+
+  def reduce(self, env: Env) -> Term:
+    # A literal is a value unless reduction could change one of its
+    # layers: `suc` or `zero` rebound to something that reduces, or an
+    # `auto` rule that could match `suc(...)` or `zero`.  In those rare
+    # cases, reduce it layer by layer like any other call.
+    if self.rator.reduce(env) is self.rator \
+       and self.zero.reduce(env) is self.zero \
+       and (get_eval_all()
+            or not any(may_rewrite_nat_literal(rule.lhs, rule.variables, self)
+                       for rule in env.get_auto_rewrites(call_head_name(self)))):
+      return self
+    return super().reduce(env)
 
 def intToNat(
     loc: Meta,
@@ -327,11 +440,10 @@ def intToNat(
     sname: str | bool = 'suc',
     ty: Type | None = None,
 ) -> Term:
+  zero = mkZero(loc, zname=zname, ty=ty)
   if n <= 0:
-    return mkZero(loc, zname=zname, ty=ty)
-  else:
-    return mkSuc(loc, intToNat(loc, n - 1, zname=zname, sname=sname, ty=ty),
-                 sname=sname, ty=ty)
+    return zero
+  return intern_nat(loc, ty, _resolved_or_var(loc, None, str(sname)), zero, n)
 
 def isNat(t: Term) -> bool:
   # Value-type recognizer — see the comment on ``isUInt`` for why
@@ -339,6 +451,9 @@ def isNat(t: Term) -> bool:
   match t:
     case (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)) if base_name(n) == 'zero':
       return True
+    case NatLit(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)), zero, _) \
+         if base_name(n) == 'suc':
+      return isNat(zero)
     case Call(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)), [arg]) \
          if base_name(n) == 'suc':
       return isNat(arg)
@@ -357,6 +472,9 @@ def isRawNat(t: Term) -> bool:
   match t:
     case (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)) if base_name(n) == 'zero':
       return True
+    case NatLit(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)), zero, _) \
+         if base_name(n) == 'suc':
+      return isRawNat(zero)
     case Call(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)), [arg]) \
          if base_name(n) == 'suc':
       return isRawNat(arg)
@@ -396,6 +514,9 @@ def getZero(t: Term) -> str | bool:
   match t:
     case (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)) if base_name(n) == 'zero':
       return n
+    case NatLit(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)), zero, _) \
+      if base_name(n) == 'suc':
+      return getZero(zero)
     case Call(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n)), [arg]) \
       if base_name(n) == 'suc':
       return getZero(arg)
@@ -416,6 +537,9 @@ def natToInt(t: Term) -> int:
   match t:
     case (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)) if base_name(n) == 'zero':
       return 0
+    case NatLit(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)), zero, value) \
+      if base_name(n) == 'suc':
+      return value + natToInt(zero)
     case Call(_, _, (OverloadedVar(_, _, [n, *_]) | ResolvedVar(_, _, n) | Var(_, _, n)), [arg]) \
       if base_name(n) == 'suc':
       return 1 + natToInt(arg)
@@ -653,18 +777,17 @@ def formulas_equal_modulo_numeric_literals(frm1: AST, frm2: AST) -> bool:
       return False
 
 def check_literal_size(loc: Meta, num: int) -> None:
-    # Reject a literal whose value is so large its unary desugaring
-    # would overflow the recursion limit mid-check. Raising a located
-    # ``ParseError`` here turns an opaque "maximum recursion depth
-    # exceeded" crash into a beginner-friendly diagnostic (issue #1021).
+    # Reject a literal above ``MAX_LITERAL``. The literal itself is a
+    # single ``NatLit`` node, but printing it or unfolding a recursive
+    # definition over it still walks one ``suc`` at a time, so a located
+    # ``ParseError`` here beats an unbounded run (issue #1021).
     from flags import MAX_LITERAL
     from error import ParseError
     if abs(num) > MAX_LITERAL:
         raise ParseError(
             loc,
-            f'numeric literal {num} is too large: Deduce represents '
-            f'numbers as unary terms whose depth equals the value, so it '
-            f'only supports literals up to {MAX_LITERAL}.',
+            f'numeric literal {num} is too large: Deduce only supports '
+            f'literals up to {MAX_LITERAL}.',
         )
 
 def mkLitNat(loc: Meta, num: int) -> Term:
@@ -741,6 +864,11 @@ def constr_name(term: Term) -> str:
     
 def constructor_conflict(term1: Term, term2: Term, env: Env) -> bool:
   match (term1, term2):
+    case (NatLit(_, _, rator1, _, value1), NatLit(_, _, rator2, _, value2)) \
+         if is_constr_term(rator1, env) and constr_name(rator1) == constr_name(rator2):
+      # Peel the layers the two literals have in common at once.
+      common = min(value1, value2)
+      return constructor_conflict(term1.peel(common), term2.peel(common), env)
     case (Call(_, _, rator1, rands1),
           Call(_, _, rator2, rands2)) if is_constr_term(rator1, env) and is_constr_term(rator2, env):
      if constr_name(rator1) != constr_name(rator2):
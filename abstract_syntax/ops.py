@@ -184,10 +184,13 @@ def flatten_assoc_list(op_name: str, args: Sequence[Term]) -> list[Term]:
 # new class hierarchy.
 # --------------------------------------------------------------------------
 
-def _walk_ast_descendants(roots: object) -> Iterator[object]:
+def _walk_ast_descendants(roots: object,
+                          descend_imports: bool = True) -> Iterator[object]:
   """Yield every AST descendant reachable from ``roots`` (a single
   node or an iterable). Memoized by ``id()`` so shared sub-ASTs
-  (e.g. cached imported-module statements) aren't revisited."""
+  (e.g. cached imported-module statements) aren't revisited.
+  ``descend_imports=False`` stops at ``Import`` nodes instead of
+  walking the imported module's statements."""
   from dataclasses import fields, is_dataclass
   seen: set[int] = set()
   stack: list[object] = []
@@ -208,6 +211,12 @@ def _walk_ast_descendants(roots: object) -> Iterator[object]:
     if isinstance(node, dict):
       stack.extend(node.values())
       continue
+    if not descend_imports and isinstance(node, Import):
+      continue
+    if isinstance(node, NatLit):
+      # Its layers share one `rator` and one `zero`.
+      stack.extend((node.rator, node.zero))
+      continue
     if isinstance(node, AST) and is_dataclass(node):
       for f in fields(node):
         child = getattr(node, f.name, None)
@@ -229,9 +238,14 @@ def check_post_uniquify_invariants(ast_list: Sequence[Statement]) -> None:
   arithmetic) already produce a fully-narrowed reference, and that's
   fine — it just means there's nothing for type-check to do.
 
+  Imported modules are not re-walked: each module's statements were
+  audited by the ``uniquify_deduce`` call that produced them (before
+  its ``.pfi`` interface, if any, was written), so re-auditing the
+  whole prelude under every importer is pure overhead.
+
   Raises ``Exception`` listing up to 20 offending nodes on failure."""
   bad = []
-  for node in _walk_ast_descendants(ast_list):
+  for node in _walk_ast_descendants(ast_list, descend_imports=False):
     if type(node) is Var:
       bad.append((getattr(node, 'location', None), node.name))
   if bad:
@@ -425,6 +439,9 @@ def _alpha_equiv(t1: object, t2: object,
     return _alpha_equiv_tlet(t1, t2, env1, env2)
   if isinstance(t1, FunctionType):
     return _alpha_equiv_function_type(t1, t2, env1, env2)
+  if isinstance(t1, NatLit) or isinstance(t2, NatLit):
+    # A literal binds nothing and its constructors are global.
+    return bool(t1 == t2)
   # Default: structural walk. TermInst/TAnnote already unwrapped, so
   # a class mismatch here is real.
   if type(t1) is not type(t2):
@@ -0,0 +1,239 @@
+"""Memo table for reductions of ground calls to recursive functions.
+
+Scope: ``Call.reduce`` routes every call whose head is a ``RecFun`` or
+``GenRecFun`` (possibly under a ``TermInst``) through
+``cached_reduction``.  When the arguments are ground -- built only from
+constructors, global names, and ``Bool`` literals -- the result is looked
+up in a bounded LRU table before ``do_function_call`` runs, so
+``length(node(...))`` or ``pow2(ℕ10)`` is reduced once per check rather
+than once per goal that mentions it.
+
+A table entry is keyed by everything the reduction reads besides the
+call itself:
+
+  * the function's unique name and explicit type arguments;
+  * the arguments, each mapped to a small integer that identifies its
+    structure (``_node_key``), so equal arguments share a key without
+    re-walking them on every lookup;
+  * the reduction flags (``reduce_all``, ``eval_all``,
+    ``dont_reduce_opaque``) and the names in ``reduce_only``;
+  * the environment's current module (opaque visibility) and its
+    ``auto`` rule set, which decides the ``auto_rewrites`` applied to
+    every intermediate result.
+
+A hit replays the bookkeeping the reduction would have done: the names
+it added to ``reduced_defs`` (which drive the "unused expand clause"
+warnings) and the number of rewrites it counted.  Calls made while
+tracing, under ``--verbose``, or with the debugger attached are never
+cached, so their output is unchanged.
+
+The table is cleared at the start of every ``check_deduce`` run, because
+a unique name such as ``f.s3_1`` can denote different functions in
+different files.  Hit, miss, and eviction counts are reported by
+``checker_cache.get_cache_stats`` under the ``reduce`` tag.
+
+Goes here:
+  * the memo table, its key, and its statistics
+
+Does NOT go here:
+  * the reduction rules themselves (``terms``)
+  * the per-statement proof-check cache (``checker_cache``)
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from flags import (get_debugger, get_reduction_cache, get_unique_names,
+                   get_verbose, set_unique_names)
+
+from .core import *
+from .terms import *
+from .declarations import *
+from .env import *
+from .literals import NatLit
+from .rewrite import get_num_rewrites, inc_rewrites
+
+# Cached reductions kept at once; the least recently used is evicted.
+MAX_REDUCTIONS = 1 << 14
+
+# Distinct argument structures numbered before the table starts over.
+MAX_STRUCTURES = 1 << 18
+
+# Structure ids remembered for argument nodes; cleared when full.
+MAX_NODE_KEYS = 1 << 16
+
+
+@dataclass
+class _Reduction:
+  value: Term
+  reduced_defs: frozenset[str]
+  rewrites: int
+  # The ``auto`` binding whose ``id`` is part of the key, kept alive so
+  # the id cannot be reused while the entry exists.
+  auto: object
+
+
+_reductions: OrderedDict[tuple[object, ...], _Reduction] = OrderedDict()
+
+# shallow structural key -> small integer standing for that structure
+_structure_ids: dict[tuple[object, ...], int] = {}
+
+# ``id(node)`` -> (node, its structure id, or -1 if it is not ground);
+# the node is kept so the id stays valid.
+_node_keys: dict[int, tuple[Term, int]] = {}
+
+_reduction_stats: dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def get_reduction_cache_stats() -> dict[str, int]:
+  return dict(_reduction_stats)
+
+
+def reset_reduction_cache(stats: bool = False) -> None:
+  """Drop every cached reduction; with ``stats``, also zero the
+  counters."""
+  _reductions.clear()
+  _structure_ids.clear()
+  _node_keys.clear()
+  if stats:
+    for counter in _reduction_stats:
+      _reduction_stats[counter] = 0
+
+
+def _structure_id(shape: tuple[object, ...]) -> int:
+  sid = _structure_ids.get(shape)
+  if sid is None:
+    sid = len(_structure_ids)
+    _structure_ids[shape] = sid
+  return sid
+
+
+def _node_key(t: Term, env: Env) -> Optional[int]:
+  """Structure id of the ground term ``t``, or ``None`` if ``t`` mentions
+  a local variable, a binder, or a node this cache does not model."""
+  known = _node_keys.get(id(t))
+  if known is not None:
+    return known[1] if known[1] >= 0 else None
+  shape = _node_shape(t, env)
+  sid = -1 if shape is None else _structure_id(shape)
+  if len(_node_keys) >= MAX_NODE_KEYS:
+    _node_keys.clear()
+  _node_keys[id(t)] = (t, sid)
+  return sid if sid >= 0 else None
+
+
+def _types_key(types: list[Type]) -> tuple[str, ...]:
+  """The types printed with their unique names, so that two type
+  variables that share a base name, such as the ``T`` of two theorems,
+  get different keys."""
+  if get_unique_names():
+    return tuple(str(ty) for ty in types)
+  set_unique_names(True)
+  try:
+    return tuple(str(ty) for ty in types)
+  finally:
+    set_unique_names(False)
+
+
+def _node_shape(t: Term, env: Env) -> Optional[tuple[object, ...]]:
+  match t:
+    case ResolvedVar(_, _, name):
+      binding = env.dict.get(name)
+      if not isinstance(binding, TermBinding) or binding.local:
+        return None
+      return ('var', name)
+    case Bool(_, _, value):
+      return ('bool', value)
+    case TermInst(_, _, subject, type_args, inferred):
+      subject_key = _node_key(subject, env)
+      if subject_key is None:
+        return None
+      return ('inst', subject_key, _types_key(type_args),
+              inferred)
+    case NatLit(_, _, rator, zero, value):
+      rator_key = _node_key(rator, env)
+      zero_key = _node_key(zero, env)
+      if rator_key is None or zero_key is None:
+        return None
+      return ('nat', rator_key, zero_key, value)
+    case Call(_, _, rator, args):
+      keys: list[object] = ['call']
+      for child in [rator, *args]:
+        key = _node_key(child, env)
+        if key is None:
+          return None
+        keys.append(key)
+      return tuple(keys)
+    case _:
+      return None
+
+
+def _function_key(fun: object) -> Optional[tuple[object, ...]]:
+  match fun:
+    case RecFun(_, name) | GenRecFun(_, name):
+      return (name,)
+    case TermInst(_, _, RecFun(_, name) | GenRecFun(_, name), type_args):
+      return (name, _types_key(type_args))
+    case _:
+      return None
+
+
+def _reduction_key(fun: object, args: list[Term], env: Env,
+                   auto: object) -> Optional[tuple[object, ...]]:
+  if not get_reduction_cache() or get_verbose() \
+     or get_debugger() is not None or 'tracing' in env.dict:
+    return None
+  fun_key = _function_key(fun)
+  if fun_key is None:
+    return None
+  arg_keys = []
+  for arg in args:
+    key = _node_key(arg, env)
+    if key is None:
+      return None
+    arg_keys.append(key)
+  return (fun_key, tuple(arg_keys), get_reduce_all(), get_eval_all(),
+          get_dont_reduce_opaque(),
+          frozenset(v.get_name() for v in get_reduce_only()),
+          env.dict.get('__current_module__'), id(auto))
+
+
+def cached_reduction(fun: object, args: list[Term], env: Env,
+                     reduce: Callable[[], Term]) -> Term:
+  """``reduce()``, the reduction of ``fun`` applied to ``args``, served
+  from the memo table when the call is ground."""
+  if len(_structure_ids) > MAX_STRUCTURES:
+    reset_reduction_cache()
+  auto = env.dict.get('__auto__')
+  key = _reduction_key(fun, args, env, auto)
+  if key is None:
+    return reduce()
+  entry = _reductions.get(key)
+  if entry is not None:
+    _reductions.move_to_end(key)
+    _reduction_stats['hits'] += 1
+    get_reduced_defs().update(entry.reduced_defs)
+    inc_rewrites(entry.rewrites)
+    return entry.value
+  _reduction_stats['misses'] += 1
+  # Collect the names this reduction expands in a fresh set: a name the
+  # caller had already recorded must still be replayed by a later hit,
+  # which may come after ``reset_reduced_defs``.
+  outer_defs = get_reduced_defs()
+  reset_reduced_defs()
+  rewrites_before = get_num_rewrites()
+  try:
+    value = reduce()
+  finally:
+    reduced = frozenset(get_reduced_defs())
+    reset_reduced_defs()
+    get_reduced_defs().update(outer_defs, reduced)
+  _reductions[key] = _Reduction(
+    value, reduced, get_num_rewrites() - rewrites_before, auto)
+  if len(_reductions) > MAX_REDUCTIONS:
+    _reductions.popitem(last=False)
+    _reduction_stats['evictions'] += 1
+  return value
@@ -30,6 +30,7 @@ from .proofs import *
 from .declarations import *
 from .env import *
 from .literals import *
+from .hashcons import intern_call
 
 if TYPE_CHECKING:
     from .ops import callable_name, flatten_assoc, flatten_assoc_list, is_associative
@@ -60,6 +61,8 @@ def count_marks(formula: AST) -> int:
       return count_marks(subject)
     case Var() | OverloadedVar() | ResolvedVar():
       return 0
+    case NatLit():
+      return 0
     case Bool(_, _, _):
       return 0
     case And(_, _, args):
@@ -118,6 +121,8 @@ def find_mark(formula: AST) -> None:
       find_mark(subject)
     case Var() | OverloadedVar() | ResolvedVar():
       pass
+    case NatLit():
+      pass
     case Bool(_, _, _):
       pass
     case And(_, _, args):
@@ -204,6 +209,8 @@ def replace_mark(formula: Term | SwitchCase, replacement: Term) -> Term | Switch
       return TermInst(loc2, tyof, replace_mark(subject, replacement), tyargs, inferred)
     case Var() | OverloadedVar() | ResolvedVar():
       return formula
+    case NatLit():
+      return formula
     case Bool(loc2, tyof, _):
       return formula
     case And(loc2, tyof, args):
@@ -301,9 +308,9 @@ def reset_num_rewrites() -> None:
     global num_rewrites
     num_rewrites = 0
 
-def inc_rewrites() -> None:
+def inc_rewrites(n: int = 1) -> None:
     global num_rewrites
-    num_rewrites = 1 + num_rewrites
+    num_rewrites = n + num_rewrites
 
 def get_num_rewrites() -> int:
     global num_rewrites
@@ -315,6 +322,11 @@ def _rule_lhs(equation: Formula | AutoRewriteRule, env: Env) -> Term:
   lhs, _ = split_equation(equation.location, equation, env)
   return lhs
 
+def _rule_variables(equation: Formula | AutoRewriteRule) -> list[Term]:
+  if isinstance(equation, AutoRewriteRule):
+    return equation.variables
+  return equation_vars(equation)
+
 @overload
 def rewrite_aux(loc: Meta, formula: Formula, equation: Formula | AutoRewriteRule, env: Env,
                 depth: int = -1) -> Formula: ...
@@ -345,6 +357,10 @@ def rewrite_aux(loc: Meta, formula: Term | SwitchCase, equation: Formula | AutoR
                       tyargs, inferred)
     case OverloadedVar() | ResolvedVar() | Var():
       return formula
+    case NatLit() if not may_rewrite_nat_literal(_rule_lhs(equation, env),
+                                                 _rule_variables(equation),
+                                                 formula):
+      return formula
     case Bool(loc2, tyof, _):
       return formula
     case And(loc2, tyof, args):
@@ -410,7 +426,7 @@ def rewrite_aux(loc: Meta, formula: Term | SwitchCase, equation: Formula | AutoR
         else:
             return output_terms[0]
       else: # not an associative rator
-        return Call(loc2, tyof, new_rator, new_args)
+        return intern_call(loc2, tyof, new_rator, new_args)
   
     case Switch(loc2, tyof, subject, cases):
       return Switch(loc2, tyof, rewrite_aux(loc, subject, equation, env, depth - 1),
@@ -658,13 +674,203 @@ def call_head_name(term: Term) -> str | None:
           return base_name(name) if name is not None else None
       case _:
           return None
-    
+
+############# Discrimination tree over auto-rewrite rules ######################
+
+# The edge taken by a pattern variable, or by any pattern node the index
+# does not model: rules below it may match whatever the subterm is.
+_ANY = '*'
+
+# rules handed to the matcher, and rules the index ruled out without
+# calling it
+_auto_rewrite_stats: dict[str, int] = {'candidates': 0, 'pruned': 0}
+
+def get_auto_rewrite_stats() -> dict[str, int]:
+  return dict(_auto_rewrite_stats)
+
+def reset_auto_rewrite_stats() -> None:
+  for counter in _auto_rewrite_stats:
+    _auto_rewrite_stats[counter] = 0
+
+def _pattern_key(pattern: Term, variables: list[Term]) -> object:
+  """The edge for one argument of a rule's left-hand side: the symbol
+  that any term it matches must carry at the top, or ``_ANY``."""
+  match pattern:
+    case TermInst(_, _, subject, _, _):
+      return _pattern_key(subject, variables)
+    case Bool(_, _, value):
+      return ('bool', value)
+    case ResolvedVar(_, _, name) if pattern not in variables:
+      return ('var', name)
+    case Call(_, _, rator, _):
+      while isinstance(rator, TermInst):
+        rator = rator.subject
+      if isinstance(rator, ResolvedVar) and rator not in variables:
+        return ('call', rator.name)
+      return _ANY
+    case _:
+      return _ANY
+
+def _term_key(term: Term) -> object | None:
+  """The symbol at the top of ``term`` in the vocabulary of
+  ``_pattern_key``, or ``None`` if ``term`` has no modelled symbol (it
+  then follows every edge)."""
+  match term:
+    case TermInst(_, _, subject, _, _):
+      return _term_key(subject)
+    case Bool(_, _, value):
+      return ('bool', value)
+    case ResolvedVar(_, _, name):
+      return ('var', name)
+    case Call(_, _, rator, _):
+      while isinstance(rator, TermInst):
+        rator = rator.subject
+      if isinstance(rator, ResolvedVar | RecFun | GenRecFun):
+        return ('call', callable_name(rator))
+      return None
+    case _:
+      return None
+
+def _may_match(edge: object, key: object | None) -> bool:
+  """Whether a pattern argument filed under ``edge`` can match a term
+  argument whose top symbol is ``key``.  A call and a ``Bool`` are not
+  told apart: the matcher's fallback reduces both sides, and a call to
+  ``=`` or ``≤`` can reduce to a ``Bool``."""
+  if key is None or edge == _ANY or edge == key:
+    return True
+  return {cast(tuple[str, object], edge)[0],
+          cast(tuple[str, object], key)[0]} == {'call', 'bool'}
+
+def may_rewrite_nat_literal(lhs: Term, variables: list[Term], lit: NatLit) -> bool:
+  """Whether a rule with left-hand side ``lhs`` could match any layer of
+  ``lit``: some ``suc(...)`` inside it, or its ``zero``.  When it cannot,
+  rewriting and reduction leave the literal whole instead of walking
+  its layers."""
+  suc_key = _term_key(lit)
+  zero_key = _term_key(lit.zero)
+  edge = _pattern_key(lhs, variables)
+  if _may_match(edge, zero_key):
+    return True
+  if not _may_match(edge, suc_key):
+    return False
+  match lhs:
+    case Call(_, _, _, [arg]):
+      arg_edge = _pattern_key(arg, variables)
+      return _may_match(arg_edge, suc_key) or _may_match(arg_edge, zero_key)
+    case _:
+      return True
+
+@dataclass(frozen=True)
+class _IndexNode:
+  # edge -> subtree; below a head the first edge is the arity, then one
+  # edge per argument
+  children: dict[object, _IndexNode]
+  # (declaration number, rule) for the rules whose path ends here
+  rules: tuple[tuple[int, AutoRewriteRule], ...]
+  # number of rules in this subtree
+  size: int
+
+  def insert(self, path: list[object], entry: tuple[int, AutoRewriteRule]) -> _IndexNode:
+    """A copy of this node with ``entry`` added at the end of ``path``,
+    sharing every subtree off that path."""
+    if not path:
+      return _IndexNode(self.children, self.rules + (entry,), self.size + 1)
+    children = dict(self.children)
+    children[path[0]] = children.get(path[0], _EMPTY_NODE).insert(path[1:], entry)
+    return _IndexNode(children, self.rules, self.size + 1)
+
+  def collect_all(self, out: list[tuple[int, AutoRewriteRule]]) -> None:
+    out.extend(self.rules)
+    for child in self.children.values():
+      child.collect_all(out)
+
+  def collect(self, keys: list[object | None],
+              out: list[tuple[int, AutoRewriteRule]]) -> None:
+    if not keys:
+      out.extend(self.rules)
+      return
+    key, rest = keys[0], keys[1:]
+    for (edge, child) in self.children.items():
+      if _may_match(edge, key):
+        child.collect(rest, out)
+
+_EMPTY_NODE = _IndexNode({}, (), 0)
+
+class AutoRewriteIndex:
+  """The ``auto`` rules of an environment, indexed by the shape of their
+  left-hand sides so that ``auto_rewrites`` only hands the matcher rules
+  that can match the term at hand.
+
+  Each rule is filed under its head name (``call_head_name``), then its
+  arity, then the top symbol of each argument pattern (``_pattern_key``).
+  A lookup follows, for each argument of the term, both the edge for its
+  own top symbol and the ``_ANY`` edge, so it never drops a rule that
+  ``formula_match`` could apply.  It only discriminates on arguments when
+  that is sound: the term has exactly the rule's arity and none of its
+  arguments has the term's own head, so neither associative flattening
+  nor the matcher's folding of surplus arguments can shift them.  Rules
+  of a smaller arity are always kept, since those can still match after
+  folding.
+
+  The index is persistent: ``insert`` returns a new index that shares
+  all of the old one except the path to the new rule, so
+  ``Env.declare_auto_rewrite`` does not copy the rule set.
+  """
+
+  __slots__ = ('_heads', '_count')
+
+  def __init__(self) -> None:
+    self._heads: dict[str, _IndexNode] = {}
+    self._count = 0
+
+  @staticmethod
+  def build(equations: Mapping[str, list[AutoRewriteRule]]) -> AutoRewriteIndex:
+    index = AutoRewriteIndex()
+    for head, rules in equations.items():
+      for rule in rules:
+        index = index.insert(head, rule)
+    return index
+
+  def insert(self, head: str, rule: AutoRewriteRule) -> AutoRewriteIndex:
+    match rule.lhs:
+      case Call(_, _, _, args):
+        path: list[object] = [len(args)]
+        path += [_pattern_key(arg, rule.variables) for arg in args]
+      case _:
+        path = [_ANY]
+    new = AutoRewriteIndex()
+    new._heads = dict(self._heads)
+    new._heads[head] = self._heads.get(head, _EMPTY_NODE).insert(
+      path, (self._count, rule))
+    new._count = self._count + 1
+    return new
+
+  def candidates(self, head: str, term: Term) -> list[AutoRewriteRule]:
+    """The rules filed under ``head`` that may match ``term``, in the
+    order they were declared."""
+    root = self._heads.get(head, _EMPTY_NODE)
+    found: list[tuple[int, AutoRewriteRule]] = []
+    args = term.args if isinstance(term, Call) else None
+    if args is None or any(call_head_name(arg) == head for arg in args):
+      root.collect_all(found)
+    else:
+      keys = [_term_key(arg) for arg in args]
+      for (arity, child) in root.children.items():
+        if arity == len(args):
+          child.collect(keys, found)
+        elif arity == _ANY or cast(int, arity) < len(args):
+          child.collect_all(found)
+    _auto_rewrite_stats['candidates'] += len(found)
+    _auto_rewrite_stats['pruned'] += root.size - len(found)
+    found.sort(key=lambda entry: entry[0])
+    return [rule for (_, rule) in found]
+
 def auto_rewrites(term: Term, env: Env, include_conditionals: bool = True) -> Term:
     # Iterate until we can't rewrite anymore (to a fixed point)
     while True:
         current = get_num_rewrites()
-        # Grab all the equations that are applicable to the head constructor
-        equations = env.get_auto_rewrites(call_head_name(term))
+        # Grab the equations for the head constructor that can match
+        equations = env.get_auto_rewrite_candidates(term)
         # Rewrite using the first equation that matches 
         for eq in equations:
             if eq.premises and not include_conditionals:
@@ -29,6 +29,8 @@ Does NOT go here:
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache, partial
 from typing import TYPE_CHECKING
 
 from .core import *
@@ -36,6 +38,8 @@ from .core import *
 if TYPE_CHECKING:
     from .declarations import FunCase, GenRecFun, RecFun, Union, overwrite
     from .env import Env, TermBinding
+    from .hashcons import _interned_ids, intern_call
+    from .reduction_cache import cached_reduction
     from .literals import (
         _array_index_predecessor,
         _is_named,
@@ -1022,6 +1026,63 @@ def _connective_arg_str(connective: str, arg: 'str | Formula') -> str:
 
 
 
+# The prelude sources whose Nat operators `fast_nat_call` computes with
+# Python ints: Deduce's own `lib/NatDefs.pf` and `lib/NatDiv.pf`, not
+# any file that happens to share their names.
+_PRELUDE_DIR = os.path.join(
+  os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lib')
+_FAST_NAT_SOURCES = frozenset(
+  os.path.realpath(os.path.join(_PRELUDE_DIR, module + '.pf'))
+  for module in ('NatDefs', 'NatDiv'))
+
+@lru_cache(maxsize=None)
+def _is_fast_nat_source(filename: str) -> bool:
+  return os.path.realpath(filename) in _FAST_NAT_SOURCES
+
+def fast_nat_call(loc: Meta, name: str, args: list[Term],
+                  return_type: Type | None,
+                  defn_loc: Meta | None) -> Term | None:
+  # Under full evaluation, compute `+`, `/`, `*`, `^`, `∸`, `≤`, and `<`
+  # on two Nat literals with Python ints instead of unfolding the
+  # definition one `suc` at a time.  Only the prelude's own definitions
+  # qualify (``defn_loc`` is where the called function is defined), so
+  # a user's operator of the same name is unfolded as written.  Returns
+  # None if the shortcut does not apply.
+  ret: Term | None = None
+  filename = getattr(defn_loc, 'filename', None)
+  if not filename or not _is_fast_nat_source(filename):
+    return None
+  if get_eval_all() and len(args) == 2  and isNat(args[0]) and isNat(args[1]):
+    op = base_name(name)
+    arg_x = natToInt(args[0])
+    arg_y = natToInt(args[1])
+    # This is a really hack-y fix
+    sname = getSuc(args[0])
+    sname = sname if sname else getSuc(args[1])
+    zname = getZero(args[0])
+    ty = return_type
+    if op == '+':
+      ret = intToNat(loc, arg_x + arg_y, sname=sname, zname=zname, ty=ty)
+    elif op == '/' and arg_y != 0:
+      ret = intToNat(loc, arg_x // arg_y, sname=sname, zname=zname, ty=ty)
+    elif op == '*':
+      ret = intToNat(loc, arg_x * arg_y, sname=sname, zname=zname, ty=ty)
+    elif op == '^':
+      ret = intToNat(loc, arg_x ** arg_y, sname=sname, zname=zname, ty=ty)
+    elif op == '∸':
+      ret = intToNat(loc, max(0, arg_x - arg_y), sname=sname, zname=zname,
+                     ty=ty)
+    elif op == '≤':
+      ret = Bool(loc, ty, arg_x <= arg_y)
+    elif op == '<':
+      ret = Bool(loc, ty, arg_x < arg_y)
+    if ret: 
+      if get_verbose():
+        print(f"Doing fast arithmetic on call {arg_x} {op} {arg_y}.")
+      # ``intToNat`` already typed the result ``return_type`` (it may be
+      # a shared, hash-consed value, so it is not retyped here).
+  return ret
+
 def do_function_call(loc: Meta, name: str, type_params: list[str],
                      type_args: list[Type], params: list[str],
                      args: list[Term], body: Term,
@@ -1061,32 +1122,9 @@ def do_function_call(loc: Meta, name: str, type_params: list[str],
                      defn_loc=defn_loc,
                      display_args=display_args if display_args is not None
                                                  else args)
-  fast_call = False
-  ret: Term | None = None
-  if get_eval_all() and len(args) == 2  and isNat(args[0]) and isNat(args[1]):
-    op = base_name(name)
-    arg_x = natToInt(args[0])
-    arg_y = natToInt(args[1])
-    # This is a really hack-y fix
-    sname = getSuc(args[0])
-    sname = sname if sname else getSuc(args[1])
-    zname = getZero(args[0])
-    ty = return_type
-    if op == '+':
-      ret = intToNat(loc, arg_x + arg_y, sname=sname, zname=zname, ty=ty)
-    elif op == '-':
-      ret = intToNat(loc, arg_x - arg_y, sname=sname, zname=zname, ty=ty)
-    elif op == '/':
-      ret = intToNat(loc, arg_x // arg_y, sname=sname, zname=zname, ty=ty)
-    elif op == '*':
-      ret = intToNat(loc, arg_x * arg_y, sname=sname, zname=zname, ty=ty)
-    elif op == '^':
-      ret = intToNat(loc, arg_x ** arg_y, sname=sname, zname=zname, ty=ty)
-    if ret: 
-      if get_verbose():
-        print(f"Doing fast arithmetic on call {arg_x} {op} {arg_y}.")
-      ret.typeof = return_type
-      fast_call = True
+  ret: Term | None = fast_nat_call(loc, name, args, return_type,
+                                   getattr(body, 'location', None))
+  fast_call = ret is not None
 
   if not fast_call:    
     body_env = env
@@ -1184,6 +1222,11 @@ class Call(Term):
         + ")"
 
   def __eq__(self, other: object) -> bool:
+      if self is other:
+        return True
+      if id(self) in _interned_ids and id(other) in _interned_ids:
+        # Distinct hash-consed values are structurally different.
+        return False
       if isinstance(other, TermInst):
         return self == other.subject
       if not isinstance(other, Call):
@@ -1196,6 +1239,12 @@ class Call(Term):
       #print(str(self) + ' =? ' + str(other) + ' = ' + str(result))
       return result
 
+  def substitute(self, sub: Mapping[str, Term | Type | RecFun | GenRecFun]) -> Term | RecFun | GenRecFun:
+    if id(self) in _interned_ids:
+      # A hash-consed literal value is closed.
+      return self
+    return super().substitute(sub)
+
   def reduce(self, env: Env) -> Term:
     fun = cast(Term | RecFun | GenRecFun, self.rator.reduce(env))
     if get_eval_all():
@@ -1262,9 +1311,9 @@ class Call(Term):
           print('>' * recursion_depth, str(base_name(name)) + '(' + str(' '.join([str(x) for x in args]) + ')'))
 
         subst: dict[str, Term | Type] = {k: v for ((k,t),v) in zip(params, args)}
-        ret = do_function_call(loc, name, [], [], [x for (x,t) in params], args,
-                               body, subst, env, None,
-                               display_args=args)
+        ret = cached_reduction(fun, args, env, partial(
+          do_function_call, loc, name, [], [], [x for (x,t) in params], args,
+          body, subst, env, None, display_args=args))
 
       case TermInst(loc, _, subject, type_args) if isinstance(subject, GenRecFun):
         gen_fun = cast(GenRecFun, subject)
@@ -1273,13 +1322,15 @@ class Call(Term):
         params = gen_fun.vars
         body = gen_fun.body
         subst2: dict[str, Term | Type] = {k: v for ((k,t),v) in zip(params, args)}
-        ret = do_function_call(loc, name, typarams, type_args, [x for (x,t) in params], args,
-                               body, subst2, env, None,
-                               display_args=args)
+        ret = cached_reduction(fun, args, env, partial(
+          do_function_call, loc, name, typarams, type_args,
+          [x for (x,t) in params], args, body, subst2, env, None,
+          display_args=args))
     
       case RecFun(loc, name, [], params, returns, cases):
-        ret = self.do_recursive_call(loc, name, cast(Term | RecFun, fun), [], [], params, args,
-                                     returns, cases, is_assoc, env)
+        ret = cached_reduction(fun, args, env, partial(
+          self.do_recursive_call, loc, name, cast(Term | RecFun, fun), [], [],
+          params, args, returns, cases, is_assoc, env))
       case TermInst(loc, _, subject, type_args) if isinstance(subject, RecFun):
         rec_fun = cast(RecFun, subject)
         name = rec_fun.name
@@ -1287,13 +1338,13 @@ class Call(Term):
         params = rec_fun.params
         returns = rec_fun.returns
         cases = rec_fun.cases
-        ret = self.do_recursive_call(loc, name, cast(Term | RecFun, fun), typarams, type_args,
-                                     params, args, returns, cases, is_assoc,
-                                     env)
+        ret = cached_reduction(fun, args, env, partial(
+          self.do_recursive_call, loc, name, cast(Term | RecFun, fun),
+          typarams, type_args, params, args, returns, cases, is_assoc, env))
       case Generic(_, _, typarams, body):
         internal_error(self.location, 'in reduction, call to generic\n\t' + str(self))
       case _:
-        ret = Call(self.location, self.typeof, cast(Term, fun), args)
+        ret = intern_call(self.location, self.typeof, cast(Term, fun), args)
 
     if not get_eval_all():
         assert ret is not None
@@ -1332,6 +1383,16 @@ class Call(Term):
       return self.reduce_associative(loc, name, fun, type_params, type_args,
                                      params, args, cases, env, returns)
 
+    if get_debugger() is None and not env.get_tracing(name):
+      # The prelude's recursive `+`, `*`, `∸`, and `≤` on Nat literals;
+      # with the debugger or tracing on, the call is unfolded so every
+      # step is shown.
+      rec_fun = fun.subject if isinstance(fun, TermInst) else fun
+      fast = fast_nat_call(loc, name, args, returns,
+                           getattr(rec_fun, 'location', None))
+      if fast is not None:
+        return fast
+
     if len(args) == len(params):
       first_arg = args[0]
       rest_args = args[1:]
@@ -10,7 +10,15 @@ File charter:
   a Deduce program is valid except by reporting cache hits and misses.
 """
 
-from typing import cast
+import atexit
+import functools
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Optional, cast
 
 from abstract_syntax import (
     Auto,
@@ -22,6 +30,10 @@ from abstract_syntax import (
     VarRef,
     ViewDecl,
     ViewRecFun,
+    get_auto_rewrite_stats,
+    get_reduction_cache_stats,
+    reset_auto_rewrite_stats,
+    reset_reduction_cache,
 )
 from checker_common import *
 
@@ -44,6 +56,10 @@ from checker_common import *
 # ``check_deduce`` calls.  ``lsp/library.py`` clears it when the
 # prelude key changes (different prelude => different baseline =>
 # cache invalid).
+#
+# Behind the in-memory dict sits an optional persistent store (see
+# "Persistent verdict store" below) so a fresh CLI process or a
+# restarted LSP/MCP daemon can reuse verdicts from earlier runs.
 
 # Key shape is ``("check_proofs", stmt_hash, deps_fingerprint, target,
 # module_name)``; ``target`` is the LSP target hole location (``None`` outside
@@ -54,25 +70,43 @@ _stmt_cache: dict[_StmtCacheKey, bool] = {}
 
 # Hits and misses bucketed by loop, for the test instrumentation
 # the plan requires ("untouched statements were cache hits").
-_cache_stats: dict[str, dict[str, int]] = {"hits": {}, "misses": {}}
+# ``persistent_hits`` counts the subset of ``hits`` that were served
+# from the on-disk store rather than ``_stmt_cache``.
+_cache_stats: dict[str, dict[str, int]] = {
+    "hits": {}, "misses": {}, "persistent_hits": {},
+}
 
 
 def reset_stmt_cache() -> None:
     """Drop everything in ``_stmt_cache`` and zero the stats.  Called
     by the LSP pipeline when the prelude key changes; tests use it
-    to start each fixture from a clean slate."""
+    to start each fixture from a clean slate.  The persistent store
+    (if enabled) is left alone: its keys already fold in the imported
+    modules' ASTs, so a different prelude simply misses."""
     global _stmt_cache
     _stmt_cache.clear()
-    _cache_stats["hits"].clear()
-    _cache_stats["misses"].clear()
+    for bucket in _cache_stats.values():
+        bucket.clear()
+    reset_reduction_cache(stats=True)
+    reset_auto_rewrite_stats()
 
 
 def get_cache_stats() -> dict[str, dict[str, int]]:
-    """Return a copy of the per-loop hit/miss counters."""
-    return {
-        "hits": dict(_cache_stats["hits"]),
-        "misses": dict(_cache_stats["misses"]),
-    }
+    """Return a copy of the per-loop hit/miss counters.  The memo table
+    for ground recursive calls (``abstract_syntax.reduction_cache``)
+    reports under the ``reduce`` tag, including its LRU evictions.  The
+    ``auto`` rule index reports, under the ``auto`` tag, how many rules
+    it handed to the matcher (``candidates``) and how many it ruled out
+    without matching (``pruned``)."""
+    stats = {kind: dict(bucket) for kind, bucket in _cache_stats.items()}
+    reductions = get_reduction_cache_stats()
+    stats["hits"]["reduce"] = reductions["hits"]
+    stats["misses"]["reduce"] = reductions["misses"]
+    stats["evictions"] = {"reduce": reductions["evictions"]}
+    rewrites = get_auto_rewrite_stats()
+    stats["candidates"] = {"auto": rewrites["candidates"]}
+    stats["pruned"] = {"auto": rewrites["pruned"]}
+    return stats
 
 
 def _record_hit(loop_tag: str) -> None:
@@ -83,13 +117,33 @@ def _record_miss(loop_tag: str) -> None:
     _cache_stats["misses"][loop_tag] = _cache_stats["misses"].get(loop_tag, 0) + 1
 
 
+def _record_persistent_hit(loop_tag: str) -> None:
+    bucket = _cache_stats["persistent_hits"]
+    bucket[loop_tag] = bucket.get(loop_tag, 0) + 1
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _stable_str_hash(s: str) -> int:
+    """Process-independent hash of ``s``.
+
+    The builtin ``hash(str)`` is salted per process (``PYTHONHASHSEED``),
+    which is fine for the in-memory cache but would make every
+    persisted key unreachable from the next process.  Ints, and tuples
+    of ints, already hash deterministically, so routing every string
+    through this keeps ``_hash_ast`` stable across runs."""
+    digest = hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
 def _hash_ast(node: object) -> int:
     """Stable structural hash of a (post-uniquify) AST.
 
     Skips the ``location`` (Meta) attribute, which carries source
     line/column info that shifts with edits to unrelated parts of
     the file -- we want only the structure + names to participate
-    in the hash.
+    in the hash.  Strings are hashed with ``_stable_str_hash`` so the
+    result is the same in every process, which the persistent
+    verdict store relies on.
 
     Memoised on the node via ``__hash_cache__`` so each statement
     is hashed at most once per session, even if it appears in
@@ -97,16 +151,21 @@ def _hash_ast(node: object) -> int:
     """
     if node is None:
         return 0
-    if isinstance(node, (str, int, bool, float)):
+    if isinstance(node, str):
+        return _stable_str_hash(node)
+    if isinstance(node, (int, bool, float)):
         return hash(node)
     if isinstance(node, (list, tuple)):
         seq = cast(list[object] | tuple[object, ...], node)
         return hash(tuple(_hash_ast(x) for x in seq))
+    if isinstance(node, (set, frozenset)):
+        members = cast(set[object] | frozenset[object], node)
+        return hash(tuple(sorted(_hash_ast(x) for x in members)))
     if isinstance(node, dict):
         mapping = cast(dict[object, object], node)
         return hash(
             tuple(
-                (k, _hash_ast(v))
+                (_hash_ast(k), _hash_ast(v))
                 for k, v in sorted(mapping.items(), key=lambda item: repr(item[0]))
             )
         )
@@ -118,14 +177,217 @@ def _hash_ast(node: object) -> int:
         for k, v in cast(dict[str, object], vars(node)).items():
             if k == "location" or k == "__hash_cache__":
                 continue
-            items.append((k, _hash_ast(v)))
-        h = hash((type(node).__name__, tuple(items)))
+            items.append((_stable_str_hash(k), _hash_ast(v)))
+        h = hash((_stable_str_hash(type(node).__name__), tuple(items)))
         try:
             setattr(node, "__hash_cache__", h)
         except AttributeError:
             pass
         return h
-    return hash(repr(node))
+    return _stable_str_hash(repr(node))
+
+
+# ---------------------------------------------------------------------------
+# Persistent verdict store
+# ---------------------------------------------------------------------------
+#
+# An optional on-disk layer under ``_stmt_cache``.  Each verdict is
+# stored content-addressed: the row key is a SHA-256 of the in-memory
+# key plus ``_checker_version()``, so an edit to the checker's own
+# source (or a different Python, whose tuple hash may differ) makes
+# every old row unreachable instead of silently trusted.  Stale rows
+# are not deleted eagerly; they age out through the LRU eviction in
+# ``_PersistentVerdictStore.flush``.
+#
+# The store is a single SQLite file so several checker processes (a
+# grading farm, the CLI next to a running LSP daemon) can share one
+# directory safely.  Any SQLite failure degrades to a cache miss --
+# the persistent layer may only ever save work, never change a
+# verdict or abort a check.
+
+# Source files whose contents decide whether a statement checks.  The
+# parsers are deliberately absent: their output is hashed directly.
+_VERSIONED_SOURCES = (
+    "abstract_syntax/*.py",
+    "checker_*.py",
+    "error.py",
+    "flags.py",
+    "imperative_verifier.py",
+    "proof_checker.py",
+)
+
+# Default cap on stored verdicts.  A row is ~150 bytes, so this bounds
+# the database at roughly 30 MB.
+DEFAULT_PERSISTENT_CACHE_ENTRIES = 200_000
+
+PERSISTENT_CACHE_FILENAME = "proof-cache.sqlite3"
+
+
+@functools.lru_cache(maxsize=1)
+def _checker_version() -> str:
+    """Digest of the checker's own source files and the Python version."""
+    root = Path(__file__).resolve().parent
+    digest = hashlib.sha256(repr(sys.version_info[:2]).encode("utf-8"))
+    for pattern in _VERSIONED_SOURCES:
+        for path in sorted(root.glob(pattern)):
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _persistent_key(key: _StmtCacheKey) -> str:
+    return hashlib.sha256(
+        repr((_checker_version(), key)).encode("utf-8")
+    ).hexdigest()
+
+
+class _PersistentVerdictStore:
+    """SQLite-backed set of verified statement keys with LRU eviction.
+
+    Lookups hit the database directly; insertions and LRU touches are
+    buffered and written in one transaction by ``flush`` (called at the
+    end of every ``check_deduce``), so a check pays one commit rather
+    than one per statement."""
+
+    def __init__(self, directory: Path, max_entries: int) -> None:
+        self.path = directory / PERSISTENT_CACHE_FILENAME
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = -1
+        self._pending: dict[str, float] = {}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # A connection must not cross ``fork``; reopen in the child.
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS verdicts_lru ON verdicts (last_used)"
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error):
+            return None
+        self._conn = conn
+        self._pid = os.getpid()
+        self._pending = {}
+        return conn
+
+    def contains(self, key: str) -> bool:
+        if key in self._pending:
+            self._pending[key] = time.time()
+            return True
+        conn = self._connection()
+        if conn is None:
+            return False
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return False
+        if row is None:
+            return False
+        self._pending[key] = time.time()
+        return True
+
+    def add(self, key: str) -> None:
+        self._pending[key] = time.time()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        conn = self._connection()
+        if conn is None:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO verdicts (key, last_used) "
+                    "VALUES (?, ?)",
+                    pending.items(),
+                )
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM verdicts"
+                ).fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM verdicts WHERE key IN ("
+                        "SELECT key FROM verdicts ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+_persistent_store: Optional[_PersistentVerdictStore] = None
+
+
+def enable_persistent_cache(
+    directory: str,
+    max_entries: int = DEFAULT_PERSISTENT_CACHE_ENTRIES,
+) -> None:
+    """Back ``_stmt_cache`` with the on-disk store in ``directory``.
+
+    Used by ``deduce.py --proof-cache`` and the LSP/MCP servers (via
+    ``DEDUCE_PROOF_CACHE``).  The directory is created on first use."""
+    global _persistent_store
+    disable_persistent_cache()
+    _persistent_store = _PersistentVerdictStore(
+        Path(directory).expanduser(), max_entries
+    )
+
+
+def disable_persistent_cache() -> None:
+    """Flush and detach the on-disk store, if one is enabled."""
+    global _persistent_store
+    if _persistent_store is not None:
+        _persistent_store.close()
+    _persistent_store = None
+
+
+def flush_persistent_cache() -> None:
+    """Write buffered verdicts and LRU touches to disk."""
+    if _persistent_store is not None:
+        _persistent_store.flush()
+
+
+atexit.register(flush_persistent_cache)
+
+
+def lookup_verdict(key: _StmtCacheKey) -> bool:
+    """True iff ``key`` was verified earlier, in this process or (when
+    the persistent store is enabled) in an earlier one.  A persistent
+    hit is promoted into ``_stmt_cache``."""
+    if key in _stmt_cache:
+        return True
+    if _persistent_store is None:
+        return False
+    if not _persistent_store.contains(_persistent_key(key)):
+        return False
+    _stmt_cache[key] = True
+    _record_persistent_hit(key[0])
+    return True
+
+
+def store_verdict(key: _StmtCacheKey) -> None:
+    """Record that the statement behind ``key`` verified."""
+    _stmt_cache[key] = True
+    if _persistent_store is not None:
+        _persistent_store.add(_persistent_key(key))
 
 
 def _collect_referenced_names(
@@ -13,6 +13,8 @@ File charter:
   phase ordering or statement-level orchestration.
 """
 
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, cast
 
@@ -23,6 +25,7 @@ if TYPE_CHECKING:
 
 from abstract_syntax import (
     All, And, Array, ArrayGet, ArraySet, Assert, AST, Associative, Auto, Bool,
+    access_key,
     Call, Conditional, Constructor, Declaration, Define, Env, Export,
     Formula, FunCase, FunctionType, GenRecFun, Generic, GenericUnknownInst,
     Hole, IfThen, ImpAlloc, ImpAssert, ImpAssign, ImpAssume, ImpCallExpr,
@@ -35,12 +38,15 @@ from abstract_syntax import (
     Statement, Switch, SwitchCase, TAnnote, TermBinding, TLet, Term, TermInst, Theorem,
     Trace, Type, TypeAlias, TypeInst, TypeType, Union, Var, VarRef, VerboseLevel,
     ViewDecl, ViewRecFun, alpha_equiv, base_name, callable_name,
-    check_post_typecheck_invariants, find_file, full_reduce, mkEqual,
-    print_theorems, type_match, type_names,
+    assert_equal_lazily, check_post_typecheck_invariants, eval_lazily,
+    find_file, full_reduce, lazy_eval_applies, mkEqual, print_lazily,
+    print_theorems, reset_interned_terms, reset_reduction_cache, type_match,
+    type_names,
 )
 from checker_cache import (
     _collect_defined_names, _collect_referenced_names, _hash_ast,
-    _is_global_barrier, _record_hit, _record_miss, _stmt_cache,
+    _is_global_barrier, _record_hit, _record_miss, _StmtCacheKey,
+    flush_persistent_cache, lookup_verdict, store_verdict,
 )
 from checker_common import *
 from checker_predicates import (
@@ -59,13 +65,13 @@ from checker_types import (
     type_check_term, type_synth_term,
 )
 from error import (
-    Diagnostic, ErrorSink, MatchFailed, error_header, get_active_sink,
-    get_active_warning_sink, internal_error, set_active_sink, user_error,
-    warning,
+    Diagnostic, ErrorSink, MatchFailed, WarningRecord, error_header,
+    get_active_sink, get_active_warning_sink, internal_error, set_active_sink,
+    set_active_warning_sink, user_error, warning,
 )
 from flags import (
-    get_check_imports, get_debugger, get_quiet_mode,
-    get_target_hole_location, get_verbose, set_verbose,
+    get_check_imports, get_debugger, get_lazy_eval, get_proof_jobs,
+    get_quiet_mode, get_target_hole_location, get_verbose, set_verbose,
 )
 
 imported_modules: set[str] = set()
@@ -233,32 +239,38 @@ def _array_write_element_type(loc: Meta, lhs: LValueIndex,
   return binding.typ.elt_type
 
 def _type_check_array_write(loc: Meta, lhs: LValueIndex, rhs: Term,
-                            env: Env) -> None:
+                            env: Env) -> tuple[Term, Term]:
   # A mutable-array element write `a[i] := v` (#1118): the index must be a
   # `UInt` (as for a read, #1117) and the value must have the element type.
+  # Returns the checked index and value.
   elt_type = _array_write_element_type(loc, lhs, env)
   new_index = type_synth_term(lhs.index, env, None, [])
   _check_array_index_type(new_index)
-  type_check_term(rhs, elt_type, env, None, [])
+  return new_index, type_check_term(rhs, elt_type, env, None, [])
 
-def _type_check_imp_stmt(s: ImpStmt, env: Env,
-                         return_type: Optional[Type]) -> Env:
+def _type_check_imp_stmt(s: ImpStmt, env: Env, return_type: Optional[Type]
+                         ) -> tuple[Env, ImpStmt]:
   # Returns the environment as seen by the *following* statement in the same
-  # block: a `var` extends it with the new local; everything else leaves it
-  # unchanged. `Env` is functional, so nested `if` blocks type-check against a
-  # value derived from `env` without leaking their locals back out.
+  # block -- a `var` extends it with the new local; everything else leaves it
+  # unchanged -- and the statement with its terms type-checked. `Env` is
+  # functional, so nested `if` blocks type-check against a value derived from
+  # `env` without leaking their locals back out.
   match s:
-    case ImpVar(loc, name, type_annot, rhs, _):
+    case ImpVar(loc, name, type_annot, rhs, ghost):
       if type_annot is not None:
         var_ty = check_type(type_annot, env)
-        type_check_term(cast(Term, rhs), var_ty, env, None, [])
+        new_rhs = type_check_term(cast(Term, rhs), var_ty, env, None, [])
       else:
-        var_ty = type_synth_term(cast(Term, rhs), env, None, []).typeof
-      return env.declare_term_var(loc, name, var_ty, local=True)
+        new_rhs = type_synth_term(cast(Term, rhs), env, None, [])
+        var_ty = new_rhs.typeof
+      return env.declare_term_var(loc, name, var_ty, local=True), \
+          ImpVar(loc, name, var_ty, new_rhs, ghost)
     case ImpAssign(loc, lhs, rhs):
       if isinstance(lhs, LValueIndex):
-        _type_check_array_write(loc, lhs, cast(Term, rhs), env)
-        return env
+        new_index, new_rhs = _type_check_array_write(loc, lhs, cast(Term, rhs),
+                                                     env)
+        return env, ImpAssign(loc, LValueIndex(lhs.location, lhs.array,
+                                               new_index), new_rhs)
       target = cast(LValueVar, lhs)
       binding = env.dict.get(target.name)
       if not isinstance(binding, TermBinding):
@@ -267,49 +279,53 @@ def _type_check_imp_stmt(s: ImpStmt, env: Env,
       if not binding.local:
         user_error(loc, 'cannot assign to ' + base_name(target.name)
                    + ' because it is not a local variable')
-      type_check_term(cast(Term, rhs), binding.typ, env, None, [])
-      return env
+      return env, ImpAssign(loc, lhs, type_check_term(cast(Term, rhs),
+                                                      binding.typ, env, None,
+                                                      []))
     case ImpIf(loc, cond, then_body, else_body):
-      type_check_formula(cond, env)
-      _type_check_imp_block(then_body, env, return_type)
+      new_cond = type_check_formula(cond, env)
+      new_then = _type_check_imp_block(then_body, env, return_type)
+      new_else = None
       if else_body is not None:
-        _type_check_imp_block(else_body, env, return_type)
-      return env
+        new_else = _type_check_imp_block(else_body, env, return_type)
+      return env, ImpIf(loc, new_cond, new_then, new_else)
     case ImpReturn(loc, value):
       if return_type is None:
         user_error(loc, 'this procedure has no return type, so it may not '
                    + 'return a value')
-      else:
-        type_check_term(value, return_type, env, None, [])
-      return env
-    case ImpAssert(loc, formula, _):
+      return env, ImpReturn(loc, type_check_term(value,
+                                                 cast(Type, return_type),
+                                                 env, None, []))
+    case ImpAssert(loc, formula, proof):
       # The asserted formula must be a `bool`; the obligation that it actually
       # holds is discharged later in `verify_proc` (Phase 2f).
-      type_check_formula(formula, env)
-      return env
+      return env, ImpAssert(loc, type_check_formula(formula, env), proof)
     case ImpAssume(loc, formula):
       # `assume` is proof-only: the formula must be a `bool`, and it becomes a
       # given for the statements that follow (see `proc_obligations`). It has
       # no runtime effect, so it never contributes to the state.
-      type_check_formula(formula, env)
-      return env
-    case ImpWhile(loc, cond, invariants, _, _, body, _, _, _):
+      return env, ImpAssume(loc, type_check_formula(formula, env))
+    case ImpWhile(loc, cond, invariants, modifies, decreases, body,
+                  established, preserved, decreases_proof):
       # Phase 2l (#1121): the loop condition and each invariant must be a
       # `bool`, and the body type-checks against the enclosing environment
       # (its own locals stay block-scoped, matching uniquify). The `decreases`
       # measure is left for the termination slice (#1122).
-      type_check_formula(cond, env)
-      for inv in invariants:
-        type_check_formula(inv, env)
-      _type_check_imp_block(body, env, return_type)
-      return env
+      new_cond = type_check_formula(cond, env)
+      new_invariants = [type_check_formula(inv, env) for inv in invariants]
+      new_body = _type_check_imp_block(body, env, return_type)
+      return env, ImpWhile(loc, new_cond, new_invariants, modifies, decreases,
+                           new_body, established, preserved, decreases_proof)
     case _:
-      return env
+      return env, s
 
 def _type_check_imp_block(stmts: list[ImpStmt], env: Env,
-                          return_type: Optional[Type]) -> None:
+                          return_type: Optional[Type]) -> list[ImpStmt]:
+  checked: list[ImpStmt] = []
   for s in stmts:
-    env = _type_check_imp_stmt(s, env, return_type)
+    env, new_s = _type_check_imp_stmt(s, env, return_type)
+    checked.append(new_s)
+  return checked
 
 # Phase 2e (issue #1114): ghost-variable noninterference. `ghost` parameters
 # and `ghost var` locals are proof-only, so Phase 6 can erase them without
@@ -403,23 +419,26 @@ def _ghost_check_block(stmts: list[ImpStmt], ghost_names: set[str]) -> None:
 def check_ghost_noninterference(decl: ProcDecl) -> None:
   _ghost_check_block(decl.body, {p.name for p in decl.params if p.ghost})
 
-def type_check_proc_body(decl: ProcDecl, env: Env) -> None:
+def type_check_proc_body(decl: ProcDecl,
+                         env: Env) -> Optional[list[ImpStmt]]:
   # Phase 2d (issue #1113): type-check a procedure's straight-line body --
   # annotated and inferred local `var` declarations, assignments to local
   # variables, and `return` -- with lexical block scope. Bodies that use
   # constructs not yet modeled (see `_proc_body_unmodeled`) are deferred to
-  # later slices. No specifications are proved here.
+  # later slices. No specifications are proved here. Returns the checked
+  # body, or None for a deferred one.
   if _proc_body_unmodeled(decl):
-    return
+    return None
   loc = decl.location
   type_env = env.declare_type_vars(loc, decl.type_params)
   param_pairs = [(p.name, p.typ) for p in decl.params]
   body_env = type_env.declare_term_vars(loc, param_pairs, local=True)
-  _type_check_imp_block(decl.body, body_env, decl.return_type)
+  checked = _type_check_imp_block(decl.body, body_env, decl.return_type)
   if decl.return_type is not None and not _block_always_returns(decl.body):
     user_error(loc, "procedure '" + base_name(decl.name)
                + "' declares return type " + str(decl.return_type)
                + ' but may finish without returning a value')
+  return checked
 
 # --- Phase 2f/2g/2i (issues #1115, #1116, #1118): procedure verification -----
 # A procedure is *verifiable* by these slices when its body is built from local
@@ -902,6 +921,7 @@ def verify_proc(decl: ProcDecl, env: Env) -> None:
   if not _proc_verifiable(decl):
     warn_unverified_imperative(decl)
     return
+  from imperative_verifier import ObligationKind
   slots = {entry.label: entry for entry in decl.proof_block}
   cur_env, obligations = proc_obligations(decl, env)
   used: set[str] = set()
@@ -916,6 +936,11 @@ def verify_proc(decl: ProcDecl, env: Env) -> None:
       user_error(entry.location,
                  "unused proof slot '" + base_name(label) + "': no `by "
                  + base_name(label) + "` clause in this proc cites it")
+  # Every obligation was discharged, so the compiler may drop the runtime
+  # bounds check of each access that raised one. An access on no path (and a
+  # `while` condition, which raises none) keeps its check.
+  decl.proven_in_bounds = {access_key(o.location) for o in obligations
+                           if o.kind == ObligationKind.ARRAY_BOUNDS}
 
 def process_declaration_visibility(decl: Declaration, env: Env,
                                    module_chain: list[str],
@@ -1165,20 +1190,44 @@ def process_declaration_visibility(decl: Declaration, env: Env,
               if get_quiet_mode() == False:
                   print('> checking ' + name)
               
+          # Under ``--jobs`` the module's proofs are queued and checked
+          # by ``_check_pending_imports`` alongside the other modules of
+          # this import tree; only the environment is built here.  A
+          # module with output of its own is checked here, after the
+          # modules queued before it, so the output stays in import order.
+          deferred = needs_checking[0] and name not in checked_modules \
+              and _proof_pool_size() > 1
+          if deferred and any(isinstance(s, _PRINTING_STMTS) for s in ast3):
+            deferred = False
+            _check_pending_imports()
+          proofs: list[tuple[Statement, Env]] = []
           for s in ast3:
             env = collect_env(s, env)
 
             # TODO: only check if the pf file is newer than the thm file
             if name not in checked_modules and needs_checking[0]:
-              check_proofs(s, env)
+              if deferred:
+                proofs.append((s, env))
+              else:
+                check_proofs(s, env)
             
           if name not in checked_modules:
             checked_modules.add(name)  
 
           set_verbose(old_verbose)
 
-          if needs_checking[0]:
+          if deferred:
+            # The ``.thm`` file marks the module as checked, so it is
+            # written only once the queued proofs have passed.
+            _pending_import_checks.append(
+              _ImportedModuleCheck(name, filename, ast3, proofs))
+          elif needs_checking[0]:
             print_theorems(filename, ast3)
+          # ``module_chain`` now starts with this module, so length two
+          # means the importer is the file being checked: the whole
+          # import tree below this statement is built.
+          if len(module_chain) == 2 and _pending_import_checks:
+            _check_pending_imports()
           
           return Import(loc, name, ast3, visibility=decl.visibility), \
               env.declare_module(current_module)
@@ -1702,7 +1751,7 @@ def type_check_stmt(stmt: Statement, env: Env,
       # Phase 2e (issue #1114): the syntactic ghost-noninterference check runs
       # regardless of whether the body is type-modeled (see its note).
       check_ghost_noninterference(stmt)
-      type_check_proc_body(stmt, env)
+      stmt.checked_body = type_check_proc_body(stmt, env)
       return stmt
 
     case ObjectDecl() | ObserverDecl() | ResourceDecl():
@@ -1900,6 +1949,7 @@ def collect_env(stmt: Statement, env: Env) -> Env:
           user_error(loc, 'Could not find a proof of\n\t' + str(assoc_formula))
   
     case Trace(loc, function_name):
+      _traced_functions.add(function_name.get_name())
       return env.declare_tracing(function_name.get_name())
 
     case _:
@@ -2037,6 +2087,9 @@ def check_proofs(stmt: Statement, env: Env) -> None:
   _dbg = get_debugger()
   if _dbg is not None:
     _dbg.on_statement(stmt, env)
+  # `print` and `assert` evaluate call-by-need under `--lazy`.
+  lazy = isinstance(stmt, (Print, Assert)) and get_lazy_eval() \
+    and lazy_eval_applies(env)
   match stmt:
     case Define(loc, name, _, body):
       pass
@@ -2129,31 +2182,48 @@ def check_proofs(stmt: Statement, env: Env) -> None:
       pass
   
     case Print(loc, trm):
-      result = full_reduce(trm, env)
-      print(str(result))
+      if lazy:
+        print_lazily(trm, env, lambda text: print(text, end='', flush=True))
+      else:
+        result = full_reduce(trm, env)
+        print(str(result))
       
     case Assert(loc, frm):
       match frm:
         case Call(_, _, rator, [lhs, rhs]) if isinstance(rator, VarRef) and rator.get_name() == '=':
-          L = full_reduce(lhs, env)
-          R = full_reduce(rhs, env)
-          if L == R:
-            pass
-          else:
+          if lazy:
+            same, values = assert_equal_lazily(lhs, rhs, env)
+            if not same:
+              L, R = values()
               user_error(loc, 'assertion failed:\n' +
                     '\t' + str(L) + ' ≠ ' + str(R) + '\n')
+          else:
+            L = full_reduce(lhs, env)
+            R = full_reduce(rhs, env)
+            if L == R:
+              pass
+            else:
+                user_error(loc, 'assertion failed:\n' +
+                      '\t' + str(L) + ' ≠ ' + str(R) + '\n')
         case IfThen(_, _,
                     Call(_, _, rator, [lhs, rhs]),
                     Bool(_, _, False)) if isinstance(rator, VarRef) and rator.get_name() == '=':
-          L = full_reduce(lhs, env)
-          R = full_reduce(rhs, env)
-          if L != R:
-            pass
-          else:
+          if lazy:
+            same, values = assert_equal_lazily(lhs, rhs, env)
+            if same:
+              L, R = values()
               user_error(loc, 'assertion failed:\n' +
                     '\t' + str(L) + ' = ' + str(R) + '\n')
+          else:
+            L = full_reduce(lhs, env)
+            R = full_reduce(rhs, env)
+            if L != R:
+              pass
+            else:
+                user_error(loc, 'assertion failed:\n' +
+                      '\t' + str(L) + ' = ' + str(R) + '\n')
         case _:
-          result = full_reduce(frm, env)
+          result = eval_lazily(frm, env) if lazy else full_reduce(frm, env)
           match result:
             case Bool(_, _, True):
               pass
@@ -2248,6 +2318,191 @@ def check_exported_contract_visibility(ast: List[Statement]) -> None:
                  + "' in its contract; a public contract may only mention "
                  + 'names visible to importing modules.')
 
+# Statements whose ``check_proofs`` is worth handing to a ``--jobs``
+# worker: theorem proofs and ``recfun ... measure`` termination proofs.
+# Everything else is cheap, or (``print``, ``assert``, imperative
+# declarations) has effects that must happen in the checking process.
+_OFFLOADABLE = (Theorem, GenRecFun)
+
+# Proof-check tasks for the ``--jobs`` workers, indexed by task number:
+# the (statement, env) pairs to check, in order.  A task is a single
+# theorem of the file being checked, or every statement of an imported
+# module.  Filled in by the parent just before the pool forks, so each
+# worker reads its copy-on-write snapshot and no AST or ``Env`` is ever
+# pickled.
+_offloaded_proofs: list[list[tuple[Statement, Env]]] = []
+
+
+def _check_offloaded_proofs(index: int) -> bool:
+  """Worker side of ``--jobs``: check one task's proofs and report
+  whether they all passed cleanly.  A diagnostic, a warning, or any
+  other exception returns ``False`` and the parent re-checks the task
+  itself, so failures are reported exactly as a sequential run would."""
+  sink = ErrorSink()
+  warnings: list[WarningRecord] = []
+  set_active_sink(sink)
+  set_active_warning_sink(warnings)
+  try:
+    for stmt, env in _offloaded_proofs[index]:
+      check_proofs(stmt, env)
+  except Exception:
+    return False
+  return not sink and not warnings
+
+
+def _start_proof_pool(
+    tasks: list[list[tuple[Statement, Env]]], jobs: int,
+) -> tuple[ProcessPoolExecutor, list[Future[bool]]]:
+  """Fork up to ``jobs`` workers and submit ``tasks`` in order.  The
+  caller must ``_stop_proof_pool`` once it has the results it needs."""
+  _offloaded_proofs[:] = tasks
+  pool = ProcessPoolExecutor(
+    max_workers=min(jobs, len(tasks)),
+    mp_context=multiprocessing.get_context('fork'))
+  return pool, [pool.submit(_check_offloaded_proofs, n)
+                for n in range(len(tasks))]
+
+
+def _stop_proof_pool(pool: ProcessPoolExecutor) -> None:
+  # When a diagnostic propagates, don't wait for the tasks after it.
+  pool.shutdown(wait=False, cancel_futures=True)
+  _offloaded_proofs.clear()
+
+
+def _offloaded_proof_verified(future: Future[bool]) -> bool:
+  try:
+    return future.result()
+  except Exception:
+    # A worker that died (``BrokenProcessPool``) verified nothing.
+    return False
+
+
+# The functions traced by ``--trace`` or a ``trace`` statement during
+# this ``check_deduce`` call.
+_traced_functions: set[str] = set()
+
+
+def _proof_pool_size() -> int:
+  """Number of workers for this ``check_deduce`` call; 1 means check
+  proofs in process.  Debugger sessions, verbose traces, and function
+  tracing (``--trace`` or a ``trace`` statement) stay sequential because
+  all of them are observed from the checking process.  A ``trace``
+  statement can turn up after the pool size was first asked for, so the
+  pool is sized again right before it is started."""
+  jobs = get_proof_jobs()
+  if jobs <= 1 or get_debugger() is not None or get_verbose() \
+     or _traced_functions \
+     or 'fork' not in multiprocessing.get_all_start_methods():
+    return 1
+  return jobs
+
+
+@dataclass
+class _ScheduledProof:
+  stmt: Statement
+  env: Env
+  key: _StmtCacheKey
+  offload: bool
+
+
+class _ProofSchedule:
+  """The ``check_proofs`` work of one ``check_deduce`` call under
+  ``--jobs``, recorded in source order by the ``collect_env`` loop and
+  run once that loop is done.
+
+  Each statement is checked against the ``Env`` that ``collect_env``
+  had built when it was reached, which only holds earlier statements
+  (auto rules included), so the theorems do not depend on each other's
+  checks and can run in any order.  ``run`` hands the uncached ones to a
+  fork pool, then walks the schedule in source order: worker-verified
+  proofs are recorded as verified, everything else goes through the
+  usual in-process check, so diagnostics come out in source order.
+  """
+
+  def __init__(self, jobs: int):
+    self.jobs = jobs
+    self.entries: list[_ScheduledProof | Diagnostic] = []
+
+  def add(self, stmt: Statement, env: Env, key: _StmtCacheKey) -> None:
+    offload = isinstance(stmt, _OFFLOADABLE) and not lookup_verdict(key)
+    self.entries.append(_ScheduledProof(stmt, env, key, offload))
+
+  def add_error(self, exc: Diagnostic) -> None:
+    """Keep a ``collect_env`` diagnostic in its source position."""
+    self.entries.append(exc)
+
+  def run(self,
+          check: Callable[[Statement, Env, _StmtCacheKey, bool], None],
+          collect_diagnostic: Callable[[Diagnostic], None]) -> None:
+    offloaded = [e for e in self.entries
+                 if isinstance(e, _ScheduledProof) and e.offload]
+    futures: dict[int, Future[bool]] = {}
+    pool = None
+    jobs = min(self.jobs, _proof_pool_size())
+    if len(offloaded) > 1 and jobs > 1:
+      pool, submitted = _start_proof_pool(
+        [[(e.stmt, e.env)] for e in offloaded], jobs)
+      futures = {id(e): f for e, f in zip(offloaded, submitted)}
+    try:
+      for entry in self.entries:
+        if isinstance(entry, Diagnostic):
+          collect_diagnostic(entry)
+          continue
+        future = futures.get(id(entry))
+        verified = future is not None and _offloaded_proof_verified(future)
+        check(entry.stmt, entry.env, entry.key, verified)
+    finally:
+      if pool is not None:
+        _stop_proof_pool(pool)
+
+
+@dataclass
+class _ImportedModuleCheck:
+  name: str
+  filename: str
+  ast: list[Statement]
+  proofs: list[tuple[Statement, Env]]
+
+
+# Statements whose check can write to stdout.  A worker's output would
+# interleave with the other workers', so the ``Import`` arm does not
+# queue a module that contains one.
+_PRINTING_STMTS = (Print, Assert, Trace)
+
+# Imported modules whose proofs the ``Import`` arm of
+# ``process_declaration_visibility`` queued for the ``--jobs`` pool, in
+# the order their environments were finished (dependencies first).
+_pending_import_checks: list[_ImportedModuleCheck] = []
+
+
+def _check_pending_imports() -> None:
+  """Check the proofs of every queued imported module, one module per
+  worker task, then write each module's ``.thm`` file.
+
+  The module environments were built serially by the ``Import`` arm
+  (which walks the import DAG depth first), and every proof is checked
+  against the ``Env`` snapshot taken when its statement was collected,
+  so the modules' proof checks are independent of each other.  Results
+  are consumed in queue order; a module a worker did not verify is
+  re-checked in process, raising its diagnostic as a serial run would."""
+  pending = list(_pending_import_checks)
+  _pending_import_checks.clear()
+  pool = None
+  futures: list[Future[bool]] = []
+  jobs = _proof_pool_size()
+  if len(pending) > 1 and jobs > 1:
+    pool, futures = _start_proof_pool([m.proofs for m in pending], jobs)
+  try:
+    for n, module in enumerate(pending):
+      if not (futures and _offloaded_proof_verified(futures[n])):
+        for s, env in module.proofs:
+          check_proofs(s, env)
+      print_theorems(module.filename, module.ast)
+  finally:
+    if pool is not None:
+      _stop_proof_pool(pool)
+
+
 def check_deduce(ast: List[Statement], module_name: str, modified: bool,
                  tracing_functions: List[str],
                  error_sink: Optional[ErrorSink] = None) -> List[Statement]:
@@ -2273,6 +2528,11 @@ def check_deduce(ast: List[Statement], module_name: str, modified: bool,
   env = Env()
   env = env.declare_module(module_name)
   imported_modules.clear()
+  _pending_import_checks.clear()
+  _traced_functions.clear()
+  _traced_functions.update(tracing_functions)
+  reset_interned_terms()
+  reset_reduction_cache()
   needs_checking = [modified]
 
   prev_sink = get_active_sink()
@@ -2283,6 +2543,9 @@ def check_deduce(ast: List[Statement], module_name: str, modified: bool,
     )
   finally:
     set_active_sink(prev_sink)
+    _pending_import_checks.clear()
+    _traced_functions.clear()
+    flush_persistent_cache()
 
 
 def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
@@ -2354,6 +2617,72 @@ def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
     for s in ast3:
       print(s)
 
+  def _check_stmt_proofs(s: Statement, env: Env, key: _StmtCacheKey,
+                         verified: bool = False) -> None:
+    """``check_proofs`` behind the per-statement cache.  ``verified``
+    means a ``--jobs`` worker already checked ``s`` cleanly."""
+    if verified:
+      store_verdict(key)
+      _record_miss("check_proofs")
+      return
+    # ``Print`` and ``Assert`` have observable side effects in
+    # ``check_proofs`` (printing a value, raising on a failed
+    # assertion).  Their cache key is fully determined by the
+    # statement's text and its dependency set, so two identical
+    # ``print zero`` lines hash to the same key -- caching the
+    # verdict would skip the side effect on every duplicate.
+    # ``ProcDecl``/``ObserverDecl``/``ResourceDecl`` are the same:
+    # their only effect in ``check_proofs`` is the Phase 1m
+    # "accepted but not verified" warning (issue #1108).  When no
+    # warning sink is installed (``check_file(collect_errors=False)``,
+    # e.g. the CLI) ``warnings_emitted`` below stays ``False``, so
+    # the miss branch would cache them and a later re-check in a
+    # long-lived process would silently drop the warning.  Bypass
+    # the cache for all of these; ``check_proofs`` on them is cheap.
+    try:
+      _sink = get_active_sink()
+      pre_n = len(_sink) if _sink is not None else 0
+      # Warning sink is separate from the error sink; track its
+      # size the same way so we can skip caching when a warning
+      # fired (see below). Issue #991.
+      _wsink = get_active_warning_sink()
+      pre_wn = len(_wsink) if _wsink is not None else 0
+      # Phase 5 / Step 21: when a debugger is attached, every
+      # ``check_proofs`` call must run its hooks -- a cache hit
+      # would silently skip the trap.  Re-check unconditionally;
+      # this also avoids polluting the cache with cache-key
+      # collisions caused by debugger-driven reduction order.
+      if get_debugger() is not None:
+        check_proofs(s, env)
+        _record_miss("check_proofs")
+      elif isinstance(s, (Print, Assert, ProcDecl, ObserverDecl,
+                          ResourceDecl)):
+        check_proofs(s, env)
+        _record_miss("check_proofs")
+      elif lookup_verdict(key):
+        _record_hit("check_proofs")
+      else:
+        check_proofs(s, env)
+        # Don't cache if check_proofs absorbed errors into the
+        # sink -- next run must re-check so the diagnostic is
+        # re-emitted. Same rule applies when a warning fired:
+        # ``lsp.query.check`` surfaces warnings as diagnostics
+        # (issue #991), so a cache hit that silently skipped the
+        # warning-emitting statement would drop the diagnostic on
+        # every subsequent run.
+        _sink2 = get_active_sink()
+        _wsink2 = get_active_warning_sink()
+        errors_absorbed = _sink2 is not None and len(_sink2) != pre_n
+        warnings_emitted = _wsink2 is not None and len(_wsink2) != pre_wn
+        if not errors_absorbed and not warnings_emitted:
+          store_verdict(key)
+        _record_miss("check_proofs")
+    except Diagnostic as e:
+      # Don't update the cache on failure -- next run will
+      # re-check this stmt, which is what we want once the user
+      # fixes it.
+      _collect_diagnostic(e)
+
   if get_verbose():
     print('--------- Proof Checking ------------------------')
   if module_name not in checked_modules:
@@ -2381,7 +2710,12 @@ def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
     # doesn't reuse a verdict made under the previous target (a `?`
     # that was previously treated as ``sorry`` should now raise, or
     # vice versa).
+    #
+    # Under ``--jobs`` the checks are only scheduled here and run by
+    # ``_ProofSchedule.run`` once every statement's env is known.
     target = get_target_hole_location()
+    jobs = _proof_pool_size() if needs_checking[0] else 1
+    schedule = _ProofSchedule(jobs) if jobs > 1 else None
     defined_to_idx: dict[str, int] = {}
     barrier_idxs: set[int] = set()
     auto_idxs: list[int] = []
@@ -2394,7 +2728,13 @@ def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
         # the bookkeeping below. Append to ``stmt_hashes_so_far`` so
         # subsequent indices keep lining up with ``ast3`` for the
         # dependency lookup.
-        _collect_diagnostic(e)
+        if schedule is None:
+          _collect_diagnostic(e)
+        else:
+          schedule.add_error(e)
+          if error_sink is None:
+            # The schedule stops at this error; nothing after it runs.
+            break
         stmt_hashes_so_far.append(sh)
         continue
       referenced = _collect_referenced_names(s)
@@ -2417,63 +2757,10 @@ def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
       )
       key = ("check_proofs", sh, deps_fingerprint, target, module_name)
       if needs_checking[0]:
-        # ``Print`` and ``Assert`` have observable side effects in
-        # ``check_proofs`` (printing a value, raising on a failed
-        # assertion).  Their cache key is fully determined by the
-        # statement's text and its dependency set, so two identical
-        # ``print zero`` lines hash to the same key -- caching the
-        # verdict would skip the side effect on every duplicate.
-        # ``ProcDecl``/``ObserverDecl``/``ResourceDecl`` are the same:
-        # their only effect in ``check_proofs`` is the Phase 1m
-        # "accepted but not verified" warning (issue #1108).  When no
-        # warning sink is installed (``check_file(collect_errors=False)``,
-        # e.g. the CLI) ``warnings_emitted`` below stays ``False``, so
-        # the miss branch would cache them and a later re-check in a
-        # long-lived process would silently drop the warning.  Bypass
-        # the cache for all of these; ``check_proofs`` on them is cheap.
-        try:
-          _sink = get_active_sink()
-          pre_n = len(_sink) if _sink is not None else 0
-          # Warning sink is separate from the error sink; track its
-          # size the same way so we can skip caching when a warning
-          # fired (see below). Issue #991.
-          _wsink = get_active_warning_sink()
-          pre_wn = len(_wsink) if _wsink is not None else 0
-          # Phase 5 / Step 21: when a debugger is attached, every
-          # ``check_proofs`` call must run its hooks -- a cache hit
-          # would silently skip the trap.  Re-check unconditionally;
-          # this also avoids polluting the cache with cache-key
-          # collisions caused by debugger-driven reduction order.
-          if get_debugger() is not None:
-            check_proofs(s, env)
-            _record_miss("check_proofs")
-          elif isinstance(s, (Print, Assert, ProcDecl, ObserverDecl,
-                              ResourceDecl)):
-            check_proofs(s, env)
-            _record_miss("check_proofs")
-          elif key in _stmt_cache:
-            _record_hit("check_proofs")
-          else:
-            check_proofs(s, env)
-            # Don't cache if check_proofs absorbed errors into the
-            # sink -- next run must re-check so the diagnostic is
-            # re-emitted. Same rule applies when a warning fired:
-            # ``lsp.query.check`` surfaces warnings as diagnostics
-            # (issue #991), so a cache hit that silently skipped the
-            # warning-emitting statement would drop the diagnostic on
-            # every subsequent run.
-            _sink2 = get_active_sink()
-            _wsink2 = get_active_warning_sink()
-            errors_absorbed = _sink2 is not None and len(_sink2) != pre_n
-            warnings_emitted = _wsink2 is not None and len(_wsink2) != pre_wn
-            if not errors_absorbed and not warnings_emitted:
-              _stmt_cache[key] = True
-            _record_miss("check_proofs")
-        except Diagnostic as e:
-          # Don't update the cache on failure -- next run will
-          # re-check this stmt, which is what we want once the user
-          # fixes it.
-          _collect_diagnostic(e)
+        if schedule is None:
+          _check_stmt_proofs(s, env, key)
+        else:
+          schedule.add(s, env, key)
       # Bookkeeping for the next iteration -- happens regardless of
       # ``needs_checking`` so the dependency map stays consistent.
       # ``defined_to_idx`` is updated *after* the dep lookup so a
@@ -2486,6 +2773,8 @@ def _check_deduce_body(ast: list[Statement], module_name: str, modified: bool,
       for n in _collect_defined_names(s):
         defined_to_idx[n] = i
       stmt_hashes_so_far.append(sh)
+    if schedule is not None:
+      schedule.run(_check_stmt_proofs, _collect_diagnostic)
     checked_modules.add(module_name)
   # Sanity-check the post-typecheck AST: every variable reference
   # should be ``ResolvedVar`` (or, if a real overload couldn't be
@@ -44,6 +44,7 @@ from abstract_syntax import (
     MakeArray,
     Mark,
     MutableArrayType,
+    NatLit,
     Omitted,
     Or,
     OverloadType,
@@ -166,6 +167,9 @@ def _nat_constructor_literal_value(term: Term) -> int | None:
       return _nat_constructor_literal_value(subject)
     case _ if _var_ref_base_name(term) == 'zero':
       return 0
+    case NatLit(_, _, rator, zero, value) if _var_ref_base_name(rator) == 'suc':
+      zero_value = _nat_constructor_literal_value(zero)
+      return None if zero_value is None else zero_value + value
     case Call(_, _, rator, [arg]) if _var_ref_base_name(rator) == 'suc':
       arg_value = _nat_constructor_literal_value(arg)
       return None if arg_value is None else arg_value + 1
@@ -608,6 +612,28 @@ def _escape_error(loc: Meta, recfun: str) -> None:
         + " of a recursive function may only appear as the operator"
         + " of a function call within its own body")
 
+def _type_nat_literal(
+    lit: NatLit, typ: TypeExpr | None, env: Env, recfun: RecursiveName,
+    subterms: SubtermNames
+) -> Term:
+  # Check the single layer `suc(zero)` and give every layer its typing.
+  # That is only right when the resolved `suc` maps the literal's type to
+  # itself; otherwise the layers are checked one at a time.  The result is
+  # a fresh node, not an interned one, so that it keeps its own location.
+  layer = Call(lit.location, None, lit.rator, [lit.zero])
+  if typ is None:
+    checked = type_synth_term(layer, env, recfun, subterms)
+  else:
+    checked = type_check_term(layer, typ, env, recfun, subterms)
+  match checked:
+    case Call(_, ty, ResolvedVar() as rator, [VarRef() as zero]) \
+        if ty is not None and zero.typeof == ty:
+      return NatLit(lit.location, ty, rator, zero, lit.value)
+  layers = Call(lit.location, None, lit.rator, lit.args)
+  if typ is None:
+    return type_synth_term(layers, env, recfun, subterms)
+  return type_check_term(layers, typ, env, recfun, subterms)
+
 def check_no_recfun_escape(term: Term | None, recfun: str) -> None:
   # Walk ``term`` and raise an error if ``recfun`` (the uniquified
   # name of the enclosing recursive function) appears anywhere other
@@ -623,6 +649,9 @@ def check_no_recfun_escape(term: Term | None, recfun: str) -> None:
       _escape_error(term.location, recfun)
     return
   match term:
+    case NatLit(_, _, rator, zero, _):
+      _check_rator_no_escape(rator, recfun)
+      check_no_recfun_escape(zero, recfun)
     case Call(_, _, rator, args):
       _check_rator_no_escape(rator, recfun)
       for a in args:
@@ -1066,6 +1095,9 @@ def type_synth_term(
                 + '\t' + str(lhs.typeof) + ' ≠ ' + str(rhs.typeof))
       ret = Call(loc, ty, ResolvedVar(loc2, ty2, op_name), [lhs, rhs])
         
+    case NatLit():
+      ret = _type_nat_literal(term, None, env, recfun, subterms)
+
     case Call(loc, _, rator, args):
       ret = type_check_call(loc, rator, args, env, recfun, subterms, None, term)
       check_recursive_call(ret, recfun, subterms)
@@ -1312,6 +1344,9 @@ def type_check_term(
       check_recursive_call(ret, recfun, subterms)
       return ret
 
+    case NatLit():
+      return _type_nat_literal(term, typ, env, recfun, subterms)
+
     case Call(loc, _, rator, args):
       ret = type_check_call(loc, rator, args, env, recfun, subterms, typ, term)
       check_recursive_call(ret, recfun, subterms)
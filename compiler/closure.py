@@ -11,9 +11,15 @@ Output: an `ir.Program` with no `Lam` nodes. Each lambda becomes:
 
 Top-level user-defined functions remain as they were — they cannot be
 captured and never gain a `captures` list. References to top-level
-names appearing as the rator of `App` are direct calls; references to
-top-level names used as first-class values are not yet supported and
-raise `CompileError` in the emitter, not here.
+names appearing as the rator of `App` are direct calls; emit_c builds
+a closure only where a top-level function is used as a value.
+
+A closure whose function is known at a call site is not built at all.
+`App(MkClosure(f, caps), args)` is a *known call*: emit_c calls `f`
+directly, handing it `caps` in a stack-allocated environment. When a
+`Let` binds a lambda and the bound name is only ever called, never
+passed on or captured (as for a local `define f = λ...`), the `Let` is
+dropped and each call becomes such a known call.
 
 Pure rewriting; no I/O, no globals.
 """
@@ -57,8 +63,11 @@ def closure_convert(p: ir.Program) -> ir.Program:
 
     def go(t: ir.Term, enclosing_module: "str | None") -> ir.Term:
         match t:
-            case ir.Var(_) | ir.Bool(_) | ir.Int(_):
+            case ir.Var(_) | ir.Bool(_) | ir.Int(_) | ir.Num(_, _):
                 return t
+            case ir.Prim(op, args, kind):
+                return ir.Prim(op, [go(a, enclosing_module) for a in args],
+                               kind)
             case ir.Lam(params, body):
                 # Convert the body first so any nested Lam is hoisted
                 # and the body is now lambda-free.
@@ -90,8 +99,12 @@ def closure_convert(p: ir.Program) -> ir.Program:
                 return ir.App(go(rator, enclosing_module),
                               [go(a, enclosing_module) for a in args])
             case ir.Let(name, rhs, body):
-                return ir.Let(name, go(rhs, enclosing_module),
-                              go(body, enclosing_module))
+                new_rhs = go(rhs, enclosing_module)
+                new_body = go(body, enclosing_module)
+                if isinstance(new_rhs, ir.MkClosure) \
+                   and not _escapes(name, new_body):
+                    return _call_known(name, new_rhs, new_body)
+                return ir.Let(name, new_rhs, new_body)
             case ir.If(c, th, el):
                 return ir.If(go(c, enclosing_module),
                              go(th, enclosing_module),
@@ -111,9 +124,8 @@ def closure_convert(p: ir.Program) -> ir.Program:
                 return t
             case ir.MakeArray(s, loc):
                 return ir.MakeArray(go(s, enclosing_module), loc=loc)
-            case ir.ArrayGet(s, i, loc):
-                return ir.ArrayGet(go(s, enclosing_module),
-                                   go(i, enclosing_module), loc=loc)
+            case ir.ArrayGet() | ir.ArraySet() | ir.ArrayLength():
+                return ir.map_subterms(t, lambda c: go(c, enclosing_module))
         raise AssertionError(f"closure_convert: unknown term {type(t).__name__}")
 
     new_decls: List[ir.TopLevel] = []
@@ -159,3 +171,27 @@ def closure_convert(p: ir.Program) -> ir.Program:
         import_globals=p.import_globals,
         import_ctors=p.import_ctors,
     )
+
+
+def _called(name: str, t: ir.Term) -> bool:
+    return isinstance(t, ir.App) and isinstance(t.rator, ir.Var) \
+        and t.rator.name == name
+
+
+def _escapes(name: str, t: ir.Term) -> bool:
+    """Whether `t` uses the variable `name` other than by calling it."""
+    if isinstance(t, ir.Var):
+        return t.name == name
+    if _called(name, t):
+        assert isinstance(t, ir.App)
+        return any(_escapes(name, a) for a in t.args)
+    return any(_escapes(name, c) for c in ir.subterms(t))
+
+
+def _call_known(name: str, clo: ir.MkClosure, t: ir.Term) -> ir.Term:
+    """`t` with every call of `name` made a known call of `clo`. The
+    captures of `clo` are variables, still in scope at those calls."""
+    if _called(name, t):
+        assert isinstance(t, ir.App)
+        return ir.App(clo, [_call_known(name, clo, a) for a in t.args])
+    return ir.map_subterms(t, lambda c: _call_known(name, clo, c))
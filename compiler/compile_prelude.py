@@ -21,6 +21,17 @@ The archive is built reproducibly: file order is deterministic
 the BSD `ar` on macOS, and the `D` modifier asks GNU `ar` for the
 same on Linux. A second invocation produces a byte-identical `.a`.
 
+Builds are incremental. Each module's `.c`/`.h`/`.o` in the build dir
+is stamped with a key hashing its source, the sources of every module
+it imports directly or transitively, the compiler's own sources, and
+the C compiler and flags. A module whose key matches its stamp is not
+rebuilt. The imports' sources are keyed rather than their generated
+headers because code generation reads imported function bodies too
+(to inline them and to recognise the Nat operators), so an edit to a
+body can change what an importer compiles to. Modules are
+compiled on a pool of `--jobs` workers; a module starts as soon as
+everything it imports is built.
+
 Run from the repo root:
     python3 compiler/compile_prelude.py
 """
@@ -28,11 +39,13 @@ Run from the repo root:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
 import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from graphlib import TopologicalSorter
 from pathlib import Path
 from typing import Dict, List
@@ -50,21 +63,63 @@ ARCHIVE = RUNTIME / "libdeduce_prelude.a"
 # Per Step 27/28: deduce.py infers each module's symbols from the
 # file basename, not the in-file `module` declaration. So symbol
 # stability and import resolution all key off the .pf basename.
-IMPORT_RE = re.compile(r"^\s*import\s+(\S+)", re.MULTILINE)
+IMPORT_RE = re.compile(r"^\s*(?:public\s+)?import\s+(\S+)", re.MULTILINE)
 
+CFLAGS = ["-Wall", "-Wextra", "-Werror",
+          "-ffunction-sections", "-fdata-sections"]
 
-def topo_order(pfs: List[Path]) -> List[Path]:
-    """Topological sort of `pfs` by `import` directive."""
-    by_name: Dict[str, Path] = {p.stem: p for p in pfs}
+# Everything that decides what a module compiles to, besides the
+# module itself: the front end, the compiler, and the runtime header.
+COMPILER_SOURCES = ["*.py", "abstract_syntax/**/*.py", "compiler/*.py",
+                    "compiler/runtime/deduce.h"]
+
+
+def imports_of(pfs: List[Path]) -> Dict[str, List[str]]:
+    """Each module's imports among `pfs`, by stem."""
+    names = {p.stem for p in pfs}
     deps: Dict[str, List[str]] = {}
     for p in pfs:
         text = p.read_text()
         # Only edges that point at other prelude files; user-side
         # imports (none here) would be ignored.
         deps[p.stem] = [
-            imp for imp in IMPORT_RE.findall(text) if imp in by_name
+            imp for imp in IMPORT_RE.findall(text) if imp in names
         ]
-    return [by_name[n] for n in TopologicalSorter(deps).static_order()]
+    return deps
+
+
+def transitive_imports(deps: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Each module's direct and indirect imports, sorted, by stem."""
+    closure: Dict[str, List[str]] = {}
+
+    def visit(name: str) -> List[str]:
+        if name not in closure:
+            found = set(deps[name])
+            for dep in deps[name]:
+                found.update(visit(dep))
+            closure[name] = sorted(found)
+        return closure[name]
+
+    for name in deps:
+        visit(name)
+    return closure
+
+
+def topo_order(pfs: List[Path]) -> List[Path]:
+    """Topological sort of `pfs` by `import` directive."""
+    by_name: Dict[str, Path] = {p.stem: p for p in pfs}
+    order = TopologicalSorter(imports_of(pfs)).static_order()
+    return [by_name[n] for n in order]
+
+
+def compiler_version() -> str:
+    """A hash of the sources listed in `COMPILER_SOURCES`."""
+    h = hashlib.sha256()
+    files = sorted({f for pat in COMPILER_SOURCES for f in ROOT.glob(pat)})
+    for f in files:
+        h.update(str(f.relative_to(ROOT)).encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()
 
 
 def find_cc() -> str:
@@ -95,13 +150,15 @@ def run(cmd: List[str], *, env: "dict[str, str] | None" = None) -> None:
 
 def compile_pf_to_c(pf: Path) -> Path:
     """`deduce.py --compile-module --no-main` into the build dir.
-    Returns the generated `.c` path."""
+    Returns the generated `.c` path. Imports are not re-checked:
+    each prelude module is checked by its own compile, and concurrent
+    compiles would otherwise race to write the same `.thm` files."""
     out_c = BUILD_DIR / (pf.stem + ".c")
     run([
         sys.executable, str(ROOT / "deduce.py"),
         "--compile-module", "--no-main", "--no-stdlib",
         "--dir", str(LIB),
-        "--suppress-theorems", "--quiet",
+        "--suppress-theorems", "--no-check-imports", "--quiet",
         "-o", str(out_c),
         str(pf),
     ])
@@ -114,15 +171,85 @@ def compile_c_to_o(cc: str, c: Path) -> Path:
     files live in the build dir."""
     o = c.with_suffix(".o")
     run([
-        cc, "-c",
-        "-Wall", "-Wextra", "-Werror",
-        "-ffunction-sections", "-fdata-sections",
+        cc, "-c", *CFLAGS,
         "-I", str(BUILD_DIR), "-I", str(RUNTIME),
         "-o", str(o), str(c),
     ])
     return o
 
 
+def module_key(pf: Path, dep_sources: List[Path], version: str,
+               cc: str) -> str:
+    """The build key of `pf`: what its artifacts are a function of."""
+    h = hashlib.sha256()
+    for part in [version, cc, *CFLAGS]:
+        h.update(part.encode())
+        h.update(b"\0")
+    for source in dep_sources:
+        h.update(hashlib.sha256(source.read_bytes()).digest())
+    h.update(pf.read_bytes())
+    return h.hexdigest()
+
+
+def stamp_path(pf: Path) -> Path:
+    return BUILD_DIR / (pf.stem + ".key")
+
+
+def is_current(pf: Path, key: str) -> bool:
+    """Whether the build dir holds `pf`'s artifacts for `key`."""
+    stamp = stamp_path(pf)
+    artifacts = [BUILD_DIR / (pf.stem + ext) for ext in (".c", ".h", ".o")]
+    return stamp.exists() and stamp.read_text() == key \
+        and all(a.exists() for a in artifacts)
+
+
+def build_module(cc: str, pf: Path, key: str) -> None:
+    """Compile `pf` to `.c`/`.h`/`.o` and stamp them with `key`. The
+    old stamp is removed first and the new one written last, so an
+    interrupted build is redone next time."""
+    stamp = stamp_path(pf)
+    if stamp.exists():
+        stamp.unlink()
+    compile_c_to_o(cc, compile_pf_to_c(pf))
+    stamp.write_text(key)
+
+
+def build_modules(cc: str, pfs: List[Path], jobs: int,
+                  verbose: bool) -> int:
+    """Bring every module of `pfs` up to date, compiling a module once
+    all its imports are done, up to `jobs` at a time. Returns the
+    number of modules compiled."""
+    by_name: Dict[str, Path] = {p.stem: p for p in pfs}
+    deps = imports_of(pfs)
+    closure = transitive_imports(deps)
+    version = compiler_version()
+    sorter = TopologicalSorter(deps)
+    sorter.prepare()
+    running: Dict[Future[None], str] = {}
+    built = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while sorter.is_active():
+            for name in sorted(sorter.get_ready()):
+                pf = by_name[name]
+                sources = [by_name[d] for d in closure[name]]
+                key = module_key(pf, sources, version, cc)
+                if is_current(pf, key):
+                    sorter.done(name)
+                    continue
+                if verbose:
+                    print(f"compile {pf.name}")
+                running[pool.submit(build_module, cc, pf, key)] = name
+                built += 1
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                # Re-raises the `sys.exit` of a failed command.
+                future.result()
+                sorter.done(running.pop(future))
+    return built
+
+
 def make_archive(ar: str, objects: List[Path]) -> None:
     """`ar rcs` the objects into the prelude archive. The archive is
     rebuilt from scratch (deleted first) so removed prelude files
@@ -175,6 +302,10 @@ def main() -> int:
         "-v", "--verbose", action="store_true",
         help="Echo each step.",
     )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Modules to compile at once (default: one per CPU).",
+    )
     args = parser.parse_args()
 
     pfs = sorted(LIB.glob("*.pf"))
@@ -200,17 +331,8 @@ def main() -> int:
         for p in order:
             print(f"  {p.name}")
 
-    for pf in order:
-        if args.verbose:
-            print(f"deduce {pf.name}")
-        compile_pf_to_c(pf)
-
-    objects: List[Path] = []
-    for pf in order:
-        c = BUILD_DIR / (pf.stem + ".c")
-        if args.verbose:
-            print(f"cc {c.name}")
-        objects.append(compile_c_to_o(cc, c))
+    built = build_modules(cc, pfs, max(1, args.jobs), args.verbose)
+    objects = [BUILD_DIR / (pf.stem + ".o") for pf in order]
 
     if args.verbose:
         print(f"ar -> {ARCHIVE.relative_to(ROOT)}")
@@ -224,7 +346,7 @@ def main() -> int:
     print(
         f"built {ARCHIVE.relative_to(ROOT)} "
         f"({ARCHIVE.stat().st_size} bytes, "
-        f"{len(order)} modules)"
+        f"{len(order)} modules, {built} recompiled)"
     )
     return 0
 
@@ -1,14 +1,48 @@
 """Emit C source from a closure-converted IR program.
 
 The output `#include`s `deduce.h` (the runtime header). Every Deduce
-value is a `deduce_value` (opaque pointer); every function takes
-`(deduce_value* env, deduce_value* args)` and returns `deduce_value`.
+value is a `deduce_value` (opaque pointer).
+
+Each top-level function has two entry points. `P_<mangled>` holds the
+body and takes its arguments as positional C parameters, preceded by
+`deduce_value* env` if the function has captures. Direct calls --
+calls to a top-level function by name, and known calls
+`App(MkClosure(f, caps), args)`, whose captures go in a stack array --
+use it. `F_<mangled>(deduce_value* env, deduce_value* args)` is the
+uniform entry a closure stores; it unpacks `args` and calls `P_`.
+A closure is built only where a function is used as a value. For a
+function without captures that closure is the same every time, so it
+is built once at startup (`K_<mangled>`, like the nullary-constructor
+singletons).
 
-Top-level functions are emitted as `static deduce_value F_<mangled>(...)`.
 Top-level globals are emitted as `static deduce_value G_<mangled>;` and
 their initialisation is appended to `deduce_program_main`. Print and
 assert statements are appended to `deduce_program_main` in source order.
 
+Every C function that handles values (generated functions,
+`deduce_program_main`, module `_init`s) declares all of its
+`deduce_value` locals at the top, initialised to NULL, and registers
+their addresses with the collector as a frame (`DEDUCE_PUSH_FRAME`,
+see `deduce.h`) before it can allocate. Term emission therefore never
+declares a value local inline: it records the name with
+`EmitCtx.declare` and assigns to it. Globals and nullary-constructor
+singletons are registered with `deduce_gc_add_root` before any
+allocation.
+
+`ir.Num` and `ir.Prim` (the prelude's `Nat` and `UInt`) become the
+runtime's unboxed naturals: `DEDUCE_NUM` constants and calls to the
+inline `deduce_num_*` operations. They never allocate.
+
+A loop group from the tail-call pass (`compiler/tailcall.py`) runs in
+one C activation. A single self-recursive function gets a `loop:`
+label after its entry, and a `TailCall` assigns the parameters and
+jumps there. A group of several functions becomes one `static`
+`T_<mangled>` function holding every member's body under its own label.
+Each member's `F_` symbol enters it with the member's index. When a
+`TailCon` occurs, results are not returned directly but stored through
+`dest`: the `result` local at first, and the hole of the last
+constructor built after that.
+
 Emit is purely functional in the IR: walks the program once, builds a
 list of strings, joins. No global state.
 """
@@ -49,6 +83,17 @@ def _mangle(name: str) -> str:
     return s
 
 
+_NUM_KIND_MACROS = {
+    "nat": "DEDUCE_NAT",
+    "uint": "DEDUCE_UINT",
+    "uview": "DEDUCE_UINT_VIEW",
+}
+
+# Larger constants go through the checked `deduce_make_num`, since
+# DEDUCE_NUM_MAX depends on the target's pointer width.
+_NUM_CONST_MAX = 2**29 - 1
+
+
 def _local_id(name: str) -> str:
     return "v_" + _mangle(name)
 
@@ -59,6 +104,23 @@ def _base_name(name: str) -> str:
     return name.split(".", 1)[0]
 
 
+# Constructor base names the runtime recognises by shape. Their
+# constructors are built with the runtime's own copy of the name
+# (`deduce_name_<base>`), which it compares by pointer.
+_RUNTIME_CTOR_NAMES = frozenset({
+    "empty", "node", "zero", "suc", "bzero", "dub_inc", "inc_dub",
+    "lit", "fromNat", "pos", "negsuc",
+})
+
+
+def _ctor_name(name: str) -> str:
+    """The C expression for the printed name of constructor `name`."""
+    base = _base_name(name)
+    if base in _RUNTIME_CTOR_NAMES:
+        return f"deduce_name_{base}"
+    return _c_string(base)
+
+
 def _c_string(s: str) -> str:
     out = ['"']
     for ch in s:
@@ -81,6 +143,8 @@ class EmitCtx:
     top_funcs: Dict[str, int] = field(default_factory=dict)   # name -> arity
     top_globals: Set[str] = field(default_factory=set)
     ctor_ids: Dict[str, int] = field(default_factory=dict)
+    # This program's constructors -> all constructors of their union.
+    union_ctors: Dict[str, List[str]] = field(default_factory=dict)
     ctor_arities: Dict[str, int] = field(default_factory=dict)
     # Per-name source module for `<Module>__<base_name>` symbol
     # mangling (Step 25 of separate-compile-plan.md). Names absent
@@ -93,12 +157,34 @@ class EmitCtx:
     # separate-compile-plan.md).
     name_to_seq: Dict[str, int] = field(default_factory=dict)
     tmp_counter: int = 0
+    # `deduce_value` locals of the C function being emitted, in order
+    # of first use. Hoisted to the top of the function and registered
+    # as its GC frame; see the module docstring.
+    frame_locals: List[str] = field(default_factory=list)
+    # Frame locals already cleared once dead (see `_emit_term`).
+    released: Set[str] = field(default_factory=set)
+    # The loop group whose body is being emitted, if any.
+    loop: "_Loop | None" = None
+    # Functions whose closure is built once, at startup (`K_`).
+    static_closures: Set[str] = field(default_factory=set)
 
     def fresh_tmp(self) -> str:
         n = self.tmp_counter
         self.tmp_counter += 1
         return f"t{n}"
 
+    def begin_frame(self) -> None:
+        self.frame_locals = []
+        self.released = set()
+
+    def declare(self, c_name: str) -> str:
+        if c_name not in self.frame_locals:
+            self.frame_locals.append(c_name)
+        return c_name
+
+    def fresh_local(self) -> str:
+        return self.declare(self.fresh_tmp())
+
     def _mangle_top(self, name: str) -> str:
         """Mangle a top-level name. If we know its source module,
         prefix with `<Module>__`. The within-module disambiguator is
@@ -119,6 +205,15 @@ class EmitCtx:
     def func_id(self, name: str) -> str:
         return "F_" + self._mangle_top(name)
 
+    def direct_id(self, name: str) -> str:
+        return "P_" + self._mangle_top(name)
+
+    def loop_id(self, name: str) -> str:
+        return "T_" + self._mangle_top(name)
+
+    def closure_singleton(self, name: str) -> str:
+        return "K_" + self._mangle_top(name)
+
     def global_id(self, name: str) -> str:
         return "G_" + self._mangle_top(name)
 
@@ -131,6 +226,16 @@ class EmitCtx:
         return "C_" + self._mangle_top(name)
 
 
+@dataclass
+class _Loop:
+    """A loop group being emitted: the label each member's body starts
+    at, the C locals of its parameters, and whether results go through
+    `dest` (the group builds a `TailCon`)."""
+    labels: Dict[str, str]
+    params: Dict[str, List[str]]
+    dest: bool
+
+
 def emit_program(p: ir.Program) -> str:
     ctx = EmitCtx(name_to_module=dict(p.name_to_module), name_to_seq=dict(p.name_to_seq))
     next_ctor_id = 0
@@ -139,6 +244,7 @@ def emit_program(p: ir.Program) -> str:
             for c in d.ctors:
                 ctx.ctor_ids[c.name] = next_ctor_id
                 ctx.ctor_arities[c.name] = c.arity
+                ctx.union_ctors[c.name] = [k.name for k in d.ctors]
                 next_ctor_id += 1
         elif isinstance(d, ir.Function):
             ctx.top_funcs[d.name] = len(d.params)
@@ -154,6 +260,8 @@ def emit_program(p: ir.Program) -> str:
         c.name for d in p.decls if isinstance(d, ir.UnionDecl)
         for c in d.ctors if c.arity == 0
     ]
+    closures = _static_closures(p)
+    ctx.static_closures = set(closures)
 
     out: List[str] = []
     out.append('#include "deduce.h"')
@@ -168,11 +276,12 @@ def emit_program(p: ir.Program) -> str:
     for d in p.decls:
         if isinstance(d, ir.Function):
             out.append(_emit_fn_decl(d, ctx) + ";")
+            out.append(_emit_direct_decl(d, ctx) + ";")
     out.append("")
 
-    # Singleton storage for nullary ctors.
-    for name in nullary_ctors:
-        out.append(f"deduce_value {ctx.ctor_singleton(name)};")
+    # Singleton storage for nullary ctors and static closures.
+    for root in _singletons(nullary_ctors, closures, ctx):
+        out.append(f"deduce_value {root};")
     out.append("")
 
     # Global variables. Same reasoning as the function declarations:
@@ -183,50 +292,72 @@ def emit_program(p: ir.Program) -> str:
     out.append("")
 
     # Function bodies
-    for d in p.decls:
-        if isinstance(d, ir.Function):
-            out.append(_emit_function(d, ctx))
-            out.append("")
+    out.extend(_emit_functions(p.decls, ctx))
 
     # The single program-entry function with globals + prints + asserts
     # in source order.
     out.append("void deduce_program_main(void) {")
-    # Initialise the nullary-ctor singletons. Must run before any
-    # global initialiser because user-level Globals like
+    roots = _singletons(nullary_ctors, closures, ctx) + [
+        ctx.global_id(d.name) for d in p.decls if isinstance(d, ir.Global)
+    ]
+    for root in roots:
+        out.append(f"    deduce_gc_add_root(&{root});")
+    # Initialise the singletons. Must run before any global
+    # initialiser because user-level Globals like
     # `define two = suc(suc(zero))` reference these.
-    for name in nullary_ctors:
-        out.append(
-            f"    {ctx.ctor_singleton(name)} = deduce_make_ctor("
-            f"{ctx.ctor_id_macro(name)}, {_c_string(_base_name(name))}, 0, NULL);"
-        )
+    body = _singleton_inits(nullary_ctors, closures, ctx)
+    ctx.begin_frame()
     for d in p.decls:
         if isinstance(d, ir.Global):
             ctx.fresh_tmp()
             stmts, expr = _emit_term(d.body, ctx, locals_in_scope=set())
-            for s in stmts:
-                out.append("    " + s)
-            out.append(f"    {ctx.global_id(d.name)} = {expr};")
-        elif isinstance(d, ir.Print):
-            stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
-            for s in stmts:
-                out.append("    " + s)
-            out.append(f"    deduce_println({expr});")
-        elif isinstance(d, ir.AssertEq):
-            sl, el = _emit_term(d.lhs, ctx, locals_in_scope=set())
-            sr, er = _emit_term(d.rhs, ctx, locals_in_scope=set())
-            for s in sl + sr:
-                out.append("    " + s)
-            out.append(f"    deduce_assert_eq({el}, {er}, NULL);")
-        elif isinstance(d, ir.AssertBool):
-            stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
-            for s in stmts:
-                out.append("    " + s)
-            out.append(f"    deduce_assert_bool({expr}, NULL);")
+            body.extend(stmts)
+            body.append(f"{ctx.global_id(d.name)} = {expr};")
+        else:
+            body.extend(_emit_statement(d, ctx))
+    out.extend("    " + line for line in _framed(ctx, body))
     out.append("}")
 
     return "\n".join(out) + "\n"
 
 
+def _emit_statement(d: ir.TopLevel, ctx: EmitCtx) -> List[str]:
+    """Lines running a top-level `print` or assert; none for other decls."""
+    if isinstance(d, ir.Print):
+        stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
+        return stmts + [f"deduce_println({expr});"]
+    if isinstance(d, ir.AssertEq):
+        sl, el = _emit_term(d.lhs, ctx, locals_in_scope=set())
+        sr, er = _emit_term(d.rhs, ctx, locals_in_scope=set())
+        return sl + sr + [f"deduce_assert_eq({el}, {er}, NULL);"]
+    if isinstance(d, ir.AssertBool):
+        stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
+        return stmts + [f"deduce_assert_bool({expr}, NULL);"]
+    return []
+
+
+def _framed(ctx: EmitCtx, body: List[str],
+            inits: "Dict[str, str] | None" = None,
+            result: "str | None" = None) -> List[str]:
+    """Wrap `body` with the declarations of `ctx.frame_locals` and the
+    push/pop of their GC frame. `inits` gives initial values (function
+    parameters and captures); `result`, if given, is returned after the
+    frame is popped."""
+    inits = inits or {}
+    lines = [f"deduce_value {n} = {inits.get(n, 'NULL')};"
+             for n in ctx.frame_locals]
+    if ctx.frame_locals:
+        addrs = ", ".join("&" + n for n in ctx.frame_locals)
+        lines.append(f"deduce_value* gc_roots[] = {{ {addrs} }};")
+        lines.append("DEDUCE_PUSH_FRAME(gc_roots);")
+    lines.extend(body)
+    if ctx.frame_locals:
+        lines.append("DEDUCE_POP_FRAME();")
+    if result is not None:
+        lines.append(f"return {result};")
+    return lines
+
+
 def _seed_ctx_with_imports(ctx: "EmitCtx", p: ir.Program,
                            own_ctor_count: int) -> None:
     """In per-module mode, register every imported decl in `ctx`
@@ -281,6 +412,7 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
             for c in d.ctors:
                 ctx.ctor_ids[c.name] = next_ctor_id
                 ctx.ctor_arities[c.name] = c.arity
+                ctx.union_ctors[c.name] = [k.name for k in d.ctors]
                 next_ctor_id += 1
         elif isinstance(d, ir.Function):
             ctx.top_funcs[d.name] = len(d.params)
@@ -296,6 +428,8 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
         c.name for d in p.decls if isinstance(d, ir.UnionDecl)
         for c in d.ctors if c.arity == 0
     ]
+    closures = _static_closures(p)
+    ctx.static_closures = set(closures)
 
     # ----- the .c file -----
     out: List[str] = []
@@ -322,14 +456,16 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
     for d in p.decls:
         if isinstance(d, ir.Function):
             out.append(_emit_fn_decl(d, ctx) + ";")
+            out.append(_emit_direct_decl(d, ctx) + ";")
     if any(isinstance(d, ir.Function) for d in p.decls):
         out.append("")
 
-    # Ctor singleton storage (definitions, not externs — the .h
-    # declares them extern; here we provide the storage).
-    for name in nullary_ctors:
-        out.append(f"deduce_value {ctx.ctor_singleton(name)};")
-    if nullary_ctors:
+    # Singleton storage (definitions, not externs — the .h declares
+    # the ctor singletons extern; here we provide the storage).
+    singletons = _singletons(nullary_ctors, closures, ctx)
+    for root in singletons:
+        out.append(f"deduce_value {root};")
+    if singletons:
         out.append("")
 
     # Global storage.
@@ -340,10 +476,7 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
         out.append("")
 
     # Function bodies.
-    for d in p.decls:
-        if isinstance(d, ir.Function):
-            out.append(_emit_function(d, ctx))
-            out.append("")
+    out.extend(_emit_functions(p.decls, ctx))
 
     # Per-module init: idempotent (per-module flag), calls direct
     # imports' inits first so any singletons / globals they own are
@@ -353,19 +486,21 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
     out.append(f"void {init_name}(void) {{")
     out.append(f"    if ({init_name}__inited) return;")
     out.append(f"    {init_name}__inited = 1;")
+    roots = singletons + [
+        ctx.global_id(d.name) for d in p.decls if isinstance(d, ir.Global)
+    ]
+    for root in roots:
+        out.append(f"    deduce_gc_add_root(&{root});")
     for imp in p.imports:
         out.append(f"    {_module_init_name(imp)}();")
-    for name in nullary_ctors:
-        out.append(
-            f"    {ctx.ctor_singleton(name)} = deduce_make_ctor("
-            f"{ctx.ctor_id_macro(name)}, {_c_string(_base_name(name))}, 0, NULL);"
-        )
+    body = _singleton_inits(nullary_ctors, closures, ctx)
+    ctx.begin_frame()
     for d in p.decls:
         if isinstance(d, ir.Global):
             stmts, expr = _emit_term(d.body, ctx, locals_in_scope=set())
-            for s in stmts:
-                out.append("    " + s)
-            out.append(f"    {ctx.global_id(d.name)} = {expr};")
+            body.extend(stmts)
+            body.append(f"{ctx.global_id(d.name)} = {expr};")
+    out.extend("    " + line for line in _framed(ctx, body))
     out.append("}")
     out.append("")
 
@@ -373,23 +508,11 @@ def emit_module(p: ir.Program, is_main: bool) -> "tuple[str, str]":
     if is_main:
         out.append("void deduce_program_main(void) {")
         out.append(f"    {init_name}();")
+        ctx.begin_frame()
+        body = []
         for d in p.decls:
-            if isinstance(d, ir.Print):
-                stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
-                for s in stmts:
-                    out.append("    " + s)
-                out.append(f"    deduce_println({expr});")
-            elif isinstance(d, ir.AssertEq):
-                sl, el = _emit_term(d.lhs, ctx, locals_in_scope=set())
-                sr, er = _emit_term(d.rhs, ctx, locals_in_scope=set())
-                for s in sl + sr:
-                    out.append("    " + s)
-                out.append(f"    deduce_assert_eq({el}, {er}, NULL);")
-            elif isinstance(d, ir.AssertBool):
-                stmts, expr = _emit_term(d.term, ctx, locals_in_scope=set())
-                for s in stmts:
-                    out.append("    " + s)
-                out.append(f"    deduce_assert_bool({expr}, NULL);")
+            body.extend(_emit_statement(d, ctx))
+        out.extend("    " + line for line in _framed(ctx, body))
         out.append("}")
 
     c_source = "\n".join(out) + "\n"
@@ -438,6 +561,7 @@ def emit_header(
             for c in d.ctors:
                 ctx.ctor_ids[c.name] = next_ctor_id
                 ctx.ctor_arities[c.name] = c.arity
+                ctx.union_ctors[c.name] = [k.name for k in d.ctors]
                 next_ctor_id += 1
         elif isinstance(d, ir.Function):
             ctx.top_funcs[d.name] = len(d.params)
@@ -488,6 +612,7 @@ def emit_header(
     for d in p.decls:
         if isinstance(d, ir.Function) and in_module(d):
             fn_protos.append(_emit_fn_decl(d, ctx) + ";")
+            fn_protos.append(_emit_direct_decl(d, ctx) + ";")
     if fn_protos:
         out.extend(fn_protos)
         out.append("")
@@ -533,32 +658,261 @@ def _emit_fn_decl(f: ir.Function, ctx: EmitCtx) -> str:
     return f"deduce_value {ctx.func_id(f.name)}(deduce_value* env, deduce_value* args)"
 
 
+def _emit_direct_decl(f: ir.Function, ctx: EmitCtx) -> str:
+    params = ["deduce_value* env"] if f.captures else []
+    params += [f"deduce_value a{i}" for i in range(len(f.params))]
+    return (f"deduce_value {ctx.direct_id(f.name)}"
+            f"({', '.join(params) or 'void'})")
+
+
+def _emit_closure_entry(f: ir.Function, ctx: EmitCtx) -> str:
+    """`F_`, which unpacks a closure call's `args` for `P_`."""
+    args = ["env"] if f.captures else []
+    args += [f"args[{i}]" for i in range(len(f.params))]
+    lines = [_emit_fn_decl(f, ctx) + " {"]
+    if not f.captures:
+        lines.append("    (void)env;")
+    if not f.params:
+        lines.append("    (void)args;")
+    lines.append(f"    return {ctx.direct_id(f.name)}({', '.join(args)});")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _static_closures(p: ir.Program) -> List[str]:
+    """The functions of `p` without captures that are used as values,
+    in declaration order. Each gets a `K_` closure built at startup."""
+    funcs = {d.name for d in p.decls
+             if isinstance(d, ir.Function) and not d.captures}
+    used: Set[str] = set()
+
+    def walk(t: ir.Term) -> None:
+        match t:
+            case ir.Var(name):
+                if name in funcs:
+                    used.add(name)
+                return
+            case ir.MkClosure(fn, []):
+                if fn in funcs:
+                    used.add(fn)
+                return
+            case ir.App(ir.Var(_) | ir.MkClosure(_, _) as rator, args):
+                # A call by name, or a known call: no closure.
+                for c in ir.subterms(rator) + args:
+                    walk(c)
+                return
+        for c in ir.subterms(t):
+            walk(c)
+
+    for d in p.decls:
+        match d:
+            case ir.Function(_, _, body) | ir.Global(_, body) | ir.Print(body) \
+                    | ir.AssertBool(body):
+                walk(body)
+            case ir.AssertEq(l, r):
+                walk(l)
+                walk(r)
+    return [d.name for d in p.decls
+            if isinstance(d, ir.Function) and d.name in used]
+
+
+def _singletons(nullary_ctors: List[str], closures: List[str],
+                ctx: EmitCtx) -> List[str]:
+    return [ctx.ctor_singleton(n) for n in nullary_ctors] \
+        + [ctx.closure_singleton(n) for n in closures]
+
+
+def _singleton_inits(nullary_ctors: List[str], closures: List[str],
+                     ctx: EmitCtx) -> List[str]:
+    lines = [
+        f"{ctx.ctor_singleton(name)} = deduce_make_ctor("
+        f"{ctx.ctor_id_macro(name)}, {_ctor_name(name)}, 0, NULL);"
+        for name in nullary_ctors
+    ]
+    lines += [
+        f"{ctx.closure_singleton(name)} = deduce_make_closure("
+        f"{ctx.func_id(name)}, {_c_string(_base_name(name))}, "
+        f"{ctx.top_funcs[name]}, 0, NULL);"
+        for name in closures
+    ]
+    return lines
+
+
+def _emit_functions(decls: List[ir.TopLevel], ctx: EmitCtx) -> List[str]:
+    """The definitions of the functions in `decls`, each followed by a
+    blank line. A loop group of several functions is emitted once,
+    ahead of its first member's entry point."""
+    groups: Dict[str, List[ir.Function]] = {}
+    for d in decls:
+        if isinstance(d, ir.Function) and d.loop is not None:
+            groups.setdefault(d.loop, []).append(d)
+    out: List[str] = []
+    for d in decls:
+        if not isinstance(d, ir.Function):
+            continue
+        group = groups.get(d.loop) if d.loop is not None else None
+        if group is not None and len(group) > 1:
+            if d.name == d.loop:
+                out.append(_emit_loop_group(group, ctx))
+                out.append("")
+            out.append(_emit_loop_entry(d, group.index(d), ctx))
+        else:
+            out.append(_emit_function(d, ctx))
+        out.append("")
+    return out
+
+
+def _fills_holes(t: ir.Term) -> bool:
+    """Whether `t` has a `TailCon` in tail position (the only place the
+    tail-call pass puts one)."""
+    match t:
+        case ir.Let(_, _, body):
+            return _fills_holes(body)
+        case ir.If(_, th, el):
+            return _fills_holes(th) or _fills_holes(el)
+        case ir.Match(_, arms, _):
+            return any(_fills_holes(arm.body) for arm in arms)
+        case ir.TailCon(_, _, _):
+            return True
+    return False
+
+
+def _emit_loop_group(group: List[ir.Function], ctx: EmitCtx) -> str:
+    """The `T_` function running a loop group of several functions.
+    `entry` selects the member that was called; `args` are its
+    arguments."""
+    ctx.begin_frame()
+    ctx.loop = _Loop(
+        labels={f.name: f"entry{i}" for i, f in enumerate(group)},
+        params={f.name: [_local_id(p) for p in f.params] for f in group},
+        dest=any(_fills_holes(f.body) for f in group),
+    )
+    ctx.declare("result")
+    for f in group:
+        for p in f.params:
+            ctx.declare(_local_id(p))
+    body: List[str] = []
+    if not any(f.params for f in group):
+        body.append("(void)args;")
+    if ctx.loop.dest:
+        body.append("deduce_value* dest = &result;")
+    body.append("switch (entry) {")
+    for i, f in enumerate(group):
+        binds = "".join(f"{_local_id(p)} = args[{j}]; "
+                        for j, p in enumerate(f.params))
+        body.append(f"case {i}: {binds}goto {ctx.loop.labels[f.name]};")
+    body.append("}")
+    for f in group:
+        stmts, expr = _emit_term(f.body, ctx, set(f.params))
+        body.append(f"{ctx.loop.labels[f.name]}:;")
+        body.extend(stmts)
+        body.append(f"{'*dest' if ctx.loop.dest else 'result'} = {expr};")
+        body.append("goto done;")
+    body.append("done:;")
+    ctx.loop = None
+    lines = [
+        f"static deduce_value {ctx.loop_id(group[0].name)}"
+        "(int entry, deduce_value* args) {"
+    ]
+    lines.extend("    " + line for line in _framed(ctx, body, result="result"))
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _emit_loop_entry(f: ir.Function, index: int, ctx: EmitCtx) -> str:
+    lines: List[str] = []
+    if f.loc:
+        lines.append(f"// from {f.loc}")
+    lines.append(_emit_direct_decl(f, ctx) + " {")
+    assert f.loop is not None
+    if f.params:
+        args = ", ".join(f"a{i}" for i in range(len(f.params)))
+        lines.append(f"    deduce_value args[] = {{ {args} }};")
+        lines.append(f"    return {ctx.loop_id(f.loop)}({index}, args);")
+    else:
+        lines.append(f"    return {ctx.loop_id(f.loop)}({index}, NULL);")
+    lines.append("}")
+    lines.append("")
+    lines.append(_emit_closure_entry(f, ctx))
+    return "\n".join(lines)
+
+
 def _emit_function(f: ir.Function, ctx: EmitCtx) -> str:
     # Locals in scope inside the body include the params (bound from
-    # args[]) and the captures (bound from env[]).
+    # the C parameters) and the captures (bound from env[]).
     in_scope: Set[str] = set(f.params) | set(f.captures)
     body_stmts: List[str] = []
     if f.loc:
         body_stmts.append(f"// from {f.loc}")
-    body_stmts.append(_emit_fn_decl(f, ctx) + " {")
-    if not f.params:
-        body_stmts.append("    (void)args;")
-    if not f.captures:
-        body_stmts.append("    (void)env;")
+    body_stmts.append(_emit_direct_decl(f, ctx) + " {")
+    ctx.begin_frame()
+    inits: Dict[str, str] = {}
     for i, p in enumerate(f.params):
-        body_stmts.append(f"    deduce_value {_local_id(p)} = args[{i}];")
-        body_stmts.append(f"    (void){_local_id(p)};")
+        inits[ctx.declare(_local_id(p))] = f"a{i}"
     for i, c in enumerate(f.captures):
-        body_stmts.append(f"    deduce_value {_local_id(c)} = env[{i}];")
-        body_stmts.append(f"    (void){_local_id(c)};")
+        inits[ctx.declare(_local_id(c))] = f"env[{i}]"
+    prologue = [f"(void){n};" for n in inits]
+    if f.loop is not None:
+        # A self-recursive loop; see the module docstring.
+        ctx.loop = _Loop(labels={f.name: "loop"},
+                         params={f.name: [_local_id(p) for p in f.params]},
+                         dest=_fills_holes(f.body))
+        if ctx.loop.dest:
+            ctx.declare("result")
+            prologue.append("deduce_value* dest = &result;")
+        prologue.append("loop:;")
     stmts, expr = _emit_term(f.body, ctx, in_scope)
-    for s in stmts:
-        body_stmts.append("    " + s)
-    body_stmts.append(f"    return {expr};")
+    if ctx.loop is not None and ctx.loop.dest:
+        stmts.append(f"*dest = {expr};")
+        expr = "result"
+    ctx.loop = None
+    stmts = prologue + stmts
+    if not _allocates(f.body, ctx):
+        # Nothing in the body can trigger a collection, so its values
+        # need no frame; locals stay plain C variables.
+        lines = [f"deduce_value {n} = {inits.get(n, 'NULL')};"
+                 for n in ctx.frame_locals] + stmts + [f"return {expr};"]
+    else:
+        lines = _framed(ctx, stmts, inits, result=expr)
+    body_stmts.extend("    " + line for line in lines)
     body_stmts.append("}")
+    body_stmts.append("")
+    body_stmts.append(_emit_closure_entry(f, ctx))
     return "\n".join(body_stmts)
 
 
+def _allocates(t: ir.Term, ctx: EmitCtx) -> bool:
+    """Whether evaluating `t` may allocate (and so collect). Any call
+    may; so may building a constructor, closure, int or array, and a
+    top-level function used as a value (it becomes a closure), unless
+    its closure is built at startup."""
+    match t:
+        case ir.Var(name):
+            return name in ctx.top_funcs and name not in ctx.static_closures
+        case ir.MkClosure(fn, []):
+            return fn not in ctx.static_closures
+        case ir.Bool(_) | ir.Panic(_, _):
+            return False
+        case ir.Con(_, args):
+            return bool(args)
+        case ir.Let(_, rhs, body):
+            return _allocates(rhs, ctx) or _allocates(body, ctx)
+        case ir.If(c, th, el):
+            return any(_allocates(x, ctx) for x in (c, th, el))
+        case ir.Match(subj, arms, _):
+            return _allocates(subj, ctx) \
+                or any(_allocates(arm.body, ctx) for arm in arms)
+        case ir.Eq(l, r):
+            return _allocates(l, ctx) or _allocates(r, ctx)
+        case ir.ArrayGet() | ir.ArraySet() | ir.ArrayLength():
+            return any(_allocates(c, ctx) for c in ir.subterms(t))
+        case ir.Num(_, _):
+            return False
+        case ir.Prim(_, args, _) | ir.TailCall(_, args):
+            return any(_allocates(a, ctx) for a in args)
+    return True
+
+
 # --------------------------------------------------------------------------
 # Term emission
 # --------------------------------------------------------------------------
@@ -571,21 +925,59 @@ def _emit_function(f: ir.Function, ctx: EmitCtx) -> str:
 # so callers can treat `expr` as side-effect-free.
 
 def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[List[str], str]:
+    """Emit `t`, then clear the frame locals it declared other than its
+    result. Those are dead once `t` has a value, and a dead local that
+    stays rooted keeps its garbage alive for as long as the function
+    runs -- across a recursive call, for every pending activation."""
+    start = len(ctx.frame_locals)
+    stmts, expr = _emit_node(t, ctx, locals_in_scope)
+    for name in ctx.frame_locals[start:]:
+        if name != expr and name not in ctx.released:
+            ctx.released.add(name)
+            stmts.append(f"{name} = NULL;")
+    return stmts, expr
+
+
+def _emit_cond(t: ir.Term, ctx: EmitCtx,
+               locals_in_scope: Set[str]) -> Tuple[List[str], str]:
+    """Like `_emit_term` for a `bool`-valued term, but the expression
+    is a C truth value. A test on naturals is used directly rather than
+    boxed as a Deduce bool and unboxed again."""
+    if isinstance(t, ir.Prim) and t.kind is None:
+        stmts, args = _emit_prim_args(t, ctx, locals_in_scope)
+        return stmts, f"deduce_num_{t.op}({', '.join(args)})"
+    stmts, expr = _emit_term(t, ctx, locals_in_scope)
+    return stmts, f"deduce_get_bool({expr})"
+
+
+def _emit_prim_args(t: ir.Prim, ctx: EmitCtx,
+                    locals_in_scope: Set[str]) -> Tuple[List[str], List[str]]:
+    stmts: List[str] = []
+    exprs: List[str] = []
+    for a in t.args:
+        sa, ea = _emit_term(a, ctx, locals_in_scope)
+        stmts.extend(sa)
+        exprs.append(ea)
+    return stmts, exprs
+
+
+def _emit_node(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[List[str], str]:
     match t:
         case ir.Var(name):
             if name in locals_in_scope:
                 return [], _local_id(name)
             if name in ctx.top_globals:
                 return [], ctx.global_id(name)
+            if name in ctx.static_closures:
+                return [], ctx.closure_singleton(name)
             if name in ctx.top_funcs:
-                # First-class top-level function reference: build a
-                # closure with empty env. Phase 1 doesn't exercise this,
-                # but supporting it is a few lines.
+                # First-class reference to an imported function: build
+                # a closure with empty env.
                 arity = ctx.top_funcs[name]
                 stmts: List[str] = []
-                tmp = ctx.fresh_tmp()
+                tmp = ctx.fresh_local()
                 stmts.append(
-                    f"deduce_value {tmp} = deduce_make_closure("
+                    f"{tmp} = deduce_make_closure("
                     f"{ctx.func_id(name)}, {_c_string(_base_name(name))}, "
                     f"{arity}, 0, NULL);"
                 )
@@ -603,9 +995,9 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
             # can't materialise. Emit a runtime panic so the binary
             # still builds; if pruning kept this code path it'll abort
             # with a clear message.
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             return [
-                f"deduce_value {tmp} = deduce_unreachable_value("
+                f"{tmp} = deduce_unreachable_value("
                 f"{_c_string(f'undefined name: {name}')});"
             ], tmp
 
@@ -613,17 +1005,20 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
             return [], f"deduce_make_bool({'true' if b else 'false'})"
 
         case ir.Int(v):
-            return [], f"deduce_make_int({v})"
+            # Allocates, so it gets a rooted local like any other
+            # allocation rather than appearing inline in an argument
+            # list next to another allocation.
+            tmp = ctx.fresh_local()
+            return [f"{tmp} = deduce_make_int({v});"], tmp
 
         case ir.If(cond, thn, els):
-            scond, econd = _emit_term(cond, ctx, locals_in_scope)
+            scond, ccond = _emit_cond(cond, ctx, locals_in_scope)
             sthn, ethn = _emit_term(thn, ctx, locals_in_scope)
             sels, eels = _emit_term(els, ctx, locals_in_scope)
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             stmts = []
             stmts.extend(scond)
-            stmts.append(f"deduce_value {tmp};")
-            stmts.append(f"if (deduce_get_bool({econd})) {{")
+            stmts.append(f"if ({ccond}) {{")
             for s in sthn:
                 stmts.append("    " + s)
             stmts.append(f"    {tmp} = {ethn};")
@@ -638,7 +1033,12 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
             srhs, erhs = _emit_term(rhs, ctx, locals_in_scope)
             stmts = []
             stmts.extend(srhs)
-            stmts.append(f"deduce_value {_local_id(name)} = {erhs};")
+            # A procedure's `a[i] := v` is bound only for its effect,
+            # which `srhs` already performs.
+            if isinstance(rhs, ir.ArraySet) and name not in ir.free_vars(body):
+                sbody, ebody = _emit_term(body, ctx, locals_in_scope)
+                return stmts + sbody, ebody
+            stmts.append(f"{ctx.declare(_local_id(name))} = {erhs};")
             sbody, ebody = _emit_term(body, ctx, locals_in_scope | {name})
             stmts.extend(sbody)
             return stmts, ebody
@@ -660,10 +1060,10 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
             stmts.append(
                 f"deduce_value {arr}[] = {{ {', '.join(arg_exprs)} }};"
             )
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             stmts.append(
-                f"deduce_value {tmp} = deduce_make_ctor("
-                f"{ctx.ctor_id_macro(ctor)}, {_c_string(_base_name(ctor))}, "
+                f"{tmp} = deduce_make_ctor("
+                f"{ctx.ctor_id_macro(ctor)}, {_ctor_name(ctor)}, "
                 f"{len(args)}, {arr});"
             )
             return stmts, tmp
@@ -671,6 +1071,8 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
         case ir.MkClosure(fn, caps):
             if fn not in ctx.top_funcs:
                 raise EmitError(f"closure refers to unknown function: {fn}")
+            if fn in ctx.static_closures and not caps:
+                return [], ctx.closure_singleton(fn)
             arity = ctx.top_funcs[fn]
             cap_stmts: List[str] = []
             cap_exprs: List[str] = []
@@ -687,9 +1089,9 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                 arr_arg = arr
             else:
                 arr_arg = "NULL"
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             stmts.append(
-                f"deduce_value {tmp} = deduce_make_closure("
+                f"{tmp} = deduce_make_closure("
                 f"{ctx.func_id(fn)}, {_c_string(_base_name(fn))}, {arity}, "
                 f"{len(caps)}, {arr_arg});"
             )
@@ -704,7 +1106,7 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                 arg_exprs.append(ea)
             stmts = list(arg_stmts)
 
-            # Direct call to a top-level function: no env, args[].
+            # Direct call to a top-level function: positional args.
             if isinstance(rator, ir.Var) \
                and rator.name in ctx.top_funcs \
                and rator.name not in locals_in_scope:
@@ -713,17 +1115,32 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                         f"arity mismatch calling {rator.name}: "
                         f"declared {ctx.top_funcs[rator.name]}, called with {len(args)}"
                     )
-                if arg_exprs:
-                    arr = ctx.fresh_tmp() + "_args"
+                tmp = ctx.fresh_local()
+                stmts.append(
+                    f"{tmp} = {ctx.direct_id(rator.name)}"
+                    f"({', '.join(arg_exprs)});"
+                )
+                return stmts, tmp
+
+            # Known call: the closure is only called, so its captures
+            # go in a stack array instead of a heap closure.
+            if isinstance(rator, ir.MkClosure) \
+               and ctx.top_funcs.get(rator.fn_name) == len(args):
+                call_args = list(arg_exprs)
+                if rator.captures:
+                    cap_exprs = []
+                    for c in rator.captures:
+                        sc, ec = _emit_term(c, ctx, locals_in_scope)
+                        stmts.extend(sc)
+                        cap_exprs.append(ec)
+                    arr = ctx.fresh_tmp() + "_env"
                     stmts.append(
-                        f"deduce_value {arr}[] = {{ {', '.join(arg_exprs)} }};"
+                        f"deduce_value {arr}[] = {{ {', '.join(cap_exprs)} }};"
                     )
-                    arr_arg = arr
-                else:
-                    arr_arg = "NULL"
-                tmp = ctx.fresh_tmp()
+                    call_args.insert(0, arr)
+                tmp = ctx.fresh_local()
                 stmts.append(
-                    f"deduce_value {tmp} = {ctx.func_id(rator.name)}(NULL, {arr_arg});"
+                    f"{tmp} = {ctx.direct_id(rator.fn_name)}({', '.join(call_args)});"
                 )
                 return stmts, tmp
 
@@ -738,19 +1155,18 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                 arr_arg = arr
             else:
                 arr_arg = "NULL"
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             stmts.append(
-                f"deduce_value {tmp} = deduce_call({erator}, {len(args)}, {arr_arg});"
+                f"{tmp} = deduce_call({erator}, {len(args)}, {arr_arg});"
             )
             return stmts, tmp
 
         case ir.Match(subj, arms, match_loc):
             ssubj, esubj = _emit_term(subj, ctx, locals_in_scope)
             stmts = list(ssubj)
-            subj_var = ctx.fresh_tmp()
-            stmts.append(f"deduce_value {subj_var} = {esubj};")
-            tmp = ctx.fresh_tmp()
-            stmts.append(f"deduce_value {tmp};")
+            subj_var = ctx.fresh_local()
+            stmts.append(f"{subj_var} = {esubj};")
+            tmp = ctx.fresh_local()
 
             # Detect bool vs ctor patterns. Mixing is not allowed in
             # Deduce source so we don't try to handle it.
@@ -774,19 +1190,33 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                 stmts.append(f"    {tmp} = {fe};")
                 stmts.append("}")
             else:
-                stmts.append(f"switch (deduce_ctor_id({subj_var})) {{")
+                # One `case` per constructor, so the C compiler can
+                # dispatch through a jump table. Of two arms for the
+                # same constructor the first wins, as in the
+                # interpreter. When the arms cover the whole union, the
+                # last one is the `default` and no panic is needed.
+                ctor_arms: Dict[str, ir.MatchArm] = {}
                 for arm in arms:
                     if not isinstance(arm.pattern, ir.PatCon):
                         raise EmitError("expected constructor pattern in ctor match")
+                    ctor_arms.setdefault(arm.pattern.ctor, arm)
+                union = ctx.union_ctors.get(next(iter(ctor_arms), ""))
+                exhaustive = union is not None and set(union) == set(ctor_arms)
+                stmts.append(f"switch (deduce_ctor_id({subj_var})) {{")
+                for i, arm in enumerate(ctor_arms.values()):
+                    assert isinstance(arm.pattern, ir.PatCon)
                     pc: ir.PatCon = arm.pattern
-                    stmts.append(f"case {ctx.ctor_id_macro(pc.ctor)}: {{")
+                    if exhaustive and i == len(ctor_arms) - 1:
+                        stmts.append("default: {")
+                    else:
+                        stmts.append(f"case {ctx.ctor_id_macro(pc.ctor)}: {{")
                     inner_scope = locals_in_scope | set(pc.binds)
-                    for i, bind in enumerate(pc.binds):
+                    for field_ix, bind in enumerate(pc.binds):
                         # Cast to (void) to silence -Wunused on bindings
                         # the case body happens to ignore.
                         stmts.append(
-                            f"    deduce_value {_local_id(bind)} = "
-                            f"deduce_ctor_field({subj_var}, {i});"
+                            f"    {ctx.declare(_local_id(bind))} = "
+                            f"deduce_ctor_field({subj_var}, {field_ix});"
                         )
                         stmts.append(f"    (void){_local_id(bind)};")
                     bs, be = _emit_term(arm.body, ctx, inner_scope)
@@ -795,10 +1225,11 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
                     stmts.append(f"    {tmp} = {be};")
                     stmts.append("    break;")
                     stmts.append("}")
-                msg = "non-exhaustive match"
-                if match_loc:
-                    msg = f"{match_loc}: {msg}"
-                stmts.append(f"default: deduce_panic({_c_string(msg)});")
+                if not exhaustive:
+                    msg = "non-exhaustive match"
+                    if match_loc:
+                        msg = f"{match_loc}: {msg}"
+                    stmts.append(f"default: deduce_panic({_c_string(msg)});")
                 stmts.append("}")
             return stmts, tmp
 
@@ -806,39 +1237,134 @@ def _emit_term(t: ir.Term, ctx: EmitCtx, locals_in_scope: Set[str]) -> Tuple[Lis
             sl, el = _emit_term(l, ctx, locals_in_scope)
             sr, er = _emit_term(r, ctx, locals_in_scope)
             stmts = list(sl) + list(sr)
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             stmts.append(
-                f"deduce_value {tmp} = deduce_make_bool(deduce_equal({el}, {er}));"
+                f"{tmp} = deduce_make_bool(deduce_equal({el}, {er}));"
             )
             return stmts, tmp
 
         case ir.Panic(msg, loc):
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             full = f"{loc}: {msg}" if loc else msg
             return [
-                f"deduce_value {tmp} = deduce_unreachable_value({_c_string(full)});"
+                f"{tmp} = deduce_unreachable_value({_c_string(full)});"
             ], tmp
 
         case ir.MakeArray(s, loc):
             ssub, esub = _emit_term(s, ctx, locals_in_scope)
             stmts = list(ssub)
-            tmp = ctx.fresh_tmp()
+            tmp = ctx.fresh_local()
             loc_arg = _c_string(loc) if loc else "NULL"
             stmts.append(
-                f"deduce_value {tmp} = deduce_make_array_from_list({esub}, {loc_arg});"
+                f"{tmp} = deduce_make_array_from_list({esub}, {loc_arg});"
             )
             return stmts, tmp
 
-        case ir.ArrayGet(s, i, loc):
+        case ir.ArrayGet(s, i, loc, checked):
             ssub, esub = _emit_term(s, ctx, locals_in_scope)
             sidx, eidx = _emit_term(i, ctx, locals_in_scope)
             stmts = list(ssub) + list(sidx)
-            tmp = ctx.fresh_tmp()
-            loc_arg = _c_string(loc) if loc else "NULL"
+            tmp = ctx.fresh_local()
+            if checked:
+                loc_arg = _c_string(loc) if loc else "NULL"
+                stmts.append(
+                    f"{tmp} = deduce_array_get({esub}, {eidx}, {loc_arg});"
+                )
+            else:
+                stmts.append(
+                    f"{tmp} = deduce_array_get_unchecked({esub}, {eidx});"
+                )
+            return stmts, tmp
+
+        case ir.ArraySet(s, i, v, loc, checked):
+            ssub, esub = _emit_term(s, ctx, locals_in_scope)
+            sidx, eidx = _emit_term(i, ctx, locals_in_scope)
+            sval, evalue = _emit_term(v, ctx, locals_in_scope)
+            stmts = list(ssub) + list(sidx) + list(sval)
+            if checked:
+                loc_arg = _c_string(loc) if loc else "NULL"
+                stmts.append(
+                    f"deduce_array_set({esub}, {eidx}, {evalue}, {loc_arg});"
+                )
+            else:
+                stmts.append(
+                    f"deduce_array_set_unchecked({esub}, {eidx}, {evalue});"
+                )
+            return stmts, esub
+
+        case ir.ArrayLength(s):
+            ssub, esub = _emit_term(s, ctx, locals_in_scope)
+            return list(ssub), f"deduce_array_length({esub})"
+
+        case ir.Num(kind, v):
+            if v <= _NUM_CONST_MAX:
+                return [], f"DEDUCE_NUM({_NUM_KIND_MACROS[kind]}, {v})"
+            return [], (f"deduce_make_num({_NUM_KIND_MACROS[kind]}, "
+                        f"UINT64_C({v}))")
+
+        case ir.Prim(op, _, kind):
+            if kind is None:
+                stmts, test = _emit_cond(t, ctx, locals_in_scope)
+                tmp = ctx.fresh_local()
+                stmts.append(f"{tmp} = deduce_make_bool({test});")
+                return stmts, tmp
+            stmts, call_args = _emit_prim_args(t, ctx, locals_in_scope)
+            call_args.append(_NUM_KIND_MACROS[kind])
+            tmp = ctx.fresh_local()
+            stmts.append(f"{tmp} = deduce_num_{op}({', '.join(call_args)});")
+            return stmts, tmp
+
+        case ir.TailCall(fn, args):
+            loop = ctx.loop
+            if loop is None or fn not in loop.labels:
+                raise EmitError(f"tail call to {fn} outside its loop group")
+            stmts = []
+            params = loop.params[fn]
+            reads: List[str] = []
+            for a in args:
+                sa, ea = _emit_term(a, ctx, locals_in_scope)
+                stmts.extend(sa)
+                reads.append(ea)
+            for i, e in enumerate(reads):
+                # An argument that reads a parameter assigned before it
+                # must read the old value.
+                if e in params[:i]:
+                    tmp = ctx.fresh_local()
+                    stmts.append(f"{tmp} = {e};")
+                    reads[i] = tmp
+            for param, e in zip(params, reads):
+                if param != e:
+                    stmts.append(f"{param} = {e};")
+            stmts.append(f"goto {loop.labels[fn]};")
+            # Control never reaches the use of the result.
+            return stmts, "NULL"
+
+        case ir.TailCon(ctor, args, hole):
+            if ctx.loop is None or not ctx.loop.dest:
+                raise EmitError(f"{ctor} with a hole outside its loop group")
+            stmts = []
+            field_exprs: List[str] = []
+            for i, a in enumerate(args):
+                if i == hole:
+                    field_exprs.append("NULL")
+                    continue
+                sa, ea = _emit_term(a, ctx, locals_in_scope)
+                stmts.extend(sa)
+                field_exprs.append(ea)
+            arr = ctx.fresh_tmp() + "_args"
             stmts.append(
-                f"deduce_value {tmp} = deduce_array_get({esub}, {eidx}, {loc_arg});"
+                f"deduce_value {arr}[] = {{ {', '.join(field_exprs)} }};"
             )
-            return stmts, tmp
+            cell = ctx.fresh_local()
+            stmts.append(
+                f"{cell} = deduce_make_ctor("
+                f"{ctx.ctor_id_macro(ctor)}, {_ctor_name(ctor)}, "
+                f"{len(args)}, {arr});"
+            )
+            stmts.append(f"*dest = {cell};")
+            stmts.append(f"dest = deduce_ctor_slot({cell}, {hole});")
+            sj, ej = _emit_term(args[hole], ctx, locals_in_scope)
+            return stmts + sj, ej
 
         case ir.Lam(_, _):
             raise EmitError(
@@ -21,7 +21,7 @@ against; keep it stable.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Union
 
 
 # ---------- terms ----------
@@ -151,17 +151,100 @@ class MakeArray:
 
 @dataclass
 class ArrayGet:
-    """Read an array element by index. The index is a Nat or UInt;
-    the runtime decodes it by inspecting constructor names. Out-of-
+    """Read an array element by index. The index is a Nat or UInt,
+    which the runtime holds as an unboxed natural (see `Num`). Out-of-
     bounds returns the original ArrayGet — matches the interpreter
     convention of not raising on OOB. (We diverge: the compiled
-    binary aborts via `deduce_panic` instead.)"""
+    binary aborts via `deduce_panic` instead.) `checked` is False for
+    a read the verifier proved in bounds; the backend then skips the
+    check."""
     subject: "Term"
     index: "Term"
     loc: "str | None" = None  # source `file:line`, for OOB panic messages
+    checked: bool = True
 
 
-Term = Union[Var, Bool, Int, Lam, MkClosure, App, Let, If, Con, Match, Eq, Panic, MakeArray, ArrayGet]
+@dataclass
+class ArraySet:
+    """`a[i] := v` in a procedure: overwrite an element of the mutable
+    array `subject` in place. The index is a UInt. Its value is the
+    array. `checked` is as for `ArrayGet`."""
+    subject: "Term"
+    index: "Term"
+    value: "Term"
+    loc: "str | None" = None
+    checked: bool = True
+
+
+@dataclass
+class ArrayLength:
+    """`length(a)` of an array, as a UInt."""
+    subject: "Term"
+
+
+# The prelude's natural-number unions, which lowering replaces by
+# unboxed machine integers: `Nat` (zero/suc), `UInt`'s private binary
+# representation (bzero/dub_inc/inc_dub), and the `zero`/`suc` view of
+# `UInt`. The kind of a value decides how the runtime prints it.
+NUM_KINDS = ("nat", "uint", "uview")
+
+
+@dataclass
+class Num:
+    """A constant of one of the `NUM_KINDS`."""
+    kind: str
+    value: int
+
+
+# Operations on unboxed naturals. Each maps to a `deduce_num_<op>`
+# function of the runtime. Arithmetic saturates the way the prelude
+# does: `sub` is truncated subtraction, `pred(0)` is 0, and `div`/`mod`
+# by zero give 0 and the dividend.
+NUM_OPS = {
+    # op: arity
+    "suc": 1, "pred": 1, "dub": 1, "dub_inc": 1, "inc_dub": 1,
+    "half": 1, "log": 1, "cast": 1,
+    "add": 2, "sub": 2, "mul": 2, "div": 2, "mod": 2, "pow": 2,
+    "max": 2, "min": 2, "dist": 2,
+}
+# Operations returning `bool` rather than a number.
+NUM_TESTS = {"is_zero": 1, "is_odd": 1, "eq": 2, "le": 2, "lt": 2}
+
+
+@dataclass
+class Prim:
+    """A native operation on unboxed naturals (`NUM_OPS` or
+    `NUM_TESTS`). `kind` is the kind of the result, and None for
+    the tests. `cast` changes only the kind, e.g. `toNat` on a
+    `UInt`."""
+    op: str
+    args: List["Term"]
+    kind: "str | None" = None
+
+
+@dataclass
+class TailCall:
+    """Created by the tail-call pass (`compiler/tailcall.py`). A direct
+    call, in tail position, to a function of the caller's loop group
+    (`Function.loop`). The backend rebinds the callee's parameters and
+    jumps to its entry instead of making a call."""
+    fn: str
+    args: List["Term"]
+
+
+@dataclass
+class TailCon:
+    """Created by the tail-call pass. A constructor application in tail
+    position whose `hole`-th argument is a `TailCall` (tail recursion
+    modulo constructors). The backend allocates the constructor with
+    that field empty, makes the field the destination of the loop's
+    result, and jumps."""
+    ctor: str
+    args: List["Term"]
+    hole: int
+
+
+Term = Union[Var, Bool, Int, Lam, MkClosure, App, Let, If, Con, Match, Eq, Panic, MakeArray, ArrayGet, ArraySet, ArrayLength, Num, Prim, TailCall, TailCon]
 
 
 # ---------- top-level ----------
@@ -203,13 +286,18 @@ class Function:
 
     `module` is the source module the function came from (or None for
     synthesised functions like closure-conversion `$lam<N>`). Used by
-    emit_c for `<Module>__<base_name>` symbol mangling."""
+    emit_c for `<Module>__<base_name>` symbol mangling.
+
+    `loop` is set by the tail-call pass: functions with the same `loop`
+    tail-call each other (or themselves) with `TailCall`/`TailCon` and
+    are emitted as one loop. It names the group's first member."""
     name: str
     params: List[str]
     body: Term
     captures: List[str] = field(default_factory=list)
     loc: "str | None" = None
     module: "str | None" = None
+    loop: "str | None" = None
 
 
 @dataclass
@@ -303,11 +391,13 @@ def pp_top(d: TopLevel) -> str:
         case UnionDecl(name, ctors, _):
             body = ", ".join(f"{c.name}/{c.arity}" for c in ctors)
             return f"union {name} {{{body}}}"
-        case Function(name, params, body, captures, _, _):
+        case Function(name, params, body, captures, _, _, loop):
             head = f"fn {name}"
             if captures:
                 head += "[" + ", ".join(captures) + "]"
             head += "(" + ", ".join(params) + ")"
+            if loop is not None:
+                head += f" loop {loop}"
             return head + " = " + pp_term(body, 2)
         case Global(name, body, _):
             return f"global {name} = " + pp_term(body, 2)
@@ -362,8 +452,25 @@ def pp_term(t: Term, indent: int) -> str:
             return f"panic({msg!r})"
         case MakeArray(s, _):
             return "array(" + pp_term(s, indent) + ")"
-        case ArrayGet(s, i, _):
-            return pp_term(s, indent) + "[" + pp_term(i, indent) + "]"
+        case ArrayGet(s, i, _, checked):
+            return ("" if checked else "unchecked ") \
+                + pp_term(s, indent) + "[" + pp_term(i, indent) + "]"
+        case ArraySet(s, i, v, _, checked):
+            return ("" if checked else "unchecked ") + pp_term(s, indent) \
+                + "[" + pp_term(i, indent) + "] := " + pp_term(v, indent)
+        case ArrayLength(s):
+            return "length(" + pp_term(s, indent) + ")"
+        case Num(kind, v):
+            return f"{v}:{kind}"
+        case Prim(op, args, kind):
+            head = f"%{kind}.{op}" if kind else f"%{op}"
+            return head + "(" + ", ".join(pp_term(a, indent) for a in args) + ")"
+        case TailCall(fn, args):
+            return "tailcall " + fn + "(" + ", ".join(pp_term(a, indent) for a in args) + ")"
+        case TailCon(ctor, args, hole):
+            shown = [pp_term(a, indent) for a in args]
+            shown[hole] = "[" + shown[hole] + "]"
+            return ctor + "(" + ", ".join(shown) + ")"
     raise AssertionError(f"pp_term: unknown term {type(t).__name__}")
 
 
@@ -386,7 +493,8 @@ def verify(p: Program) -> None:
     top_classes = (UnionDecl, Function, Global, Print, AssertEq, AssertBool)
     term_classes = (
         Var, Bool, Int, Lam, MkClosure, App, Let, If, Con, Match, Eq,
-        Panic, MakeArray, ArrayGet,
+        Panic, MakeArray, ArrayGet, ArraySet, ArrayLength, Num, Prim,
+        TailCall, TailCon,
     )
 
     def check_term(t: object, ctx: str) -> None:
@@ -397,6 +505,17 @@ def verify(p: Program) -> None:
         match t:
             case Var(_) | Bool(_) | Int(_):
                 return
+            case Num(kind, _):
+                if kind not in NUM_KINDS:
+                    raise AssertionError(f"verify: bad number kind in {ctx}")
+            case Prim(op, args, kind):
+                arity = NUM_OPS.get(op, NUM_TESTS.get(op))
+                if arity != len(args) or (kind in NUM_KINDS) != (op in NUM_OPS):
+                    raise AssertionError(
+                        f"verify: bad primitive {op}/{len(args)} in {ctx}"
+                    )
+                for a in args:
+                    check_term(a, ctx)
             case Lam(_, body):
                 check_term(body, ctx)
             case MkClosure(_, caps):
@@ -438,6 +557,21 @@ def verify(p: Program) -> None:
             case ArrayGet(s, i, _):
                 check_term(s, ctx)
                 check_term(i, ctx)
+            case ArraySet(s, i, v, _):
+                check_term(s, ctx)
+                check_term(i, ctx)
+                check_term(v, ctx)
+            case ArrayLength(s):
+                check_term(s, ctx)
+            case TailCall(_, args):
+                for a in args:
+                    check_term(a, ctx)
+            case TailCon(_, args, hole):
+                if not (0 <= hole < len(args)
+                        and isinstance(args[hole], TailCall)):
+                    raise AssertionError(f"verify: bad TailCon hole in {ctx}")
+                for a in args:
+                    check_term(a, ctx)
 
     if not isinstance(p, Program):
         raise AssertionError(f"verify: not a Program: {type(p).__name__}")
@@ -464,16 +598,96 @@ def verify(p: Program) -> None:
                 check_term(t, "assert_bool")
 
 
+def subterms(t: Term) -> List[Term]:
+    """The immediate subterms of `t`, in evaluation order."""
+    match t:
+        case Var(_) | Bool(_) | Int(_) | Num(_, _) | Panic(_, _):
+            return []
+        case Lam(_, body):
+            return [body]
+        case MkClosure(_, caps):
+            return list(caps)
+        case App(rator, args):
+            return [rator, *args]
+        case Let(_, rhs, body):
+            return [rhs, body]
+        case If(c, th, el):
+            return [c, th, el]
+        case Match(subj, arms, _):
+            return [subj, *(arm.body for arm in arms)]
+        case Eq(l, r):
+            return [l, r]
+        case MakeArray(s, _):
+            return [s]
+        case ArrayGet(s, i, _):
+            return [s, i]
+        case ArraySet(s, i, v, _):
+            return [s, i, v]
+        case ArrayLength(s):
+            return [s]
+        case Con(_, args) | Prim(_, args, _) | TailCall(_, args) \
+                | TailCon(_, args, _):
+            return list(args)
+    raise AssertionError(f"subterms: unknown term {type(t).__name__}")
+
+
+def map_subterms(t: Term, f: "Callable[[Term], Term]") -> Term:
+    """`t` with `f` applied to each immediate subterm. Binders are kept
+    as they are; uniquified names make that safe for any `f` that does
+    not introduce new bindings of existing names."""
+    match t:
+        case Var(_) | Bool(_) | Int(_) | Num(_, _) | Panic(_, _):
+            return t
+        case Lam(params, body):
+            return Lam(params, f(body))
+        case MkClosure(fn, caps):
+            return MkClosure(fn, [f(c) for c in caps])
+        case App(rator, args):
+            return App(f(rator), [f(a) for a in args])
+        case Let(name, rhs, body):
+            return Let(name, f(rhs), f(body))
+        case If(c, th, el):
+            return If(f(c), f(th), f(el))
+        case Con(ctor, args):
+            return Con(ctor, [f(a) for a in args])
+        case Match(subj, arms, loc):
+            return Match(f(subj), [MatchArm(arm.pattern, f(arm.body))
+                                   for arm in arms], loc)
+        case Eq(l, r):
+            return Eq(f(l), f(r))
+        case MakeArray(s, loc):
+            return MakeArray(f(s), loc)
+        case ArrayGet(s, i, loc, checked):
+            return ArrayGet(f(s), f(i), loc, checked)
+        case ArraySet(s, i, v, loc, checked):
+            return ArraySet(f(s), f(i), f(v), loc, checked)
+        case ArrayLength(s):
+            return ArrayLength(f(s))
+        case Prim(op, args, kind):
+            return Prim(op, [f(a) for a in args], kind)
+        case TailCall(fn, args):
+            return TailCall(fn, [f(a) for a in args])
+        case TailCon(ctor, args, hole):
+            return TailCon(ctor, [f(a) for a in args], hole)
+    raise AssertionError(f"map_subterms: unknown term {type(t).__name__}")
+
+
 def free_vars(t: Term, bound: frozenset[str] = frozenset()) -> set[str]:
+    out: set[str]
     match t:
         case Var(name):
             return set() if name in bound else {name}
-        case Bool(_) | Int(_):
+        case Bool(_) | Int(_) | Num(_, _):
             return set()
+        case Prim(_, args, _):
+            out = set()
+            for a in args:
+                out |= free_vars(a, bound)
+            return out
         case Lam(params, body):
             return free_vars(body, bound | set(params))
         case MkClosure(_, caps):
-            out: set[str] = set()
+            out = set()
             for c in caps:
                 out |= free_vars(c, bound)
             return out
@@ -508,4 +722,14 @@ def free_vars(t: Term, bound: frozenset[str] = frozenset()) -> set[str]:
             return free_vars(s, bound)
         case ArrayGet(s, i, _):
             return free_vars(s, bound) | free_vars(i, bound)
+        case ArraySet(s, i, v, _):
+            return free_vars(s, bound) | free_vars(i, bound) \
+                | free_vars(v, bound)
+        case ArrayLength(s):
+            return free_vars(s, bound)
+        case TailCall(_, args) | TailCon(_, args, _):
+            out = set()
+            for a in args:
+                out |= free_vars(a, bound)
+            return out
     raise AssertionError(f"free_vars: unknown term {type(t).__name__}")
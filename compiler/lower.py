@@ -11,12 +11,20 @@ explicitly — there is no silent fallthrough.
 Phase 1 supports: Bool, Int literals; Var; Conditional; TLet; Lambda;
 Generic; TermInst; TAnnote; Mark; Call (function or constructor);
 Switch (PatternCons / PatternBool); Define; RecFun; Union; Print;
-Assert. MakeArray/ArrayGet/GenRecFun/Array etc. raise CompileError.
+Assert; MakeArray, ArrayGet and ArrayLength. GenRecFun, Array etc.
+raise CompileError. Imperative `proc`s lower to functions with loops
+and in-place array writes; see `lower_proc`.
+
+The prelude's `Nat` and `UInt` are not lowered as unions. Their
+constructors become `ir.Num` constants and `ir.Prim` operations on
+machine integers, a `switch` over them becomes comparisons, and the
+prelude's arithmetic on them (`+`, `*`, `≤`, `/`, ...) becomes a
+single native operation; see `_NUM_CTORS` and `_NUM_FUNCS`.
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Set, Tuple, cast
+from typing import Callable, Dict, List, Optional, Set, Tuple, cast
 
 from lark.tree import Meta
 
@@ -63,6 +71,93 @@ def _ast_loc(loc: Optional[Meta]) -> Optional[str]:
         return None
 
 
+# --------------------------------------------------------------------------
+# Unboxed naturals
+# --------------------------------------------------------------------------
+#
+# Recognised by the module (file stem) that declares them plus the base
+# name and arity, so a user's own `union Nat` stays an ordinary union.
+
+# (module, constructor, arity) -> (kind, op). A nullary constructor is
+# the constant 0; the others are the `ir.NUM_OPS` of the same name.
+_NUM_CTORS: Dict[Tuple[str, str, int], Tuple[str, str]] = {
+    ("NatDefs", "zero", 0): ("nat", "zero"),
+    ("NatDefs", "suc", 1): ("nat", "suc"),
+    ("UIntDefs", "bzero", 0): ("uint", "zero"),
+    ("UIntDefs", "dub_inc", 1): ("uint", "dub_inc"),
+    ("UIntDefs", "inc_dub", 1): ("uint", "inc_dub"),
+    # The `zero`/`suc` view of UInt: `suc(p)` holds a UInt `p`.
+    ("UIntDefs", "zero", 0): ("uview", "zero"),
+    ("UIntDefs", "suc", 1): ("uview", "suc"),
+}
+
+# (module, function) -> (arity, op, result kind, arguments). Each
+# argument is the index of a parameter or a constant. A call with that
+# arity becomes the operation, and so does the function's own body, so
+# a first-class use of the function is native too.
+_NumFunc = Tuple[int, str, Optional[str], Tuple["int | ir.Num", ...]]
+
+_NUM_FUNCS: Dict[Tuple[str, str], _NumFunc] = {
+    ("NatDefs", "+"): (2, "add", "nat", (0, 1)),
+    ("NatDefs", "*"): (2, "mul", "nat", (0, 1)),
+    ("NatDefs", "∸"): (2, "sub", "nat", (0, 1)),
+    ("NatDefs", "expt"): (2, "pow", "nat", (1, 0)),
+    ("NatDefs", "^"): (2, "pow", "nat", (0, 1)),
+    ("NatDefs", "pow2"): (1, "pow", "nat", (ir.Num("nat", 2), 0)),
+    ("NatDefs", "max"): (2, "max", "nat", (0, 1)),
+    ("NatDefs", "min"): (2, "min", "nat", (0, 1)),
+    ("NatDefs", "dist"): (2, "dist", "nat", (0, 1)),
+    ("NatDefs", "pred"): (1, "pred", "nat", (0,)),
+    ("NatDefs", "lit"): (1, "cast", "nat", (0,)),
+    ("NatDefs", "≤"): (2, "le", None, (0, 1)),
+    ("NatDefs", "<"): (2, "lt", None, (0, 1)),
+    ("NatDefs", "≥"): (2, "le", None, (1, 0)),
+    ("NatDefs", ">"): (2, "lt", None, (1, 0)),
+    ("NatDefs", "equal"): (2, "eq", None, (0, 1)),
+    ("NatDiv", "/"): (2, "div", "nat", (0, 1)),
+    ("NatDiv", "%"): (2, "mod", "nat", (0, 1)),
+    ("UIntDefs", "toNat"): (1, "cast", "nat", (0,)),
+    ("UIntDefs", "fromNat"): (1, "cast", "uint", (0,)),
+    ("UIntDefs", "uint_view"): (1, "cast", "uview", (0,)),
+    ("UIntDefs", "uint_unview"): (1, "cast", "uint", (0,)),
+    ("UIntDefs", "+"): (2, "add", "uint", (0, 1)),
+    ("UIntDefs", "*"): (2, "mul", "uint", (0, 1)),
+    ("UIntDefs", "∸"): (2, "sub", "uint", (0, 1)),
+    ("UIntDefs", "sqr"): (1, "mul", "uint", (0, 0)),
+    ("UIntDefs", "expt"): (2, "pow", "uint", (1, 0)),
+    ("UIntDefs", "^"): (2, "pow", "uint", (0, 1)),
+    ("UIntDefs", "max"): (2, "max", "uint", (0, 1)),
+    ("UIntDefs", "min"): (2, "min", "uint", (0, 1)),
+    ("UIntDefs", "inc"): (1, "suc", "uint", (0,)),
+    ("UIntDefs", "dub"): (1, "dub", "uint", (0,)),
+    ("UIntDefs", "pred"): (1, "pred", "uint", (0,)),
+    ("UIntDefs", "div2"): (1, "half", "uint", (0,)),
+    ("UIntDefs", "log"): (1, "log", "uint", (0,)),
+    ("UIntDefs", "<"): (2, "lt", None, (0, 1)),
+    ("UIntDefs", "≤"): (2, "le", None, (0, 1)),
+    ("UIntDefs", ">"): (2, "lt", None, (1, 0)),
+    ("UIntDefs", "≥"): (2, "le", None, (1, 0)),
+    ("UIntDiv", "/"): (2, "div", "uint", (0, 1)),
+    ("UIntDiv", "%"): (2, "mod", "uint", (0, 1)),
+}
+
+# Constant folding for the constructor operations, so a literal such
+# as `fromNat(lit(suc(suc(zero))))` lowers to one `ir.Num`.
+_NUM_FOLD = {
+    "suc": lambda v: v + 1,
+    "dub_inc": lambda v: 2 * v + 2,
+    "inc_dub": lambda v: 2 * v + 1,
+    "cast": lambda v: v,
+}
+
+
+def _num_op(op: str, args: List[ir.Term], kind: Optional[str]) -> ir.Term:
+    if op in _NUM_FOLD and kind is not None \
+       and all(isinstance(a, ir.Num) for a in args):
+        return ir.Num(kind, _NUM_FOLD[op](cast(ir.Num, args[0]).value))
+    return ir.Prim(op, args, kind)
+
+
 # --------------------------------------------------------------------------
 # Top-level lowering
 # --------------------------------------------------------------------------
@@ -113,15 +208,23 @@ def lower_program(stmts: List[ast.Statement],
         ctors.add(cname)
         arities[cname] = carity
 
-    lc = LoweringCtx(ctors=ctors, ctor_arities=arities)
+    num_ctors: Dict[str, Tuple[str, str]] = {}
+    for cname in ctors:
+        key = (name_to_module.get(cname, ""), ast.base_name(cname),
+               arities[cname])
+        if key in _NUM_CTORS:
+            num_ctors[cname] = _NUM_CTORS[key]
+    num_funcs: Dict[str, _NumFunc] = {}
+    for fname, mod in name_to_module.items():
+        spec = _NUM_FUNCS.get((mod, ast.base_name(fname)))
+        if spec is not None:
+            num_funcs[fname] = spec
+
+    lc = LoweringCtx(ctors=ctors, ctor_arities=arities,
+                     num_ctors=num_ctors, num_funcs=num_funcs)
     out: List[ir.TopLevel] = []
     for s, mod in flat:
-        d = lc.lower_stmt(s, mod)
-        if d is not None:
-            if isinstance(d, list):
-                out.extend(d)
-            else:
-                out.append(d)
+        out.extend(lc.lower_stmt(s, mod))
     return ir.Program(
         decls=out,
         name_to_module=name_to_module,
@@ -199,6 +302,9 @@ def _flatten_imports(
         elif isinstance(s, ast.GenRecFun):
             name_to_module[s.name] = module
             assign_seq(s.name, module)
+        elif isinstance(s, ast.ProcDecl):
+            name_to_module[s.name] = module
+            assign_seq(s.name, module)
         elif isinstance(s, ast.Union):
             name_to_module[s.name] = module
             assign_seq(s.name, module)
@@ -279,10 +385,22 @@ def _flatten_imports(
 
 
 class LoweringCtx:
-    def __init__(self, ctors: Set[str], ctor_arities: Dict[str, int]):
+    def __init__(self, ctors: Set[str], ctor_arities: Dict[str, int],
+                 num_ctors: Optional[Dict[str, Tuple[str, str]]] = None,
+                 num_funcs: Optional[Dict[str, _NumFunc]] = None):
         self.ctors = ctors
         self.ctor_arities = ctor_arities
+        # Constructors and functions of the unboxed naturals, by
+        # uniquified name; see `_NUM_CTORS` and `_NUM_FUNCS`.
+        self.num_ctors = num_ctors or {}
+        self.num_funcs = num_funcs or {}
         self._gensym = 0
+        # Per-module counter for the functions a procedure's loops and
+        # joins become; see `lower_proc`.
+        self._proc_helpers: Dict[str, int] = {}
+        # `access_key`s of the array accesses of the procedure being
+        # lowered that the verifier proved in bounds.
+        self.proven_in_bounds: Set[Tuple[int, int]] = set()
 
     def fresh(self, hint: str = "_t") -> str:
         n = self._gensym
@@ -293,13 +411,13 @@ class LoweringCtx:
 
     # ---- statements --------------------------------------------------
 
-    def lower_stmt(self, s: ast.Statement, module: str) -> Optional[ir.TopLevel]:
+    def lower_stmt(self, s: ast.Statement, module: str) -> List[ir.TopLevel]:
         if isinstance(s, ast.Theorem) or isinstance(s, ast.Postulate) \
            or isinstance(s, ast.Predicate) or isinstance(s, ast.Auto) \
            or isinstance(s, ast.Inductive) or isinstance(s, ast.Module) \
            or isinstance(s, ast.Export) or isinstance(s, ast.Associative) \
-           or isinstance(s, ast.Trace):
-            return None
+           or isinstance(s, ast.Trace) or isinstance(s, ast.ViewDecl):
+            return []
         if isinstance(s, ast.Import):
             # Imports are lowered to a flat statement list upstream
             # (the proof checker walks them via `Import.ast`); the
@@ -309,29 +427,40 @@ class LoweringCtx:
             # caller did NOT inline imports the compiler will simply
             # be missing definitions; that fails later with a clearer
             # "undefined name" error.
-            return None
+            return []
         if isinstance(s, ast.Union):
-            return ir.UnionDecl(
+            if s.alternatives and all(c.name in self.num_ctors
+                                      for c in s.alternatives):
+                # Its values are machine integers; there is no union.
+                return []
+            return [ir.UnionDecl(
                 name=s.name,
                 ctors=[ir.Constructor(c.name, len(c.parameters))
                        for c in s.alternatives],
                 module=module,
-            )
+            )]
+        if isinstance(s, (ast.Define, ast.RecFun, ast.GenRecFun)) \
+           and s.name in self.num_funcs:
+            native = self.lower_num_function(s, module)
+            if native is not None:
+                return [native]
         if isinstance(s, ast.Define):
-            return self.lower_define(s, module)
+            return [self.lower_define(s, module)]
         if isinstance(s, ast.RecFun):
-            return self.lower_recfun(s, module)
+            return [self.lower_recfun(s, module)]
         if isinstance(s, ast.GenRecFun):
-            return self.lower_genrecfun(s, module)
+            return [self.lower_genrecfun(s, module)]
+        if isinstance(s, ast.ProcDecl):
+            return self.lower_proc(s, module)
         if isinstance(s, ast.Print):
-            return ir.Print(self.lower_term(s.term))
+            return [ir.Print(self.lower_term(s.term))]
         if isinstance(s, ast.Assert):
             # Asserts have already been validated by `check_proofs`
             # before lowering runs. Re-checking them at the compiled
             # binary's startup is wasted work, and treating them as
             # roots would force the prelude's many sanity-check asserts
             # to drag in their dependencies. Drop them.
-            return None
+            return []
         raise CompileError(
             getattr(s, "location", None),
             f"compiler does not yet support top-level: {type(s).__name__}",
@@ -392,7 +521,7 @@ class LoweringCtx:
             pat = self.lower_pattern(case.pattern)
             arms.append(ir.MatchArm(pat, body))
 
-        match = ir.Match(ir.Var(scrutinee), arms, loc=_ast_loc(r.location))
+        match = self.match(ir.Var(scrutinee), arms, _ast_loc(r.location))
         return ir.Function(
             name=r.name,
             params=[scrutinee] + other_params,
@@ -417,6 +546,136 @@ class LoweringCtx:
             module=module,
         )
 
+    # ---- procedures --------------------------------------------------
+
+    def lower_proc(self, d: ast.ProcDecl, module: str) -> List[ir.TopLevel]:
+        """A procedure becomes a function of its non-ghost parameters.
+        Its body is rewritten into the functional IR: a `var` or an
+        assignment binds a fresh name for the rest of the block, `a[i]
+        := v` is an `ArraySet`, and ghost code, `assert` and `assume`
+        are erased. Each `while` loop becomes a function of the locals
+        in scope that calls itself to iterate (so the tail-call pass
+        makes it a C loop), and the code after an `if` becomes a join
+        function both branches call, unless it is straight-line and
+        can be copied into each. Those functions are returned after
+        the procedure's own.
+
+        A procedure with no return type returns `true`. Its array
+        accesses keep their bounds checks unless `verify_proc` proved
+        them; the caller must then establish the `requires` clauses.
+
+        A body the checker does not type (one with `call`, `new`, a
+        field write, or a frame) lowers to a panic, so that the program
+        around it still compiles."""
+        loc = _ast_loc(d.location)
+        params = [p.name for p in d.params if not p.ghost]
+        if d.checked_body is None:
+            return [ir.Function(
+                name=d.name, params=params,
+                body=ir.Panic(f"procedure {ast.base_name(d.name)} uses "
+                              "statements the compiler does not support",
+                              loc=loc),
+                loc=loc, module=module,
+            )]
+        ghosts = {p.name for p in d.params if p.ghost}
+        helpers: List[ir.TopLevel] = []
+        Scope = Dict[str, str]  # local's source name -> its current IR name
+        Cont = Callable[[Scope], ir.Term]
+
+        def term(t: ast.Term, scope: Scope) -> ir.Term:
+            return subst_vars(self.lower_term(t), scope)
+
+        def helper(kind: str, scope: Scope,
+                   build: Callable[[str, Scope], ir.Term]) -> str:
+            """A new function of the locals in `scope`, with body
+            `build(its name, its scope)`."""
+            n = self._proc_helpers.get(module, 0) + 1
+            self._proc_helpers[module] = n
+            name = f"{module}${kind}{n}"
+            inner = {x: self.fresh(ast.base_name(x)) for x in scope}
+            body = build(name, inner)
+            helpers.append(ir.Function(name, list(inner.values()), body,
+                                       loc=loc, module=module))
+            return name
+
+        def call(name: str, scope: Scope, locals_: List[str]) -> ir.Term:
+            return ir.App(ir.Var(name), [ir.Var(scope[x]) for x in locals_])
+
+        def block(stmts: List[ast.ImpStmt], scope: Scope, k: Cont) -> ir.Term:
+            if not stmts:
+                return k(scope)
+            s, rest = stmts[0], stmts[1:]
+            if isinstance(s, ast.ImpVar):
+                if s.ghost:
+                    ghosts.add(s.name)
+                    return block(rest, scope, k)
+                fresh = self.fresh(ast.base_name(s.name))
+                return ir.Let(fresh, term(cast(ast.Term, s.rhs), scope),
+                              block(rest, {**scope, s.name: fresh}, k))
+            if isinstance(s, ast.ImpAssign) \
+               and isinstance(s.lhs, ast.LValueIndex):
+                return ir.Let(
+                    self.fresh("set"),
+                    ir.ArraySet(
+                        ir.Var(scope[s.lhs.array]),
+                        term(s.lhs.index, scope),
+                        term(cast(ast.Term, s.rhs), scope),
+                        loc=_ast_loc(s.location),
+                        checked=ast.access_key(s.location)
+                        not in self.proven_in_bounds,
+                    ),
+                    block(rest, scope, k),
+                )
+            if isinstance(s, ast.ImpAssign) \
+               and isinstance(s.lhs, ast.LValueVar):
+                x = s.lhs.name
+                if x in ghosts:
+                    return block(rest, scope, k)
+                fresh = self.fresh(ast.base_name(x))
+                return ir.Let(fresh, term(cast(ast.Term, s.rhs), scope),
+                              block(rest, {**scope, x: fresh}, k))
+            if isinstance(s, (ast.ImpAssert, ast.ImpAssume)):
+                return block(rest, scope, k)
+            if isinstance(s, ast.ImpReturn):
+                return term(s.value, scope)
+            if isinstance(s, ast.ImpIf):
+                cond = term(s.cond, scope)
+                outer = list(scope)
+                after: Cont = lambda sc: block(rest, sc, k)
+                if any(isinstance(r, (ast.ImpIf, ast.ImpWhile))
+                       for r in rest):
+                    join = helper("join", scope,
+                                  lambda _name, sc: block(rest, sc, k))
+                    after = lambda sc: call(join, sc, outer)
+                return ir.If(cond, block(s.then_body, scope, after),
+                             block(s.else_body or [], scope, after))
+            if isinstance(s, ast.ImpWhile):
+                outer = list(scope)
+                loop = helper("loop", scope, lambda name, sc: ir.If(
+                    term(s.cond, sc),
+                    block(s.body, sc, lambda sc2: call(name, sc2, outer)),
+                    block(rest, sc, k),
+                ))
+                return call(loop, scope, outer)
+            raise CompileError(
+                s.location,
+                f"compiler does not yet support statement: {type(s).__name__}",
+            )
+
+        if d.return_type is None:
+            fall_off: Cont = lambda sc: ir.Bool(True)
+        else:
+            fall_off = lambda sc: ir.Panic(
+                f"procedure {ast.base_name(d.name)} ended without a return",
+                loc=loc)
+        self.proven_in_bounds = d.proven_in_bounds
+        try:
+            body = block(d.checked_body, {x: x for x in params}, fall_off)
+        finally:
+            self.proven_in_bounds = set()
+        return [ir.Function(name=d.name, params=params, body=body, loc=loc,
+                            module=module), *helpers]
+
     # ---- terms -------------------------------------------------------
 
     def lower_term(self, t: ast.Term) -> ir.Term:
@@ -434,8 +693,17 @@ class LoweringCtx:
             return ir.Bool(t.value)
         if isinstance(t, ast.Int):
             return ir.Int(t.value)
+        if isinstance(t, ast.NatLit):
+            rator = t.rator
+            while isinstance(rator, ast.TermInst):
+                rator = rator.subject
+            if isinstance(rator, ast.VarRef) \
+               and self.num_ctors.get(self._resolve(rator)) == ("nat", "suc"):
+                return ir.Num("nat", t.value)
         if isinstance(t, ast.VarRef):
             name = self._resolve(t)
+            if name in self.num_ctors and self.ctor_arities.get(name) == 0:
+                return ir.Num(self.num_ctors[name][0], 0)
             if name in self.ctors and self.ctor_arities.get(name, 0) == 0:
                 # Nullary constructor used as a value.
                 return ir.Con(name, [])
@@ -508,7 +776,11 @@ class LoweringCtx:
                 self.lower_term(t.subject),
                 self.lower_term(t.position),
                 loc=_ast_loc(t.location),
+                checked=ast.access_key(t.location)
+                not in self.proven_in_bounds,
             )
+        if isinstance(t, ast.ArrayLength):
+            return ir.ArrayLength(self.lower_term(t.subject))
         if isinstance(t, ast.Array):
             # `Array` only appears in source as the result of reducing
             # `MakeArray` (literal `array([…])` uses the latter). The
@@ -539,8 +811,14 @@ class LoweringCtx:
                     self.lower_term(c.args[0]),
                     self.lower_term(c.args[1]),
                 )
+            if name in self.num_ctors and len(c.args) == 1:
+                kind, op = self.num_ctors[name]
+                return _num_op(op, [self.lower_term(c.args[0])], kind)
             if name in self.ctors:
                 return ir.Con(name, [self.lower_term(a) for a in c.args])
+            spec = self.num_funcs.get(name)
+            if spec is not None and spec[0] == len(c.args):
+                return self.num_call(spec, [self.lower_term(a) for a in c.args])
         return ir.App(
             self.lower_term(c.rator),
             [self.lower_term(a) for a in c.args],
@@ -553,10 +831,17 @@ class LoweringCtx:
                 self.lower_pattern(case.pattern),
                 self.lower_term(case.body),
             ))
-        return ir.Match(
-            self.lower_term(sw.subject), arms, loc=_ast_loc(sw.location),
+        return self.match(
+            self.lower_term(sw.subject), arms, _ast_loc(sw.location),
         )
 
+    def match(self, subject: ir.Term, arms: List[ir.MatchArm],
+              loc: Optional[str]) -> ir.Term:
+        first = arms[0].pattern if arms else None
+        if isinstance(first, ir.PatCon) and first.ctor in self.num_ctors:
+            return self.lower_num_match(subject, arms, loc)
+        return ir.Match(subject, arms, loc=loc)
+
     def lower_pattern(self, p: ast.Pattern) -> ir.Pattern:
         if isinstance(p, ast.PatternBool):
             return ir.PatBool(p.value)
@@ -575,6 +860,97 @@ class LoweringCtx:
             f"compiler does not support pattern: {type(p).__name__}",
         )
 
+    # ---- unboxed naturals --------------------------------------------
+
+    def lower_num_function(self, s: ast.Define | ast.RecFun | ast.GenRecFun,
+                           module: str) -> Optional[ir.Function]:
+        """The prelude function `s` with a native body, or None if its
+        arity is not the one `_NUM_FUNCS` expects."""
+        spec = self.num_funcs[s.name]
+        if isinstance(s, ast.RecFun):
+            arity = len(s.params)
+        elif isinstance(s, ast.GenRecFun):
+            arity = len(s.vars)
+        else:
+            body = s.body
+            if isinstance(body, ast.Generic):
+                body = body.body
+            if not isinstance(body, ast.Lambda):
+                return None
+            arity = len(body.vars)
+        if arity != spec[0]:
+            return None
+        params = [self.fresh("n") for _ in range(arity)]
+        return ir.Function(
+            name=s.name,
+            params=params,
+            body=self.num_call(spec, [ir.Var(p) for p in params]),
+            loc=_ast_loc(s.location),
+            module=module,
+        )
+
+    def num_call(self, spec: _NumFunc, args: List[ir.Term]) -> ir.Term:
+        _arity, op, kind, order = spec
+        # An argument the operation uses twice (`sqr`) is evaluated once.
+        binds: List[Tuple[str, ir.Term]] = []
+        for i, a in enumerate(args):
+            if order.count(i) > 1 and not isinstance(a, (ir.Var, ir.Num)):
+                name = self.fresh("arg")
+                binds.append((name, a))
+                args[i] = ir.Var(name)
+        result = _num_op(
+            op, [args[x] if isinstance(x, int) else x for x in order], kind,
+        )
+        for name, a in reversed(binds):
+            result = ir.Let(name, a, result)
+        return result
+
+    def lower_num_match(self, subject: ir.Term, arms: List[ir.MatchArm],
+                        loc: Optional[str]) -> ir.Term:
+        """A `switch` on an unboxed natural as a chain of tests: zero
+        first, then (for UInt's binary form) odd, with the constructor's
+        argument recovered arithmetically."""
+        kind = self.num_ctors[cast(ir.PatCon, arms[0].pattern).ctor][0]
+        by_op: Dict[str, ir.MatchArm] = {}
+        for arm in arms:
+            pat = arm.pattern
+            if not isinstance(pat, ir.PatCon) or pat.ctor not in self.num_ctors:
+                raise CompileError(None, "mixed patterns in a switch on "
+                                         "a natural number")
+            by_op.setdefault(self.num_ctors[pat.ctor][1], arm)
+
+        if isinstance(subject, ir.Var):
+            n: ir.Term = subject
+            wrap = None
+        else:
+            wrap = self.fresh("n")
+            n = ir.Var(wrap)
+
+        def num_arm(op: str, field: Optional[ir.Term] = None) -> ir.Term:
+            found = by_op.get(op)
+            if found is None:
+                return ir.Panic("non-exhaustive match", loc=loc)
+            binds = cast(ir.PatCon, found.pattern).binds
+            if binds and field is not None:
+                return ir.Let(binds[0], field, found.body)
+            return found.body
+
+        if kind == "uint":
+            half = ir.Prim("half", [n], "uint")
+            nonzero: ir.Term = ir.If(
+                ir.Prim("is_odd", [n]),
+                num_arm("inc_dub", half),
+                num_arm("dub_inc", ir.Prim("pred", [half], "uint")),
+            )
+        else:
+            # `suc(p)` of the UInt view holds a UInt.
+            field_kind = "nat" if kind == "nat" else "uint"
+            nonzero = num_arm("suc", ir.Prim("pred", [n], field_kind))
+        result: ir.Term = ir.If(ir.Prim("is_zero", [n]), num_arm("zero"), nonzero)
+        if wrap is not None:
+            result = ir.Let(wrap, subject, result)
+        return result
+
     # ---- helpers -----------------------------------------------------
 
     def _resolve(self, v: ast.VarRef) -> str:
@@ -601,8 +977,10 @@ def subst_vars(t: ir.Term, sub: Dict[str, str]) -> ir.Term:
                 if name in blocked:
                     return t
                 return ir.Var(sub.get(name, name))
-            case ir.Bool(_) | ir.Int(_):
+            case ir.Bool(_) | ir.Int(_) | ir.Num(_, _):
                 return t
+            case ir.Prim(op, args, kind):
+                return ir.Prim(op, [go(a, blocked) for a in args], kind)
             case ir.Lam(params, body):
                 inner = blocked | set(params)
                 return ir.Lam(params, go(body, inner))
@@ -633,8 +1011,8 @@ def subst_vars(t: ir.Term, sub: Dict[str, str]) -> ir.Term:
                 return t
             case ir.MakeArray(s, loc):
                 return ir.MakeArray(go(s, blocked), loc=loc)
-            case ir.ArrayGet(s, i, loc):
-                return ir.ArrayGet(go(s, blocked), go(i, blocked), loc=loc)
+            case ir.ArrayGet() | ir.ArraySet() | ir.ArrayLength():
+                return ir.map_subterms(t, lambda c: go(c, blocked))
         raise AssertionError(f"subst_vars: unknown {type(t).__name__}")
 
     return go(t, set())
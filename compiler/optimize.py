@@ -0,0 +1,475 @@
+"""Simplify an IR program before emission.
+
+Runs between closure conversion and the tail-call pass, controlled by
+the `-O` level of `deduce.py`:
+
+- `-O0`: nothing.
+- `-O1`: the local passes below, repeated until the program stops
+  changing (at most `ROUNDS` times).
+- `-O2` (the default): `-O1`, with `inline` run first in each round.
+
+The passes, each followed by `ir.verify`:
+
+- `inline` replaces a direct or known call of a small non-recursive
+  function (at most `INLINE_SIZE` nodes) by its body. The arguments
+  (and, for a lifted lambda, the captured values) are let-bound to
+  the parameters and every binder of the copy is renamed, so names
+  stay unique.
+- `known_cases` selects the arm of a `match` whose subject is a
+  constructor application, a variable let-bound to one, or the
+  subject of an enclosing arm; and the arm of a `match` on a
+  constant `bool`.
+- `fold_constants` evaluates `if` on a constant, `=` on constants
+  (or a variable and itself), and numeric primitives on constants.
+  Arithmetic whose result would overflow the runtime's numbers is
+  left for the runtime to report.
+- `float_lets` moves a `let` out of the right-hand side of another
+  `let`, out of the subject of a `match` or the condition of an `if`,
+  and out of the first operand of a call or constructor that is not
+  a variable or a constant, exposing the value underneath to the
+  other passes.
+- `drop_dead_lets` substitutes lets of variables and constants,
+  removes lets whose name is unused and whose right-hand side cannot
+  fail or have an effect, and turns `let x = e; x` into `e`.
+
+None of the passes changes the order in which effects (array writes,
+panics) happen. Top-level declarations are only rewritten, never
+added or removed; dropping functions that are no longer called is
+the pruner's job.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from compiler import ir
+
+# Functions with at most this many IR nodes are inlined at -O2.
+INLINE_SIZE = 16
+
+# Rounds of the pass pipeline. Inlining exposes more work for the
+# local passes, which can make more functions small enough to inline.
+ROUNDS = 4
+
+# Mirrors `DEDUCE_NUM_MAX` of the runtime on 64-bit targets.
+NUM_MAX = (1 << 61) - 1
+
+Pass = Callable[[ir.Program], ir.Program]
+
+
+def optimize(p: ir.Program, level: int = 2) -> ir.Program:
+    if level <= 0:
+        return p
+    passes: List[Pass] = [known_cases, fold_constants, float_lets,
+                          drop_dead_lets]
+    if level >= 2:
+        passes.insert(0, inline)
+    for _ in range(ROUNDS):
+        before = p.decls
+        for run in passes:
+            p = run(p)
+            ir.verify(p)
+        if p.decls == before:
+            break
+    return p
+
+
+def _map_bodies(p: ir.Program, f: Callable[[ir.Term], ir.Term]) -> ir.Program:
+    """`p` with `f` applied to the body of every function and global
+    and to every statement's terms."""
+    new_decls: List[ir.TopLevel] = []
+    for d in p.decls:
+        match d:
+            case ir.Function() | ir.Global():
+                d = dataclasses.replace(d, body=f(d.body))
+            case ir.Print(t):
+                d = ir.Print(f(t))
+            case ir.AssertEq(l, r):
+                d = ir.AssertEq(f(l), f(r))
+            case ir.AssertBool(t):
+                d = ir.AssertBool(f(t))
+        new_decls.append(d)
+    return dataclasses.replace(p, decls=new_decls)
+
+
+def _bodies(p: ir.Program) -> Iterator[ir.Term]:
+    """The terms `_map_bodies` rewrites."""
+    for d in p.decls:
+        match d:
+            case ir.Function() | ir.Global():
+                yield d.body
+            case ir.Print(t) | ir.AssertBool(t):
+                yield t
+            case ir.AssertEq(l, r):
+                yield l
+                yield r
+
+
+def _bottom_up(t: ir.Term, f: Callable[[ir.Term], ir.Term]) -> ir.Term:
+    return f(ir.map_subterms(t, lambda s: _bottom_up(s, f)))
+
+
+def _size(t: ir.Term) -> int:
+    return 1 + sum(_size(s) for s in ir.subterms(t))
+
+
+def _is_const(t: ir.Term) -> bool:
+    return isinstance(t, (ir.Bool, ir.Int, ir.Num)) \
+        or isinstance(t, ir.Con) and not t.args
+
+
+def _is_trivial(t: ir.Term) -> bool:
+    """Variables and constants: free to duplicate."""
+    return isinstance(t, ir.Var) or _is_const(t)
+
+
+# Primitives that cannot panic on numbers: everything but the ones
+# that can overflow.
+_TOTAL_PRIMS = frozenset(ir.NUM_TESTS) | {
+    "pred", "half", "log", "cast", "sub", "div", "mod", "max", "min",
+    "dist",
+}
+
+
+def _is_pure(t: ir.Term) -> bool:
+    """Evaluating `t` has no effect and cannot fail, so it can be
+    dropped when its value is unused."""
+    match t:
+        case ir.Var(_) | ir.Bool(_) | ir.Int(_) | ir.Num(_, _) \
+                | ir.Lam(_, _):
+            return True
+        case ir.Con(_, args) | ir.MkClosure(_, args):
+            return all(_is_pure(a) for a in args)
+        case ir.Prim(op, args, _):
+            return op in _TOTAL_PRIMS and all(_is_pure(a) for a in args)
+        case ir.Eq() | ir.ArrayLength() | ir.Let() | ir.If():
+            return all(_is_pure(s) for s in ir.subterms(t))
+    return False
+
+
+def _subst(t: ir.Term, sub: Dict[str, ir.Term]) -> ir.Term:
+    """Replace free occurrences of the names in `sub`. Names are unique,
+    so no binder inside `t` can capture or shadow them."""
+    if isinstance(t, ir.Var):
+        return sub.get(t.name, t)
+    return ir.map_subterms(t, lambda s: _subst(s, sub))
+
+
+# ---------- inline ----------
+
+_COPY_SUFFIX = re.compile(r"(.+)\$(\d+)")
+
+
+class _Renamer:
+    """Fresh local names: an existing name (without the suffix of an
+    earlier copy) and `$<n>`, numbered after every such name already
+    in `p`."""
+
+    def __init__(self, p: ir.Program) -> None:
+        self.count = 0
+
+        def scan(t: ir.Term) -> None:
+            names: List[str] = []
+            match t:
+                case ir.Let(name, _, _):
+                    names = [name]
+                case ir.Lam(params, _):
+                    names = params
+                case ir.Match(_, arms, _):
+                    names = [x for arm in arms
+                             if isinstance(arm.pattern, ir.PatCon)
+                             for x in arm.pattern.binds]
+            for x in names:
+                m = _COPY_SUFFIX.fullmatch(x)
+                if m:
+                    self.count = max(self.count, int(m.group(2)))
+            for s in ir.subterms(t):
+                scan(s)
+
+        for t in _bodies(p):
+            scan(t)
+
+    def fresh(self, name: str) -> str:
+        self.count += 1
+        m = _COPY_SUFFIX.fullmatch(name)
+        return f"{m.group(1) if m else name}${self.count}"
+
+    def copy(self, t: ir.Term, names: Dict[str, str]) -> ir.Term:
+        """`t` with every binder renamed and variables renamed after
+        `names`, which it extends."""
+        match t:
+            case ir.Var(n):
+                return ir.Var(names.get(n, n))
+            case ir.Let(name, rhs, body):
+                rhs = self.copy(rhs, names)
+                names[name] = self.fresh(name)
+                return ir.Let(names[name], rhs, self.copy(body, names))
+            case ir.Lam(params, body):
+                for x in params:
+                    names[x] = self.fresh(x)
+                return ir.Lam([names[x] for x in params],
+                              self.copy(body, names))
+            case ir.Match(subj, arms, loc):
+                new_arms = []
+                for arm in arms:
+                    pat = arm.pattern
+                    if isinstance(pat, ir.PatCon):
+                        for x in pat.binds:
+                            names[x] = self.fresh(x)
+                        pat = ir.PatCon(pat.ctor, [names[x] for x in pat.binds])
+                    new_arms.append(ir.MatchArm(pat, self.copy(arm.body, names)))
+                return ir.Match(self.copy(subj, names), new_arms, loc)
+        return ir.map_subterms(t, lambda s: self.copy(s, names))
+
+
+def _recursive(funcs: Dict[str, ir.Function]) -> Set[str]:
+    """The functions that can reach themselves through references
+    (calls, or closures passed around) to functions in `funcs`."""
+    refs: Dict[str, Set[str]] = {}
+    for name, f in funcs.items():
+        out: Set[str] = set()
+
+        def walk(t: ir.Term) -> None:
+            if isinstance(t, ir.Var) and t.name in funcs:
+                out.add(t.name)
+            elif isinstance(t, ir.MkClosure) and t.fn_name in funcs:
+                out.add(t.fn_name)
+            for s in ir.subterms(t):
+                walk(s)
+
+        walk(f.body)
+        refs[name] = out
+
+    recursive: Set[str] = set()
+    for name in funcs:
+        seen: Set[str] = set()
+        work = list(refs[name])
+        while work:
+            n = work.pop()
+            if n == name:
+                recursive.add(name)
+                break
+            if n not in seen:
+                seen.add(n)
+                work.extend(refs[n])
+    return recursive
+
+
+def inline(p: ir.Program) -> ir.Program:
+    funcs = {d.name: d for d in p.decls if isinstance(d, ir.Function)}
+    recursive = _recursive(funcs)
+    small = {
+        name: f for name, f in funcs.items()
+        if name not in recursive and _size(f.body) <= INLINE_SIZE
+    }
+    renamer = _Renamer(p)
+
+    def expand(f: ir.Function, values: List[ir.Term]) -> ir.Term:
+        names: Dict[str, str] = {}
+        binders = [*f.captures, *f.params]
+        for x in binders:
+            names[x] = renamer.fresh(x)
+        body = renamer.copy(f.body, names)
+        for x, v in reversed(list(zip(binders, values))):
+            body = ir.Let(names[x], v, body)
+        return body
+
+    def rewrite(t: ir.Term) -> ir.Term:
+        match t:
+            case ir.App(ir.Var(fn), args) if fn in small:
+                f = small[fn]
+                if not f.captures and len(f.params) == len(args):
+                    return expand(f, args)
+            case ir.App(ir.MkClosure(fn, caps), args) if fn in small:
+                f = small[fn]
+                if len(f.captures) == len(caps) \
+                        and len(f.params) == len(args):
+                    return expand(f, [*caps, *args])
+        return t
+
+    return _map_bodies(p, lambda t: _bottom_up(t, rewrite))
+
+
+# ---------- known_cases ----------
+
+def _select(arms: List[ir.MatchArm], subject: ir.Term) -> Optional[ir.Term]:
+    """The body of the arm `subject` (a constructor application or a
+    constant `bool`) takes, with the arm's binders let-bound to the
+    constructor's arguments; None if no arm matches."""
+    for arm in arms:
+        pat = arm.pattern
+        if isinstance(pat, ir.PatBool) and isinstance(subject, ir.Bool) \
+                and pat.value == subject.value:
+            return arm.body
+        if isinstance(pat, ir.PatCon) and isinstance(subject, ir.Con) \
+                and pat.ctor == subject.ctor \
+                and len(pat.binds) == len(subject.args):
+            body = arm.body
+            for x, a in reversed(list(zip(pat.binds, subject.args))):
+                body = ir.Let(x, a, body)
+            return body
+    return None
+
+
+def _scrutinized(t: ir.Term, name: str) -> bool:
+    if isinstance(t, ir.Match) and t.subject == ir.Var(name):
+        return True
+    return any(_scrutinized(s, name) for s in ir.subterms(t))
+
+
+def known_cases(p: ir.Program) -> ir.Program:
+    renamer = _Renamer(p)
+
+    def go(t: ir.Term, known: Dict[str, ir.Con]) -> ir.Term:
+        match t:
+            case ir.Let(name, rhs, body):
+                rhs = go(rhs, known)
+                if isinstance(rhs, ir.Con) \
+                        and not all(map(_is_trivial, rhs.args)) \
+                        and _scrutinized(body, name):
+                    # Name the arguments so the matches can use them.
+                    lets = [(renamer.fresh(name), a) for a in rhs.args]
+                    out: ir.Term = ir.Let(name, ir.Con(
+                        rhs.ctor, [ir.Var(x) for x, _ in lets]), body)
+                    for x, a in reversed(lets):
+                        out = ir.Let(x, a, out)
+                    return go(out, known)
+                if isinstance(rhs, ir.Con) and all(map(_is_trivial, rhs.args)):
+                    known = {**known, name: rhs}
+                return ir.Let(name, rhs, go(body, known))
+            case ir.Match(subj, arms, loc):
+                subj = go(subj, known)
+                shape: ir.Term = subj
+                if isinstance(subj, ir.Var) and subj.name in known:
+                    shape = known[subj.name]
+                if isinstance(shape, (ir.Con, ir.Bool)):
+                    chosen = _select(arms, shape)
+                    if chosen is not None:
+                        return go(chosen, known)
+                new_arms = []
+                for arm in arms:
+                    inner = known
+                    if isinstance(subj, ir.Var) \
+                            and isinstance(arm.pattern, ir.PatCon):
+                        inner = {**known, subj.name: ir.Con(
+                            arm.pattern.ctor,
+                            [ir.Var(x) for x in arm.pattern.binds],
+                        )}
+                    new_arms.append(ir.MatchArm(arm.pattern,
+                                                go(arm.body, inner)))
+                return ir.Match(subj, new_arms, loc)
+        return ir.map_subterms(t, lambda s: go(s, known))
+
+    return _map_bodies(p, lambda t: go(t, {}))
+
+
+# ---------- fold_constants ----------
+
+_FOLD_OPS: Dict[str, Callable[..., "int | bool"]] = {
+    "suc": lambda x: x + 1,
+    "pred": lambda x: max(x - 1, 0),
+    "dub": lambda x: 2 * x,
+    "dub_inc": lambda x: 2 * x + 2,
+    "inc_dub": lambda x: 2 * x + 1,
+    "half": lambda x: x // 2,
+    "log": lambda x: max(x.bit_length() - 1, 0),
+    "cast": lambda x: x,
+    "add": lambda x, y: x + y,
+    "sub": lambda x, y: max(x - y, 0),
+    "mul": lambda x, y: x * y,
+    "div": lambda x, y: x // y if y else 0,
+    "mod": lambda x, y: x % y if y else x,
+    "max": max,
+    "min": min,
+    "dist": lambda x, y: abs(x - y),
+    "is_zero": lambda x: x == 0,
+    "is_odd": lambda x: x % 2 == 1,
+    "eq": lambda x, y: x == y,
+    "le": lambda x, y: x <= y,
+    "lt": lambda x, y: x < y,
+}
+
+
+def _fold(t: ir.Term) -> ir.Term:
+    match t:
+        case ir.If(ir.Bool(b), th, el):
+            return th if b else el
+        case ir.If(c, ir.Bool(True), ir.Bool(False)):
+            return c
+        case ir.Eq(ir.Var(x), ir.Var(y)) if x == y:
+            return ir.Bool(True)
+        case ir.Eq(l, r) if _is_const(l) and _is_const(r):
+            if type(l) is type(r) and not (
+                    isinstance(l, ir.Num) and isinstance(r, ir.Num)
+                    and l.kind != r.kind):
+                return ir.Bool(l == r)
+        case ir.Prim(op, args, kind) if op in _FOLD_OPS \
+                and all(isinstance(a, ir.Num) for a in args):
+            out = _FOLD_OPS[op](*(a.value for a in args
+                                  if isinstance(a, ir.Num)))
+            if kind is None:
+                return ir.Bool(bool(out))
+            if out <= NUM_MAX:
+                return ir.Num(kind, int(out))
+    return t
+
+
+def fold_constants(p: ir.Program) -> ir.Program:
+    return _map_bodies(p, lambda t: _bottom_up(t, _fold))
+
+
+# ---------- float_lets ----------
+
+def _float(t: ir.Term) -> ir.Term:
+    match t:
+        case ir.Let(x, ir.Let(y, r, b), body):
+            return ir.Let(y, r, _float(ir.Let(x, b, body)))
+        case ir.Match(ir.Let(y, r, b), arms, loc):
+            return ir.Let(y, r, _float(ir.Match(b, arms, loc)))
+        case ir.If(ir.Let(y, r, b), th, el):
+            return ir.Let(y, r, _float(ir.If(b, th, el)))
+        case ir.App() | ir.Con() | ir.Prim() | ir.Eq() | ir.MkClosure():
+            # Out of the first operand that is not a variable or a
+            # constant, which is evaluated before the others.
+            for s in ir.subterms(t):
+                if isinstance(s, ir.Let):
+                    inner = ir.map_subterms(t, lambda c: c.body if c is s else c)
+                    return ir.Let(s.name, s.rhs, _float(inner))
+                if not _is_trivial(s):
+                    break
+    return t
+
+
+def float_lets(p: ir.Program) -> ir.Program:
+    return _map_bodies(p, lambda t: _bottom_up(t, _float))
+
+
+# ---------- drop_dead_lets ----------
+
+def _uses(t: ir.Term, out: Dict[str, int]) -> Dict[str, int]:
+    if isinstance(t, ir.Var):
+        out[t.name] = out.get(t.name, 0) + 1
+    for s in ir.subterms(t):
+        _uses(s, out)
+    return out
+
+
+def drop_dead_lets(p: ir.Program) -> ir.Program:
+    def clean(t: ir.Term) -> ir.Term:
+        uses = _uses(t, {})
+
+        def go(t: ir.Term) -> ir.Term:
+            if isinstance(t, ir.Let):
+                if _is_trivial(t.rhs):
+                    return go(_subst(t.body, {t.name: t.rhs}))
+                if uses.get(t.name, 0) == 0 and _is_pure(t.rhs):
+                    return go(t.body)
+                if t.body == ir.Var(t.name):
+                    return go(t.rhs)
+            return ir.map_subterms(t, go)
+
+        return go(t)
+
+    return _map_bodies(p, clean)
@@ -105,8 +105,11 @@ def _referenced(t: ir.Term) -> Set[str]:
         match t:
             case ir.Var(n):
                 out.add(n)
-            case ir.Bool(_) | ir.Int(_):
+            case ir.Bool(_) | ir.Int(_) | ir.Num(_, _):
                 pass
+            case ir.Prim(_, args, _):
+                for a in args:
+                    walk(a)
             case ir.Lam(_, body):
                 walk(body)
             case ir.MkClosure(fn, caps):
@@ -141,9 +144,17 @@ def _referenced(t: ir.Term) -> Set[str]:
                 pass
             case ir.MakeArray(s, _):
                 walk(s)
-            case ir.ArrayGet(s, i, _):
-                walk(s)
-                walk(i)
+            case ir.ArrayGet() | ir.ArraySet() | ir.ArrayLength():
+                for c in ir.subterms(t):
+                    walk(c)
+            case ir.TailCall(fn, args):
+                out.add(fn)
+                for a in args:
+                    walk(a)
+            case ir.TailCon(ctor, args, _):
+                out.add(ctor)
+                for a in args:
+                    walk(a)
 
     walk(t)
     return out
@@ -6,8 +6,17 @@
 #include <stdlib.h>
 #include <string.h>
 
+#ifndef DEDUCE_GC_MIN_HEAP
+#define DEDUCE_GC_MIN_HEAP (8u << 20)
+#endif
+
 struct deduce_obj {
     deduce_tag tag;
+    bool marked;
+    /* Next object in the collector's list of heap objects. */
+    struct deduce_obj* gc_next;
+    /* Bytes of this allocation, header plus trailing fields. */
+    size_t gc_size;
     union {
         bool b;
         int64_t i;
@@ -15,8 +24,9 @@ struct deduce_obj {
             int id;
             const char* name;   /* statically-allocated, do not free */
             int n_fields;
-            /* fields[] is allocated separately to avoid mixing
-             * flexible arrays with a union. */
+            /* Points just past the header: a constructor, closure or
+             * array is a single allocation, so the collector frees it
+             * with one `free`. */
             deduce_value* fields;
         } ctor;
         struct {
@@ -33,23 +43,20 @@ struct deduce_obj {
     } u;
 };
 
+/* The tag of any value, unboxed naturals included. */
+static deduce_tag tag_of(deduce_value v) {
+    return deduce_is_num(v) ? D_NUM : v->tag;
+}
+
 /* Total allocations performed by the program. Reported at exit when
  * DEDUCE_TRACE_ALLOC=1 is in the environment. */
 static long long deduce_alloc_count = 0;
-static int deduce_trace_alloc_enabled = -1;  /* -1 = uninspected */
 
 static void deduce_alloc_atexit(void) {
     fprintf(stderr, "deduce: %lld allocations\n", deduce_alloc_count);
 }
 
 void* deduce_alloc(size_t size) {
-    if (deduce_trace_alloc_enabled == -1) {
-        const char* env = getenv("DEDUCE_TRACE_ALLOC");
-        deduce_trace_alloc_enabled = (env && env[0] == '1') ? 1 : 0;
-        if (deduce_trace_alloc_enabled) {
-            atexit(deduce_alloc_atexit);
-        }
-    }
     deduce_alloc_count++;
     void* p = calloc(1, size);
     if (!p) {
@@ -59,33 +66,178 @@ void* deduce_alloc(size_t size) {
     return p;
 }
 
+/* --- garbage collection ---------------------------------------------- */
+
+struct deduce_frame* deduce_gc_frames = NULL;
+
+static struct deduce_obj* gc_heap = NULL;      /* every live-or-garbage object */
+static size_t gc_heap_bytes = 0;               /* bytes in gc_heap */
+static size_t gc_since_collect = 0;            /* bytes allocated since */
+static size_t gc_threshold = DEDUCE_GC_MIN_HEAP;
+
+static deduce_value** gc_globals = NULL;
+static int gc_n_globals = 0, gc_cap_globals = 0;
+
+/* Explicit mark stack: a long list would overflow the C stack if
+ * marking recursed. */
+static deduce_value* gc_stack = NULL;
+static size_t gc_stack_len = 0, gc_stack_cap = 0;
+
+static long long gc_collections = 0;
+static long long gc_objects = 0, gc_freed = 0;
+static long long gc_live_objects = 0, gc_peak_objects = 0;
+static size_t gc_peak_bytes = 0;
+
+void deduce_gc_add_root(deduce_value* slot) {
+    if (gc_n_globals == gc_cap_globals) {
+        gc_cap_globals = gc_cap_globals ? 2 * gc_cap_globals : 64;
+        gc_globals = realloc(gc_globals,
+                             sizeof(deduce_value*) * (size_t)gc_cap_globals);
+        if (!gc_globals) deduce_panic("out of memory");
+    }
+    gc_globals[gc_n_globals++] = slot;
+}
+
+static void gc_push(deduce_value v) {
+    if (v == NULL || deduce_is_num(v) || v->marked) return;
+    v->marked = true;
+    if (gc_stack_len == gc_stack_cap) {
+        gc_stack_cap = gc_stack_cap ? 2 * gc_stack_cap : 1024;
+        gc_stack = realloc(gc_stack, sizeof(deduce_value) * gc_stack_cap);
+        if (!gc_stack) deduce_panic("out of memory");
+    }
+    gc_stack[gc_stack_len++] = v;
+}
+
+static void gc_mark(void) {
+    for (int i = 0; i < gc_n_globals; ++i) gc_push(*gc_globals[i]);
+    for (struct deduce_frame* f = deduce_gc_frames; f; f = f->prev) {
+        for (int i = 0; i < f->n_roots; ++i) gc_push(*f->roots[i]);
+    }
+    while (gc_stack_len > 0) {
+        deduce_value v = gc_stack[--gc_stack_len];
+        switch (v->tag) {
+            case D_CTOR:
+                for (int i = 0; i < v->u.ctor.n_fields; ++i)
+                    gc_push(v->u.ctor.fields[i]);
+                break;
+            case D_CLOSURE:
+                for (int i = 0; i < v->u.closure.n_env; ++i)
+                    gc_push(v->u.closure.env[i]);
+                break;
+            case D_ARRAY:
+                for (int i = 0; i < v->u.array.n; ++i)
+                    gc_push(v->u.array.elements[i]);
+                break;
+            case D_BOOL:
+            case D_INT:
+            case D_NUM:
+                break;
+        }
+    }
+}
+
+static void gc_sweep(void) {
+    struct deduce_obj** link = &gc_heap;
+    while (*link) {
+        struct deduce_obj* v = *link;
+        if (v->marked) {
+            v->marked = false;
+            link = &v->gc_next;
+        } else {
+            *link = v->gc_next;
+            gc_heap_bytes -= v->gc_size;
+            gc_live_objects--;
+            gc_freed++;
+            free(v);
+        }
+    }
+}
+
+void deduce_gc_collect(void) {
+    gc_collections++;
+    gc_mark();
+    gc_sweep();
+    gc_since_collect = 0;
+    /* Let the heap double before the next collection, so the cost of
+     * marking stays proportional to what was allocated. */
+    gc_threshold = gc_heap_bytes > DEDUCE_GC_MIN_HEAP
+        ? gc_heap_bytes : DEDUCE_GC_MIN_HEAP;
+}
+
+/* Allocate a traced object with `n_values` trailing value slots. */
+static deduce_value gc_new(deduce_tag tag, int n_values) {
+    size_t size = sizeof(struct deduce_obj)
+        + sizeof(deduce_value) * (size_t)n_values;
+#ifdef DEDUCE_GC_STRESS
+    deduce_gc_collect();
+#else
+    if (gc_since_collect + size > gc_threshold) deduce_gc_collect();
+#endif
+    deduce_value v = deduce_alloc(size);
+    v->tag = tag;
+    v->gc_size = size;
+    v->gc_next = gc_heap;
+    gc_heap = v;
+    gc_heap_bytes += size;
+    gc_since_collect += size;
+    gc_objects++;
+    gc_live_objects++;
+    if (gc_live_objects > gc_peak_objects) gc_peak_objects = gc_live_objects;
+    if (gc_heap_bytes > gc_peak_bytes) gc_peak_bytes = gc_heap_bytes;
+    return v;
+}
+
+static deduce_value* gc_trailing(deduce_value v) {
+    return (deduce_value*)(v + 1);
+}
+
+static void gc_stats_atexit(void) {
+    fprintf(stderr,
+            "deduce: gc: %lld collections, %lld objects allocated, "
+            "%lld freed, peak %lld objects (%zu bytes)\n",
+            gc_collections, gc_objects, gc_freed,
+            gc_peak_objects, gc_peak_bytes);
+}
+
 /* Bool values are interned: every `deduce_make_bool(true)` returns
  * the same pointer, every `deduce_make_bool(false)` returns the
  * other. Lifts the bool case of constructor unboxing into the
- * runtime so the codegen doesn't have to special-case it. */
-static struct deduce_obj BOOL_TRUE  = { D_BOOL, { .b = true } };
-static struct deduce_obj BOOL_FALSE = { D_BOOL, { .b = false } };
+ * runtime so the codegen doesn't have to special-case it. They are
+ * permanently marked, so the collector never visits them. */
+static struct deduce_obj BOOL_TRUE  = { .tag = D_BOOL, .marked = true, .u = { .b = true } };
+static struct deduce_obj BOOL_FALSE = { .tag = D_BOOL, .marked = true, .u = { .b = false } };
 
 deduce_value deduce_make_bool(bool b) {
     return b ? &BOOL_TRUE : &BOOL_FALSE;
 }
 
 deduce_value deduce_make_int(int64_t i) {
-    deduce_value v = deduce_alloc(sizeof(struct deduce_obj));
-    v->tag = D_INT;
+    deduce_value v = gc_new(D_INT, 0);
     v->u.i = i;
     return v;
 }
 
+const char deduce_name_empty[] = "empty";
+const char deduce_name_node[] = "node";
+const char deduce_name_zero[] = "zero";
+const char deduce_name_suc[] = "suc";
+const char deduce_name_bzero[] = "bzero";
+const char deduce_name_dub_inc[] = "dub_inc";
+const char deduce_name_inc_dub[] = "inc_dub";
+const char deduce_name_lit[] = "lit";
+const char deduce_name_fromNat[] = "fromNat";
+const char deduce_name_pos[] = "pos";
+const char deduce_name_negsuc[] = "negsuc";
+
 deduce_value deduce_make_ctor(int ctor_id, const char* name,
                               int n_fields, deduce_value* fields) {
-    deduce_value v = deduce_alloc(sizeof(struct deduce_obj));
-    v->tag = D_CTOR;
+    deduce_value v = gc_new(D_CTOR, n_fields);
     v->u.ctor.id = ctor_id;
     v->u.ctor.name = name;
     v->u.ctor.n_fields = n_fields;
     if (n_fields > 0) {
-        v->u.ctor.fields = deduce_alloc(sizeof(deduce_value) * (size_t)n_fields);
+        v->u.ctor.fields = gc_trailing(v);
         memcpy(v->u.ctor.fields, fields, sizeof(deduce_value) * (size_t)n_fields);
     } else {
         v->u.ctor.fields = NULL;
@@ -96,14 +248,13 @@ deduce_value deduce_make_ctor(int ctor_id, const char* name,
 deduce_value deduce_make_closure(deduce_value (*fn)(deduce_value*, deduce_value*),
                                  const char* name, int arity,
                                  int n_env, deduce_value* env_vals) {
-    deduce_value v = deduce_alloc(sizeof(struct deduce_obj));
-    v->tag = D_CLOSURE;
+    deduce_value v = gc_new(D_CLOSURE, n_env);
     v->u.closure.fn = fn;
     v->u.closure.name = name;
     v->u.closure.arity = arity;
     v->u.closure.n_env = n_env;
     if (n_env > 0) {
-        v->u.closure.env = deduce_alloc(sizeof(deduce_value) * (size_t)n_env);
+        v->u.closure.env = gc_trailing(v);
         memcpy(v->u.closure.env, env_vals, sizeof(deduce_value) * (size_t)n_env);
     } else {
         v->u.closure.env = NULL;
@@ -112,32 +263,38 @@ deduce_value deduce_make_closure(deduce_value (*fn)(deduce_value*, deduce_value*
 }
 
 deduce_tag deduce_tag_of(deduce_value v) {
-    return v->tag;
+    return tag_of(v);
 }
 
 bool deduce_get_bool(deduce_value v) {
-    if (v->tag != D_BOOL) deduce_panic("expected bool");
+    if (tag_of(v) != D_BOOL) deduce_panic("expected bool");
     return v->u.b;
 }
 
 int64_t deduce_get_int(deduce_value v) {
-    if (v->tag != D_INT) deduce_panic("expected int");
+    if (tag_of(v) != D_INT) deduce_panic("expected int");
     return v->u.i;
 }
 
 int deduce_ctor_id(deduce_value v) {
-    if (v->tag != D_CTOR) deduce_panic("expected constructor");
+    if (tag_of(v) != D_CTOR) deduce_panic("expected constructor");
     return v->u.ctor.id;
 }
 
 deduce_value deduce_ctor_field(deduce_value v, int i) {
-    if (v->tag != D_CTOR) deduce_panic("expected constructor");
+    if (tag_of(v) != D_CTOR) deduce_panic("expected constructor");
     if (i < 0 || i >= v->u.ctor.n_fields) deduce_panic("ctor field out of range");
     return v->u.ctor.fields[i];
 }
 
+deduce_value* deduce_ctor_slot(deduce_value v, int i) {
+    if (tag_of(v) != D_CTOR) deduce_panic("expected constructor");
+    if (i < 0 || i >= v->u.ctor.n_fields) deduce_panic("ctor field out of range");
+    return &v->u.ctor.fields[i];
+}
+
 deduce_value deduce_call(deduce_value clo, int n_args, deduce_value* args) {
-    if (clo->tag != D_CLOSURE) deduce_panic("call: not a function");
+    if (tag_of(clo) != D_CLOSURE) deduce_panic("call: not a function");
     if (clo->u.closure.arity != n_args) deduce_panic("call: arity mismatch");
     return clo->u.closure.fn(clo->u.closure.env, args);
 }
@@ -158,11 +315,11 @@ static const char* with_loc(const char* loc, const char* msg) {
 static int list_length(deduce_value v, const char* loc) {
     int n = 0;
     while (1) {
-        if (v->tag != D_CTOR)
+        if (tag_of(v) != D_CTOR)
             deduce_panic(with_loc(loc, "array: subject is not a list"));
         const char* name = v->u.ctor.name;
-        if (strcmp(name, "empty") == 0 || strcmp(name, "[]") == 0) return n;
-        if (strcmp(name, "node") != 0)
+        if (name == deduce_name_empty) return n;
+        if (name != deduce_name_node)
             deduce_panic(with_loc(loc, "array: list constructor not empty/node"));
         if (v->u.ctor.n_fields != 2)
             deduce_panic(with_loc(loc, "array: node arity != 2"));
@@ -173,11 +330,10 @@ static int list_length(deduce_value v, const char* loc) {
 
 deduce_value deduce_make_array_from_list(deduce_value list, const char* loc) {
     int n = list_length(list, loc);
-    deduce_value v = deduce_alloc(sizeof(struct deduce_obj));
-    v->tag = D_ARRAY;
+    deduce_value v = gc_new(D_ARRAY, n);
     v->u.array.n = n;
     if (n > 0) {
-        v->u.array.elements = deduce_alloc(sizeof(deduce_value) * (size_t)n);
+        v->u.array.elements = gc_trailing(v);
         deduce_value cur = list;
         for (int i = 0; i < n; ++i) {
             v->u.array.elements[i] = cur->u.ctor.fields[0];
@@ -193,24 +349,24 @@ deduce_value deduce_make_array_from_list(deduce_value list, const char* loc) {
  * to a non-negative C int. `lit` (and any wrapper that the user may
  * have defined for literal-display purposes) is unwrapped silently. */
 static int64_t decode_index(deduce_value v) {
+    if (deduce_is_num(v)) return (int64_t)deduce_get_num(v);
     while (1) {
-        if (v->tag != D_CTOR) deduce_panic("array index is not Nat/UInt");
+        if (tag_of(v) != D_CTOR) deduce_panic("array index is not Nat/UInt");
         const char* n = v->u.ctor.name;
-        if (strcmp(n, "zero") == 0) return 0;
-        if (strcmp(n, "bzero") == 0) return 0;
-        if (strcmp(n, "suc") == 0) {
+        if (n == deduce_name_zero || n == deduce_name_bzero) return 0;
+        if (n == deduce_name_suc) {
             if (v->u.ctor.n_fields != 1) deduce_panic("suc arity != 1");
             return 1 + decode_index(v->u.ctor.fields[0]);
         }
-        if (strcmp(n, "dub_inc") == 0) {
+        if (n == deduce_name_dub_inc) {
             if (v->u.ctor.n_fields != 1) deduce_panic("dub_inc arity != 1");
             return 2 * (1 + decode_index(v->u.ctor.fields[0]));
         }
-        if (strcmp(n, "inc_dub") == 0) {
+        if (n == deduce_name_inc_dub) {
             if (v->u.ctor.n_fields != 1) deduce_panic("inc_dub arity != 1");
             return 1 + 2 * decode_index(v->u.ctor.fields[0]);
         }
-        if (strcmp(n, "lit") == 0 || strcmp(n, "fromNat") == 0) {
+        if (n == deduce_name_lit || n == deduce_name_fromNat) {
             if (v->u.ctor.n_fields != 1) deduce_panic("lit/fromNat arity != 1");
             v = v->u.ctor.fields[0];
             continue;
@@ -220,7 +376,7 @@ static int64_t decode_index(deduce_value v) {
 }
 
 deduce_value deduce_array_get(deduce_value arr, deduce_value idx, const char* loc) {
-    if (arr->tag != D_ARRAY)
+    if (tag_of(arr) != D_ARRAY)
         deduce_panic(with_loc(loc, "array get: not an array"));
     int64_t i = decode_index(idx);
     if (i < 0 || i >= arr->u.array.n)
@@ -228,10 +384,44 @@ deduce_value deduce_array_get(deduce_value arr, deduce_value idx, const char* lo
     return arr->u.array.elements[(int)i];
 }
 
+deduce_value deduce_make_array(int64_t n, deduce_value fill) {
+    if (n < 0 || n > INT32_MAX) deduce_panic("make array: bad length");
+    deduce_value v = gc_new(D_ARRAY, (int)n);
+    v->u.array.n = (int)n;
+    v->u.array.elements = n > 0 ? gc_trailing(v) : NULL;
+    for (int i = 0; i < n; ++i)
+        v->u.array.elements[i] = fill;
+    return v;
+}
+
+deduce_value deduce_array_length(deduce_value arr) {
+    if (tag_of(arr) != D_ARRAY) deduce_panic("length: not an array");
+    return DEDUCE_NUM(DEDUCE_UINT, arr->u.array.n);
+}
+
+void deduce_array_set(deduce_value arr, deduce_value idx, deduce_value val,
+                      const char* loc) {
+    if (tag_of(arr) != D_ARRAY)
+        deduce_panic(with_loc(loc, "array set: not an array"));
+    int64_t i = decode_index(idx);
+    if (i < 0 || i >= arr->u.array.n)
+        deduce_panic(with_loc(loc, "array index out of range"));
+    arr->u.array.elements[i] = val;
+}
+
+deduce_value deduce_array_get_unchecked(deduce_value arr, deduce_value idx) {
+    return arr->u.array.elements[(uintptr_t)idx >> 3];
+}
+
+void deduce_array_set_unchecked(deduce_value arr, deduce_value idx,
+                                deduce_value val) {
+    arr->u.array.elements[(uintptr_t)idx >> 3] = val;
+}
+
 bool deduce_equal(deduce_value a, deduce_value b) {
     if (a == b) return true;
-    if (a->tag != b->tag) return false;
-    switch (a->tag) {
+    if (tag_of(a) != tag_of(b)) return false;
+    switch (tag_of(a)) {
         case D_BOOL:    return a->u.b == b->u.b;
         case D_INT:     return a->u.i == b->u.i;
         case D_CTOR: {
@@ -253,6 +443,8 @@ bool deduce_equal(deduce_value a, deduce_value b) {
             return true;
         }
         case D_CLOSURE: return false;
+        /* Equal naturals are the same word. */
+        case D_NUM:     return false;
     }
     return false;
 }
@@ -270,16 +462,20 @@ bool deduce_equal(deduce_value a, deduce_value b) {
  * true on success and writes the decoded non-negative integer to *out;
  * returns false if any node in the chain fails to match the shape. */
 static bool try_decode_uint(deduce_value v, int64_t* out) {
-    if (v->tag != D_CTOR) return false;
+    if (deduce_is_num(v) && deduce_num_kind(v) == DEDUCE_UINT) {
+        *out = (int64_t)deduce_get_num(v);
+        return true;
+    }
+    if (tag_of(v) != D_CTOR) return false;
     const char* n = v->u.ctor.name;
-    if (strcmp(n, "bzero") == 0) { *out = 0; return true; }
-    if (strcmp(n, "dub_inc") == 0 && v->u.ctor.n_fields == 1) {
+    if (n == deduce_name_bzero) { *out = 0; return true; }
+    if (n == deduce_name_dub_inc && v->u.ctor.n_fields == 1) {
         int64_t inner;
         if (!try_decode_uint(v->u.ctor.fields[0], &inner)) return false;
         *out = 2 * (1 + inner);
         return true;
     }
-    if (strcmp(n, "inc_dub") == 0 && v->u.ctor.n_fields == 1) {
+    if (n == deduce_name_inc_dub && v->u.ctor.n_fields == 1) {
         int64_t inner;
         if (!try_decode_uint(v->u.ctor.fields[0], &inner)) return false;
         *out = 1 + 2 * inner;
@@ -291,14 +487,14 @@ static bool try_decode_uint(deduce_value v, int64_t* out) {
 /* Walk an Int-shaped value (`pos(<UInt>)` or `negsuc(<UInt>)`). On
  * success writes the signed value and returns true. */
 static bool try_decode_int(deduce_value v, int64_t* out) {
-    if (v->tag != D_CTOR || v->u.ctor.n_fields != 1) return false;
+    if (tag_of(v) != D_CTOR || v->u.ctor.n_fields != 1) return false;
     const char* n = v->u.ctor.name;
     int64_t mag;
-    if (strcmp(n, "pos") == 0 && try_decode_uint(v->u.ctor.fields[0], &mag)) {
+    if (n == deduce_name_pos && try_decode_uint(v->u.ctor.fields[0], &mag)) {
         *out = mag;
         return true;
     }
-    if (strcmp(n, "negsuc") == 0 && try_decode_uint(v->u.ctor.fields[0], &mag)) {
+    if (n == deduce_name_negsuc && try_decode_uint(v->u.ctor.fields[0], &mag)) {
         *out = -(mag + 1);
         return true;
     }
@@ -309,10 +505,10 @@ static bool try_decode_int(deduce_value v, int64_t* out) {
  * Used only for printing, so we don't decode — the caller walks the
  * chain itself. */
 static bool is_list_shape(deduce_value v) {
-    while (v->tag == D_CTOR) {
+    while (tag_of(v) == D_CTOR) {
         const char* n = v->u.ctor.name;
-        if (strcmp(n, "empty") == 0 && v->u.ctor.n_fields == 0) return true;
-        if (strcmp(n, "node") == 0 && v->u.ctor.n_fields == 2) {
+        if (n == deduce_name_empty && v->u.ctor.n_fields == 0) return true;
+        if (n == deduce_name_node && v->u.ctor.n_fields == 2) {
             v = v->u.ctor.fields[1];
             continue;
         }
@@ -327,7 +523,7 @@ void deduce_println(deduce_value v) {
 }
 
 void deduce_print(deduce_value v) {
-    switch (v->tag) {
+    switch (tag_of(v)) {
         case D_BOOL:
             fputs(v->u.b ? "true" : "false", stdout);
             return;
@@ -353,8 +549,8 @@ void deduce_print(deduce_value v) {
                 fputc('[', stdout);
                 deduce_value cur = v;
                 int first = 1;
-                while (cur->tag == D_CTOR
-                       && strcmp(cur->u.ctor.name, "node") == 0) {
+                while (tag_of(cur) == D_CTOR
+                       && cur->u.ctor.name == deduce_name_node) {
                     if (!first) fputs(", ", stdout);
                     first = 0;
                     deduce_print(cur->u.ctor.fields[0]);
@@ -377,6 +573,23 @@ void deduce_print(deduce_value v) {
         case D_CLOSURE:
             printf("<closure %s>", v->u.closure.name ? v->u.closure.name : "?");
             return;
+        case D_NUM: {
+            uint64_t n = deduce_get_num(v);
+            switch (deduce_num_kind(v)) {
+                case DEDUCE_NAT:
+                    for (uint64_t i = 0; i < n; ++i) fputs("suc(", stdout);
+                    fputs("zero", stdout);
+                    for (uint64_t i = 0; i < n; ++i) fputc(')', stdout);
+                    return;
+                case DEDUCE_UINT_VIEW:
+                    if (n == 0) fputs("zero", stdout);
+                    else printf("suc(%llu)", (unsigned long long)(n - 1));
+                    return;
+                default:
+                    printf("%llu", (unsigned long long)n);
+                    return;
+            }
+        }
         case D_ARRAY:
             fputs("array(", stdout);
             for (int i = 0; i < v->u.array.n; ++i) {
@@ -401,7 +614,7 @@ void deduce_assert_eq(deduce_value lhs, deduce_value rhs, const char* loc) {
 }
 
 void deduce_assert_bool(deduce_value b, const char* loc) {
-    if (b->tag != D_BOOL) {
+    if (tag_of(b) != D_BOOL) {
         printf("%s: assertion expected Boolean result\n", loc ? loc : "?");
         exit(1);
     }
@@ -420,7 +633,41 @@ deduce_value deduce_unreachable_value(const char* msg) {
     deduce_panic(msg);
 }
 
-int main(void) {
+void deduce_num_overflow(void) {
+    deduce_panic("natural number too large for the compiled runtime");
+}
+
+static uint64_t num_mul(uint64_t x, uint64_t y) {
+    if (y != 0 && x > DEDUCE_NUM_MAX / y) deduce_num_overflow();
+    return x * y;
+}
+
+deduce_value deduce_num_pow(deduce_value base, deduce_value exp, int kind) {
+    uint64_t b = deduce_get_num(base), e = deduce_get_num(exp), r = 1;
+    /* Square-and-multiply. Squaring is skipped after the last bit, so
+     * it only overflows when the result would. */
+    while (e) {
+        if (e & 1u) r = num_mul(r, b);
+        e >>= 1;
+        if (e) b = num_mul(b, b);
+    }
+    return DEDUCE_NUM(kind, r);
+}
+
+int main(int argc, char** argv) {
+    /* Checked here rather than at the first allocation, so a program
+     * that never allocates still reports its zero. */
+    const char* trace = getenv("DEDUCE_TRACE_ALLOC");
+    if (trace && trace[0] == '1') atexit(deduce_alloc_atexit);
+    for (int i = 1; i < argc; ++i) {
+        if (strcmp(argv[i], "--gc-stats") == 0) {
+            atexit(gc_stats_atexit);
+        } else {
+            fprintf(stderr, "deduce: unknown option %s\n"
+                    "usage: %s [--gc-stats]\n", argv[i], argv[0]);
+            return 2;
+        }
+    }
     deduce_program_main();
     return 0;
 }
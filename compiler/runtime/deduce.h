@@ -1,13 +1,17 @@
 /* Deduce-to-C runtime, Phase 1.
  *
- * Single uniform value representation (boxed). No GC: the runtime
- * mallocs and never frees. That's fine for short-lived test programs
- * and keeps the runtime under 200 lines. Phase 4 of the compile plan
- * is where memory management gets revisited.
+ * Single uniform value representation (boxed). Memory is managed by a
+ * precise mark-sweep collector: every heap object is linked into one
+ * list, the generated code registers each function's `deduce_value`
+ * locals on a shadow stack of frames (DEDUCE_PUSH_FRAME below) and each
+ * module's globals with `deduce_gc_add_root`, and an allocation that
+ * crosses the heap threshold marks from those roots and frees the rest.
  *
  * Every Deduce value is a `deduce_value` (an opaque pointer). The
  * concrete shape depends on the tag stored at offset 0; do not access
- * fields directly — use the helpers below.
+ * fields directly — use the helpers below. The exception is the
+ * prelude's natural numbers, which are not pointers at all (see
+ * "unboxed naturals" below).
  */
 
 #ifndef DEDUCE_RUNTIME_H
@@ -24,14 +28,76 @@ typedef enum {
     D_INT,
     D_CTOR,
     D_CLOSURE,
-    D_ARRAY
+    D_ARRAY,
+    D_NUM
 } deduce_tag;
 
 /* The actual struct shape is hidden in deduce.c. */
 
-/* Allocation. */
+/* Raw, zeroed allocation that aborts on failure. Memory from here is
+ * not traced or freed by the collector; values come from the
+ * `deduce_make_*` constructors below. */
 void* deduce_alloc(size_t size);
 
+/* --- garbage collection -------------------------------------------------
+ *
+ * A frame records the addresses of one C function's `deduce_value`
+ * locals. Generated functions declare all their locals at the top
+ * (NULL-initialised), push a frame before the first allocation and pop
+ * it before returning, so a collection can find every value a running
+ * function still holds. Values held only in C temporaries (e.g. the
+ * argument arrays passed to `deduce_make_ctor`) must also be held by a
+ * registered local, a global root, or be one of the interned bools.
+ */
+struct deduce_frame {
+    struct deduce_frame* prev;
+    int n_roots;
+    deduce_value** roots;
+};
+
+/* Innermost frame of the running program. */
+extern struct deduce_frame* deduce_gc_frames;
+
+#define DEDUCE_PUSH_FRAME(roots)                                        \
+    struct deduce_frame gc_frame = {                                    \
+        deduce_gc_frames, (int)(sizeof(roots) / sizeof((roots)[0])), roots \
+    };                                                                  \
+    deduce_gc_frames = &gc_frame
+
+#define DEDUCE_POP_FRAME() (deduce_gc_frames = gc_frame.prev)
+
+/* Register a global (or nullary-constructor singleton) as a root. Call
+ * before the first allocation that stores into it. */
+void deduce_gc_add_root(deduce_value* slot);
+
+/* Run a full collection now. Allocation triggers one automatically once
+ * the bytes allocated since the last collection exceed the live heap
+ * (at least DEDUCE_GC_MIN_HEAP, a compile-time setting of deduce.c);
+ * building deduce.c with -DDEDUCE_GC_STRESS collects before every
+ * allocation instead, which tests use to flush out missing roots. */
+void deduce_gc_collect(void);
+
+/* The constructor base names the runtime recognises by shape: lists
+ * (`empty`/`node`) for `array(...)` and printing, and the numerals
+ * decoded by `deduce_array_get` and printing. Generated code passes
+ * these, not a string literal with the same text, as the `name` of
+ * such a constructor, so the runtime tests a name by comparing
+ * pointers rather than strings. The constructor id cannot stand in:
+ * each separately compiled module numbers its constructors from 0,
+ * and any union with `empty` and `node` constructors counts as a
+ * list, as in the interpreter. */
+extern const char deduce_name_empty[];
+extern const char deduce_name_node[];
+extern const char deduce_name_zero[];
+extern const char deduce_name_suc[];
+extern const char deduce_name_bzero[];
+extern const char deduce_name_dub_inc[];
+extern const char deduce_name_inc_dub[];
+extern const char deduce_name_lit[];
+extern const char deduce_name_fromNat[];
+extern const char deduce_name_pos[];
+extern const char deduce_name_negsuc[];
+
 /* Constructors for the four value kinds. `env_vals` and `fields` are
  * copied; the caller does not need to keep the array alive. */
 deduce_value deduce_make_bool(bool b);
@@ -52,25 +118,52 @@ int64_t     deduce_get_int(deduce_value v);
 int         deduce_ctor_id(deduce_value v);
 deduce_value deduce_ctor_field(deduce_value v, int i);
 
+/* Address of field `i` of a constructor the caller has just built.
+ * Loops compiled from tail recursion modulo constructors allocate a
+ * constructor with one field left NULL and fill it in later through
+ * this pointer. */
+deduce_value* deduce_ctor_slot(deduce_value v, int i);
+
 /* Closure call: dispatches through the closure's function pointer. */
 deduce_value deduce_call(deduce_value clo, int n_args, deduce_value* args);
 
 /* `array(<list>)` — walk a `node(_, _)` … `empty` chain and pack into
- * a flat array. Dispatches by the constructor's stored base name, so
+ * a flat array. Dispatches by the constructor's base name, so
  * any union with `empty` and `node` constructors works (matches the
  * interpreter's `isNodeList` semantics). Aborts on a non-list value.
  * `loc` is a `file:line` string used in panic messages; OK to be
  * NULL. */
 deduce_value deduce_make_array_from_list(deduce_value list, const char* loc);
 
-/* `arr[idx]` — read an element. The index must be a Nat or UInt; the
- * runtime decodes by inspecting constructor base names (`zero`/`suc`
- * for Nat, `bzero`/`dub_inc`/`inc_dub` for UInt). Out-of-bounds
+/* `arr[idx]` — read an element. The index must be a Nat or UInt: an
+ * unboxed natural, or (for a user numeral) a constructor chain decoded
+ * by base name (`zero`/`suc`, `bzero`/`dub_inc`/`inc_dub`). Out-of-bounds
  * aborts; the interpreter's behaviour of leaving the term un-reduced
  * has no compiled-program analogue. `loc` is a `file:line` string
  * used in panic messages; OK to be NULL. */
 deduce_value deduce_array_get(deduce_value arr, deduce_value idx, const char* loc);
 
+/* A mutable array `[T]!` of `n` elements, each `fill`. Compiled
+ * procedures take such arrays as parameters; this is how a C caller
+ * makes one. `fill` must stay reachable from a root (or be a natural)
+ * across the call. */
+deduce_value deduce_make_array(int64_t n, deduce_value fill);
+
+/* `length(arr)`, as a UInt. */
+deduce_value deduce_array_length(deduce_value arr);
+
+/* `arr[idx] := val` — overwrite an element in place. The index must be
+ * a UInt; out-of-bounds aborts as for `deduce_array_get`. */
+void deduce_array_set(deduce_value arr, deduce_value idx, deduce_value val,
+                      const char* loc);
+
+/* Element access with no checks at all, for an access the verifier
+ * proved in bounds. `idx` must be an unboxed natural below the length
+ * of the array `arr`. */
+deduce_value deduce_array_get_unchecked(deduce_value arr, deduce_value idx);
+void deduce_array_set_unchecked(deduce_value arr, deduce_value idx,
+                                deduce_value val);
+
 /* Structural equality. Closures compare by pointer identity (the
  * surface language has no closure-equality primitive at runtime, but
  * `assert lhs = rhs` may end up comparing them anyway — pointer is the
@@ -95,7 +188,141 @@ void deduce_panic(const char* msg) __attribute__((noreturn));
  * pruner couldn't drop the surrounding code. */
 deduce_value deduce_unreachable_value(const char* msg) __attribute__((noreturn));
 
-/* Generated programs call this from main(). */
+/* --- unboxed naturals ---------------------------------------------------
+ *
+ * Values of the prelude's `Nat` and `UInt` are machine integers rather
+ * than constructor chains: the natural n of kind k is the word
+ * `(n << 3) | (k << 1) | 1`. Object pointers are aligned, so the low
+ * bit tells the two apart; the collector skips these values and
+ * `deduce_tag_of` reports D_NUM. The kind only decides how a value
+ * prints: a Nat as `suc(...(zero))`, a UInt in decimal, and UInt's
+ * `zero`/`suc` view as `zero` or `suc(<UInt>)`.
+ *
+ * The operations mirror the prelude's definitions, including its
+ * conventions for the partial ones (truncated subtraction, `pred(0) =
+ * 0`, division by zero gives 0). A result above DEDUCE_NUM_MAX panics
+ * instead of wrapping around.
+ */
+#define DEDUCE_NAT       0
+#define DEDUCE_UINT      1
+#define DEDUCE_UINT_VIEW 2
+
+#define DEDUCE_NUM_MAX ((uint64_t)(UINTPTR_MAX >> 3))
+
+/* The natural `n` of kind `kind`; `n` must be at most DEDUCE_NUM_MAX. */
+#define DEDUCE_NUM(kind, n)                                             \
+    ((deduce_value)(((uintptr_t)(n) << 3) | ((uintptr_t)(kind) << 1) | 1u))
+
+void deduce_num_overflow(void) __attribute__((noreturn));
+deduce_value deduce_num_pow(deduce_value base, deduce_value exp, int kind);
+
+static inline bool deduce_is_num(deduce_value v) {
+    return ((uintptr_t)v & 1u) != 0;
+}
+
+static inline uint64_t deduce_get_num(deduce_value v) {
+    if (!deduce_is_num(v)) deduce_panic("expected a natural number");
+    return (uint64_t)((uintptr_t)v >> 3);
+}
+
+static inline int deduce_num_kind(deduce_value v) {
+    return (int)(((uintptr_t)v >> 1) & 3u);
+}
+
+static inline deduce_value deduce_make_num(int kind, uint64_t n) {
+    if (n > DEDUCE_NUM_MAX) deduce_num_overflow();
+    return DEDUCE_NUM(kind, n);
+}
+
+/* Operands are at most DEDUCE_NUM_MAX, so sums and doublings below
+ * cannot wrap before deduce_make_num checks them. */
+static inline deduce_value deduce_num_cast(deduce_value a, int kind) {
+    return DEDUCE_NUM(kind, deduce_get_num(a));
+}
+static inline deduce_value deduce_num_suc(deduce_value a, int kind) {
+    return deduce_make_num(kind, deduce_get_num(a) + 1);
+}
+static inline deduce_value deduce_num_pred(deduce_value a, int kind) {
+    uint64_t x = deduce_get_num(a);
+    return DEDUCE_NUM(kind, x ? x - 1 : 0);
+}
+static inline deduce_value deduce_num_dub(deduce_value a, int kind) {
+    return deduce_make_num(kind, 2 * deduce_get_num(a));
+}
+static inline deduce_value deduce_num_dub_inc(deduce_value a, int kind) {
+    return deduce_make_num(kind, 2 * deduce_get_num(a) + 2);
+}
+static inline deduce_value deduce_num_inc_dub(deduce_value a, int kind) {
+    return deduce_make_num(kind, 2 * deduce_get_num(a) + 1);
+}
+static inline deduce_value deduce_num_half(deduce_value a, int kind) {
+    return DEDUCE_NUM(kind, deduce_get_num(a) / 2);
+}
+/* floor(log2(a)), and 0 for 0. */
+static inline deduce_value deduce_num_log(deduce_value a, int kind) {
+    uint64_t x = deduce_get_num(a), r = 0;
+    while (x > 1) { x >>= 1; r++; }
+    return DEDUCE_NUM(kind, r);
+}
+static inline deduce_value deduce_num_add(deduce_value a, deduce_value b,
+                                          int kind) {
+    return deduce_make_num(kind, deduce_get_num(a) + deduce_get_num(b));
+}
+static inline deduce_value deduce_num_sub(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, x > y ? x - y : 0);
+}
+static inline deduce_value deduce_num_mul(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    if (y != 0 && x > DEDUCE_NUM_MAX / y) deduce_num_overflow();
+    return DEDUCE_NUM(kind, x * y);
+}
+static inline deduce_value deduce_num_div(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, y ? x / y : 0);
+}
+static inline deduce_value deduce_num_mod(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, y ? x % y : x);
+}
+static inline deduce_value deduce_num_max(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, x > y ? x : y);
+}
+static inline deduce_value deduce_num_min(deduce_value a, deduce_value b,
+                                          int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, x < y ? x : y);
+}
+static inline deduce_value deduce_num_dist(deduce_value a, deduce_value b,
+                                           int kind) {
+    uint64_t x = deduce_get_num(a), y = deduce_get_num(b);
+    return DEDUCE_NUM(kind, x > y ? x - y : y - x);
+}
+static inline bool deduce_num_is_zero(deduce_value a) {
+    return deduce_get_num(a) == 0;
+}
+static inline bool deduce_num_is_odd(deduce_value a) {
+    return (deduce_get_num(a) & 1u) != 0;
+}
+static inline bool deduce_num_eq(deduce_value a, deduce_value b) {
+    return deduce_get_num(a) == deduce_get_num(b);
+}
+static inline bool deduce_num_le(deduce_value a, deduce_value b) {
+    return deduce_get_num(a) <= deduce_get_num(b);
+}
+static inline bool deduce_num_lt(deduce_value a, deduce_value b) {
+    return deduce_get_num(a) < deduce_get_num(b);
+}
+
+/* Generated programs call this from main(). The runtime's main()
+ * accepts one option, `--gc-stats`, which prints collector statistics
+ * to stderr at exit. */
 void deduce_program_main(void);
 
 #endif
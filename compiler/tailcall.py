@@ -0,0 +1,186 @@
+"""Turn tail calls into loops.
+
+Runs between closure conversion and emission. Every IR call used to
+become a C call, so a recursion as deep as a long list (`foldl`, `get`,
+`drop`, or `map` and `++` on their way down) overflowed the C stack.
+
+A call is in *tail position* when its value is the function's result:
+the body itself, the body of a `Let`, a branch of an `If`, an arm of a
+`Match`. A constructor application in tail position whose argument is
+a call counts as well ("tail recursion modulo constructors") as long
+as every later argument is a variable or a constant, so jumping first
+does not reorder work that could fail. `node(f(x), map(ls, f))` is the
+typical case.
+
+The pass builds the graph of such tail calls between top-level
+functions without captures, and takes its strongly connected
+components. Each component that calls back into itself -- a function
+calling itself, or a group of functions calling each other like
+`even`/`odd` -- becomes a *loop group*: its members get the same
+`Function.loop`, and their tail calls to one another become
+`ir.TailCall` (or `ir.TailCon` under a constructor). Other calls,
+including non-tail calls to the same functions, are left alone. The
+backend turns a group into one C function that jumps between its
+members, so a group runs in constant stack however deep it recurses.
+
+Closures are not followed: a lifted lambda calls itself through its
+environment, not by name.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Set
+
+from compiler import ir
+
+
+def loop_tail_calls(p: ir.Program) -> ir.Program:
+    funcs: Dict[str, ir.Function] = {
+        d.name: d for d in p.decls
+        if isinstance(d, ir.Function) and not d.captures
+    }
+    edges: Dict[str, Set[str]] = {
+        name: _tail_targets(f.body, funcs) for name, f in funcs.items()
+    }
+
+    loop_of: Dict[str, str] = {}
+    for group in _components(list(funcs), edges):
+        if len(group) == 1 and group[0] not in edges[group[0]]:
+            continue
+        for name in group:
+            loop_of[name] = group[0]
+
+    new_decls: List[ir.TopLevel] = []
+    for d in p.decls:
+        if isinstance(d, ir.Function) and d.name in loop_of:
+            members = {n for n, g in loop_of.items() if g == loop_of[d.name]}
+            d = ir.Function(
+                d.name, d.params, _rewrite(d.body, members, funcs),
+                d.captures, d.loc, d.module, loop=loop_of[d.name],
+            )
+        new_decls.append(d)
+    return ir.Program(
+        decls=new_decls,
+        name_to_module=p.name_to_module,
+        name_to_seq=p.name_to_seq,
+        main_module=p.main_module,
+        imports=p.imports,
+        import_funcs=p.import_funcs,
+        import_globals=p.import_globals,
+        import_ctors=p.import_ctors,
+    )
+
+
+def _callee(t: ir.Term, funcs: Dict[str, ir.Function]) -> "str | None":
+    """The function `t` calls directly with all its arguments, if any."""
+    if isinstance(t, ir.App) and isinstance(t.rator, ir.Var):
+        f = funcs.get(t.rator.name)
+        if f is not None and len(f.params) == len(t.args):
+            return f.name
+    return None
+
+
+def _hole(t: ir.Con, funcs: Dict[str, ir.Function]) -> "int | None":
+    """The argument of `t` that can be filled in after the constructor
+    is built: the last direct call, provided only variables and
+    constants follow it."""
+    for i in reversed(range(len(t.args))):
+        a = t.args[i]
+        if _callee(a, funcs) is not None:
+            return i
+        if not (isinstance(a, (ir.Var, ir.Bool, ir.Int, ir.Num))
+                or isinstance(a, ir.Con) and not a.args):
+            return None
+    return None
+
+
+def _tail_targets(t: ir.Term, funcs: Dict[str, ir.Function]) -> Set[str]:
+    out: Set[str] = set()
+
+    def walk(t: ir.Term) -> None:
+        match t:
+            case ir.Let(_, _, body):
+                walk(body)
+            case ir.If(_, th, el):
+                walk(th)
+                walk(el)
+            case ir.Match(_, arms, _):
+                for arm in arms:
+                    walk(arm.body)
+            case ir.Con(_, args):
+                hole = _hole(t, funcs)
+                if hole is not None:
+                    walk(args[hole])
+            case _:
+                fn = _callee(t, funcs)
+                if fn is not None:
+                    out.add(fn)
+
+    walk(t)
+    return out
+
+
+def _components(names: List[str], edges: Dict[str, Set[str]]) -> List[List[str]]:
+    """Strongly connected components (Tarjan), each in `names` order."""
+    order = {n: i for i, n in enumerate(names)}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    out: List[List[str]] = []
+
+    def visit(n: str) -> None:
+        index[n] = low[n] = len(index)
+        stack.append(n)
+        on_stack.add(n)
+        for m in sorted(edges[n], key=order.__getitem__):
+            if m not in index:
+                visit(m)
+                low[n] = min(low[n], low[m])
+            elif m in on_stack:
+                low[n] = min(low[n], index[m])
+        if low[n] == index[n]:
+            group: List[str] = []
+            while True:
+                m = stack.pop()
+                on_stack.discard(m)
+                group.append(m)
+                if m == n:
+                    break
+            out.append(sorted(group, key=order.__getitem__))
+
+    for n in names:
+        if n not in index:
+            visit(n)
+    return out
+
+
+def _rewrite(t: ir.Term, members: Set[str],
+             funcs: Dict[str, ir.Function]) -> ir.Term:
+    """`t` in tail position, with its tail calls to `members` made
+    into jumps."""
+    match t:
+        case ir.Let(name, rhs, body):
+            return ir.Let(name, rhs, _rewrite(body, members, funcs))
+        case ir.If(c, th, el):
+            return ir.If(c, _rewrite(th, members, funcs),
+                         _rewrite(el, members, funcs))
+        case ir.Match(subj, arms, loc):
+            return ir.Match(subj, [
+                ir.MatchArm(arm.pattern, _rewrite(arm.body, members, funcs))
+                for arm in arms
+            ], loc)
+        case ir.Con(ctor, args):
+            hole = _hole(t, funcs)
+            if hole is not None and _callee(args[hole], funcs) in members:
+                call = args[hole]
+                assert isinstance(call, ir.App)
+                assert isinstance(call.rator, ir.Var)
+                new_args = list(args)
+                new_args[hole] = ir.TailCall(call.rator.name, call.args)
+                return ir.TailCon(ctor, new_args, hole)
+            return t
+    if _callee(t, funcs) in members:
+        assert isinstance(t, ir.App) and isinstance(t.rator, ir.Var)
+        return ir.TailCall(t.rator.name, t.args)
+    return t
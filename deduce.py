@@ -5,12 +5,18 @@ from flags import (
     init_import_directories,
     set_check_imports,
     set_experimental_imperative,
+    set_hash_consing,
+    set_lazy_eval,
+    set_module_interfaces,
+    set_proof_jobs,
+    set_reduction_cache,
     set_quiet_mode,
     set_recursive_descent,
     set_unique_names,
     set_verbose,
 )
 from abstract_syntax import print_theorems
+from checker_cache import enable_persistent_cache
 from lsp.library import check_file
 from signal import signal, SIGINT
 import sys
@@ -65,7 +71,8 @@ def deduce_file(filename: str, error_expected: bool,
 def compile_file(filename: str, output: str, prelude: list[str],
                  no_prune: bool = False,
                  separate: bool = False,
-                 is_main: bool = True) -> None:
+                 is_main: bool = True,
+                 opt_level: int = 2) -> None:
     """Compile a checked .pf file.
 
     In monolithic mode (`separate=False`, the default): inlines every
@@ -84,9 +91,11 @@ def compile_file(filename: str, output: str, prelude: list[str],
     elimination via `-Wl,--gc-sections`). `is_main=True` (default)
     means the module emits `deduce_program_main`; pass `False` for
     library modules with no `print` statements of their own.
+
+    `opt_level` is the `-O` level of `compiler/optimize.py`.
     """
     from compiler import closure as _closure, emit_c, ir, lower
-    from compiler import prune as _prune
+    from compiler import optimize, prune as _prune, tailcall
 
     result = check_file(filename, tracing_functions=(), prelude=prelude)
     if not result.ok:
@@ -102,6 +111,9 @@ def compile_file(filename: str, output: str, prelude: list[str],
     ir.verify(program)
     program = _closure.closure_convert(program)
     ir.verify(program)
+    program = optimize.optimize(program, opt_level)
+    program = tailcall.loop_tail_calls(program)
+    ir.verify(program)
     if separate:
         c_src, h_src = emit_c.emit_module(program, is_main=is_main)
         if output == "-":
@@ -160,12 +172,26 @@ Options:
   --suppress-theorems       do not write .thm files
   --error                   expect each file to error (exit 255 if not)
   --no-check-imports        do not check proofs of imported files
+  --proof-cache <directory> reuse proof-check verdicts stored in <directory>
+                            across runs (default: $DEDUCE_PROOF_CACHE)
+  --module-interfaces       load unchanged imports from .pfi module
+                            interfaces kept in ~/.cache/deduce/interfaces
+  --no-module-interfaces    do not read or write .pfi module interfaces
+  --no-hash-cons            do not share equal Nat/UInt literal values
+  --no-reduction-cache      do not reuse reductions of repeated calls
+  --lazy                    evaluate print and assert call-by-need, printing
+                            lists one element at a time
+  -j, --jobs <n>            check the proofs of independent theorems and
+                            imported modules in <n> worker processes
+                            (default: 1)
   --color / --no-color      force or disable ANSI color output
   --compile                 compile to a self-contained C program
   --compile-module          compile as a single module (.c + .h)
   --no-main                 (with --compile-module) library module, no main
   -o <path>                 output path for --compile / --compile-module
   --no-prune                with --compile, keep all lowered declarations
+  -O0, -O1, -O2             optimization level for --compile /
+                            --compile-module (default: -O2)
   --debug                   enable the interactive debugger
 
 See gh_pages/doc/GettingStarted.md for the full reference.
@@ -201,10 +227,12 @@ if __name__ == "__main__":
     compile_target = None
     compile_output = None
     no_prune = False
+    opt_level = 2
     separate_compile = False
     is_main_module = True
     debug_enabled = False
     color_mode = 'auto'  # 'auto' | 'always' | 'never'
+    proof_cache_dir = os.environ.get('DEDUCE_PROOF_CACHE')
     init_import_directories()
 
     # TODO: Cleanup 
@@ -258,6 +286,26 @@ if __name__ == "__main__":
             exit(0)
         elif argument == '--no-check-imports':
             set_check_imports(False)
+        elif argument == '--proof-cache' and i + 1 < len(sys.argv):
+            proof_cache_dir = sys.argv[i + 1]
+            already_processed_next = True
+        elif argument == '--module-interfaces':
+            set_module_interfaces(True)
+        elif argument == '--no-module-interfaces':
+            set_module_interfaces(False)
+        elif argument == '--no-hash-cons':
+            set_hash_consing(False)
+        elif argument == '--no-reduction-cache':
+            set_reduction_cache(False)
+        elif argument == '--lazy':
+            set_lazy_eval(True)
+        elif argument in ('--jobs', '-j') and i + 1 < len(sys.argv):
+            if not sys.argv[i + 1].isdigit() or int(sys.argv[i + 1]) < 1:
+                print(f"{argument} expects a positive number, not "
+                      f"'{sys.argv[i + 1]}'", file=sys.stderr)
+                exit(1)
+            set_proof_jobs(int(sys.argv[i + 1]))
+            already_processed_next = True
         elif argument == '--compile':
             compile_target = '__pending__'
         elif argument == '--compile-module':
@@ -270,6 +318,8 @@ if __name__ == "__main__":
             already_processed_next = True
         elif argument == '--no-prune':
             no_prune = True
+        elif argument in ('-O0', '-O1', '-O2'):
+            opt_level = int(argument[2])
         elif argument == '--debug':
             debug_enabled = True
         elif argument == '--no-color':
@@ -302,6 +352,9 @@ if __name__ == "__main__":
         print("Couldn't find a file to deduce!")
         exit(1)
 
+    if proof_cache_dir:
+        enable_persistent_cache(proof_cache_dir)
+
     sys.setrecursionlimit(RECURSION_LIMIT)
     # We can probably use a loop for some tail recursive functions
     # And even the non-tail recursive functions can be turned into a
@@ -342,6 +395,7 @@ if __name__ == "__main__":
                 no_prune=no_prune,
                 separate=separate_compile,
                 is_main=is_main_module,
+                opt_level=opt_level,
             )
         elif os.path.isfile(deducable):
             deduce_file(deducable, error_expected, tracing_functions, deducable_prelude,
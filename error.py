@@ -406,6 +406,12 @@ class ParseError(Exception):
     self.trace.append(ParseError(loc, msg))
     return self
 
+  def __reduce__(self) -> tuple[object, ...]:
+    # ``Exception`` pickles as ``cls(*self.args)``, which would miss
+    # ``loc``; ``lsp.library.check_files`` sends these between
+    # processes.
+    return (ParseError, (self.loc, self.base_message()), self.__dict__)
+
   def base_message(self) -> str:
     return super().__str__()
 
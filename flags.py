@@ -23,15 +23,14 @@ class VerboseLevel(Enum):
 RECURSION_LIMIT: int = 40000
 
 # Largest magnitude Deduce accepts for an integer or ``Nat`` literal.
-# Literals desugar to a unary term of depth == value, and CPython's C
-# stack guard trips (a clean ``RecursionError``) once a tree-walking
-# pass recurses a few thousand frames deep -- empirically around a
-# literal value of ~5000 with ``RECURSION_LIMIT`` above. Rejecting
-# larger literals at parse time with a located, beginner-friendly error
-# is far better than an opaque mid-check recursion crash (issue #1021).
-# Kept comfortably below the empirical ceiling so a literal near the
-# bound still checks even inside a moderately deep proof.
-MAX_LITERAL: int = 4000
+# Literals are stored as a single ``NatLit`` node, so their size no
+# longer bounds the recursion depth of the checker; the ceiling now only
+# guards against passes that still unfold a literal one ``suc`` at a
+# time (printing a ``Nat`` in unary, or ``evaluate`` through a recursive
+# definition), which take time and memory proportional to the value.
+# Rejecting larger literals at parse time with a located error keeps
+# such runs bounded (issue #1021).
+MAX_LITERAL: int = 10**6
 
 # flag for displaying uniquified names
 
@@ -164,6 +163,89 @@ def set_check_imports(b: bool) -> None:
   global check_imports
   check_imports = b
 
+# flag for reading and writing binary module interfaces (``.pfi``) of
+# imported ``.pf`` files, so unchanged imports are loaded instead of
+# re-parsed and re-uniquified.  Off unless asked for, because it writes
+# files to the user's cache directory.
+
+module_interfaces: bool = False
+
+def get_module_interfaces() -> bool:
+  global module_interfaces
+  return module_interfaces
+
+def set_module_interfaces(b: bool) -> None:
+  global module_interfaces
+  module_interfaces = b
+
+# directory the module interfaces are kept in; ``None`` means the
+# per-user cache, ``$XDG_CACHE_HOME/deduce/interfaces`` (or
+# ``~/.cache/deduce/interfaces``).
+
+module_interface_dir: Optional[str] = None
+
+def get_module_interface_dir() -> Optional[str]:
+  global module_interface_dir
+  return module_interface_dir
+
+def set_module_interface_dir(d: Optional[str]) -> None:
+  global module_interface_dir
+  module_interface_dir = d
+
+# flag for hash-consing ground Nat/UInt literal values, so equal values
+# built during checking share one node (see abstract_syntax.hashcons).
+
+hash_consing: bool = True
+
+def get_hash_consing() -> bool:
+  global hash_consing
+  return hash_consing
+
+def set_hash_consing(b: bool) -> None:
+  global hash_consing
+  hash_consing = b
+
+# flag for memoising reductions of ground calls to recursive functions
+# (see abstract_syntax.reduction_cache).
+
+reduction_cache: bool = True
+
+def get_reduction_cache() -> bool:
+  global reduction_cache
+  return reduction_cache
+
+def set_reduction_cache(b: bool) -> None:
+  global reduction_cache
+  reduction_cache = b
+
+# flag for evaluating `print` and `assert` call-by-need, computing only
+# the parts of a value that are printed or compared and writing a list
+# one element at a time (see abstract_syntax.lazy_eval).
+
+lazy_eval: bool = False
+
+def get_lazy_eval() -> bool:
+  global lazy_eval
+  return lazy_eval
+
+def set_lazy_eval(b: bool) -> None:
+  global lazy_eval
+  lazy_eval = b
+
+# number of worker processes used to check the proofs of a file's
+# top-level theorems (``--jobs``). 1 (the default) checks every proof
+# in the checking process itself.
+
+proof_jobs: int = 1
+
+def get_proof_jobs() -> int:
+  global proof_jobs
+  return proof_jobs
+
+def set_proof_jobs(n: int) -> None:
+  global proof_jobs
+  proof_jobs = max(1, n)
+
 # flag for LSP-targeted hole queries: when set to (line, column), the
 # proof checker treats every `?` hole at a different location as a
 # successful proof of its goal, and only raises IncompleteProof at the
@@ -0,0 +1,256 @@
+"""Statement-level incremental parsing of editor buffers.
+
+The LSP server re-checks the whole buffer on every ``didChange``.
+``checker_cache`` already skips the proof checks of statements whose
+dependencies did not change, but the buffer was still lexed and parsed
+from scratch each time, so typing in one proof cost time proportional to
+the file.  This module keeps, per document, the previous text and the
+statements parsed from it, and re-parses only the statements an edit
+touched.
+
+The buffer is cut into *chunks*: each chunk starts at the first token of
+a top-level statement that begins a line, and owns the text up to the
+next chunk (so comments between statements belong to the chunk above
+them).  Against the previous text, the longest common prefix and suffix
+bound the edit; then
+
+* chunks that end inside the unchanged prefix are reused as they are;
+* chunks that start inside the unchanged suffix are reused with their
+  source locations moved by the edit's line and offset delta;
+* the text in between is parsed on its own, and its locations moved to
+  where that text sits in the buffer.
+
+Parsing the middle text alone gives the same statements as a full parse
+because a statement cannot continue past the start of the next one
+(which is always a keyword at the start of a line).  When that
+reasoning cannot be relied on -- the middle text fails to parse, leaves
+a block comment open, or does not end at a line break -- the whole
+buffer is parsed instead, so errors are always those of a full parse.
+
+Reusing parsed statements is sound because ``uniquify`` builds new
+nodes: the pipeline never mutates the statements handed out here.
+
+Goes here:
+  * the per-document chunk table and the reuse rules above
+
+Does NOT go here:
+  * which proof checks are skipped (``checker_cache``)
+  * the parsers themselves (``rec_desc_parser``, ``parser``)
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from lark.tree import Meta
+
+from abstract_syntax import Statement
+from error import ParseError
+
+# Documents whose chunks are kept; the least recently checked is dropped.
+MAX_DOCUMENTS = 32
+
+
+@dataclass
+class _Chunk:
+    start: int  # offset of the chunk's first character
+    line: int  # 1-based line of that character
+    stmts: list[Statement]
+
+
+@dataclass
+class _Document:
+    text: str
+    chunks: list[_Chunk]
+
+
+_documents: OrderedDict[Hashable, _Document] = OrderedDict()
+
+_parse_stats: dict[str, int] = {"reused": 0, "reparsed": 0, "full": 0}
+
+
+def get_incremental_parse_stats() -> dict[str, int]:
+    """Statements ``reused`` from the previous parse, statements
+    ``reparsed`` because an edit touched them, and ``full`` parses of a
+    whole buffer."""
+    return dict(_parse_stats)
+
+
+def reset_incremental_parses() -> None:
+    """Forget every document and zero the statistics."""
+    _documents.clear()
+    for counter in _parse_stats:
+        _parse_stats[counter] = 0
+
+
+def parse_incremental(
+    key: Hashable, text: str, parse: Callable[[str], list[Statement]]
+) -> list[Statement]:
+    """The statements of ``text``, as ``parse(text)`` would return them.
+
+    ``key`` names the document (and anything else the parse depends on,
+    such as which parser ``parse`` runs); the previous text parsed under
+    the same key is the baseline for reuse.  A ``ParseError`` from a full
+    parse propagates, and the baseline is kept for the next call.
+    """
+    previous = _documents.pop(key, None)
+    chunks = None
+    if previous is not None:
+        chunks = _reparse(previous, text, parse)
+    if chunks is None:
+        stmts = parse(text)
+        _parse_stats["full"] += 1
+        chunks = _chunk(text, stmts, 0, 1)
+    _documents[key] = _Document(text, chunks)
+    if len(_documents) > MAX_DOCUMENTS:
+        _documents.popitem(last=False)
+    return [stmt for chunk in chunks for stmt in chunk.stmts]
+
+
+def _chunk(text: str, stmts: list[Statement], start: int,
+           line: int) -> list[_Chunk]:
+    """Group ``stmts``, parsed from ``text`` starting at offset ``start``
+    on line ``line``, into chunks."""
+    chunks = [_Chunk(start, line, [])]
+    for stmt in stmts:
+        loc = stmt.location
+        pos = getattr(loc, "start_pos", None)
+        if isinstance(pos, int) and pos > chunks[-1].start \
+           and text[pos - 1] == "\n" and chunks[-1].stmts:
+            chunks.append(_Chunk(pos, loc.line, []))
+        chunks[-1].stmts.append(stmt)
+    return chunks
+
+
+def _common_prefix(a: str, b: str) -> int:
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _reparse(
+    previous: _Document, text: str, parse: Callable[[str], list[Statement]]
+) -> list[_Chunk] | None:
+    """The chunks of ``text``, reusing those of ``previous`` the edit did
+    not touch, or ``None`` when the whole buffer must be parsed."""
+    old_text, old_chunks = previous.text, previous.chunks
+    if text == old_text:
+        _parse_stats["reused"] += sum(len(c.stmts) for c in old_chunks)
+        return old_chunks
+    prefix = _common_prefix(old_text, text)
+    suffix = _common_suffix(old_text, text,
+                            min(len(old_text), len(text)) - prefix)
+    old_edit_end = len(old_text) - suffix
+    delta = len(text) - len(old_text)
+
+    # Chunks [0, first) end inside the prefix; chunks [last, n) start
+    # inside the suffix.  Chunk 0 starts at offset 0, so ``first`` is at
+    # most the index of the chunk holding the edit.
+    ends = [c.start for c in old_chunks[1:]] + [len(old_text)]
+    first = 0
+    while first < len(old_chunks) and ends[first] <= prefix \
+          and ends[first] < len(old_text):
+        first += 1
+    last = len(old_chunks)
+    while last - 1 > first and old_chunks[last - 1].start >= old_edit_end:
+        last -= 1
+
+    start = old_chunks[first].start
+    end = old_chunks[last].start + delta if last < len(old_chunks) \
+        else len(text)
+    middle = text[start:end]
+    if last < len(old_chunks) and text[end - 1] != "\n":
+        return None
+    if middle.count("/*") != middle.count("*/"):
+        return None
+    try:
+        stmts = parse(middle)
+    except ParseError:
+        return None
+
+    line = old_chunks[first].line
+    for stmt in stmts:
+        _shift(stmt, line - 1, start)
+    middle_chunks = _chunk(text, stmts, start, line)
+    if last < len(old_chunks):
+        old_end = old_chunks[last].start
+        line_shift = text.count("\n", start, end) \
+            - old_text.count("\n", start, old_end)
+        suffix_chunks = [_moved(c, line_shift, delta)
+                         for c in old_chunks[last:]]
+    else:
+        suffix_chunks = []
+    _parse_stats["reused"] += sum(
+        len(c.stmts) for c in old_chunks[:first] + suffix_chunks)
+    _parse_stats["reparsed"] += len(stmts)
+    return old_chunks[:first] + middle_chunks + suffix_chunks
+
+
+def _moved(chunk: _Chunk, lines: int, offset: int) -> _Chunk:
+    if lines or offset:
+        for stmt in chunk.stmts:
+            _shift(stmt, lines, offset)
+    return _Chunk(chunk.start + offset, chunk.line + lines, chunk.stmts)
+
+
+def _shift(stmt: Statement, lines: int, offset: int) -> None:
+    """Move every source location in ``stmt`` down ``lines`` lines and
+    ``offset`` characters.  Columns are unchanged because a chunk starts
+    a line.  Each ``Meta`` is replaced rather than updated, since one may
+    also be held by the nodes of an earlier check."""
+    moved: dict[int, Meta] = {}
+    stack: list[object] = [stmt]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        if isinstance(node, dict):
+            stack.extend(node.values())
+            continue
+        fields = getattr(node, "__dict__", None)
+        if fields is None:
+            continue
+        for name, value in list(fields.items()):
+            if isinstance(value, Meta):
+                new = moved.get(id(value))
+                if new is None:
+                    new = _moved_meta(value, lines, offset)
+                    moved[id(value)] = new
+                setattr(node, name, new)
+            elif not isinstance(value, (str, int, float, bool)) \
+                    and value is not None:
+                stack.append(value)
+
+
+def _moved_meta(meta: Meta, lines: int, offset: int) -> Meta:
+    new = Meta()  # type: ignore[no-untyped-call]
+    new.__dict__.update(meta.__dict__)
+    if not getattr(meta, "empty", True):
+        new.line = meta.line + lines
+        new.end_line = meta.end_line + lines
+        new.start_pos = meta.start_pos + offset
+        new.end_pos = meta.end_pos + offset
+    return new
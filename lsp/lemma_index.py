@@ -0,0 +1,390 @@
+"""Indexes over lemma conclusions for ``available_lemmas_at``.
+
+Ranking the lemmas in scope at a hole has two stages (see
+``lsp.query._rank_lemmas``): cheap textual signals -- the conclusion's
+head symbol and the operator/function symbols it shares with the goal
+-- then the first-order matcher, which tries the conclusion against the
+goal and each equation side against every goal subterm.  With the full
+standard library in scope both stages used to walk every lemma on every
+request, and the matcher paid for a reduction on each failed pair.
+
+``LemmaIndex`` keeps, per lemma name:
+
+* an inverted index from conclusion head symbol, and from each symbol
+  the formula mentions, to the lemmas, so the textual stage only visits
+  lemmas that share something with the goal;
+* a discrimination tree over the typed conclusions, and one over the
+  sides of equational conclusions (including the equations inside a
+  disjunctive conclusion), so the matcher is only handed lemmas whose
+  conclusion can match the goal or whose equation side can match one
+  of its subterms.
+
+The trees use the vocabulary of ``AutoRewriteIndex`` in
+``abstract_syntax.rewrite``: a pattern is filed under its head symbol,
+then its arity, then the head symbol of each argument, with bound
+variables and shapes the index does not model taking the ``ANY`` edge.
+A lookup never drops a lemma ``formula_match`` could match: it only
+discriminates on arguments when the term has at least the pattern's
+arity and none of its arguments shares the term's head (associative
+flattening could shift them), and a ``Bool`` is compatible with any
+formula, since a formula can reduce to one.
+
+The index is persistent: ``insert`` returns a new index sharing all of
+the old one except the paths to the new lemma.  ``lsp.query`` builds
+one for the prelude once per prelude snapshot and inserts the user
+file's lemmas into it on each request.
+
+Goes here:
+  * the index structures and the pattern/term keys they use
+
+Does NOT go here:
+  * which lemmas are in scope (``lsp.query._collect_lemma_candidates``)
+  * the scoring itself (``lsp.query._rank_lemmas``)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from abstract_syntax import (
+    AST,
+    All,
+    And,
+    Bool,
+    Call,
+    Formula,
+    GenRecFun,
+    IfThen,
+    Or,
+    RecFun,
+    ResolvedVar,
+    Some,
+    Term,
+    TermInst,
+    VarRef,
+    callable_name,
+)
+
+# The edge taken by a bound variable, or by any pattern node the index
+# does not model: lemmas below it may match whatever the term is.
+ANY = "*"
+
+# The key of an AST node that is not a term (a type, say).  Lemma
+# conclusions and equation sides are terms, and the matcher never
+# equates a term with a non-term, so no edge admits it.
+_NOT_A_TERM = ("other",)
+
+# The key of a call whose operator is itself a call.
+_APPLY = ("apply",)
+
+_FORMULA_KINDS = frozenset({"call", "apply", "bool", "and", "or"})
+
+# A term as lookups see it: its key, and the keys of its arguments when
+# the index may discriminate on them (``None`` otherwise).
+_Signature = tuple[object, Optional[tuple[object, ...]]]
+
+
+def _strip_inst(t: Term) -> Term:
+    while isinstance(t, TermInst):
+        t = t.subject
+    return t
+
+
+def _pattern_key(pattern: Term, bound: frozenset[str]) -> object:
+    """The edge for ``pattern``: the symbol any term it matches must
+    carry at the top, or ``ANY``."""
+    pattern = _strip_inst(pattern)
+    if isinstance(pattern, Bool):
+        return ("bool", pattern.value)
+    if isinstance(pattern, ResolvedVar):
+        return ANY if pattern.name in bound else ("var", pattern.name)
+    if isinstance(pattern, Call):
+        rator = _strip_inst(pattern.rator)
+        if isinstance(rator, ResolvedVar) and rator.name not in bound:
+            return ("call", rator.name)
+        if isinstance(rator, Call):
+            # ``f(a)(b)``: the matcher matches the operators, so only
+            # another application of an application can match.
+            return _APPLY
+        return ANY
+    if isinstance(pattern, And):
+        return ("and",)
+    if isinstance(pattern, Or):
+        return ("or",)
+    return ANY
+
+
+def _pattern_path(pattern: Term, bound: frozenset[str]) -> list[object]:
+    """The path ``pattern`` is filed under: its key, then for a call
+    its arity and the key of each argument."""
+    key = _pattern_key(pattern, bound)
+    pattern = _strip_inst(pattern)
+    if isinstance(key, tuple) and key[0] == "call" and isinstance(pattern, Call):
+        return [key, len(pattern.args)] + [
+            _pattern_key(arg, bound) for arg in pattern.args]
+    return [key]
+
+
+def _term_key(term: object) -> object:
+    """The symbol at the top of ``term`` in the vocabulary of
+    ``_pattern_key``, or ``None`` if ``term`` has no modelled symbol
+    (it then follows every edge)."""
+    if not isinstance(term, Term):
+        return _NOT_A_TERM
+    term = _strip_inst(term)
+    if isinstance(term, Bool):
+        return ("bool", term.value)
+    if isinstance(term, ResolvedVar):
+        return ("var", term.name)
+    if isinstance(term, Call):
+        rator = _strip_inst(term.rator)
+        if isinstance(rator, (ResolvedVar, RecFun, GenRecFun)):
+            return ("call", callable_name(rator))
+        if isinstance(rator, Call):
+            return _APPLY
+        return None
+    if isinstance(term, And):
+        return ("and",)
+    if isinstance(term, Or):
+        return ("or",)
+    return None
+
+
+def _signature(term: object) -> _Signature:
+    key = _term_key(term)
+    if not (isinstance(key, tuple) and key[0] == "call"):
+        return (key, None)
+    call = _strip_inst(term)
+    assert isinstance(call, Call)
+    arg_keys = tuple(_term_key(arg) for arg in call.args)
+    if key in arg_keys:
+        return (key, None)
+    return (key, arg_keys)
+
+
+def _may_match(edge: object, key: object) -> bool:
+    """Whether a pattern filed under ``edge`` can match a term whose top
+    symbol is ``key``.  A ``Bool`` is not told apart from a call or a
+    connective: the matcher's fallback reduces both sides, and either
+    can reduce to a ``Bool``."""
+    if key is _NOT_A_TERM:
+        return False
+    if key is None or edge == ANY or edge == key:
+        return True
+    kinds = {edge[0], key[0]}  # type: ignore[index]
+    return "bool" in kinds and kinds <= _FORMULA_KINDS
+
+
+def _path_admits(path: list[object], sig: _Signature) -> bool:
+    key, arg_keys = sig
+    edge = path[0]
+    if not _may_match(edge, key):
+        return False
+    if edge != key or len(path) == 1 or arg_keys is None:
+        return True
+    arity = path[1]
+    assert isinstance(arity, int)
+    if arity != len(arg_keys):
+        # Surplus term arguments are folded into the last pattern
+        # argument by the matcher; too few can never match.
+        return arity < len(arg_keys)
+    return all(_may_match(e, k) for e, k in zip(path[2:], arg_keys))
+
+
+def may_match(pattern: Term, variables: Iterable[VarRef], term: AST) -> bool:
+    """Whether ``formula_match`` could match ``pattern``, whose pattern
+    variables are ``variables``, against ``term``, judged from head
+    symbols alone.  ``False`` means the match would certainly fail."""
+    bound = frozenset(v.get_name() for v in variables)
+    return _path_admits(_pattern_path(pattern, bound), _signature(term))
+
+
+@dataclass(frozen=True)
+class _Node:
+    # edge -> subtree; below a call edge the next edge is the arity,
+    # then one edge per argument
+    children: dict[object, "_Node"]
+    # lemmas whose path ends here
+    names: tuple[str, ...]
+
+    def insert(self, path: list[object], name: str) -> "_Node":
+        """A copy of this node with ``name`` added at the end of
+        ``path``, sharing every subtree off that path."""
+        if not path:
+            return _Node(self.children, self.names + (name,))
+        children = dict(self.children)
+        children[path[0]] = children.get(path[0], _EMPTY_NODE).insert(
+            path[1:], name)
+        return _Node(children, self.names)
+
+    def collect_all(self, out: set[str]) -> None:
+        out.update(self.names)
+        for child in self.children.values():
+            child.collect_all(out)
+
+    def _collect_args(self, keys: tuple[object, ...], out: set[str]) -> None:
+        if not keys:
+            out.update(self.names)
+            return
+        for edge, child in self.children.items():
+            if _may_match(edge, keys[0]):
+                child._collect_args(keys[1:], out)
+
+    def lookup(self, sig: _Signature, out: set[str]) -> None:
+        """Add to ``out`` the lemmas below this root whose path admits
+        a term with signature ``sig`` (see ``_path_admits``)."""
+        key, arg_keys = sig
+        for edge, child in self.children.items():
+            if not _may_match(edge, key):
+                continue
+            if edge != key or arg_keys is None:
+                child.collect_all(out)
+                continue
+            for arity, sub in child.children.items():
+                assert isinstance(arity, int)
+                if arity == len(arg_keys):
+                    sub._collect_args(arg_keys, out)
+                elif arity < len(arg_keys):
+                    sub.collect_all(out)
+
+
+_EMPTY_NODE = _Node({}, ())
+
+
+@dataclass(frozen=True)
+class LemmaShape:
+    """What the textual ranking signals need to know about a lemma:
+    the head symbol of its conclusion and every symbol it mentions
+    (see ``lsp.query._formula_head_symbol`` / ``_formula_symbols``)."""
+
+    head: Optional[str]
+    symbols: frozenset[str]
+
+
+def _equation_sides(conc: Formula) -> Optional[tuple[Term, Term]]:
+    # Same test as ``lsp.query._equation_subterm_match``.
+    if (isinstance(conc, Call) and isinstance(conc.rator, VarRef)
+            and conc.rator.get_name() == "=" and len(conc.args) == 2):
+        return (conc.args[0], conc.args[1])
+    return None
+
+
+def _conclusion_patterns(
+    formula: Formula,
+) -> tuple[list[object], list[list[object]]]:
+    """The path of ``formula``'s conclusion (under its outer ``all``s
+    and ``if``s), and the paths of the equation sides the matcher
+    tries against goal subterms."""
+    bound: set[str] = set()
+    f = formula
+    while isinstance(f, All):
+        bound.add(f.var[0])
+        f = f.body
+    while isinstance(f, IfThen):
+        f = f.conclusion
+    conc_bound = frozenset(bound)
+    conclusion = _pattern_path(f, conc_bound)
+
+    equations: list[tuple[Formula, frozenset[str]]] = [(f, conc_bound)]
+    node = f
+    if isinstance(node, Some):
+        bound.update(name for name, _ty in node.vars)
+        node = node.body
+    if isinstance(node, Or):
+        equations += [(d, frozenset(bound)) for d in node.args]
+    sides: list[list[object]] = []
+    for eq, eq_bound in equations:
+        pair = _equation_sides(eq)
+        if pair is None:
+            continue
+        for side in pair:
+            # A bare variable side is never tried (see
+            # ``_equation_subterm_match``).
+            if isinstance(side, VarRef) and side.get_name() in eq_bound:
+                continue
+            sides.append(_pattern_path(side, eq_bound))
+    return conclusion, sides
+
+
+class LemmaIndex:
+    """Lemmas filed by conclusion shape and by the symbols they
+    mention.  See the module docstring."""
+
+    __slots__ = ("_conclusions", "_sides", "_heads", "_symbols", "_shapes")
+
+    def __init__(self) -> None:
+        self._conclusions = _EMPTY_NODE
+        self._sides = _EMPTY_NODE
+        self._heads: dict[Optional[str], frozenset[str]] = {}
+        self._symbols: dict[str, frozenset[str]] = {}
+        self._shapes: dict[str, LemmaShape] = {}
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._shapes
+
+    def insert(
+        self, name: str, shape: LemmaShape, formula: Optional[Formula],
+    ) -> "LemmaIndex":
+        """A copy of this index with lemma ``name`` added.  ``formula``
+        is the statement the matcher will be handed -- the typed one
+        when there is one -- or ``None`` to leave the lemma out of the
+        trees (it is then never a match candidate)."""
+        return self.extend([(name, shape, formula)])
+
+    def extend(
+        self,
+        lemmas: Iterable[tuple[str, LemmaShape, Optional[Formula]]],
+    ) -> "LemmaIndex":
+        """A copy of this index with each of ``lemmas`` inserted (see
+        ``insert``).  A later lemma of the same name replaces the
+        shape of an earlier one."""
+        new = LemmaIndex()
+        new._conclusions = self._conclusions
+        new._sides = self._sides
+        new._heads = dict(self._heads)
+        new._symbols = dict(self._symbols)
+        new._shapes = dict(self._shapes)
+        for name, shape, formula in lemmas:
+            if formula is not None:
+                conclusion, sides = _conclusion_patterns(formula)
+                new._conclusions = new._conclusions.insert(conclusion, name)
+                for side in sides:
+                    new._sides = new._sides.insert(side, name)
+            new._heads[shape.head] = new._heads.get(shape.head, frozenset()) | {name}
+            for symbol in shape.symbols:
+                new._symbols[symbol] = new._symbols.get(symbol, frozenset()) | {name}
+            new._shapes[name] = shape
+        return new
+
+    def shape(self, name: str) -> Optional[LemmaShape]:
+        return self._shapes.get(name)
+
+    def textual_candidates(
+        self, head: Optional[str], symbols: Iterable[str],
+    ) -> set[str]:
+        """Lemmas whose conclusion has head ``head`` or which mention
+        one of ``symbols``."""
+        out: set[str] = set()
+        if head is not None:
+            out |= self._heads.get(head, frozenset())
+        for symbol in symbols:
+            out |= self._symbols.get(symbol, frozenset())
+        return out
+
+    def unify_candidates(self, goal: Formula, subterms: Iterable[AST]) -> set[str]:
+        """Lemmas whose conclusion may match ``goal``, or which have an
+        equation side that may match one of ``subterms`` (the goal's
+        subterms, ``goal`` included)."""
+        out: set[str] = set()
+        self._conclusions.lookup(_signature(goal), out)
+        seen: set[_Signature] = set()
+        for sub in subterms:
+            sig = _signature(sub)
+            if sig not in seen:
+                seen.add(sig)
+                self._sides.lookup(sig, out)
+        return out
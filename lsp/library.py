@@ -20,7 +20,7 @@ unique prelude and restore it before each user-file check, so:
 
 ``abstract_syntax``'s fresh-name counter (Step 12) is now an
 explicit ``UniquifyContext`` threaded through ``uniquify_deduce``.
-We keep a ``_post_prelude_ctx`` baseline -- a snapshot of the
+We keep a baseline (``CheckContext.uniquify``) -- a snapshot of the
 counter just after the prelude finished -- and fork a fresh
 context from it for each user-file check.  That way successive
 checks produce reproducible names *and* never collide with
@@ -36,14 +36,25 @@ cache only because ``_hash_ast`` is memoised on the pre-decl AST
 node, and any future change that recomputes the hash post-decl
 would silently invalidate the cache for every predicate-using
 module.  Issue #368.
+
+All of that post-prelude state -- the tracked containers, the
+scalars and the uniquify baseline -- is one ``CheckContext``.
+``check_file`` installs it into the process under a lock, so one
+process checks one document at a time. ``check_files`` checks
+several documents at once: it installs the context once, forks
+workers that inherit it copy-on-write, and each worker checks its
+documents against its own copy of the pipeline state.
 """
 
 from __future__ import annotations
 
+import functools
+import multiprocessing
 import os
 import sys
 import threading
 import traceback as _traceback
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from types import ModuleType
@@ -67,9 +78,19 @@ _ScalarSnapshot = dict[_SnapshotKey, object]
 # corrupt the prelude bootstrap of the next session, surfacing as
 # "undefined variable: Nat" because the second bootstrap cleared
 # ``uniquified_modules`` from under the first.  Serialise here
-# rather than asking every caller to do it.
+# rather than asking every caller to do it.  ``check_files`` forks
+# while holding it, so a forked child starts with a fresh one.
 _check_file_lock = threading.Lock()
 
+
+def _reset_check_file_lock() -> None:
+    global _check_file_lock
+    _check_file_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_check_file_lock)
+
 from lark.tree import Meta
 
 import abstract_syntax as _abstract_syntax
@@ -84,13 +105,19 @@ from abstract_syntax import (
     get_recursive_descent,
     get_uniquified_modules,
 )
-from error import ErrorSink, WarningRecord, set_active_warning_sink
+from error import (
+    ErrorSink,
+    IncompleteProof,
+    WarningRecord,
+    set_active_warning_sink,
+)
 from flags import (
     get_experimental_imperative,
     get_debugger,
     get_verbose,
     set_debugger,
 )
+from lsp.incremental import parse_incremental
 from proof_checker import check_deduce, uniquify_deduce
 
 
@@ -239,10 +266,10 @@ def check_file(
                             statement of *their* file rather than
                             stepping through ``lib/``.
 
-    Concurrency note: this function is NOT thread-safe. The Deduce
-    pipeline mutates module-level state, and the snapshot/restore
-    machinery here assumes a single caller at a time. Callers that
-    want to fan out should serialize.
+    Concurrency note: the Deduce pipeline mutates module-level state,
+    so calls from different threads take turns behind a process-wide
+    lock. To check several documents at the same time, use
+    ``check_files``, which runs them in forked worker processes.
     """
     if parser is not None and parser not in ("recursive-descent", "lalr"):
         raise ValueError(
@@ -273,16 +300,11 @@ def _check_file_locked(
     # asked to step through their own file, not lib/.  Phase 5 plan
     # rationale: this is the only sensible default and avoids PR #269's
     # "first prelude statement traps" bug in long-lived daemons.
-    _prepare_state(tuple(prelude), tuple(prewarm_modules))
+    context = _prepare_state(tuple(prelude), tuple(prewarm_modules))
     # Each user-file check forks a fresh ctx from the post-prelude
     # baseline so successive checks produce reproducible names.  See
-    # ``UniquifyContext`` and the ``_post_prelude_ctx`` machinery
-    # below for the rationale.
-    ctx = (
-        _post_prelude_ctx.snapshot()
-        if _post_prelude_ctx is not None
-        else UniquifyContext()
-    )
+    # ``UniquifyContext`` and ``CheckContext`` below for the rationale.
+    ctx = context.uniquify.snapshot()
     if debugger is None:
         return _check_file_impl(
             filename, tracing_functions, prelude, content, ctx,
@@ -369,22 +391,24 @@ def _check_file_impl(
                 use_rd = parser == "recursive-descent"
 
             deduce_dir = os.path.dirname(sys.argv[0])
-            if use_rd:
-                _rd_parser.set_deduce_directory(deduce_dir)
-                _rd_parser.set_filename(filename)
-                _rd_parser.init_parser()
-                ast = _rd_parser.parse(
-                    program_text, trace=get_verbose(), error_expected=False,
-                    experimental_imperative=experimental_imperative,
+            front_end = _rd_parser if use_rd else _lark_parser
+            front_end.set_deduce_directory(deduce_dir)
+            front_end.set_filename(filename)
+            front_end.init_parser()
+            parse_text = functools.partial(
+                front_end.parse, trace=get_verbose(), error_expected=False,
+                experimental_imperative=experimental_imperative,
+            )
+            if content is not None and not get_verbose():
+                # An editor buffer: re-parse only the statements the
+                # edit since the previous check touched.
+                ast = parse_incremental(
+                    (os.path.abspath(filename), use_rd,
+                     experimental_imperative),
+                    program_text, parse_text,
                 )
             else:
-                _lark_parser.set_deduce_directory(deduce_dir)
-                _lark_parser.set_filename(filename)
-                _lark_parser.init_parser()
-                ast = _lark_parser.parse(
-                    program_text, trace=get_verbose(), error_expected=False,
-                    experimental_imperative=experimental_imperative,
-                )
+                ast = parse_text(program_text)
 
             if len(prelude) > 0:
                 # Suppress the prelude entry for any module the user explicitly
@@ -473,9 +497,8 @@ def _check_file_impl(
         if isinstance(e, RecursionError):
             # A bare "maximum recursion depth exceeded" is exactly the
             # kind of opaque crash Deduce's beginner-friendly diagnostics
-            # avoid. The usual cause is an oversized integer literal:
-            # numbers desugar to a *unary* term whose depth equals the
-            # value, so every tree-walking pass recurses that deep. Skip
+            # avoid. The usual cause is a deeply nested term, such as
+            # evaluating a recursive definition on a large number. Skip
             # ``format_exc`` -- the traceback is thousands of frames deep
             # and re-walking it risks tripping the limit again. Issue
             # #1021.
@@ -484,11 +507,10 @@ def _check_file_impl(
                 error_message=(
                     "this file is too deeply nested for Deduce to check "
                     "(exceeded the recursion limit). The most common cause "
-                    "is a very large integer literal: Deduce represents a "
-                    "number as a unary term whose depth equals its value, "
-                    "so a literal like 100000 builds a term too deep to "
-                    "check. Use a smaller value, or raise RECURSION_LIMIT "
-                    "in flags.py if you really need it."
+                    "is evaluating a recursive function on a large number, "
+                    "which unfolds the definition once per `suc`. Use a "
+                    "smaller value, or raise RECURSION_LIMIT in flags.py "
+                    "if you really need it."
                 ),
                 error_traceback=None,
                 exception=e,
@@ -518,6 +540,124 @@ def _content_matches_file(filename: str, content: str) -> bool:
         return False
 
 
+# ---------------------------------------------------------------------------
+# Concurrent checks
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CheckRequest:
+    """One document for ``check_files``: the ``check_file`` arguments
+    that may differ between documents checked together."""
+
+    filename: str
+    content: Optional[str] = None
+    collect_errors: bool = False
+    parser: Optional[str] = None
+
+
+# The documents for the ``check_files`` workers, indexed by task
+# number, each with the (tracing, prelude, prewarm) options of its
+# batch.  Filled in by the parent just before the pool forks, so each
+# worker reads its copy-on-write snapshot and only the index is
+# pickled.
+_worker_requests: list[
+    tuple[CheckRequest, tuple[str, ...], tuple[str, ...], tuple[str, ...]]
+] = []
+
+
+def check_files(
+    requests: Sequence[CheckRequest],
+    tracing_functions: Sequence[str] = (),
+    prelude: Sequence[str] = (),
+    prewarm_modules: Sequence[str] = (),
+    jobs: int = 1,
+) -> list[CheckResult]:
+    """Check several documents at once and return their results in
+    order.
+
+    The prelude is loaded once, in this process, and then up to
+    ``jobs`` forked workers check the documents. Each worker owns a
+    copy of the pipeline state, so the workers neither wait on each
+    other nor on ``check_file`` calls made by other threads of this
+    process in the meantime. With ``jobs <= 1``, or where ``fork`` is
+    unavailable, the documents are checked one after another with
+    ``check_file``.
+
+    A result from a worker has ``ast=None``, and an incomplete proof in
+    it has no ``env`` or ``formula``. Both share structure with the
+    whole prelude, and sending them back would cost more than the
+    check itself; callers that need them use ``check_file``. If a
+    worker fails to return a result (it crashed, or the result could
+    not be pickled), the document is checked again in this process.
+    """
+    for request in requests:
+        if request.parser not in (None, "recursive-descent", "lalr"):
+            raise ValueError(
+                f"check_files: parser must be None, 'recursive-descent', "
+                f"or 'lalr'; got {request.parser!r}"
+            )
+    options = (tuple(tracing_functions), tuple(prelude),
+               tuple(prewarm_modules))
+    jobs = min(jobs, len(requests))
+    if jobs <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [_check_request(request, *options) for request in requests]
+
+    with _check_file_lock:
+        # Bootstrap (or install) the prelude so every worker forks from
+        # the post-prelude state.  The pool forks all of its workers on
+        # the first ``submit``, so the lock is only held until then.
+        _prepare_state(options[1], options[2])
+        _worker_requests[:] = [(request, *options) for request in requests]
+        pool = ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("fork"))
+        futures = [pool.submit(_check_in_worker, n)
+                   for n in range(len(requests))]
+    try:
+        return [
+            _worker_result(future)
+            or _check_request(request, *options)
+            for request, future in zip(requests, futures)
+        ]
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        _worker_requests.clear()
+
+
+def _check_request(
+    request: CheckRequest,
+    tracing_functions: tuple[str, ...],
+    prelude: tuple[str, ...],
+    prewarm_modules: tuple[str, ...],
+) -> CheckResult:
+    return check_file(
+        request.filename, tracing_functions, prelude, request.content,
+        collect_errors=request.collect_errors,
+        prewarm_modules=prewarm_modules, parser=request.parser,
+    )
+
+
+def _check_in_worker(index: int) -> CheckResult:
+    """Worker side of ``check_files``: check one document and strip
+    the parts of its result that are not worth pickling."""
+    result = _check_request(*_worker_requests[index])
+    result.ast = None
+    for exc in result.errors or ():
+        if isinstance(exc, IncompleteProof):
+            exc.env = None
+            exc.formula = None
+    return result
+
+
+def _worker_result(future: Future[CheckResult]) -> Optional[CheckResult]:
+    try:
+        return future.result()
+    except Exception:
+        # A worker that died (``BrokenProcessPool``) or a result that
+        # could not be pickled: the caller checks the document itself.
+        return None
+
+
 # ---------------------------------------------------------------------------
 # Per-call state isolation (Step 6)
 # ---------------------------------------------------------------------------
@@ -526,11 +666,12 @@ def _content_matches_file(filename: str, content: str) -> bool:
 # Module-level mutable containers in the pipeline whose post-prelude
 # state we capture once and restore between calls. The uniquify
 # counter is *not* in this list -- it's now an explicit
-# ``UniquifyContext`` (Step 12) managed via ``_post_prelude_ctx``
+# ``UniquifyContext`` (Step 12) kept in ``CheckContext.uniquify``
 # below.  ``proof_checker.name_id`` is *also* not in this list --
 # it's a scalar and lives in ``_TRACKED_SCALARS`` below.
 _TRACKED_CONTAINERS: tuple[_TrackedAttr, ...] = (
     (_abstract_syntax, "uniquified_modules"),
+    (_abstract_syntax, "module_interface_keys"),
     (_abstract_syntax, "_predicate_decls_by_unique_name"),
     (_abstract_syntax, "collected_imports"),
     (_abstract_syntax, "reduce_only"),
@@ -553,57 +694,85 @@ _TRACKED_SCALARS: tuple[_TrackedAttr, ...] = (
     (_proof_checker, "name_id"),
 )
 
-# The cache key (prelude tuple, prewarm tuple) the snapshot below was
-# captured for. ``None`` until the first ``check_file`` call. The
-# prewarm half is the set of modules pre-loaded into
-# ``uniquified_modules`` without being injected as imports -- batch
-# test runners use this to amortise lib parsing across a sweep while
-# keeping per-file import semantics intact.
-_prelude_key: Optional[tuple[tuple[str, ...], tuple[str, ...]]] = None
 
-# Snapshot of ``_TRACKED_CONTAINERS`` taken right after the prelude
-# load. Each entry is a fresh shallow copy of the live container.
-_prelude_snapshot: Optional[_ContainerSnapshot] = None
+@dataclass
+class CheckContext:
+    """The pipeline state a user-file check starts from: the process
+    as it was right after the prelude loaded.
 
-# Snapshot of ``_TRACKED_SCALARS`` taken right after the prelude
-# load.  Each entry is the captured scalar value (an int for the
-# fresh-name counter).
-_prelude_scalars: Optional[_ScalarSnapshot] = None
+    Attributes:
+        prelude:     Modules imported in front of every user file.
+        prewarm:     Modules pre-loaded into ``uniquified_modules``
+                     without being imported (see ``check_file``).
+        containers:  Shallow copies of ``_TRACKED_CONTAINERS``.
+        scalars:     Values of ``_TRACKED_SCALARS``.
+        uniquify:    The ``UniquifyContext`` baseline. After the
+                     prelude has been uniquified, its counter records
+                     the highest id allocated. Each user-file check
+                     forks a fresh context from it, so user-file
+                     uniquify starts at the same baseline every time
+                     -- reproducible names across calls -- without
+                     colliding with prelude-cached names.
+    """
 
-# Post-prelude ``UniquifyContext`` baseline. After the prelude has
-# been uniquified, its counter records the highest id allocated.
-# Each user-file ``check_file`` call forks a fresh context from this
-# snapshot, so user-file uniquify starts at the same baseline every
-# time -- reproducible names across calls -- without colliding with
-# prelude-cached names. ``None`` until the first prepare-state.
-_post_prelude_ctx: Optional[UniquifyContext] = None
+    prelude: tuple[str, ...]
+    prewarm: tuple[str, ...]
+    containers: _ContainerSnapshot
+    scalars: _ScalarSnapshot
+    uniquify: UniquifyContext
+
+    @classmethod
+    def capture(
+        cls,
+        prelude: tuple[str, ...],
+        prewarm: tuple[str, ...],
+        uniquify: UniquifyContext,
+    ) -> "CheckContext":
+        """Record the live pipeline state."""
+        return cls(prelude, prewarm, _capture_containers(),
+                   _capture_scalars(), uniquify.snapshot())
+
+    def install(self) -> None:
+        """Put the live pipeline state back to this context."""
+        _restore_containers(self.containers)
+        _restore_scalars(self.scalars)
+
+
+# The context for the most recent (prelude, prewarm) pair. ``None``
+# until the first ``check_file`` call. The prewarm half is the set of
+# modules pre-loaded into ``uniquified_modules`` without being
+# injected as imports -- batch test runners use this to amortise lib
+# parsing across a sweep while keeping per-file import semantics
+# intact.
+_prelude_context: Optional[CheckContext] = None
 
 
 def _prepare_state(
     prelude_key: tuple[str, ...],
     prewarm_key: tuple[str, ...] = (),
-) -> None:
-    """Make the global pipeline state ready for a fresh check.
+) -> CheckContext:
+    """Make the global pipeline state ready for a fresh check and
+    return the context it was restored from.
 
     First time we see ``(prelude_key, prewarm_key)`` (or any time
     either changes): clear every tracked container, run the prelude
     through the pipeline so the lib modules end up cached in
     ``uniquified_modules`` / ``checked_modules``, optionally pre-load
     any ``prewarm_key`` modules into the same cache (without
-    injecting them as imports into the user buffer), then take a
-    snapshot.
+    injecting them as imports into the user buffer), then capture a
+    ``CheckContext``.
 
-    On subsequent calls with the same key: just restore the
-    snapshot. The prelude reload is the expensive part (~3s for the
-    full stdlib); restore is a handful of dict/set copies.
+    On subsequent calls with the same key: just install the context.
+    The prelude reload is the expensive part (~3s for the full
+    stdlib); restore is a handful of dict/set copies.
     """
-    global _prelude_key, _prelude_snapshot, _prelude_scalars, _post_prelude_ctx
+    global _prelude_context
 
-    cache_key = (prelude_key, prewarm_key)
-    if _prelude_snapshot is not None and _prelude_key == cache_key:
-        _restore_containers(_prelude_snapshot)
-        _restore_scalars(_prelude_scalars)
-        return
+    context = _prelude_context
+    if (context is not None and context.prelude == prelude_key
+            and context.prewarm == prewarm_key):
+        context.install()
+        return context
 
     _clear_containers()
     bootstrap_ctx = UniquifyContext()
@@ -636,10 +805,9 @@ def _prepare_state(
             content="",
             ctx=bootstrap_ctx,
         )
-    _prelude_key = cache_key
-    _prelude_snapshot = _capture_containers()
-    _prelude_scalars = _capture_scalars()
-    _post_prelude_ctx = bootstrap_ctx.snapshot()
+    _prelude_context = CheckContext.capture(
+        prelude_key, prewarm_key, bootstrap_ctx)
+    return _prelude_context
 
 
 def _capture_containers() -> _ContainerSnapshot:
@@ -741,9 +909,6 @@ def reset_prelude_cache() -> None:
     scratch. Used by the test suite to test the bootstrap path and by
     long-running daemons that want to pick up changes to ``lib/``.
     """
-    global _prelude_key, _prelude_snapshot, _prelude_scalars, _post_prelude_ctx
-    _prelude_key = None
-    _prelude_snapshot = None
-    _prelude_scalars = None
-    _post_prelude_ctx = None
+    global _prelude_context
+    _prelude_context = None
     _clear_containers()
@@ -23,6 +23,10 @@ uses 1-indexed lines and 1-indexed columns to match Deduce's existing
 error messages. The translation is a simple ``+1`` / ``-1`` per
 coordinate, performed at the boundary in the helpers below.
 
+Set ``DEDUCE_WORKERS=N`` to answer diagnostics, ``deduce/goalAt`` and
+``deduce/availableLemmasAt`` from a pool of ``N`` pre-forked workers
+(see :mod:`lsp.worker_pool`).
+
 The LSP boundary stays protocol-specific: the only consumer of
 ``pygls`` and ``lsprotocol`` lives here. The query API itself is
 unchanged.
@@ -65,6 +69,7 @@ from abstract_syntax import (  # noqa: E402
     add_import_directory,
     init_import_directories,
 )
+from checker_cache import enable_persistent_cache  # noqa: E402
 from flags import RECURSION_LIMIT, set_quiet_mode  # noqa: E402
 
 sys.setrecursionlimit(RECURSION_LIMIT)
@@ -73,6 +78,9 @@ init_import_directories()
 add_import_directory(str(_LIB_DIR))
 if _TEST_IMPORTS_DIR.is_dir():
     add_import_directory(str(_TEST_IMPORTS_DIR))
+# Reuse proof-check verdicts across daemon restarts when asked to.
+if os.environ.get("DEDUCE_PROOF_CACHE"):
+    enable_persistent_cache(os.environ["DEDUCE_PROOF_CACHE"])
 
 
 def _default_prelude() -> tuple[str, ...]:
@@ -121,6 +129,7 @@ from lsprotocol import types as lsp_types  # noqa: E402
 from pygls.lsp.server import LanguageServer  # noqa: E402
 
 from lsp import query as _query  # noqa: E402
+from lsp.worker_pool import WorkerPool, pool_from_env  # noqa: E402
 
 
 SERVER_NAME = "deduce-lsp"
@@ -182,6 +191,18 @@ server = LanguageServer(
 )
 
 
+# Started by ``main`` when ``DEDUCE_WORKERS`` asks for one.
+_pool: Optional[WorkerPool] = None
+
+
+def _run_query(name: str, *args: object, **kwargs: object) -> object:
+    """Call ``_query.<name>`` on a pool worker, or here when there is
+    no pool."""
+    if _pool is None:
+        return getattr(_query, name)(*args, **kwargs)
+    return _pool.run(name, *args, **kwargs)
+
+
 # --- Position / Range translation (LSP <-> query) -------------------------
 
 
@@ -274,7 +295,8 @@ def _publish_diagnostics(ls: LanguageServer, uri: str) -> None:
     if content is None:
         return
     path = _path_from_uri(uri)
-    diags = _query.check(path, content, prelude=_prelude_for(path))
+    diags = cast(list[_query.Diagnostic], _run_query(
+        "check", path, content, prelude=_prelude_for(path)))
     # pygls 2.x exposes the publish-diagnostics notification as
     # ``text_document_publish_diagnostics(params)``. The pre-2.x
     # ``publish_diagnostics(uri, list)`` shape was removed; calling
@@ -334,9 +356,9 @@ def on_did_change(
     ordinary typing.  Eglot debounces typing-driven didChanges via
     ``eglot-send-changes-idle-time`` (default 0.5s), so the cost is
     one ``check`` per pause-while-typing rather than per-keystroke.
-    For typical proof files that's tolerable.  Step 12 of
-    ``docs/lsp-plan.md`` (per-statement caching) is the proper
-    long-term answer if this turns out to be too slow.
+    Each check re-parses only the statements the edit touched
+    (``lsp.incremental``) and re-proves only the statements whose
+    dependencies changed (``checker_cache``).
     """
     _publish_diagnostics(ls, params.text_document.uri)
 
@@ -622,6 +644,7 @@ def _code_action_from_edit(
 
 
 @server.feature(GOAL_AT_REQUEST)
+@server.thread()
 def on_goal_at(
     ls: LanguageServer, params: object
 ) -> Optional[dict[str, object]]:
@@ -645,7 +668,8 @@ def on_goal_at(
         _position_from_param(pos_obj)
     )
     path = _path_from_uri(uri)
-    goal = _query.goal_at(path, content, pos, prelude=_prelude_for(path))
+    goal = cast(Optional[_query.Goal], _run_query(
+        "goal_at", path, content, pos, prelude=_prelude_for(path)))
     if goal is None:
         return None
     return {
@@ -1000,6 +1024,7 @@ def _lemma_match_payload(m: _query.LemmaMatch) -> dict[str, object]:
 
 
 @server.feature(AVAILABLE_LEMMAS_REQUEST)
+@server.thread()
 def on_available_lemmas_at(
     ls: LanguageServer, params: object
 ) -> list[dict[str, object]]:
@@ -1036,12 +1061,12 @@ def on_available_lemmas_at(
     query = _field_as_str(params, "query")
     limit_obj = _get_field(params, "limit")
     limit = limit_obj if isinstance(limit_obj, int) else 50
-    matches = _query.available_lemmas_at(
-        path, content, pos,
+    matches = cast(tuple[_query.LemmaMatch, ...], _run_query(
+        "available_lemmas_at", path, content, pos,
         query=query,
         prelude=_prelude_for(path),
         limit=limit,
-    )
+    ))
     return [_lemma_match_payload(m) for m in matches]
 
 
@@ -1089,7 +1114,13 @@ def on_insert_lemma(
 
 def main() -> None:
     """Run the server over stdio. Used as the ``__main__`` entry."""
-    server.start_io()
+    global _pool
+    _pool = pool_from_env(_PRELUDE)
+    try:
+        server.start_io()
+    finally:
+        if _pool is not None:
+            _pool.close()
 
 
 if __name__ == "__main__":
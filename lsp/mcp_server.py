@@ -28,6 +28,14 @@ that mirrors ``deduce.py``'s ``--no-stdlib`` flag. Set
 ``test/test-imports/``; otherwise it falls back to the parent
 directory of this module.
 
+Set ``DEDUCE_WORKERS=N`` to answer ``check_file``, ``goal_at`` and
+``available_lemmas_at`` from a pool of ``N`` pre-forked workers (see
+:mod:`lsp.worker_pool`), so concurrent sessions don't queue behind
+one another.
+
+The ``batch`` tool runs a list of the other tools against one version
+of a file in a single round trip.
+
 The MCP boundary stays protocol-specific: the only consumer of
 ``mcp`` lives here. Everything reachable from tests and the LSP
 adapter (Step 9) goes through ``lsp.query``.
@@ -35,12 +43,15 @@ adapter (Step 9) goes through ``lsp.query``.
 
 from __future__ import annotations
 
+import functools
+import inspect
 import os
 import re
 import sys
+from contextvars import ContextVar
 from dataclasses import asdict, dataclass, is_dataclass
 from pathlib import Path
-from typing import Optional, TypeAlias, cast
+from typing import Callable, Optional, TypeAlias, cast
 
 
 JSONValue: TypeAlias = object
@@ -79,6 +90,7 @@ from abstract_syntax import (  # noqa: E402
     add_import_directory,
     init_import_directories,
 )
+from checker_cache import enable_persistent_cache  # noqa: E402
 from flags import RECURSION_LIMIT, set_quiet_mode  # noqa: E402
 
 sys.setrecursionlimit(RECURSION_LIMIT)
@@ -87,6 +99,9 @@ init_import_directories()
 add_import_directory(str(_LIB_DIR))
 if _TEST_IMPORTS_DIR.is_dir():
     add_import_directory(str(_TEST_IMPORTS_DIR))
+# Reuse proof-check verdicts across daemon restarts when asked to.
+if os.environ.get("DEDUCE_PROOF_CACHE"):
+    enable_persistent_cache(os.environ["DEDUCE_PROOF_CACHE"])
 
 
 def _default_prelude() -> tuple[str, ...]:
@@ -130,7 +145,9 @@ def _prelude_for(path: str) -> tuple[str, ...]:
 # ---------------------------------------------------------------------------
 
 
+import anyio  # noqa: E402
 from lsp import query  # noqa: E402
+from lsp.worker_pool import WorkerPool, pool_from_env  # noqa: E402
 from mcp.server.fastmcp import FastMCP  # noqa: E402
 
 
@@ -172,6 +189,25 @@ def _to_list_of_dicts(items: object) -> list[JSONDict]:
     return cast(list[JSONDict], _to_serializable(items))
 
 
+# Started by ``main`` when ``DEDUCE_WORKERS`` asks for one.
+_pool: Optional[WorkerPool] = None
+
+# Set while ``batch`` runs: its operations are answered here, so they
+# share this process's per-hole check cache instead of each landing on
+# whichever pool worker is idle.
+_in_batch: ContextVar[bool] = ContextVar("_in_batch", default=False)
+
+
+async def _run_query(name: str, *args: object, **kwargs: object) -> object:
+    """Call ``query.<name>``: on a pool worker, from a thread so the
+    event loop keeps serving other requests, or here when there is no
+    pool or a ``batch`` is running."""
+    if _pool is None or _in_batch.get():
+        return getattr(query, name)(*args, **kwargs)
+    return await anyio.to_thread.run_sync(
+        functools.partial(_pool.run, name, *args, **kwargs))
+
+
 def _read_file(path: str) -> str:
     """Read a file with the same encoding ``check_file`` uses."""
     with open(path, "r", encoding="utf-8") as f:
@@ -342,7 +378,7 @@ def _position_from_args(
 
 
 @mcp.tool()
-def check_file(
+async def check_file(
     path: str,
     content: Optional[str] = None,
     parser: str = "recursive-descent",
@@ -372,12 +408,12 @@ def check_file(
     """
     text = _read_file(path) if content is None else content
     if parser == "both":
-        rd_diags = query.check(
-            path, text, prelude=_prelude_for(path),
+        rd_diags = await _run_query(
+            "check", path, text, prelude=_prelude_for(path),
             parser="recursive-descent",
         )
-        lalr_diags = query.check(
-            path, text, prelude=_prelude_for(path),
+        lalr_diags = await _run_query(
+            "check", path, text, prelude=_prelude_for(path),
             parser="lalr",
         )
         merged: list[JSONDict] = []
@@ -391,14 +427,14 @@ def check_file(
             f"check_file: parser must be 'recursive-descent', 'lalr', "
             f"or 'both'; got {parser!r}"
         )
-    diagnostics = query.check(
-        path, text, prelude=_prelude_for(path), parser=parser,
+    diagnostics = await _run_query(
+        "check", path, text, prelude=_prelude_for(path), parser=parser,
     )
     return {"diagnostics": _diagnostic_payloads(diagnostics, text, path)}
 
 
 @mcp.tool()
-def goal_at(
+async def goal_at(
     path: str,
     line: Optional[int] = None,
     column: Optional[int] = None,
@@ -431,7 +467,8 @@ def goal_at(
     pos = _position_from_args(
         "goal_at", path, text, line, column, hole_id, hole
     )
-    goal = query.goal_at(path, text, pos, prelude=_prelude_for(path))
+    goal = await _run_query(
+        "goal_at", path, text, pos, prelude=_prelude_for(path))
     return _to_dict_or_none(goal)
 
 
@@ -508,7 +545,8 @@ def refine_at(
 
 @mcp.tool()
 def case_split_at(
-    path: str, line: int, column: int, variable: str
+    path: str, line: int, column: int, variable: str,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Generate a case-split skeleton at the hole at ``line``:``column``,
     splitting on ``variable``.
@@ -528,17 +566,22 @@ def case_split_at(
 
     For a list of valid ``variable`` choices at a given cursor, see
     ``splittable_vars_at``.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     edit = query.case_split_at(
-        path, content, pos, variable, prelude=_prelude_for(path)
+        path, text, pos, variable, prelude=_prelude_for(path)
     )
     return _to_dict_or_none(edit)
 
 
 @mcp.tool()
-def splittable_vars_at(path: str, line: int, column: int) -> list[str]:
+def splittable_vars_at(
+    path: str, line: int, column: int, content: Optional[str] = None,
+) -> list[str]:
     """Return base names of in-scope variables that case-split can
     target at ``line``:``column``.
 
@@ -551,17 +594,21 @@ def splittable_vars_at(path: str, line: int, column: int) -> list[str]:
     would produce a redundant skeleton. Names are sorted and
     deduplicated. Returns ``[]`` when the cursor isn't on a ``?`` or
     no splittable variable is in scope.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     return list(
-        query.splittable_vars_at(path, content, pos, prelude=_prelude_for(path))
+        query.splittable_vars_at(path, text, pos, prelude=_prelude_for(path))
     )
 
 
 @mcp.tool()
 def induction_skeleton_at(
-    path: str, line: int, column: int
+    path: str, line: int, column: int,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Generate an ``induction T`` skeleton for the goal at ``line``:``column``.
 
@@ -583,18 +630,22 @@ def induction_skeleton_at(
     - Emits ``induction T`` (term-level) rather than
       ``switch x``/``cases H``.
     - Adds ``assume IH<N>: ...`` bindings for recursive parameters.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     edit = query.induction_skeleton_at(
-        path, content, pos, prelude=_prelude_for(path)
+        path, text, pos, prelude=_prelude_for(path)
     )
     return _to_dict_or_none(edit)
 
 
 @mcp.tool()
 def eliminate_at(
-    path: str, line: int, column: int, label: str
+    path: str, line: int, column: int, label: str,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Generate a tactic that uses ``label`` to derive a fact (or
     discharge the goal) at the hole at ``line``:``column``.
@@ -619,18 +670,22 @@ def eliminate_at(
     Otherwise returns ``{path, range, new_text}``.
 
     For a list of valid ``label`` choices, see ``eliminable_vars_at``.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     edit = query.eliminate_at(
-        path, content, pos, label, prelude=_prelude_for(path)
+        path, text, pos, label, prelude=_prelude_for(path)
     )
     return _to_dict_or_none(edit)
 
 
 @mcp.tool()
 def eliminable_vars_at(
-    path: str, line: int, column: int
+    path: str, line: int, column: int,
+    content: Optional[str] = None,
 ) -> list[str]:
     """Return labels of in-scope hypotheses that ``eliminate_at`` can
     target at ``line``:``column``.
@@ -641,17 +696,21 @@ def eliminable_vars_at(
     facts are filtered out.  Names are sorted and deduplicated.
     Returns ``[]`` when the cursor isn't on a ``?`` or no eliminable
     binding is in scope.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     return list(
-        query.eliminable_vars_at(path, content, pos, prelude=_prelude_for(path))
+        query.eliminable_vars_at(path, text, pos, prelude=_prelude_for(path))
     )
 
 
 @mcp.tool()
 def fill_from_given_at(
-    path: str, line: int, column: int, label: str
+    path: str, line: int, column: int, label: str,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Fill the hole at ``line``:``column`` with ``conclude <goal> by
     <label>``.
@@ -667,11 +726,14 @@ def fill_from_given_at(
     isn't local.  Otherwise returns ``{path, range, new_text}``.
 
     For a list of valid ``label`` choices, see ``matching_givens_at``.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     edit = query.fill_from_given_at(
-        path, content, pos, label, prelude=_prelude_for(path)
+        path, text, pos, label, prelude=_prelude_for(path)
     )
     return _to_dict_or_none(edit)
 
@@ -707,7 +769,8 @@ def matching_givens_at(
 
 @mcp.tool()
 def preview_conclude_at(
-    path: str, line: int, column: int, label: str
+    path: str, line: int, column: int, label: str,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Preview ``conclude <goal> by <label>`` modulo auto-rule
     normalization at the hole at ``line``:``column``.
@@ -742,12 +805,15 @@ def preview_conclude_at(
     use bare ``check_implies`` (no reduce); this one matches what the
     proof checker actually accepts. Use this to confirm a hypothesis
     discharges the goal before committing an edit.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     return _to_dict_or_none(
         query.preview_conclude_at(
-            path, content, pos, label, prelude=_prelude_for(path)
+            path, text, pos, label, prelude=_prelude_for(path)
         )
     )
 
@@ -757,6 +823,7 @@ def apply_at(
     path: str, line: int, column: int,
     theorem: str,
     args: Optional[list[str]] = None,
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Preview ``apply <theorem>[<args>] to ?`` at the hole at
     ``line``:``column``.
@@ -793,12 +860,15 @@ def apply_at(
     ``cases`` / ... template from a hypothesis): ``eliminate_at`` says
     *what tactic to write*; ``apply_at`` says *whether the apply will
     actually unify with the current goal*.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     return _to_dict_or_none(
         query.apply_at(
-            path, content, pos, theorem,
+            path, text, pos, theorem,
             args=args, prelude=_prelude_for(path),
         )
     )
@@ -858,7 +928,8 @@ def preview_replace_at(
 
 @mcp.tool()
 def preview_expand_at(
-    path: str, line: int, column: int, names: list[str]
+    path: str, line: int, column: int, names: list[str],
+    content: Optional[str] = None,
 ) -> Optional[JSONDict]:
     """Preview the result of ``expand <names>`` at the hole at
     ``line``:``column``.
@@ -883,17 +954,20 @@ def preview_expand_at(
       by that name is in scope.
 
     Pure / read-only: the file on disk is not modified.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
     preview = query.preview_expand_at(
-        path, content, pos, names, prelude=_prelude_for(path)
+        path, text, pos, names, prelude=_prelude_for(path)
     )
     return _to_dict_or_none(preview)
 
 
 @mcp.tool()
-def available_lemmas_at(
+async def available_lemmas_at(
     path: str,
     line: Optional[int] = None,
     column: Optional[int] = None,
@@ -937,13 +1011,12 @@ def available_lemmas_at(
     on-disk file -- both for resolving ``hole_id`` and for the query
     itself.
     """
-    from lsp import query as _q
-
     text = _read_file(path) if content is None else content
     pos = _position_from_args(
         "available_lemmas_at", path, text, line, column, hole_id, hole
     )
-    matches = _q.available_lemmas_at(
+    matches = await _run_query(
+        "available_lemmas_at",
         path,
         text,
         pos,
@@ -955,7 +1028,9 @@ def available_lemmas_at(
 
 
 @mcp.tool()
-def auto_rules_at(path: str, line: int, column: int) -> list[JSONDict]:
+def auto_rules_at(
+    path: str, line: int, column: int, content: Optional[str] = None,
+) -> list[JSONDict]:
     """Return ``auto`` rewrite rules in scope at ``line``:``column``.
 
     Lines and columns are 1-indexed.  Each entry has ``name`` (the
@@ -970,15 +1045,18 @@ def auto_rules_at(path: str, line: int, column: int) -> list[JSONDict]:
     *handled automatically by an auto rule*, or a goal silently
     simplifies before a tactic runs: scan the list for the rewrite
     rule whose equation matches the surprise.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
+    text = _read_file(path) if content is None else content
     pos = query.Position(line=line, column=column)
-    rules = query.auto_rules_at(path, content, pos, prelude=_prelude_for(path))
+    rules = query.auto_rules_at(path, text, pos, prelude=_prelude_for(path))
     return _to_list_of_dicts(rules)
 
 
 @mcp.tool()
-def list_symbols(path: str) -> list[JSONDict]:
+def list_symbols(path: str, content: Optional[str] = None) -> list[JSONDict]:
     """Return all top-level declarations in ``path``.
 
     Includes theorems, lemmas, postulates, defines, recursive
@@ -987,15 +1065,103 @@ def list_symbols(path: str) -> list[JSONDict]:
     only what the user wrote. Each entry has ``name``, ``kind``
     (e.g. ``"theorem"``), ``location``, and an optional
     ``signature``.
+
+    When ``content`` is given, that text is used in place of the
+    on-disk file.
     """
-    content = _read_file(path)
-    syms = query.list_symbols(path, content, prelude=_prelude_for(path))
+    text = _read_file(path) if content is None else content
+    syms = query.list_symbols(path, text, prelude=_prelude_for(path))
     return _to_list_of_dicts(syms)
 
 
+# Tools ``batch`` can run, by name.
+_BATCH_TOOLS: dict[str, Callable[..., object]] = {
+    tool.__name__: tool
+    for tool in (
+        check_file,
+        goal_at,
+        definition_of,
+        refine_at,
+        case_split_at,
+        splittable_vars_at,
+        induction_skeleton_at,
+        eliminate_at,
+        eliminable_vars_at,
+        fill_from_given_at,
+        matching_givens_at,
+        preview_conclude_at,
+        apply_at,
+        preview_replace_at,
+        preview_expand_at,
+        available_lemmas_at,
+        auto_rules_at,
+        list_symbols,
+    )
+}
+
+
+async def _batch_operation(
+    path: str, text: str, operation: JSONDict
+) -> JSONDict:
+    arguments = dict(operation)
+    name = arguments.pop("tool", None)
+    tool = _BATCH_TOOLS.get(name) if isinstance(name, str) else None
+    if tool is None:
+        return {"error": f"batch: unknown tool {name!r}"}
+    for key in ("path", "content"):
+        if key in arguments:
+            return {"error": f"batch: {name}: {key!r} is set by the batch"}
+    try:
+        result = tool(path, content=text, **arguments)
+        if inspect.isawaitable(result):
+            result = await result
+    except Exception as e:
+        return {"error": str(e)}
+    return {"result": result}
+
+
+@mcp.tool()
+async def batch(
+    path: str,
+    operations: list[JSONDict],
+    content: Optional[str] = None,
+) -> list[JSONDict]:
+    """Run several tools against one version of ``path`` and return
+    their results in order.
+
+    Each operation is ``{"tool": <name>, <argument>: <value>, ...}``:
+    the name of any other tool of this server and its arguments,
+    without ``path`` and ``content``. The file is read once -- or
+    ``content`` is used in its place -- and every operation sees that
+    text. Operations on the same hole share one check of it, so
+    ``goal_at``, ``available_lemmas_at``, ``apply_at`` and friends on
+    one hole cost about as much as ``goal_at`` alone.
+
+    Returns one entry per operation: ``{"result": <what the tool
+    returns>}``, or ``{"error": "<message>"}`` when the operation
+    failed (unknown tool, bad arguments, unknown ``hole_id``). A
+    failed operation does not stop the ones after it.
+    """
+    text = _read_file(path) if content is None else content
+    token = _in_batch.set(True)
+    try:
+        return [
+            await _batch_operation(path, text, operation)
+            for operation in operations
+        ]
+    finally:
+        _in_batch.reset(token)
+
+
 def main() -> None:
     """Run the server over stdio. Used as the ``__main__`` entry."""
-    mcp.run()
+    global _pool
+    _pool = pool_from_env(_PRELUDE)
+    try:
+        mcp.run()
+    finally:
+        if _pool is not None:
+            _pool.close()
 
 
 if __name__ == "__main__":
@@ -41,8 +41,10 @@ in user-visible error messages.
 
 import contextlib
 import re
+import threading
 import traceback as _traceback
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
 from lark.tree import Meta
 from typing import (
@@ -61,6 +63,8 @@ if TYPE_CHECKING:
     )
     from abstract_syntax import Union as UnionDecl
     from error import WarningRecord
+    from lsp.lemma_index import LemmaIndex, LemmaShape
+    from lsp.library import CheckResult
 
 
 __all__ = [
@@ -780,9 +784,10 @@ def goal_at(
     ``Goal.range`` is then a degenerate range at the cursor.
 
     ``prelude`` matches the meaning in :func:`check`.
-    """
-    from lsp.library import check_file
 
+    Successive queries on the same hole of an unchanged buffer share
+    one check (see ``_check_at_hole``).
+    """
     # Cursor on (or just past) an existing `?`?  Don't insert a
     # second one -- `_insert_hole` would emit `?\n?` which the parser
     # rejects (issue #341).
@@ -799,14 +804,12 @@ def goal_at(
         goal_range = Range(start=pos, end=pos)
         target = (hole_pos.line, hole_pos.column)
 
-    with _target_hole(target):
-        result = check_file(path, content=modified, prelude=prelude)
-    if result.ok:
+    check = _check_at_hole(path, modified, target, prelude)
+    if check.goal is None:
         # No PHole was hit -- the surrounding proof was already complete
         # without needing the inserted ?. Nothing to report.
         return None
-
-    return _goal_from_exception(result.exception, goal_range)
+    return replace(check.goal, range=goal_range)
 
 
 def _insert_hole(content: str, pos: Position) -> Optional[tuple[str, Position]]:
@@ -869,6 +872,176 @@ def _target_hole(loc: tuple[int, int]) -> Iterator[None]:
         flags.set_target_hole_location(prev)
 
 
+# ---------------------------------------------------------------------------
+# Per-hole check cache
+# ---------------------------------------------------------------------------
+#
+# Editors and agents ask several questions about the same hole in a
+# row -- its goal, its context, which givens match, whether a candidate
+# proof checks -- and each one used to re-run the whole pipeline with
+# the hole targeted.  ``_check_at_hole`` keeps the targeted check, and
+# ``validate_proof_at`` its verdicts, in one small LRU shared by those
+# queries.
+#
+# Keys carry the path, a digest of the buffer (an edit is a new
+# document version), the prelude and the hole's location.  Each entry
+# also records what else its check read: the prelude snapshot, and the
+# modification time of every other module the document imports.  An
+# entry is a miss once either has changed -- ``reset_prelude_cache``,
+# or an imported file saved from another buffer or rewritten by an
+# agent.  Checks whose AST never came back (parse and import errors)
+# are not kept.
+
+# Entries kept; the least recently used is dropped.
+HOLE_CACHE_SIZE = 32
+
+# (file, st_mtime_ns) for each imported module outside the prelude.
+_ImportStamps = tuple[tuple[str, int], ...]
+
+_hole_cache: OrderedDict[
+    tuple[object, ...], tuple[object, _ImportStamps, object]
+] = OrderedDict()
+_hole_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class _HoleCheck:
+    """A check of a document run with one hole targeted.
+
+    ``goal`` is the goal read off the ``IncompleteProof`` the hole
+    raised (its range is the hole's start; callers substitute their
+    own), or ``None`` when the check did not stop at a hole.
+    ``formula`` and ``env`` are the goal AST and the environment at
+    the hole, when the exception carried them.
+    """
+
+    result: "CheckResult"
+    goal: Optional[Goal]
+
+    @property
+    def formula(self) -> Optional["Formula"]:
+        return getattr(self.result.exception, "formula", None)
+
+    @property
+    def env(self) -> Optional["Env"]:
+        return getattr(self.result.exception, "env", None)
+
+
+def clear_hole_cache() -> None:
+    """Forget every cached hole check and proof verdict."""
+    with _hole_cache_lock:
+        _hole_cache.clear()
+
+
+def _content_digest(content: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _import_stamps(
+    ast_nodes: Sequence["Statement"], prelude: Sequence[str]
+) -> _ImportStamps:
+    """Stamp the files of the modules ``ast_nodes`` imports, directly
+    or through other imports, leaving out the ``prelude`` (its modules
+    come from the snapshot)."""
+    import os
+
+    import flags
+    from abstract_syntax import Import as _ImportNode
+
+    stamps = []
+    seen = set(prelude)
+    pending = list(ast_nodes)
+    while pending:
+        stmt = pending.pop()
+        if not isinstance(stmt, _ImportNode) or stmt.name in seen:
+            continue
+        seen.add(stmt.name)
+        for directory in flags.get_import_directories():
+            filename = os.path.join(directory, stmt.name + ".pf")
+            if os.path.isfile(filename):
+                stamps.append((filename, os.stat(filename).st_mtime_ns))
+                break
+        pending.extend(stmt.ast or ())
+    return tuple(sorted(stamps))
+
+
+def _stamps_current(stamps: _ImportStamps) -> bool:
+    import os
+
+    try:
+        return all(os.stat(f).st_mtime_ns == mtime for f, mtime in stamps)
+    except OSError:
+        return False
+
+
+def _hole_cache_get(key: tuple[object, ...]) -> Optional[object]:
+    from lsp import library
+
+    with _hole_cache_lock:
+        entry = _hole_cache.get(key)
+        if entry is None:
+            return None
+        snapshot, stamps, value = entry
+        if snapshot is not library._prelude_context:
+            del _hole_cache[key]
+            return None
+        _hole_cache.move_to_end(key)
+    if not _stamps_current(stamps):
+        with _hole_cache_lock:
+            _hole_cache.pop(key, None)
+        return None
+    return value
+
+
+def _hole_cache_put(
+    key: tuple[object, ...],
+    snapshot: object,
+    result: "CheckResult",
+    prelude: Sequence[str],
+    value: object,
+) -> None:
+    """Store ``value``, computed from ``result``, if the prelude
+    snapshot is still ``snapshot`` -- the one current when the check
+    started."""
+    from lsp import library
+
+    if (result.ast is None or snapshot is None
+            or snapshot is not library._prelude_context):
+        return
+    stamps = _import_stamps(result.ast, prelude)
+    with _hole_cache_lock:
+        _hole_cache[key] = (snapshot, stamps, value)
+        _hole_cache.move_to_end(key)
+        while len(_hole_cache) > HOLE_CACHE_SIZE:
+            _hole_cache.popitem(last=False)
+
+
+def _check_at_hole(
+    path: str, content: str, target: tuple[int, int], prelude: Sequence[str]
+) -> _HoleCheck:
+    """Check ``content`` with the hole at ``target`` targeted, or
+    return the cached check of the same buffer and hole."""
+    from lsp import library
+
+    key = ("hole", path, _content_digest(content), tuple(prelude), target)
+    cached = _hole_cache_get(key)
+    if cached is not None:
+        return cast(_HoleCheck, cached)
+    snapshot = library._prelude_context
+    with _target_hole(target):
+        result = library.check_file(path, content=content, prelude=prelude)
+    at = Position(line=target[0], column=target[1])
+    goal = (
+        None if result.ok
+        else _goal_from_exception(result.exception, Range(start=at, end=at))
+    )
+    check = _HoleCheck(result=result, goal=goal)
+    _hole_cache_put(key, snapshot, result, prelude, check)
+    return check
+
+
 def _find_block_end(s: str) -> Optional[int]:
     """Return the offset in ``s`` where the enclosing proof block closes.
 
@@ -1737,7 +1910,14 @@ def _walk_ast(
     visit(node)
 
     from dataclasses import fields, is_dataclass
+    from abstract_syntax import NatLit
 
+    if isinstance(node, NatLit):
+        # A numeral's layers share one ``suc`` and one ``zero``; walking
+        # them one by one would recurse as deep as its value.
+        _walk_ast(node.rator, visit, ast_class, seen)
+        _walk_ast(node.zero, visit, ast_class, seen)
+        return
     if not is_dataclass(node):
         return
     for f in fields(node):
@@ -1918,11 +2098,8 @@ def refine_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
@@ -2160,11 +2337,8 @@ def case_split_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
@@ -2204,11 +2378,8 @@ def splittable_vars_at(
     if hole_range is None:
         return ()
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return ()
 
@@ -2455,11 +2626,8 @@ def induction_skeleton_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
@@ -2630,9 +2798,8 @@ def eliminate_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
-    result = check_file(path, content=content, prelude=prelude)
+    target = (hole_range.start.line, hole_range.start.column)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
@@ -2672,9 +2839,8 @@ def eliminable_vars_at(
     if hole_range is None:
         return ()
 
-    from lsp.library import check_file
-
-    result = check_file(path, content=content, prelude=prelude)
+    target = (hole_range.start.line, hole_range.start.column)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return ()
 
@@ -2970,15 +3136,10 @@ def fill_from_given_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
-    result = check_file(path, content=content, prelude=prelude)
-    if result.ok:
-        return None
-
-    exc = result.exception
-    env = getattr(exc, "env", None)
-    goal = getattr(exc, "formula", None)
+    check = _check_at_hole(
+        path, content, (hole_range.start.line, hole_range.start.column),
+        prelude)
+    env, goal = check.env, check.formula
     if env is None or goal is None:
         return None
 
@@ -3007,15 +3168,10 @@ def matching_givens_at(
     if hole_range is None:
         return ()
 
-    from lsp.library import check_file
-
-    result = check_file(path, content=content, prelude=prelude)
-    if result.ok:
-        return ()
-
-    exc = result.exception
-    env = getattr(exc, "env", None)
-    goal = getattr(exc, "formula", None)
+    check = _check_at_hole(
+        path, content, (hole_range.start.line, hole_range.start.column),
+        prelude)
+    env, goal = check.env, check.formula
     if env is None or goal is None:
         return ()
 
@@ -3194,15 +3350,10 @@ def preview_conclude_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
-    result = check_file(path, content=content, prelude=prelude)
-    if result.ok:
-        return None
-
-    exc = result.exception
-    env = getattr(exc, "env", None)
-    goal = getattr(exc, "formula", None)
+    check = _check_at_hole(
+        path, content, (hole_range.start.line, hole_range.start.column),
+        prelude)
+    env, goal = check.env, check.formula
     if env is None or goal is None:
         return None
 
@@ -3314,7 +3465,6 @@ def apply_at(
         return None
 
     from error import IncompleteProof
-    from lsp.library import check_file
 
     # Splice ``define`` statements at the hole so user-supplied arg
     # expressions are parsed and type-checked in the surrounding
@@ -3328,8 +3478,7 @@ def apply_at(
         run_content = content
         target = (hole_range.start.line, hole_range.start.column)
 
-    with _target_hole(target):
-        result = check_file(run_path, content=run_content, prelude=prelude)
+    result = _check_at_hole(run_path, run_content, target, prelude).result
     if result.ok:
         return None
 
@@ -3607,20 +3756,14 @@ def hole_context_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
-    if result.ok:
-        return None
-
-    goal = _goal_from_exception(result.exception, hole_range)
+    check = _check_at_hole(path, content, target, prelude)
+    goal = check.goal
     if goal is None:
         return None
 
     if include_lemmas:
-        lemmas = _collect_lemmas_in_scope(result.ast, prelude)
+        lemmas = _collect_lemmas_in_scope(check.result.ast, prelude)
     else:
         lemmas = ()
 
@@ -3685,14 +3828,36 @@ def _collect_lemmas_in_scope(
             module_ast = modules.get(module_name)
             if module_ast is None:
                 continue
-            for stmt in module_ast:
-                info = _lemma_info_for(stmt, public_only=True)
+            for info in _module_lemma_infos(module_name, module_ast):
                 if info is not None:
                     out.append(info)
 
     return tuple(out)
 
 
+# Module name -> (the module's uniquified AST, ``_lemma_info_for(stmt,
+# public_only=True)`` for each of its statements).  Rendering the
+# signatures is most of the cost of collecting lemmas, and every check
+# that starts from the same prelude snapshot shares the module ASTs, so
+# an entry stays good for as long as its AST is the current one.
+_module_lemma_infos_cache: dict[
+    str, tuple[Sequence["Statement"], tuple[Optional[LemmaInfo], ...]]
+] = {}
+
+
+def _module_lemma_infos(
+    module_name: str, module_ast: Sequence["Statement"]
+) -> tuple[Optional[LemmaInfo], ...]:
+    """``_lemma_info_for(stmt, public_only=True)`` for each statement
+    of ``module_ast``, in order, cached per module AST."""
+    cached = _module_lemma_infos_cache.get(module_name)
+    if cached is not None and cached[0] is module_ast:
+        return cached[1]
+    infos = tuple(_lemma_info_for(stmt, public_only=True) for stmt in module_ast)
+    _module_lemma_infos_cache[module_name] = (module_ast, infos)
+    return infos
+
+
 def _lemma_info_for(stmt: "Statement", public_only: bool = False) -> Optional[LemmaInfo]:
     """Build a :class:`LemmaInfo` from a top-level statement, or
     ``None`` if the node isn't surfaced (``Import``, etc.).
@@ -3818,16 +3983,11 @@ def available_lemmas_at(
     env: Optional["Env"] = None
     if hole_range is not None:
         target = (hole_range.start.line, hole_range.start.column)
-        with _target_hole(target):
-            result = check_file(path, content=content, prelude=prelude)
-        if not result.ok:
-            goal = _goal_from_exception(result.exception, hole_range)
-            if goal is not None:
-                goal_text = goal.formula
-            exc = result.exception
-            goal_ast = getattr(exc, "formula", None)
-            env = getattr(exc, "env", None)
-        ast_nodes = result.ast
+        check = _check_at_hole(path, content, target, prelude)
+        if check.goal is not None:
+            goal_text = check.goal.formula
+        goal_ast, env = check.formula, check.env
+        ast_nodes = check.result.ast
     else:
         result = check_file(path, content=content, prelude=prelude)
         ast_nodes = result.ast
@@ -3847,6 +4007,11 @@ def available_lemmas_at(
 
     given_pairs = _collect_local_givens(env)
     typed_by_name = _typed_formula_index(env)
+    index = (
+        _lemma_index(candidates, prelude, typed_by_name)
+        if goal_text is not None or goal_ast is not None
+        else None
+    )
     ranked = _rank_lemmas(
         candidates,
         goal_text,
@@ -3856,6 +4021,7 @@ def available_lemmas_at(
         env=env,
         given_pairs=given_pairs,
         typed_formula_by_name=typed_by_name,
+        index=index,
     )
     if not ranked:
         return ()
@@ -3913,16 +4079,11 @@ def insert_lemma_at(
 
     if hole_range is not None:
         target = (hole_range.start.line, hole_range.start.column)
-        with _target_hole(target):
-            result = check_file(path, content=content, prelude=prelude)
-        if not result.ok:
-            exc = result.exception
-            goal = _goal_from_exception(exc, hole_range)
-            if goal is not None:
-                goal_text = goal.formula
-            goal_ast = getattr(exc, "formula", None)
-            env = getattr(exc, "env", None)
-        ast_nodes = result.ast
+        check = _check_at_hole(path, content, target, prelude)
+        if check.goal is not None:
+            goal_text = check.goal.formula
+        goal_ast, env = check.formula, check.env
+        ast_nodes = check.result.ast
     else:
         result = check_file(path, content=content, prelude=prelude)
         ast_nodes = result.ast
@@ -4098,11 +4259,11 @@ def _collect_lemma_candidates(
     ) -> None:
         if module_ast is None:
             return
-        for stmt in module_ast:
+        infos = _module_lemma_infos(module_name, module_ast)
+        for stmt, info in zip(module_ast, infos):
             if importer is not None and not importer._filter_admits(stmt):
                 continue
             if isinstance(stmt, (Theorem, Postulate)):
-                info = _lemma_info_for(stmt, public_only=True)
                 if info is not None and info.name not in seen_names:
                     seen_names.add(info.name)
                     out.append((info, stmt.what, module_name))
@@ -4151,6 +4312,74 @@ def _collect_lemma_candidates(
     return tuple(out)
 
 
+# The ``LemmaIndex`` over the prelude's lemmas, with the prelude module
+# ASTs it was built from.  Those only change when ``lsp.library`` loads
+# a new prelude snapshot, so comparing them by identity tells whether
+# the index is still current.
+_prelude_lemma_index: Optional[
+    tuple[tuple[Optional[Sequence["Statement"]], ...], "LemmaIndex"]
+] = None
+
+
+def _lemma_shape(formula: "Formula") -> "LemmaShape":
+    from lsp.lemma_index import LemmaShape
+
+    return LemmaShape(_formula_head_symbol(formula), _formula_symbols(formula))
+
+
+def _lemma_index(
+    candidates: tuple[tuple[LemmaInfo, "Formula", str], ...],
+    prelude: Sequence[str],
+    typed_formula_by_name: dict[str, "Formula"],
+) -> "LemmaIndex":
+    """A :class:`LemmaIndex` over ``candidates`` for :func:`_rank_lemmas`.
+
+    The lemmas of the ``prelude`` modules are indexed once per prelude
+    snapshot and kept in ``_prelude_lemma_index``; only the candidates
+    from elsewhere -- the user file and the modules it imports -- are
+    inserted on each call.  Each lemma is filed under its typed formula
+    from ``typed_formula_by_name`` when there is one, since that is the
+    formula the unifier is handed.  The prelude half is filed under the
+    typed formulas of the request that built it; every later request
+    from the same snapshot resolves the prelude's names to the same
+    symbols, so its keys stay valid.
+    """
+    global _prelude_lemma_index
+    from abstract_syntax import Postulate, Theorem, get_uniquified_modules
+    from lsp.lemma_index import LemmaIndex
+
+    modules = get_uniquified_modules()
+    asts = tuple(modules.get(name) for name in prelude)
+    cached = _prelude_lemma_index
+    if (cached is not None and len(cached[0]) == len(asts)
+            and all(a is b for a, b in zip(cached[0], asts))):
+        base = cached[1]
+    else:
+        lemmas = []
+        for module_name, module_ast in zip(prelude, asts):
+            if module_ast is None:
+                continue
+            infos = _module_lemma_infos(module_name, module_ast)
+            for stmt, info in zip(module_ast, infos):
+                if info is None or not isinstance(stmt, (Theorem, Postulate)):
+                    continue
+                lemmas.append((
+                    info.name,
+                    _lemma_shape(stmt.what),
+                    typed_formula_by_name.get(info.name, stmt.what),
+                ))
+        base = LemmaIndex().extend(lemmas)
+        _prelude_lemma_index = (asts, base)
+
+    prelude_set = set(prelude)
+    return base.extend(
+        (info.name, _lemma_shape(formula),
+         typed_formula_by_name.get(info.name, formula))
+        for info, formula, module in candidates
+        if module not in prelude_set
+    )
+
+
 # Operator-like rator names whose appearance in a goal we can extract
 # from rendered text.  Order is the precedence order used by Deduce's
 # pretty printer (coarsely): the lowest-precedence operator that
@@ -4729,6 +4958,7 @@ def _unify_score(
 
     from abstract_syntax import formula_match
     from error import MatchFailed
+    from lsp.lemma_index import may_match
 
     peeled = _peel_quantified_implication(formula)
     if peeled is None:
@@ -4741,10 +4971,11 @@ def _unify_score(
     matching: dict[str, "Term"] = {}
     conc_matched = False
     try:
-        formula_match(location, vars, conc, goal_ast, matching, env)
-        unmatched = [v for v in vars if v.name not in matching]
-        if not unmatched and _matching_respects_var_types(vars, matching):
-            conc_matched = True
+        if may_match(conc, vars, goal_ast):
+            formula_match(location, vars, conc, goal_ast, matching, env)
+            unmatched = [v for v in vars if v.name not in matching]
+            if not unmatched and _matching_respects_var_types(vars, matching):
+                conc_matched = True
     except MatchFailed:
         pass
     except Exception:
@@ -4828,6 +5059,7 @@ def _equation_subterm_match(
     crash the caller."""
     from abstract_syntax import Call, VarRef, formula_match
     from error import MatchFailed
+    from lsp.lemma_index import may_match
 
     if not (
         isinstance(conc, Call)
@@ -4851,6 +5083,10 @@ def _equation_subterm_match(
             if isinstance(side, VarRef) and side in vars:
                 continue
             for sub in subterms:
+                # A failed match costs a reduction of both sides; skip
+                # the subterms whose head symbol rules it out.
+                if not may_match(side, vars, sub):
+                    continue
                 sub_matching: dict[str, "Term"] = {}
                 try:
                     formula_match(location, vars, side, sub, sub_matching, env)
@@ -4906,10 +5142,13 @@ def _rank_lemmas(
     env: Optional["Env"] = None,
     given_pairs: tuple[tuple[str, "Formula"], ...] = (),
     typed_formula_by_name: Optional[dict[str, "Formula"]] = None,
+    index: Optional["LemmaIndex"] = None,
 ) -> list[LemmaMatch]:
     """Score and sort candidate lemmas.
 
-    ``candidates`` is the tuple from :func:`_collect_lemma_candidates`.
+    ``candidates`` is the tuple from :func:`_collect_lemma_candidates`,
+    and ``index`` a :class:`LemmaIndex` over them from
+    :func:`_lemma_index` (built here when not given).
     Returns a list of :class:`LemmaMatch` with normalised relevance
     in ``[0.0, 1.0]``; only candidates with a strictly positive raw
     score are included.
@@ -4938,6 +5177,12 @@ def _rank_lemmas(
     (user-file lemmas first) then alphabetically. This is what makes
     off-hole exploration usable -- an agent can ask "what's in scope
     here?" without inserting a synthetic hole.
+
+    The index keeps both passes away from lemmas that cannot score: a
+    goal-only search visits just the lemmas that share the goal's head
+    or one of its symbols (plus the user file's, which score on
+    proximity), and the unifier only runs on lemmas whose conclusion
+    or equation sides the index says may match.
     """
     goal_head = _goal_head_symbol(goal_text)
     goal_syms = _goal_tokens(goal_text)
@@ -4946,6 +5191,27 @@ def _rank_lemmas(
     has_substring_query = bool(query_substr) and patterns is None
     browse_mode = goal_text is None and not query
     has_unify_signal = goal_ast is not None and env is not None
+    if index is None and not browse_mode:
+        from lsp.lemma_index import LemmaIndex
+
+        typed = typed_formula_by_name or {}
+        index = LemmaIndex().extend(
+            (info.name, _lemma_shape(formula), typed.get(info.name, formula))
+            for info, formula, _module in candidates
+        )
+    # Without a query, a lemma outside the user's module scores only
+    # through the goal's head and symbols.
+    textual = (
+        index.textual_candidates(goal_head, goal_syms)
+        if index is not None and not query and not browse_mode
+        else None
+    )
+    unifiable = (
+        index.unify_candidates(
+            cast("Formula", goal_ast), _iter_subterms(cast("Formula", goal_ast)))
+        if index is not None and has_unify_signal
+        else None
+    )
 
     raw_scores: list[
         tuple[float, LemmaInfo, str, Optional[str], tuple[tuple[str, str], ...]]
@@ -4966,6 +5232,8 @@ def _rank_lemmas(
     ] = []  # (cheap_raw, info, formula, module, proximity-marker)
     for info, formula, module in candidates:
         proximity = 1.0 if module == user_module else 0.0
+        if textual is not None and not proximity and info.name not in textual:
+            continue
 
         sig_lower = info.signature.lower()
         name_lower = info.name.lower()
@@ -4997,14 +5265,17 @@ def _rank_lemmas(
             raw_scores.append((1.0 + proximity, info, module, None, ()))
             continue
 
+        shape = index.shape(info.name) if index is not None else None
+        if shape is None:
+            shape = _lemma_shape(formula)
+
         if goal_head is not None:
-            head = _formula_head_symbol(formula)
-            head_score = 1.0 if head == goal_head else 0.0
+            head_score = 1.0 if shape.head == goal_head else 0.0
         else:
             head_score = 0.0
 
         if goal_syms:
-            symbols = _formula_symbols(formula)
+            symbols = shape.symbols
             shared = goal_syms & symbols
             overlap = len(shared) / len(goal_syms)
             # Jaccard breaks ties between lemmas with the same overlap
@@ -5041,18 +5312,20 @@ def _rank_lemmas(
         prelim.append((cheap_raw, info, formula, module, proximity))
 
     # Second pass: run the unifier only on the K cheapest-ranked
-    # survivors.  K is intentionally a few multiples of the LSP
-    # default ``limit`` (50) -- a lemma that would unify but ranks
-    # outside the top 150 by textual signals is exotic, and the
-    # latency win (≈6s -> ≈1s on stdlib-sized preludes) outweighs
-    # the rare miss.  When a future request needs a bigger window,
-    # widen this constant rather than the per-candidate cost.
+    # survivors, and of those only on the ones the index says may
+    # match (the rest would score 0).  K is intentionally a few
+    # multiples of the LSP default ``limit`` (50) -- a lemma that
+    # would unify but ranks outside the window by textual signals is
+    # exotic, and often a bare-variable conclusion (``x = y``) that
+    # unifies with anything.  When a future request needs a bigger
+    # window, widen this constant rather than the per-candidate cost.
     prelim.sort(key=lambda t: (-t[0], t[1].name))
     UNIFY_TOP_K = 50
     for idx, (cheap_raw, info, formula, module, _proximity) in enumerate(
         prelim
     ):
-        if has_unify_signal and idx < UNIFY_TOP_K:
+        if (has_unify_signal and idx < UNIFY_TOP_K
+                and (unifiable is None or info.name in unifiable)):
             # Prefer the env-resolved typed formula over the parsed
             # one when available: the latter still has OverloadedVar
             # candidate lists for both operators and variable types,
@@ -5170,14 +5443,25 @@ def validate_proof_at(
             error="hole range does not cover a `?` token",
         )
 
-    spliced = content[:start_off] + proof_text + content[end_off:]
+    from lsp import library
 
-    from lsp.library import check_file
+    # Agents re-validate the same candidate; answer repeats from the
+    # hole cache.
+    key = ("validate", path, _content_digest(content), tuple(prelude),
+           (start_off, end_off), _content_digest(proof_text))
+    cached = _hole_cache_get(key)
+    if cached is not None:
+        return cast(ValidationResult, cached)
 
-    result = check_file(path, content=spliced, prelude=prelude)
+    spliced = content[:start_off] + proof_text + content[end_off:]
+    snapshot = library._prelude_context
+    result = library.check_file(path, content=spliced, prelude=prelude)
     if result.ok:
-        return ValidationResult(ok=True, error=None)
-    return ValidationResult(ok=False, error=result.error_message)
+        verdict = ValidationResult(ok=True, error=None)
+    else:
+        verdict = ValidationResult(ok=False, error=result.error_message)
+    _hole_cache_put(key, snapshot, result, prelude, verdict)
+    return verdict
 
 
 # ---------------------------------------------------------------------------
@@ -5225,11 +5509,8 @@ def preview_replace_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
@@ -5364,11 +5645,8 @@ def preview_expand_at(
     if hole_range is None:
         return None
 
-    from lsp.library import check_file
-
     target = (hole_range.start.line, hole_range.start.column)
-    with _target_hole(target):
-        result = check_file(path, content=content, prelude=prelude)
+    result = _check_at_hole(path, content, target, prelude).result
     if result.ok:
         return None
 
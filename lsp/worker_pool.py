@@ -0,0 +1,245 @@
+"""Pre-forked worker pool for the MCP and LSP servers.
+
+A daemon that answers every query itself handles one at a time: each
+``check_file`` holds the pipeline lock for the whole check.
+``WorkerPool`` loads the prelude once in the daemon and forks workers
+that inherit it copy-on-write, the same way ``test-deduce.py`` and
+``lsp.library.check_files`` do. Each query is sent to an idle worker,
+so up to ``size`` queries run at once, each against the worker's own
+copy of the pipeline state.
+
+A worker is retired, and a fresh one forked from the daemon's warm
+state, after ``max_requests`` queries or once its peak RSS has grown
+more than ``max_growth_mb`` since it was forked. Long editor and agent
+sessions therefore don't accumulate per-check garbage in one process.
+If a worker dies mid-query, the daemon answers that query itself.
+
+Only the queries in ``POOLED_QUERIES`` go through the pool. Their
+arguments and results are small frozen dataclasses that pickle
+cheaply; queries that return ASTs or edits stay in the daemon.
+
+The servers start a pool when ``DEDUCE_WORKERS`` is set to a positive
+number (see ``pool_from_env``). ``DEDUCE_WORKER_MAX_REQUESTS`` and
+``DEDUCE_WORKER_MAX_GROWTH_MB`` override the recycling limits.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Optional, Sequence
+
+import lsp.library as _library
+from lsp import query as _query
+
+
+# ``lsp.query`` functions a worker may be asked to run.
+POOLED_QUERIES = frozenset({"check", "goal_at", "available_lemmas_at"})
+
+DEFAULT_MAX_REQUESTS = 200
+DEFAULT_MAX_GROWTH_MB = 1024
+
+
+def _peak_rss_kb() -> int:
+    import resource  # POSIX-only, like the ``fork`` the pool relies on
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _serve(
+    conn: Connection,
+    siblings: list[Connection],
+    max_requests: int,
+    max_growth_kb: int,
+) -> None:
+    """Worker loop: answer ``(name, args, kwargs)`` requests on
+    ``conn`` until the daemon sends ``None``, goes away, or this
+    worker is due to be retired. Each reply is ``((ok, value),
+    retire)``.
+
+    ``siblings`` are the daemon's ends of the other workers' pipes,
+    inherited by the fork. Closing them here means a worker sees EOF
+    as soon as the daemon exits."""
+    for sibling in siblings:
+        sibling.close()
+    baseline = _peak_rss_kb()
+    for served in itertools.count(1):
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        name, args, kwargs = request
+        try:
+            reply: tuple[bool, object] = (
+                True, getattr(_query, name)(*args, **kwargs))
+        except Exception as e:
+            reply = (False, e)
+        retire = (served >= max_requests
+                  or _peak_rss_kb() - baseline > max_growth_kb)
+        try:
+            conn.send((reply, retire))
+        except Exception as e:
+            # The result or exception didn't pickle.
+            conn.send(((False, RuntimeError(
+                f"{name}: could not send the result back: {e}")), retire))
+        if retire:
+            return
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    conn: Connection
+
+
+class WorkerPool:
+    """``size`` forked workers that answer ``lsp.query`` calls.
+
+    ``prelude`` is loaded before the first fork so the workers start
+    warm. ``run`` is thread-safe: callers on different threads are
+    served by different workers, and wait when all of them are busy.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        prelude: Sequence[str] = (),
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        max_growth_mb: int = DEFAULT_MAX_GROWTH_MB,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"WorkerPool: size must be positive; got {size}")
+        self._size = size
+        self._max_requests = max(1, max_requests)
+        self._max_growth_kb = max_growth_mb * 1024
+        self._context = multiprocessing.get_context("fork")
+        self._workers: list[_Worker] = []
+        self._idle: list[_Worker] = []
+        self._closed = False
+        self._cond = threading.Condition()
+        # ``content=""`` runs the pipeline on an empty buffer -- the
+        # cheapest way to make ``check_file`` bootstrap the prelude.
+        _library.check_file("__warmup__.pf", content="", prelude=prelude)
+        self._idle = [self._fork() for _ in range(size)]
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def run(self, name: str, *args: object, **kwargs: object) -> object:
+        """Call ``lsp.query.<name>(*args, **kwargs)`` on an idle worker
+        and return its result, or raise the exception it raised."""
+        if name not in POOLED_QUERIES:
+            raise ValueError(f"WorkerPool.run: {name!r} is not a pooled query")
+        worker = self._acquire()
+        try:
+            worker.conn.send((name, args, kwargs))
+            (ok, value), retire = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died: replace it and answer here.
+            self._retire(worker)
+            return getattr(_query, name)(*args, **kwargs)
+        if retire:
+            self._retire(worker)
+        else:
+            self._release(worker)
+        if ok:
+            return value
+        raise value
+
+    def close(self) -> None:
+        """Stop the idle workers now and the busy ones as they finish."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            self._stop(worker)
+
+    def _fork(self) -> _Worker:
+        # Fork from a quiescent pipeline: not in the middle of a
+        # ``check_file`` running on another of the daemon's threads.
+        # Holding the lock also means one fork at a time, so the
+        # sibling list below is complete.
+        with _library._check_file_lock:
+            ours, theirs = self._context.Pipe()
+            with self._cond:
+                siblings = [w.conn for w in self._workers]
+            process = self._context.Process(
+                target=_serve,
+                args=(theirs, siblings, self._max_requests,
+                      self._max_growth_kb),
+                daemon=True,
+            )
+            process.start()
+            worker = _Worker(process, ours)
+            with self._cond:
+                self._workers.append(worker)
+        theirs.close()
+        return worker
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while not self._idle:
+                if self._closed:
+                    raise RuntimeError("WorkerPool is closed")
+                self._cond.wait()
+            return self._idle.pop()
+
+    def _release(self, worker: _Worker) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.append(worker)
+                self._cond.notify()
+                return
+        self._stop(worker)
+
+    def _retire(self, worker: _Worker) -> None:
+        self._stop(worker)
+        with self._cond:
+            if self._closed:
+                return
+        replacement = self._fork()
+        with self._cond:
+            self._idle.append(replacement)
+            self._cond.notify()
+
+    def _stop(self, worker: _Worker) -> None:
+        with self._cond:
+            self._workers.remove(worker)
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass  # already gone
+        worker.conn.close()
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+
+
+def pool_from_env(prelude: Sequence[str]) -> Optional[WorkerPool]:
+    """The pool configured by ``DEDUCE_WORKERS`` and friends, or
+    ``None`` when it is unset, not positive, or ``fork`` is
+    unavailable."""
+    size = int(os.environ.get("DEDUCE_WORKERS", "0") or 0)
+    if size < 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return WorkerPool(
+        size,
+        prelude,
+        max_requests=int(os.environ.get(
+            "DEDUCE_WORKER_MAX_REQUESTS", DEFAULT_MAX_REQUESTS)),
+        max_growth_mb=int(os.environ.get(
+            "DEDUCE_WORKER_MAX_GROWTH_MB", DEFAULT_MAX_GROWTH_MB)),
+    )
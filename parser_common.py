@@ -6,6 +6,8 @@
 # imperative syntax behind the same flag. This module is the single
 # home for that shared state so the two parsers cannot drift apart.
 
+import functools
+
 from lark import Lark
 from lark.tree import Meta
 
@@ -36,9 +38,16 @@ def make_lark_parser(lalr: bool) -> Lark:
 
     ``parser.py`` parses with the LALR algorithm; ``rec_desc_parser.py``
     only uses the resulting object for its non-contextual ``.lex()``, so
-    it keeps lark's default parser.
+    it keeps lark's default parser.  Building the grammar takes most of
+    a second, and both parsers call this from ``init_parser`` before
+    every file the LSP checks, so the object is built once per grammar
+    file and reused; parsing does not change it.
     """
-    lark_file = get_deduce_directory() + "/Deduce.lark"
+    return _build_lark_parser(get_deduce_directory() + "/Deduce.lark", lalr)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_lark_parser(lark_file: str, lalr: bool) -> Lark:
     grammar = open(lark_file, encoding="utf-8").read()
     if lalr:
         return Lark(grammar, start='program', parser='lalr',
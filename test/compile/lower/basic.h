@@ -9,8 +9,11 @@
 extern deduce_value C_basic__zero_1;
 
 deduce_value F_basic__add_3(deduce_value* env, deduce_value* args);
+deduce_value P_basic__add_3(deduce_value a0, deduce_value a1);
 deduce_value F_basic__add_two_5(deduce_value* env, deduce_value* args);
+deduce_value P_basic__add_two_5(deduce_value a0);
 deduce_value F_basic__pick_6(deduce_value* env, deduce_value* args);
+deduce_value P_basic__pick_6(deduce_value a0, deduce_value a1, deduce_value a2);
 
 extern deduce_value G_basic__two_4;
 
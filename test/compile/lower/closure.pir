@@ -1,5 +1,5 @@
 union MyNat.s0_0 {zero.s0_1/0, suc.s0_2/1}
-fn add.s1_0($scr0, m.s1_1) = match $scr0 { | zero.s0_1 -> m.s1_1 | suc.s0_2(n.s1_2) -> suc.s0_2(add.s1_0(n.s1_2, m.s1_1)) }
+fn add.s1_0($scr0, m.s1_1) loop add.s1_0 = match $scr0 { | zero.s0_1 -> m.s1_1 | suc.s0_2(n.s1_2) -> suc.s0_2([tailcall add.s1_0(n.s1_2, m.s1_1)]) }
 fn adder.s2_2(x.s2_0) = closure[closure$lam1](x.s2_0)
 print adder.s2_2(suc.s0_2(zero.s0_1))(suc.s0_2(suc.s0_2(zero.s0_1)))
 fn closure$lam1[x.s2_0](y.s2_1) = add.s1_0(x.s2_0, y.s2_1)
@@ -0,0 +1,28 @@
+// === module gc ===
+#ifndef DEDUCE_gc_H
+#define DEDUCE_gc_H
+#include "deduce.h"
+
+#define CTOR_gc__zero_1 0
+#define CTOR_gc__suc_2 1
+#define CTOR_gc__empty_4 2
+#define CTOR_gc__node_5 3
+
+extern deduce_value C_gc__zero_1;
+extern deduce_value C_gc__empty_4;
+
+deduce_value F_gc__add_6(deduce_value* env, deduce_value* args);
+deduce_value P_gc__add_6(deduce_value a0, deduce_value a1);
+deduce_value F_gc__mul_7(deduce_value* env, deduce_value* args);
+deduce_value P_gc__mul_7(deduce_value a0, deduce_value a1);
+deduce_value F_gc__build_8(deduce_value* env, deduce_value* args);
+deduce_value P_gc__build_8(deduce_value a0);
+deduce_value F_gc__len_9(deduce_value* env, deduce_value* args);
+deduce_value P_gc__len_9(deduce_value a0);
+deduce_value F_gc__churn_10(deduce_value* env, deduce_value* args);
+deduce_value P_gc__churn_10(deduce_value a0, deduce_value a1);
+
+extern deduce_value G_gc__ten_11;
+
+#endif
+
@@ -0,0 +1,9 @@
+union MyNat.s0_0 {zero.s0_1/0, suc.s0_2/1}
+union MyList.s1_0 {empty.s1_1/0, node.s1_2/2}
+fn add.s2_0($scr0, m.s2_1) loop add.s2_0 = match $scr0 { | zero.s0_1 -> m.s2_1 | suc.s0_2(n.s2_2) -> suc.s0_2([tailcall add.s2_0(n.s2_2, m.s2_1)]) }
+fn mul.s3_0($scr1, m.s3_1) = match $scr1 { | zero.s0_1 -> zero.s0_1 | suc.s0_2(n.s3_2) -> add.s2_0(m.s3_1, mul.s3_0(n.s3_2, m.s3_1)) }
+fn build.s4_0($scr2) loop build.s4_0 = match $scr2 { | zero.s0_1 -> empty.s1_1 | suc.s0_2(n.s4_1) -> node.s1_2(n.s4_1, [tailcall build.s4_0(n.s4_1)]) }
+fn len.s5_0($scr3) loop len.s5_0 = match $scr3 { | empty.s1_1 -> zero.s0_1 | node.s1_2(x.s5_1, xs.s5_2) -> suc.s0_2([tailcall len.s5_0(xs.s5_2)]) }
+fn churn.s6_0($scr4, k.s6_1) loop churn.s6_0 = match $scr4 { | zero.s0_1 -> zero.s0_1 | suc.s0_2(n.s6_2) -> if (len.s5_0(build.s4_0(k.s6_1)) == k.s6_1) then tailcall churn.s6_0(n.s6_2, k.s6_1) else suc.s0_2(zero.s0_1) }
+global ten.s7_0 = suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(suc.s0_2(zero.s0_1))))))))))
+print churn.s6_0(mul.s3_0(ten.s7_0, ten.s7_0), ten.s7_0)
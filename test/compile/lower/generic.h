@@ -10,7 +10,9 @@
 extern deduce_value C_generic__zero_5;
 
 deduce_value F_generic__unbox_2(deduce_value* env, deduce_value* args);
+deduce_value P_generic__unbox_2(deduce_value a0);
 deduce_value F_generic__id_3(deduce_value* env, deduce_value* args);
+deduce_value P_generic__id_3(deduce_value a0);
 
 #endif
 
@@ -9,8 +9,11 @@
 extern deduce_value C_genrecfun__zero_1;
 
 deduce_value F_genrecfun__iszero_3(deduce_value* env, deduce_value* args);
+deduce_value P_genrecfun__iszero_3(deduce_value a0);
 deduce_value F_genrecfun__pred_4(deduce_value* env, deduce_value* args);
+deduce_value P_genrecfun__pred_4(deduce_value a0);
 deduce_value F_genrecfun__count_down_6(deduce_value* env, deduce_value* args);
+deduce_value P_genrecfun__count_down_6(deduce_value a0);
 
 #endif
 
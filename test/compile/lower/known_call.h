@@ -0,0 +1,21 @@
+// === module known_call ===
+#ifndef DEDUCE_known_call_H
+#define DEDUCE_known_call_H
+#include "deduce.h"
+
+#define CTOR_known_call__zero_1 0
+#define CTOR_known_call__suc_2 1
+
+extern deduce_value C_known_call__zero_1;
+
+deduce_value F_known_call__inc_3(deduce_value* env, deduce_value* args);
+deduce_value P_known_call__inc_3(deduce_value a0);
+deduce_value F_known_call__call_on_4(deduce_value* env, deduce_value* args);
+deduce_value P_known_call__call_on_4(deduce_value a0, deduce_value a1);
+deduce_value F_known_call__bump_5(deduce_value* env, deduce_value* args);
+deduce_value P_known_call__bump_5(deduce_value a0, deduce_value a1);
+deduce_value F_known_call__known_call__lam1(deduce_value* env, deduce_value* args);
+deduce_value P_known_call__known_call__lam1(deduce_value* env, deduce_value a0);
+
+#endif
+
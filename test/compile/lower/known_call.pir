@@ -0,0 +1,9 @@
+union MyNat.s0_0 {zero.s0_1/0, suc.s0_2/1}
+fn inc.s1_1(n.s1_0) = suc.s0_2(n.s1_0)
+fn call_on.s2_2(f.s2_0, n.s2_1) = f.s2_0(n.s2_1)
+fn bump.s3_4(k.s3_0, n.s3_1) = closure[known_call$lam1](k.s3_0)(n.s3_1)
+print call_on.s2_2(inc.s1_1, zero.s0_1)
+print call_on.s2_2(inc.s1_1, call_on.s2_2(inc.s1_1, zero.s0_1))
+print bump.s3_4(suc.s0_2(zero.s0_1), zero.s0_1)
+print bump.s3_4(zero.s0_1, suc.s0_2(zero.s0_1))
+fn known_call$lam1[k.s3_0](m.s3_2) = if (m.s3_2 == zero.s0_1) then k.s3_0 else suc.s0_2(k.s3_0)
@@ -0,0 +1,38 @@
+// === module match ===
+#ifndef DEDUCE_match_H
+#define DEDUCE_match_H
+#include "deduce.h"
+
+#define CTOR_match__clubs_1 0
+#define CTOR_match__diamonds_2 1
+#define CTOR_match__hearts_3 2
+#define CTOR_match__spades_4 3
+#define CTOR_match__stars_5 4
+#define CTOR_match__moons_6 5
+#define CTOR_match__suns_7 6
+#define CTOR_match__waves_8 7
+#define CTOR_match__card_10 8
+#define CTOR_match__joker_11 9
+#define CTOR_match__bottom_13 10
+#define CTOR_match__on_14 11
+
+extern deduce_value C_match__clubs_1;
+extern deduce_value C_match__diamonds_2;
+extern deduce_value C_match__hearts_3;
+extern deduce_value C_match__spades_4;
+extern deduce_value C_match__stars_5;
+extern deduce_value C_match__moons_6;
+extern deduce_value C_match__suns_7;
+extern deduce_value C_match__waves_8;
+extern deduce_value C_match__joker_11;
+extern deduce_value C_match__bottom_13;
+
+deduce_value F_match__next_15(deduce_value* env, deduce_value* args);
+deduce_value P_match__next_15(deduce_value a0);
+deduce_value F_match__red_16(deduce_value* env, deduce_value* args);
+deduce_value P_match__red_16(deduce_value a0);
+
+extern deduce_value G_match__deck_17;
+
+#endif
+
@@ -0,0 +1,12 @@
+union Suit.s0_0 {clubs.s0_1/0, diamonds.s0_2/0, hearts.s0_3/0, spades.s0_4/0, stars.s0_5/0, moons.s0_6/0, suns.s0_7/0, waves.s0_8/0}
+union Card.s1_0 {card.s1_1/2, joker.s1_2/0}
+union Deck.s2_0 {bottom.s2_1/0, on.s2_2/2}
+fn next.s3_1(s.s3_0) = match s.s3_0 { | clubs.s0_1 -> diamonds.s0_2 | diamonds.s0_2 -> hearts.s0_3 | hearts.s0_3 -> spades.s0_4 | spades.s0_4 -> stars.s0_5 | stars.s0_5 -> moons.s0_6 | moons.s0_6 -> suns.s0_7 | suns.s0_7 -> waves.s0_8 | waves.s0_8 -> clubs.s0_1 }
+fn red.s4_3(c.s4_0) = match c.s4_0 { | card.s1_1(s.s4_1, up.s4_2) -> match s.s4_1 { | moons.s0_6 -> up.s4_2 | diamonds.s0_2 -> true | hearts.s0_3 -> true | waves.s0_8 -> false | clubs.s0_1 -> false | spades.s0_4 -> false | stars.s0_5 -> false | suns.s0_7 -> if up.s4_2 then false else true } | joker.s1_2 -> false }
+global deck.s5_0 = on.s2_2(card.s1_1(moons.s0_6, true), on.s2_2(card.s1_1(waves.s0_8, false), on.s2_2(joker.s1_2, on.s2_2(card.s1_1(suns.s0_7, true), bottom.s2_1))))
+print next.s3_1(waves.s0_8)
+print next.s3_1(next.s3_1(stars.s0_5))
+print red.s4_3(card.s1_1(moons.s0_6, false))
+print red.s4_3(card.s1_1(hearts.s0_3, false))
+print red.s4_3(joker.s1_2)
+print deck.s5_0
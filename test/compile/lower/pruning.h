@@ -9,6 +9,7 @@
 extern deduce_value C_pruning__zero_1;
 
 deduce_value F_pruning__used_3(deduce_value* env, deduce_value* args);
+deduce_value P_pruning__used_3(deduce_value a0, deduce_value a1);
 
 #endif
 
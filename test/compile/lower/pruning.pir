@@ -1,3 +1,3 @@
 union MyNat.s0_0 {zero.s0_1/0, suc.s0_2/1}
-fn used.s1_0($scr0, m.s1_1) = match $scr0 { | zero.s0_1 -> m.s1_1 | suc.s0_2(n.s1_2) -> suc.s0_2(used.s1_0(n.s1_2, m.s1_1)) }
+fn used.s1_0($scr0, m.s1_1) loop used.s1_0 = match $scr0 { | zero.s0_1 -> m.s1_1 | suc.s0_2(n.s1_2) -> suc.s0_2([tailcall used.s1_0(n.s1_2, m.s1_1)]) }
 print used.s1_0(suc.s0_2(zero.s0_1), suc.s0_2(suc.s0_2(zero.s0_1)))
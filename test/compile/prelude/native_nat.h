@@ -0,0 +1,24 @@
+// === module UIntDiv ===
+#ifndef DEDUCE_UIntDiv_H
+#define DEDUCE_UIntDiv_H
+#include "deduce.h"
+
+deduce_value F_UIntDiv__gcd_4(deduce_value* env, deduce_value* args);
+deduce_value P_UIntDiv__gcd_4(deduce_value a0, deduce_value a1);
+
+#endif
+
+// === module native_nat ===
+#ifndef DEDUCE_native_nat_H
+#define DEDUCE_native_nat_H
+#include "deduce.h"
+
+deduce_value F_native_nat__fact_0(deduce_value* env, deduce_value* args);
+deduce_value P_native_nat__fact_0(deduce_value a0);
+deduce_value F_native_nat__halve_1(deduce_value* env, deduce_value* args);
+deduce_value P_native_nat__halve_1(deduce_value a0);
+deduce_value F_native_nat__ufact_2(deduce_value* env, deduce_value* args);
+deduce_value P_native_nat__ufact_2(deduce_value a0);
+
+#endif
+
@@ -0,0 +1,66 @@
+// === module List ===
+#ifndef DEDUCE_List_H
+#define DEDUCE_List_H
+#include "deduce.h"
+
+#define CTOR_List__empty_1 2
+#define CTOR_List__node_2 3
+
+extern deduce_value C_List__empty_1;
+
+deduce_value F_List___x2b_x2b_5(deduce_value* env, deduce_value* args);
+deduce_value P_List___x2b_x2b_5(deduce_value a0, deduce_value a1);
+deduce_value F_List__map_9(deduce_value* env, deduce_value* args);
+deduce_value P_List__map_9(deduce_value a0, deduce_value a1);
+deduce_value F_List__foldl_11(deduce_value* env, deduce_value* args);
+deduce_value P_List__foldl_11(deduce_value a0, deduce_value a1, deduce_value a2);
+deduce_value F_List__filter_14(deduce_value* env, deduce_value* args);
+deduce_value P_List__filter_14(deduce_value a0, deduce_value a1);
+deduce_value F_List__remove_all_16(deduce_value* env, deduce_value* args);
+deduce_value P_List__remove_all_16(deduce_value a0, deduce_value a1);
+deduce_value F_List__get_17(deduce_value* env, deduce_value* args);
+deduce_value P_List__get_17(deduce_value a0, deduce_value a1);
+deduce_value F_List__take_18(deduce_value* env, deduce_value* args);
+deduce_value P_List__take_18(deduce_value a0, deduce_value a1);
+deduce_value F_List__drop_19(deduce_value* env, deduce_value* args);
+deduce_value P_List__drop_19(deduce_value a0, deduce_value a1);
+deduce_value F_List__last_22(deduce_value* env, deduce_value* args);
+deduce_value P_List__last_22(deduce_value a0);
+
+#endif
+
+// === module Option ===
+#ifndef DEDUCE_Option_H
+#define DEDUCE_Option_H
+#include "deduce.h"
+
+#define CTOR_Option__none_1 0
+#define CTOR_Option__just_2 1
+
+extern deduce_value C_Option__none_1;
+
+#endif
+
+// === module tail_calls ===
+#ifndef DEDUCE_tail_calls_H
+#define DEDUCE_tail_calls_H
+#include "deduce.h"
+
+deduce_value F_tail_calls__down_1(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__down_1(deduce_value a0);
+deduce_value F_tail_calls__sum_3(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__sum_3(deduce_value a0);
+deduce_value F_tail_calls__count_up_4(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__count_up_4(deduce_value a0, deduce_value a1);
+deduce_value F_tail_calls__tail_calls__lam1(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__tail_calls__lam1(deduce_value a0, deduce_value a1);
+deduce_value F_tail_calls__tail_calls__lam2(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__tail_calls__lam2(deduce_value a0);
+deduce_value F_tail_calls__tail_calls__lam3(deduce_value* env, deduce_value* args);
+deduce_value P_tail_calls__tail_calls__lam3(deduce_value a0);
+
+extern deduce_value G_tail_calls__N_0;
+extern deduce_value G_tail_calls__xs_2;
+
+#endif
+
@@ -0,0 +1,15 @@
+#include <stdio.h>
+#include "arr.h"
+
+void deduce_program_main(void) {
+    arr_init();
+    deduce_value a = deduce_make_array(5, DEDUCE_NUM(DEDUCE_UINT, 0));
+    deduce_value* roots[] = { &a };
+    DEDUCE_PUSH_FRAME(roots);
+    P_arr__fill_2(a, DEDUCE_NUM(DEDUCE_UINT, 3));
+    deduce_println(P_arr__sum_0(a));
+    deduce_println(P_arr__write_then_read_1(a, DEDUCE_NUM(DEDUCE_UINT, 2), DEDUCE_NUM(DEDUCE_UINT, 10)));
+    deduce_println(P_arr__sum_0(a));
+    deduce_println(a);
+    DEDUCE_POP_FRAME();
+}
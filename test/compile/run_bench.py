@@ -0,0 +1,268 @@
+"""Benchmark compiled Deduce programs against the interpreter.
+
+Runs each workload in `test/compile/bench/` two ways and checks that
+they print the same:
+
+1. Under the interpreter (`deduce.py file.pf`). The time includes
+   loading the prelude and checking the file, so the runner also
+   times a program with the same imports and nothing else, reported
+   as `startup_s`.
+2. Compiled with `deduce.py --compile` and `cc -O2`. The binary is
+   run once more with `DEDUCE_TRACE_ALLOC=1` to count allocations.
+
+For each it reports the median wall time over `--runs` runs and the
+peak resident set size of the process. The results are also written
+as JSON (`--json`, default `bench_output.json`) so they can be kept
+and compared: `--baseline old.json` prints each time relative to the
+baseline and exits non-zero if one is more than `--tolerance` slower.
+
+Not part of `make tests-compile`; run it with `make bench-compile` or
+from the repo root:
+    python3 test/compile/run_bench.py
+    python3 test/compile/run_bench.py --filter sort --runs 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+BENCH_DIR = ROOT / "test" / "compile" / "bench"
+RUNTIME_DIR = ROOT / "compiler" / "runtime"
+DEFAULT_JSON = ROOT / "bench_output.json"
+SCHEMA = 1
+
+
+@dataclass
+class Run:
+    wall_s: float
+    peak_rss_kb: int
+    stdout: str
+    stderr: str
+
+
+def find_cc() -> "str | None":
+    return shutil.which("cc") or shutil.which("clang") or shutil.which("gcc")
+
+
+def run(cmd: list[str], env: "dict[str, str] | None" = None) -> Run:
+    """Run `cmd` to completion. `os.wait4` gives the resource usage of
+    this one child, where `getrusage` would mix in earlier ones."""
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=str(ROOT), stdout=out, stderr=err,
+                                env=env)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - t0
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode()
+        stderr = err.read().decode()
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(cmd)} exited {proc.returncode}:\n"
+            f"stdout:\n{stdout}\nstderr:\n{stderr}"
+        )
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" \
+        else usage.ru_maxrss
+    return Run(wall, rss, stdout, stderr)
+
+
+def repeat(cmd: list[str], runs: int) -> Run:
+    """The median wall time and the largest peak RSS of `runs` runs."""
+    results = [run(cmd) for _ in range(runs)]
+    return Run(
+        statistics.median(r.wall_s for r in results),
+        max(r.peak_rss_kb for r in results),
+        results[0].stdout, results[0].stderr,
+    )
+
+
+def interpreter_output(stdout: str) -> str:
+    lines = stdout.splitlines()
+    if lines and lines[-1].endswith("is valid"):
+        lines = lines[:-1]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def imports_only(pf: Path, work: Path) -> Path:
+    """A program with `pf`'s imports and a trivial print, for timing
+    the interpreter's start-up."""
+    lines = [line for line in pf.read_text().splitlines()
+             if line.strip().startswith(("import ", "public import "))]
+    out = work / f"{pf.stem}_startup.pf"
+    out.write_text("\n".join(lines) + "\nprint true\n")
+    return out
+
+
+def bench_interpreter(pf: Path, work: Path, runs: int) -> "tuple[dict, str]":
+    deduce = [sys.executable, str(ROOT / "deduce.py"),
+              "--suppress-theorems", "--quiet"]
+    full = repeat([*deduce, str(pf)], runs)
+    startup = repeat([*deduce, str(imports_only(pf, work))], runs)
+    return {
+        "wall_s": full.wall_s,
+        "startup_s": startup.wall_s,
+        "peak_rss_kb": full.peak_rss_kb,
+    }, interpreter_output(full.stdout)
+
+
+def bench_compiled(pf: Path, cc: str, work: Path, runs: int,
+                   opt: str) -> "tuple[dict, str]":
+    c_path = work / f"{pf.stem}.c"
+    bin_path = work / pf.stem
+    compile_run = run([sys.executable, str(ROOT / "deduce.py"),
+                       "--suppress-theorems", "--quiet", "--compile", opt,
+                       "-o", str(c_path), str(pf)])
+    run([cc, "-O2", "-I", str(RUNTIME_DIR), "-o", str(bin_path),
+         str(c_path), str(RUNTIME_DIR / "deduce.c")])
+    binary = repeat([str(bin_path)], runs)
+    traced = run([str(bin_path)],
+                 env={**os.environ, "DEDUCE_TRACE_ALLOC": "1"})
+    allocs = None
+    for line in traced.stderr.splitlines():
+        # `deduce: N allocations`
+        if line.startswith("deduce: ") and line.endswith(" allocations"):
+            allocs = int(line.split()[1])
+    return {
+        "compile_s": compile_run.wall_s,
+        "wall_s": binary.wall_s,
+        "peak_rss_kb": binary.peak_rss_kb,
+        "allocations": allocs,
+    }, binary.stdout
+
+
+def git_commit() -> "str | None":
+    proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=str(ROOT),
+                          capture_output=True, text=True, check=False)
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> bool:
+    """Print each time relative to `baseline`. Returns False if one is
+    more than `tolerance` slower."""
+    old = {w["name"]: w for w in baseline.get("workloads", [])}
+    ok = True
+    print(f"\nrelative to baseline (commit {baseline.get('commit')}):")
+    for w in results:
+        if w["name"] not in old:
+            continue
+        for mode in ("interpreter", "compiled"):
+            if mode not in w or mode not in old[w["name"]]:
+                continue
+            ratio = w[mode]["wall_s"] / old[w["name"]][mode]["wall_s"]
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  SLOWER"
+                ok = False
+            print(f"  {w['name']:<12} {mode:<12} {ratio:6.2f}x{flag}")
+    return ok
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--filter", default=None,
+                    help="only workloads whose name contains this string")
+    ap.add_argument("--runs", type=int, default=3,
+                    help="timed runs per measurement (median is reported)")
+    ap.add_argument("-O", dest="opt", default="2", choices="012",
+                    help="optimization level for the compiled runs")
+    ap.add_argument("--compiled-only", action="store_true",
+                    help="skip the interpreter")
+    ap.add_argument("--json", type=Path, default=DEFAULT_JSON,
+                    help=f"where to write the results (default: "
+                         f"{DEFAULT_JSON.name})")
+    ap.add_argument("--baseline", type=Path, default=None,
+                    help="earlier results to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="slowdown against the baseline that fails the run")
+    args = ap.parse_args()
+
+    cc = find_cc()
+    if cc is None:
+        print("SKIP: no C compiler (cc/clang/gcc) on PATH", file=sys.stderr)
+        return 0
+
+    workloads = sorted(BENCH_DIR.glob("*.pf"))
+    if args.filter:
+        workloads = [w for w in workloads if args.filter in w.stem]
+
+    results: list[dict] = []
+    failures: list[str] = []
+    work = Path(tempfile.mkdtemp(prefix="deduce-bench-"))
+    print(f"{'workload':<12} {'interp':>9} {'startup':>9} {'rss':>8}"
+          f" {'compiled':>9} {'rss':>8} {'allocs':>10} {'speedup':>8}")
+    for pf in workloads:
+        entry: dict = {"name": pf.stem}
+        try:
+            compiled, compiled_out = bench_compiled(
+                pf, cc, work, args.runs, f"-O{args.opt}")
+            entry["compiled"] = compiled
+            if not args.compiled_only:
+                interp, interp_out = bench_interpreter(pf, work, args.runs)
+                entry["interpreter"] = interp
+                if interp_out != compiled_out:
+                    raise RuntimeError(
+                        f"stdout mismatch\n--- interpreter\n{interp_out}"
+                        f"--- compiled\n{compiled_out}"
+                    )
+        except Exception as e:
+            failures.append(f"{pf.name}: {e}")
+            continue
+        results.append(entry)
+
+        c = entry["compiled"]
+        i = entry.get("interpreter")
+        interp_cols = (f"{i['wall_s']:8.2f}s {i['startup_s']:8.2f}s "
+                       f"{i['peak_rss_kb'] // 1024:6d}MB") if i \
+            else f"{'-':>9} {'-':>9} {'-':>8}"
+        speedup = f"{i['wall_s'] / c['wall_s']:7.0f}x" if i else f"{'-':>8}"
+        allocs = c["allocations"] if c["allocations"] is not None else "-"
+        print(f"{pf.stem:<12} {interp_cols} {c['wall_s'] * 1e3:7.1f}ms "
+              f"{c['peak_rss_kb'] // 1024:6d}MB {allocs:>10} {speedup}")
+
+    report = {
+        "schema": SCHEMA,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc)
+        .isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "cc": cc,
+        "opt_level": int(args.opt),
+        "runs": args.runs,
+        "workloads": results,
+    }
+    args.json.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nwrote {args.json}")
+
+    ok = True
+    if args.baseline is not None:
+        ok = compare(results, json.loads(args.baseline.read_text()),
+                     args.tolerance)
+
+    if failures:
+        print(f"\nFAILURES (workdir kept at {work}):")
+        for msg in failures:
+            print(msg)
+        return 1
+    shutil.rmtree(work, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
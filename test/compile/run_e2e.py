@@ -7,6 +7,15 @@ fixtures in `test/compile/lower/`):
 3. Compile that with the system `cc` and link against the runtime.
 4. Run the binary and compare stdout to (1).
 
+Steps 2-4 run twice: at `-O0`, where the fixture's directives
+(`expected-allocs`, `max-stack-kb`, ...) are checked against the code
+the fixture was written for, and at `-O2`, where the optimizer may
+fold much of a fixture away and only the output has to agree.
+
+The runtime is built with `-DDEDUCE_GC_STRESS`, so the collector runs
+before every allocation: a value the generated code forgot to root is
+freed at once and the fixture fails instead of passing by luck.
+
 Skips the whole run with a clear message if `cc` is not available.
 
 Run from the repo root:
@@ -17,6 +26,7 @@ from __future__ import annotations
 
 import argparse
 import os
+import resource
 import shutil
 import subprocess
 import sys
@@ -56,6 +66,18 @@ def expected_allocs(pf: Path) -> int | None:
     return None
 
 
+def max_live_objects(pf: Path) -> int | None:
+    """Look for a `// max-live-objects: N` directive. If present, the
+    runner re-runs the binary with `--gc-stats` and asserts the peak
+    number of heap objects is at most N. Under GC stress the peak is
+    exact, so this checks that garbage is actually reclaimed."""
+    for raw in pf.read_text().splitlines():
+        s = raw.strip()
+        if s.startswith("// max-live-objects:"):
+            return int(s.split(":", 1)[1].strip())
+    return None
+
+
 def expected_runtime_error(pf: Path) -> str | None:
     """Look for an `// expected-runtime-error: <substring>` directive.
     If present, the runner inverts its expectations: the binary must
@@ -68,6 +90,18 @@ def expected_runtime_error(pf: Path) -> str | None:
     return None
 
 
+def max_stack_kb(pf: Path) -> int | None:
+    """Look for a `// max-stack-kb: N` directive. If present, the
+    runner re-runs the binary with its stack limited to N KB and
+    requires the same output, which checks that deep recursion was
+    compiled to loops (Step 12)."""
+    for raw in pf.read_text().splitlines():
+        s = raw.strip()
+        if s.startswith("// max-stack-kb:"):
+            return int(s.split(":", 1)[1].strip())
+    return None
+
+
 def find_cc() -> str | None:
     return shutil.which("cc") or shutil.which("clang") or shutil.which("gcc")
 
@@ -91,11 +125,13 @@ def run_interpreter(pf: Path) -> str:
     return "\n".join(lines) + ("\n" if lines else "")
 
 
-def run_compiled(pf: Path, cc: str, tmp: Path) -> str:
-    c_path = tmp / (pf.stem + ".c")
-    bin_path = tmp / pf.stem
+def run_compiled(pf: Path, cc: str, tmp: Path, opt: str = "-O0") -> str:
+    """Compile `pf` at optimization level `opt`, run it, and return its
+    stdout. The fixture's directives are checked at `-O0` only."""
+    c_path = tmp / f"{pf.stem}{opt}.c"
+    bin_path = tmp / f"{pf.stem}{opt}"
     cmd = [sys.executable, str(ROOT / "deduce.py"),
-           "--suppress-theorems", "--quiet", "--compile",
+           "--suppress-theorems", "--quiet", "--compile", opt,
            "-o", str(c_path), str(pf)]
     if not needs_prelude(pf):
         cmd.insert(2, "--no-stdlib")
@@ -106,7 +142,7 @@ def run_compiled(pf: Path, cc: str, tmp: Path) -> str:
         capture_output=True, text=True,
     )
     subprocess.run(
-        [cc, "-Wall", "-Wextra", "-Werror",
+        [cc, "-Wall", "-Wextra", "-Werror", "-DDEDUCE_GC_STRESS",
          "-I", str(RUNTIME_DIR),
          "-o", str(bin_path),
          str(c_path), str(RUNTIME_DIR / "deduce.c")],
@@ -134,6 +170,8 @@ def run_compiled(pf: Path, cc: str, tmp: Path) -> str:
             f"{pf.name}: compiled binary exit {proc.returncode}:\n"
             f"stdout:\n{proc.stdout}\nstderr:\n{proc.stderr}"
         )
+    if opt != "-O0":
+        return proc.stdout
 
     # If the fixture declares an expected allocation count, re-run
     # under DEDUCE_TRACE_ALLOC=1 and verify.
@@ -159,6 +197,42 @@ def run_compiled(pf: Path, cc: str, tmp: Path) -> str:
             raise RuntimeError(
                 f"{pf.name}: expected {expected} allocations, got {actual}"
             )
+
+    stack_kb = max_stack_kb(pf)
+    if stack_kb is not None:
+        def limit_stack() -> None:
+            size = stack_kb * 1024
+            resource.setrlimit(resource.RLIMIT_STACK, (size, size))
+        small = subprocess.run(
+            [str(bin_path)], capture_output=True, text=True, check=False,
+            preexec_fn=limit_stack,
+        )
+        if small.returncode != 0 or small.stdout != proc.stdout:
+            raise RuntimeError(
+                f"{pf.name}: binary failed with a {stack_kb} KB stack "
+                f"(exit {small.returncode})\nstderr:\n{small.stderr}"
+            )
+
+    limit = max_live_objects(pf)
+    if limit is not None:
+        stats = subprocess.run(
+            [str(bin_path), "--gc-stats"],
+            capture_output=True, text=True, check=False,
+        )
+        # `deduce: gc: ... peak N objects (B bytes)`
+        peak = None
+        for line in stats.stderr.splitlines():
+            if line.startswith("deduce: gc: ") and " peak " in line:
+                peak = int(line.split(" peak ", 1)[1].split()[0])
+        if peak is None:
+            raise RuntimeError(
+                f"{pf.name}: --gc-stats produced no stats line\n"
+                f"stderr:\n{stats.stderr}"
+            )
+        if peak > limit:
+            raise RuntimeError(
+                f"{pf.name}: peak of {peak} live objects exceeds {limit}"
+            )
     return proc.stdout
 
 
@@ -199,6 +273,13 @@ def main() -> int:
     for pf in fixtures:
         try:
             compiled_out = run_compiled(pf, cc, tmp)
+            optimized_out = run_compiled(pf, cc, tmp, "-O2")
+            if optimized_out != compiled_out:
+                raise RuntimeError(
+                    f"-O2 output differs from -O0\n"
+                    f"--- -O0 ({len(compiled_out)} bytes)\n{compiled_out}"
+                    f"--- -O2 ({len(optimized_out)} bytes)\n{optimized_out}"
+                )
             # Fixtures that deliberately panic at runtime aren't
             # expected to match the interpreter's stdout — the panic
             # cuts the program short and the interpreter would have
@@ -23,11 +23,12 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from compiler import closure, emit_c, lower, prune  # noqa: E402
+from compiler import closure, emit_c, lower, prune, tailcall  # noqa: E402
 from abstract_syntax import (  # noqa: E402
     add_import_directory,
     init_import_directories,
 )
+from flags import RECURSION_LIMIT  # noqa: E402
 from lsp.library import check_file  # noqa: E402
 
 LOWER_DIR = ROOT / "test" / "compile" / "lower"
@@ -56,6 +57,7 @@ def headers_for(path: Path) -> str:
         raise RuntimeError(f"{path}: deduce check failed:\n{result.error_message}")
     program = lower.lower_program(result.ast, main_module=path.stem)
     program = closure.closure_convert(program)
+    program = tailcall.loop_tail_calls(program)
     program = prune.prune(program)
 
     modules = emit_c.modules_in(program)
@@ -84,6 +86,7 @@ def main() -> int:
     ap.add_argument("--filter", default=None,
                     help="only run fixtures whose name contains this string")
     args = ap.parse_args()
+    sys.setrecursionlimit(RECURSION_LIMIT)
 
     fixtures: list[Path] = []
     for d in (LOWER_DIR, PRELUDE_DIR):
@@ -4,7 +4,10 @@ For each `*.pf` fixture in `test/compile/lower/`, run the Deduce
 pipeline (parse + uniquify + type-check) without the prelude, then
 hand the post-uniquify AST to `compiler.lower.lower_program` and
 pretty-print the resulting IR. Compare against the sibling `*.ir`
-file, regenerating with `--regenerate` if requested.
+file, regenerating with `--regenerate` if requested. The IR after
+closure conversion (`*.cir`), after the tail-call pass and pruning
+(`*.pir`), and after the same with `-O2` optimization first
+(`*.oir`) are compared the same way.
 
 Run from the repo root:
 
@@ -22,15 +25,16 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(ROOT))
 
-from compiler import closure, ir, lower, prune  # noqa: E402
+from compiler import closure, ir, lower, optimize, prune, tailcall  # noqa: E402
 from lsp.library import check_file  # noqa: E402
 
 
 FIXTURE_DIR = ROOT / "test" / "compile" / "lower"
 
 
-def lower_file(path: Path) -> tuple[str, str, str]:
-    """Returns (post-lower IR, post-closure-conversion IR, post-prune IR)."""
+def lower_file(path: Path) -> tuple[str, str, str, str]:
+    """Returns (post-lower IR, post-closure-conversion IR, the IR
+    after the tail-call pass and pruning, and the same at -O2)."""
     sys.argv = [str(ROOT / "deduce.py")]  # check_file looks at sys.argv[0]
     result = check_file(str(path), prelude=[])
     if not result.ok:
@@ -41,10 +45,14 @@ def lower_file(path: Path) -> tuple[str, str, str]:
     converted = closure.closure_convert(program)
     ir.verify(converted)
     converted_str = ir.pp_program(converted)
-    pruned = prune.prune(converted)
+    pruned = prune.prune(tailcall.loop_tail_calls(converted))
     ir.verify(pruned)
     pruned_str = ir.pp_program(pruned)
-    return lowered_str, converted_str, pruned_str
+    optimized = prune.prune(tailcall.loop_tail_calls(
+        optimize.optimize(converted, 2)))
+    ir.verify(optimized)
+    optimized_str = ir.pp_program(optimized)
+    return lowered_str, converted_str, pruned_str, optimized_str
 
 
 def main() -> int:
@@ -62,12 +70,13 @@ def main() -> int:
     failures: list[str] = []
     for pf in fixtures:
         try:
-            lowered, converted, pruned = lower_file(pf)
+            lowered, converted, pruned, optimized = lower_file(pf)
         except Exception as e:
             failures.append(f"{pf.name}: lowering raised: {e}")
             continue
 
-        for stage, actual in (("ir", lowered), ("cir", converted), ("pir", pruned)):
+        for stage, actual in (("ir", lowered), ("cir", converted),
+                              ("pir", pruned), ("oir", optimized)):
             expect_path = pf.with_suffix("." + stage)
             if args.regenerate:
                 expect_path.write_text(actual)
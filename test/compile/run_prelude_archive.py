@@ -4,7 +4,8 @@ Step 29 of `docs/separate-compile-plan.md`. Builds the prelude
 archive, then verifies a hand-rolled user program that imports
 stdlib modules links against `-ldeduce_prelude` and produces the
 same output as the interpreter. Also confirms the archive is
-reproducible: a second build is byte-identical.
+reproducible: a second build is byte-identical, and a third, with
+nothing changed, recompiles no module.
 
 Run from the repo root:
     python3 test/compile/run_prelude_archive.py
@@ -43,7 +44,7 @@ def find_cc() -> "str | None":
     return shutil.which("cc") or shutil.which("clang") or shutil.which("gcc")
 
 
-def build_prelude() -> None:
+def build_prelude() -> str:
     proc = subprocess.run(
         [sys.executable, str(COMPILER / "compile_prelude.py")],
         cwd=str(ROOT), capture_output=True, text=True, check=False,
@@ -53,6 +54,7 @@ def build_prelude() -> None:
             "compile_prelude.py failed:\n"
             f"stdout:\n{proc.stdout}\nstderr:\n{proc.stderr}"
         )
+    return proc.stdout
 
 
 def main() -> int:
@@ -83,6 +85,11 @@ def main() -> int:
     finally:
         snapshot.unlink(missing_ok=True)
 
+    # Nothing changed since the last build, so nothing is recompiled.
+    if ", 0 recompiled)" not in build_prelude():
+        print("FAIL: an up-to-date prelude was recompiled", file=sys.stderr)
+        return 1
+
     # User-program acceptance.
     work = Path(tempfile.mkdtemp(prefix="deduce-prelude-"))
     try:
@@ -129,7 +136,7 @@ def main() -> int:
     finally:
         shutil.rmtree(work, ignore_errors=True)
 
-    print("ok prelude archive (deterministic + linkable)")
+    print("ok prelude archive (deterministic + incremental + linkable)")
     return 0
 
 
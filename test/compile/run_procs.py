@@ -0,0 +1,147 @@
+"""End-to-end test for compiled imperative procedures.
+
+For each scenario in `test/compile/procs/`, compile the procedures
+in `arr.pf` as a library module (`--compile-module --no-main`),
+link them with the scenario's `main.c` driver against the prelude
+archive, run the binary, and diff stdout against `expected.txt`.
+Procedures are not reachable from `print`, so the driver stands in
+for the caller.
+
+For the `arrays` scenario, also checks that bounds checks follow
+the verifier: accesses the verifier proved in bounds use the
+unchecked runtime entry points, and writes in `fill` (whose loop is
+not verified) keep theirs.
+
+Run from the repo root:
+    python3 test/compile/run_procs.py
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+SCENARIOS_DIR = ROOT / "test" / "compile" / "procs"
+COMPILER = ROOT / "compiler"
+RUNTIME = COMPILER / "runtime"
+INCLUDE_DIR = RUNTIME / "include"
+LIB = ROOT / "lib"
+
+
+def find_cc() -> "str | None":
+    return shutil.which("cc") or shutil.which("clang") or shutil.which("gcc")
+
+
+def build_prelude() -> None:
+    subprocess.run(
+        [sys.executable, str(COMPILER / "compile_prelude.py")],
+        cwd=str(ROOT), capture_output=True, text=True, check=True,
+    )
+
+
+def run_compiled(scenario: Path, cc: str, build_dir: Path) -> "tuple[str, str]":
+    """Compile the scenario, link it with its driver and run it.
+    Returns the generated C and the binary's stdout."""
+    shutil.copy(scenario / "arr.pf", build_dir / "arr.pf")
+    subprocess.run([
+        sys.executable, str(ROOT / "deduce.py"),
+        "--experimental-imperative",
+        "--compile-module", "--no-main", "--no-stdlib",
+        "--dir", str(LIB),
+        "--suppress-theorems", "--quiet",
+        "-o", str(build_dir / "arr.c"),
+        str(build_dir / "arr.pf"),
+    ], cwd=str(ROOT), capture_output=True, text=True, check=True)
+
+    bin_path = build_dir / "app"
+    subprocess.run([
+        cc, "-Wall", "-Wextra", "-Werror",
+        "-I", str(build_dir), "-I", str(INCLUDE_DIR), "-I", str(RUNTIME),
+        "-L", str(RUNTIME),
+        "-o", str(bin_path),
+        str(build_dir / "arr.c"), str(scenario / "main.c"),
+        str(RUNTIME / "deduce.c"),
+        "-ldeduce_prelude",
+    ], check=True, capture_output=True, text=True)
+
+    proc = subprocess.run(
+        [str(bin_path)], capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"compiled binary exit {proc.returncode}:\n"
+            f"stdout:\n{proc.stdout}\nstderr:\n{proc.stderr}"
+        )
+    return (build_dir / "arr.c").read_text(), proc.stdout
+
+
+def function_body(c_src: str, name: str) -> str:
+    """The definition of `name` in `c_src` (not its prototype)."""
+    start = re.search(rf"^deduce_value {name}\(.*\) {{$", c_src, re.M)
+    assert start is not None, f"no definition of {name}"
+    return c_src[start.start():c_src.index("\n}\n", start.start())]
+
+
+def check_bounds(c_src: str) -> "str | None":
+    """`sum` and `write_then_read` are verified, `fill` is not."""
+    for fn in ("P_arr__loop1", "P_arr__write_then_read_1"):
+        body = function_body(c_src, fn)
+        if "deduce_array_get(" in body or "deduce_array_set(" in body:
+            return f"{fn} keeps a bounds check the verifier discharged"
+    body = function_body(c_src, "P_arr__loop2")
+    if "deduce_array_set(" not in body:
+        return "P_arr__loop2 lost the bounds check of an unverified write"
+    return None
+
+
+def main() -> int:
+    cc = find_cc()
+    if cc is None:
+        print("SKIP: no C compiler (cc/clang/gcc) on PATH", file=sys.stderr)
+        return 0
+
+    build_prelude()
+
+    failures: list[str] = []
+    tmp = Path(tempfile.mkdtemp(prefix="deduce-procs-"))
+    for scenario in sorted(d for d in SCENARIOS_DIR.iterdir() if d.is_dir()):
+        build_dir = tmp / scenario.name
+        build_dir.mkdir()
+        try:
+            c_src, out = run_compiled(scenario, cc, build_dir)
+        except subprocess.CalledProcessError as e:
+            failures.append(f"{scenario.name}: {e}\n{e.stdout}\n{e.stderr}")
+            continue
+        except Exception as e:
+            failures.append(f"{scenario.name}: {e}")
+            continue
+        expected = (scenario / "expected.txt").read_text()
+        if out != expected:
+            failures.append(
+                f"{scenario.name}: stdout mismatch\n"
+                f"--- expected\n{expected}--- compiled\n{out}"
+            )
+            continue
+        if scenario.name == "arrays":
+            err = check_bounds(c_src)
+            if err is not None:
+                failures.append(f"arrays: {err}")
+                continue
+        print(f"ok {scenario.name}")
+
+    if failures:
+        print(f"\nFAILURES (workdir kept at {tmp}):")
+        for msg in failures:
+            print(msg)
+        return 1
+    shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
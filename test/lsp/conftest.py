@@ -13,6 +13,8 @@ inherit it automatically.
 
 Tests that need to force a fresh bootstrap call ``reset_prelude_cache``
 explicitly; ordinary tests rely on ``check_file`` to restore state.
+``_fresh_hole_cache`` empties ``lsp.query``'s per-hole cache before
+each test.
 """
 
 import sys
@@ -33,6 +35,7 @@ from abstract_syntax import (  # noqa: E402
     init_import_directories,
 )
 from flags import RECURSION_LIMIT, set_quiet_mode  # noqa: E402
+from lsp.query import clear_hole_cache  # noqa: E402
 
 
 LIB_DIR = REPO_ROOT / "lib"
@@ -48,3 +51,11 @@ def _set_up_globals():
     add_import_directory(str(TEST_IMPORTS_DIR))
     sys.setrecursionlimit(RECURSION_LIMIT)
     yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_hole_cache():
+    """Start each test without cached hole checks, so a test that
+    patches the pipeline sees its own checks run."""
+    clear_hole_cache()
+    yield
@@ -0,0 +1,101 @@
+"""``check_files``: checking several documents at once in forked
+workers, each with its own copy of the post-prelude ``CheckContext``.
+
+What this file pins:
+
+- the results match ``check_file`` on each document, in order,
+- the documents really are checked in other processes,
+- a document whose worker fails is checked again in this process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import lsp.library as _library  # noqa: E402
+from lsp.library import CheckRequest, check_file, check_files  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="check_files needs the fork start method")
+
+
+VALID_FILE = REPO_ROOT / "test" / "should-validate" / "after.pf"
+ERROR_FILE_A = REPO_ROOT / "test" / "should-error" / "advice_and.pf"
+ERROR_FILE_B = REPO_ROOT / "test" / "should-error" / "advice_or.pf"
+
+_HOLE = (
+    "theorem t: all P:bool. if P then P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  ?\n"
+    "end\n"
+)
+
+_REQUESTS = (
+    CheckRequest(str(VALID_FILE)),
+    CheckRequest(str(ERROR_FILE_A), ERROR_FILE_A.read_text()),
+    CheckRequest("hole.pf", _HOLE, collect_errors=True),
+    CheckRequest("broken.pf", "theorem t: true\nproof\n", parser="lalr"),
+    CheckRequest(str(ERROR_FILE_B), collect_errors=True),
+)
+
+
+def _summary(result):
+    return (result.ok, result.module_name, result.error_message,
+            [str(e) for e in result.errors or ()])
+
+
+def _sequential():
+    return [
+        _summary(check_file(r.filename, content=r.content,
+                            collect_errors=r.collect_errors, parser=r.parser))
+        for r in _REQUESTS
+    ]
+
+
+def test_results_match_check_file() -> None:
+    results = check_files(_REQUESTS, jobs=3)
+    assert [_summary(r) for r in results] == _sequential()
+    assert [r.ok for r in results] == [True, False, False, False, False]
+    # The AST stays in the worker.
+    assert all(r.ast is None for r in results)
+
+
+def test_documents_are_checked_in_worker_processes(
+        tmp_path, monkeypatch) -> None:
+    pids = tmp_path / "pids"
+    real_impl = _library._check_file_impl
+
+    def recording(filename, *args, **kwargs):
+        with open(pids, "a", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}\n")
+        return real_impl(filename, *args, **kwargs)
+
+    monkeypatch.setattr(_library, "_check_file_impl", recording)
+    check_files(_REQUESTS, jobs=2)
+    assert str(os.getpid()) not in pids.read_text().split()
+
+
+def _die(index: int) -> None:
+    os._exit(1)
+
+
+def test_failed_worker_is_checked_in_process(monkeypatch) -> None:
+    monkeypatch.setattr(_library, "_check_in_worker", _die)
+    results = check_files(_REQUESTS, jobs=2)
+    assert [_summary(r) for r in results] == _sequential()
+    # Checked here, so the AST is available.
+    assert results[0].ast is not None
+
+
+def test_single_job_uses_check_file() -> None:
+    results = check_files(_REQUESTS[:2], jobs=1)
+    assert [_summary(r) for r in results] == _sequential()[:2]
+    assert results[0].ast is not None
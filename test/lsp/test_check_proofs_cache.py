@@ -493,3 +493,95 @@ def test_predicate_re_check_is_all_hits() -> None:
         f"post-decl AST; called {len(calls)} times: "
         f"{[type(c).__name__ for c in calls]}"
     )
+
+
+# Persistent verdict store.  ``reset_stmt_cache`` drops only the
+# in-memory dict, which is exactly what a fresh process looks like to
+# the on-disk layer, so these tests simulate "next CLI run" without
+# paying for a subprocess + prelude bootstrap.
+
+
+@pytest.fixture
+def _persistent_cache(tmp_path):
+    import checker_cache
+
+    checker_cache.enable_persistent_cache(str(tmp_path))
+    yield tmp_path
+    checker_cache.disable_persistent_cache()
+
+
+def _persisted_rows(directory: Path) -> int:
+    import sqlite3
+
+    import checker_cache
+
+    conn = sqlite3.connect(directory / checker_cache.PERSISTENT_CACHE_FILENAME)
+    try:
+        (count,) = conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+    finally:
+        conn.close()
+    return count
+
+
+def test_persistent_cache_serves_hits_after_memory_reset(_persistent_cache) -> None:
+    check("test.pf", _THREE_THEOREMS)
+    assert _persisted_rows(_persistent_cache) == 3
+
+    proof_checker.reset_stmt_cache()
+    diags = check("test.pf", _THREE_THEOREMS)
+    assert diags == []
+    assert _hits() == 3
+    assert _misses() == 0
+    stats = proof_checker.get_cache_stats()
+    assert stats["persistent_hits"].get("check_proofs", 0) == 3
+
+
+def test_persistent_cache_is_versioned_on_checker_source(
+        _persistent_cache, monkeypatch) -> None:
+    """A verdict stored by one checker version must not be trusted by
+    another: bumping the version makes every stored row unreachable."""
+    import checker_cache
+
+    check("test.pf", _THREE_THEOREMS)
+    proof_checker.reset_stmt_cache()
+    monkeypatch.setattr(checker_cache, "_checker_version", lambda: "other")
+    check("test.pf", _THREE_THEOREMS)
+    assert _hits() == 0
+    assert _misses() == 3
+
+
+def test_persistent_cache_evicts_least_recently_used(tmp_path) -> None:
+    import checker_cache
+
+    checker_cache.enable_persistent_cache(str(tmp_path), max_entries=2)
+    try:
+        check("test.pf", _THREE_THEOREMS)
+    finally:
+        checker_cache.disable_persistent_cache()
+    assert _persisted_rows(tmp_path) == 2
+
+
+def test_hash_ast_is_stable_across_processes() -> None:
+    """The persistent proof-check cache keys verdicts on ``_hash_ast``,
+    so the hash must not depend on the per-process string-hash salt."""
+    import os
+    import subprocess
+
+    script = (
+        "import proof_checker\n"
+        "from test_ast_invariants import _SPECIMEN_FACTORIES, _make\n"
+        "print([proof_checker._hash_ast(_make(c))"
+        " for c in sorted(_SPECIMEN_FACTORIES, key=lambda c: c.__name__)])\n"
+    )
+    outputs = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [str(REPO_ROOT), str(REPO_ROOT / "test" / "unit")]
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        )
+        outputs.add(result.stdout)
+    assert len(outputs) == 1
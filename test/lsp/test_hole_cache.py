@@ -0,0 +1,120 @@
+"""The per-hole check cache shared by the hole queries.
+
+What this file pins:
+
+- a burst of queries on one hole of an unchanged buffer runs one check,
+- editing the buffer, reloading the prelude, or touching a module the
+  buffer imports makes the next query check again,
+- ``validate_proof_at`` checks each candidate proof once,
+- the cache keeps at most ``HOLE_CACHE_SIZE`` entries.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import flags  # noqa: E402
+import lsp.library as library  # noqa: E402
+from lsp import query  # noqa: E402
+from lsp.query import Position  # noqa: E402
+
+
+_HOLE = (
+    "theorem t: all P:bool. if P then P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  assume hp: P\n"
+    "  ?\n"
+    "end\n"
+)
+_POS = Position(line=5, column=3)
+
+
+@pytest.fixture
+def checks(monkeypatch) -> list[str]:
+    """Warm the prelude snapshot, then record the buffer of every
+    ``check_file`` call."""
+    library.check_file("warmup.pf", content="")
+    seen: list[str] = []
+    real_check_file = library.check_file
+
+    def counting(path, *args, content=None, **kwargs):
+        seen.append(content)
+        return real_check_file(path, *args, content=content, **kwargs)
+
+    monkeypatch.setattr(library, "check_file", counting)
+    return seen
+
+
+def test_queries_on_one_hole_share_a_check(checks) -> None:
+    goal = query.goal_at("hole.pf", _HOLE, _POS)
+    assert goal is not None and goal.formula == "P"
+    context = query.hole_context_at("hole.pf", _HOLE, _POS)
+    assert context is not None and context.goal == "P"
+    assert query.matching_givens_at("hole.pf", _HOLE, _POS) == ("hp",)
+    preview = query.preview_conclude_at("hole.pf", _HOLE, _POS, "hp")
+    assert preview is not None and preview["outcome"] == "discharges"
+    assert query.fill_from_given_at("hole.pf", _HOLE, _POS, "hp") is not None
+    query.available_lemmas_at("hole.pf", _HOLE, _POS)
+    assert checks == [_HOLE]
+
+
+def test_an_edit_or_a_new_prelude_checks_again(checks) -> None:
+    query.goal_at("hole.pf", _HOLE, _POS)
+    edited = _HOLE.replace("hp", "h")
+    assert query.matching_givens_at("hole.pf", edited, _POS) == ("h",)
+    assert len(checks) == 2
+
+    library.reset_prelude_cache()
+    library.check_file("warmup.pf", content="")
+    query.goal_at("hole.pf", _HOLE, _POS)
+    # The warm-up after the reset, then the goal query itself.
+    assert len(checks) == 4
+
+
+def test_touching_an_imported_module_checks_again(
+        tmp_path, monkeypatch, checks) -> None:
+    monkeypatch.setattr(
+        flags, "import_directories",
+        flags.import_directories | {str(tmp_path)})
+    dep = tmp_path / "HoleCacheDep.pf"
+    dep.write_text("theorem dep_true: true\nproof\n  .\nend\n")
+    text = "import HoleCacheDep\n\n" + _HOLE
+    pos = Position(line=_POS.line + 2, column=_POS.column)
+
+    query.goal_at("user.pf", text, pos)
+    query.goal_at("user.pf", text, pos)
+    assert len(checks) == 1
+
+    stat = dep.stat()
+    os.utime(dep, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    query.goal_at("user.pf", text, pos)
+    assert len(checks) == 2
+
+
+def test_validate_proof_checks_each_candidate_once(checks) -> None:
+    hole = query.Range(start=_POS, end=Position(_POS.line, _POS.column + 1))
+    for _ in range(3):
+        assert query.validate_proof_at("hole.pf", _HOLE, hole, "hp").ok
+    rejected = query.validate_proof_at("hole.pf", _HOLE, hole, "P")
+    assert not rejected.ok
+    assert query.validate_proof_at("hole.pf", _HOLE, hole, "P") == rejected
+    assert len(checks) == 2
+
+
+def test_cache_is_bounded(monkeypatch, checks) -> None:
+    monkeypatch.setattr(query, "HOLE_CACHE_SIZE", 2)
+    buffers = [_HOLE.replace("hp", label) for label in ("ha", "hb", "hc")]
+    for text in buffers:
+        query.goal_at("hole.pf", text, _POS)
+    query.goal_at("hole.pf", buffers[2], _POS)
+    assert len(checks) == 3
+    query.goal_at("hole.pf", buffers[0], _POS)
+    assert len(checks) == 4
@@ -0,0 +1,133 @@
+"""Statement-level incremental parsing of editor buffers
+(``lsp.incremental``).
+
+What this file pins:
+
+- after any edit, the statements (and their source locations) equal
+  those of a full parse of the new text,
+- only the statements an edit touched are parsed again,
+- an edit that cannot be parsed on its own falls back to a full parse,
+  so diagnostics are unchanged.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from lark.tree import Meta
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import proof_checker  # noqa: E402
+import rec_desc_parser  # noqa: E402
+from lsp import incremental  # noqa: E402
+from lsp.query import check  # noqa: E402
+
+
+_SOURCE = (
+    "union N {\n"
+    "  z\n"
+    "  s(N)\n"
+    "}\n"
+    "\n"
+    "// doubling\n"
+    "recursive dbl(N) -> N {\n"
+    "  dbl(z) = z\n"
+    "  dbl(s(n)) = s(s(dbl(n)))\n"
+    "}\n"
+    "\n"
+    "theorem d1: dbl(s(z)) = s(s(z))\n"
+    "proof\n"
+    "  evaluate\n"
+    "end\n"
+    "\n"
+    "theorem d2: dbl(z) = z\n"
+    "proof\n"
+    "  evaluate\n"
+    "end\n"
+)
+
+_POSITIONS = ("line", "column", "end_line", "end_column", "start_pos",
+              "end_pos")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_documents():
+    incremental.reset_incremental_parses()
+    proof_checker.reset_stmt_cache()
+    rec_desc_parser.set_deduce_directory(str(REPO_ROOT))
+    rec_desc_parser.set_filename("test.pf")
+    rec_desc_parser.init_parser()
+    yield
+    incremental.reset_incremental_parses()
+
+
+def _parse(text: str):
+    return rec_desc_parser.parse(text)
+
+
+def _same(a: object, b: object) -> None:
+    if isinstance(a, Meta):
+        assert isinstance(b, Meta)
+        assert [getattr(a, k, None) for k in _POSITIONS] \
+            == [getattr(b, k, None) for k in _POSITIONS]
+    elif isinstance(a, (list, tuple)):
+        assert type(a) is type(b) and len(a) == len(b)
+        for x, y in zip(a, b):
+            _same(x, y)
+    elif hasattr(a, "__dict__"):
+        assert type(a) is type(b)
+        assert vars(a).keys() == vars(b).keys()
+        for key in vars(a):
+            _same(vars(a)[key], vars(b)[key])
+    else:
+        assert a == b
+
+
+def _incremental(text: str):
+    return incremental.parse_incremental("test.pf", text, _parse)
+
+
+@pytest.mark.parametrize("edit", [
+    lambda t: t.replace("  evaluate\nend\n\ntheorem d2",
+                        "  evaluate\n  // done\nend\n\ntheorem d2"),
+    lambda t: "// header\n\n" + t,
+    lambda t: t.replace("theorem d1", "lemma d1"),
+    lambda t: t.replace("// doubling\n", ""),
+    lambda t: t + "\ntheorem d3: z = z\nproof\n  .\nend\n",
+    lambda t: t[:t.index("theorem d2")],
+])
+def test_incremental_parse_matches_a_full_parse(edit) -> None:
+    _incremental(_SOURCE)
+    edited = edit(_SOURCE)
+    _same(_incremental(edited), _parse(edited))
+
+
+def test_only_the_edited_statement_is_parsed_again() -> None:
+    _incremental(_SOURCE)
+    _incremental(_SOURCE.replace("dbl(z) = z\nproof", "dbl(z) = z\nproof\n"))
+    stats = incremental.get_incremental_parse_stats()
+    assert stats == {"reused": 3, "reparsed": 1, "full": 1}
+
+
+def test_an_open_block_comment_falls_back_to_a_full_parse() -> None:
+    # The comment closes in the last line, which the edit left alone.
+    source = _SOURCE + "// */\n"
+    _incremental(source)
+    edited = source.replace("theorem d1", "/* theorem d1")
+    _same(_incremental(edited), _parse(edited))
+    assert incremental.get_incremental_parse_stats()["full"] == 2
+
+
+def test_diagnostics_after_edits_match_a_fresh_check() -> None:
+    broken = _SOURCE.replace("dbl(s(z)) = s(s(z))", "dbl(s(z)) = s(z)")
+    check("test.pf", _SOURCE)
+    edited = check("test.pf", "\n" + broken)
+    incremental.reset_incremental_parses()
+    proof_checker.reset_stmt_cache()
+    fresh = check("test.pf", "\n" + broken)
+    assert [(d.range.start.line, d.message) for d in edited] \
+        == [(d.range.start.line, d.message) for d in fresh] != []
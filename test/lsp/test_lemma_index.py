@@ -0,0 +1,142 @@
+"""``LemmaIndex``: the conclusion-shape and symbol indexes behind
+``available_lemmas_at``.
+
+What this file pins:
+
+- ``may_match`` rules a pair out only on a head-symbol clash,
+- the index hands the unifier every lemma that unifies with the goal
+  and leaves out lemmas whose conclusion cannot,
+- ``insert`` leaves the original index untouched,
+- the prelude's index is built once per prelude snapshot, and the
+  user file's lemmas are added per request without touching it.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from lark.tree import Meta
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import abstract_syntax as ast  # noqa: E402
+import lsp.query as Q  # noqa: E402
+from lsp.lemma_index import LemmaIndex, LemmaShape, may_match  # noqa: E402
+from lsp.library import check_file, reset_prelude_cache  # noqa: E402
+from lsp.query import Position, available_lemmas_at  # noqa: E402
+
+
+def _var(name: str) -> ast.ResolvedVar:
+    return ast.ResolvedVar(Meta(), None, name)
+
+
+def _call(name: str, *args: ast.Term) -> ast.Call:
+    return ast.Call(Meta(), None, _var(name), list(args))
+
+
+def test_may_match_compares_head_symbols() -> None:
+    x, y = _var("x.1"), _var("y.2")
+    pattern = _call("add.3", _call("suc.4", x), y)
+    assert may_match(pattern, [x, y], _call("add.3", _call("suc.4", _var("a")), _var("b")))
+    assert not may_match(pattern, [x, y], _call("add.3", _var("zero.5"), _var("b")))
+    assert not may_match(pattern, [x, y], _call("mult.6", _var("a"), _var("b")))
+    # Surplus arguments fold into the last one; too few never match.
+    assert may_match(pattern, [x, y], _call("add.3", _var("a"), _var("b"), _var("c")))
+    assert not may_match(pattern, [x, y], _call("add.3", _var("a")))
+    # A pattern variable matches any term, but nothing matches a type.
+    assert may_match(x, [x], _call("mult.6", _var("a")))
+    assert not may_match(x, [x], ast.BoolType(Meta()))
+    # A call can reduce to a Bool.
+    assert may_match(_call("≤.7", x, y), [x, y], ast.Bool(Meta(), None, True))
+
+
+_SOURCE = """\
+union N {
+  z
+  s(N)
+}
+
+recursive add(N, N) -> N {
+  add(z, m) = m
+  add(s(n), m) = s(add(n, m))
+}
+
+recursive dbl(N) -> N {
+  dbl(z) = z
+  dbl(s(n)) = s(s(dbl(n)))
+}
+
+postulate add_z: all n:N. add(n, z) = n
+postulate add_s: all n:N, m:N. add(n, s(m)) = s(add(n, m))
+postulate add_comm: all n:N, m:N. add(n, m) = add(m, n)
+postulate s_inj: all n:N, m:N. if s(n) = s(m) then n = m
+postulate add_or: all n:N, m:N. add(n, m) = n or add(n, m) = m
+postulate dbl_s: all n:N. dbl(s(n)) = s(s(dbl(n)))
+
+theorem goal: all x:N, y:N. add(x, s(y)) = s(add(y, x))
+proof
+  arbitrary x:N, y:N
+  ?
+end
+"""
+
+
+def test_index_keeps_every_lemma_that_unifies() -> None:
+    pos = Position(line=26, column=3)
+    with Q._target_hole((pos.line, pos.column)):
+        result = check_file("index.pf", content=_SOURCE)
+    goal, env = result.exception.formula, result.exception.env
+    candidates = Q._collect_lemma_candidates("index.pf", result.ast, ())
+    typed = Q._typed_formula_index(env)
+    index = Q._lemma_index(candidates, (), typed)
+
+    retrieved = index.unify_candidates(goal, Q._iter_subterms(goal))
+    unifying = {
+        info.name for info, _formula, _module in candidates
+        if Q._unify_score(typed[info.name], goal, env, ())[1] is not None
+    }
+    assert {"add_s", "add_comm", "add_or"} <= unifying
+    assert unifying <= retrieved
+    # Neither side of ``dbl_s`` matches any part of the goal.
+    assert "dbl_s" not in retrieved
+
+
+def test_insert_leaves_the_original_index_alone() -> None:
+    x = _var("x.1")
+    shape = LemmaShape("=", frozenset({"=", "f"}))
+    base = LemmaIndex().insert("f_id", shape, _call("=", _call("f.2", x), x))
+    extended = base.insert("g_id", LemmaShape("=", frozenset({"=", "g"})), None)
+    assert "g_id" in extended and "g_id" not in base
+    assert base.textual_candidates("=", ()) == {"f_id"}
+    assert extended.textual_candidates(None, ("g",)) == {"g_id"}
+
+
+_HOLE = (
+    "theorem with_hole: all P:bool. P = P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  ?\n"
+    "end\n"
+)
+
+_USER_LEMMA = "postulate user_refl: all b:bool. b = b\n\n"
+
+
+def test_prelude_index_is_built_once_per_snapshot(monkeypatch) -> None:
+    monkeypatch.setattr(Q, "_prelude_lemma_index", None)
+    prelude = ("HoleFillPrelude",)
+    available_lemmas_at("user.pf", _HOLE, Position(4, 3), prelude=prelude)
+    first = Q._prelude_lemma_index
+    assert first is not None and "hf_postulate" in first[1]
+
+    matches = available_lemmas_at(
+        "user.pf", _USER_LEMMA + _HOLE, Position(6, 3), prelude=prelude)
+    assert "user_refl" in {m.name for m in matches}
+    assert Q._prelude_lemma_index is first
+    assert "user_refl" not in first[1]
+
+    reset_prelude_cache()
+    available_lemmas_at("user.pf", _HOLE, Position(4, 3), prelude=prelude)
+    assert Q._prelude_lemma_index is not first
@@ -111,6 +111,7 @@ async def test_all_tools_are_registered(server):
             "preview_expand_at",
             "available_lemmas_at",
             "auto_rules_at",
+            "batch",
         }
 
 
@@ -1567,6 +1568,125 @@ async def test_auto_rules_at_returns_empty_when_no_rules_in_scope(
     assert payload == []
 
 
+# --------------------------------------------------------------------------
+# DEDUCE_WORKERS: pooled tools give the same answers
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="the pool needs fork")
+async def test_pooled_tools_match_in_process(server, monkeypatch, tmp_path):
+    from lsp.worker_pool import WorkerPool
+
+    fp = tmp_path / "hole.pf"
+    fp.write_text(
+        "theorem t: all P:bool. if P then P\n"
+        "proof\n"
+        "  arbitrary P:bool\n"
+        "  ?\n"
+        "end\n"
+    )
+    calls = [
+        ("check_file", {"path": str(ERROR_FILE)}),
+        ("check_file", {"path": str(ERROR_FILE), "parser": "both"}),
+        ("goal_at", {"path": str(fp), "line": 4, "column": 3}),
+        ("available_lemmas_at", {"path": str(fp), "line": 4, "column": 3}),
+    ]
+    expected = [await _call(server, name, args) for name, args in calls]
+    pool = WorkerPool(2)
+    monkeypatch.setattr(_server_module, "_pool", pool)
+    try:
+        pooled = [await _call(server, name, args) for name, args in calls]
+    finally:
+        pool.close()
+    assert pooled == expected
+
+
+# --------------------------------------------------------------------------
+# batch
+# --------------------------------------------------------------------------
+
+
+_BATCH_SRC = (
+    "theorem hole_owner: all P:bool. if P then P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  assume H: P\n"
+    "  ?\n"
+    "end\n"
+)
+
+
+@pytest.mark.anyio
+async def test_batch_answers_each_operation_in_order(server, tmp_path):
+    fp = tmp_path / "batch.pf"
+    fp.write_text(_BATCH_SRC.replace("?", "H"))
+    at_hole = {"hole_id": "hole_owner#0"}
+    operations = [
+        {"tool": "goal_at", **at_hole},
+        {"tool": "matching_givens_at", **at_hole},
+        {"tool": "eliminable_vars_at", "line": 5, "column": 3},
+        {"tool": "goal_at", "hole_id": "hole_owner#7"},
+        {"tool": "batch", "operations": []},
+        {"tool": "list_symbols"},
+    ]
+
+    payload = await _call(
+        server, "batch",
+        {"path": str(fp), "operations": operations, "content": _BATCH_SRC},
+    )
+
+    singles = []
+    for op in (operations[0], operations[1], operations[2], operations[5]):
+        args = {k: v for k, v in op.items() if k != "tool"}
+        singles.append(await _call(
+            server, op["tool"],
+            {"path": str(fp), "content": _BATCH_SRC, **args},
+        ))
+    assert [entry.get("result") for entry in payload] == [
+        singles[0], singles[1], singles[2], None, None, singles[3],
+    ]
+    assert singles[1] == ["H"]
+    assert "unknown hole_id" in payload[3]["error"]
+    assert "unknown tool 'batch'" in payload[4]["error"]
+
+
+@pytest.mark.anyio
+async def test_batch_checks_a_hole_once(server, monkeypatch, tmp_path):
+    import lsp.library as library
+
+    fp = tmp_path / "batch-once.pf"
+    fp.write_text(_BATCH_SRC)
+    library.check_file("warmup.pf", content="")
+    checked: list[str] = []
+    real_check_file = library.check_file
+
+    def counting(path, *args, **kwargs):
+        checked.append(path)
+        return real_check_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(library, "check_file", counting)
+    # A batch answers in process; a pool would fail every operation.
+    monkeypatch.setattr(_server_module, "_pool", object())
+    at_hole = {"line": 5, "column": 3}
+    operations = [
+        {"tool": "goal_at", **at_hole},
+        {"tool": "refine_at", **at_hole},
+        {"tool": "eliminate_at", "label": "H", **at_hole},
+        {"tool": "preview_conclude_at", "label": "H", **at_hole},
+        {"tool": "apply_at", "theorem": "H", **at_hole},
+        {"tool": "available_lemmas_at", **at_hole},
+    ]
+
+    payload = await _call(
+        server, "batch", {"path": str(fp), "operations": operations})
+
+    assert all("result" in entry for entry in payload), payload
+    assert payload[0]["result"]["formula"] == "P"
+    assert payload[3]["result"]["outcome"] == "discharges"
+    assert checked == [str(fp)]
+
+
 # --------------------------------------------------------------------------
 # pytest-anyio plumbing -- pytest.mark.anyio needs an event-loop fixture
 # --------------------------------------------------------------------------
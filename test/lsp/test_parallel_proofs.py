@@ -0,0 +1,222 @@
+"""``--jobs N``: checking a file's theorem proofs in a fork pool.
+
+``_check_deduce_body`` records each statement's proof check while
+``collect_env`` runs and hands the uncached theorems to forked workers.
+What this file pins:
+
+- the proofs really are checked in other processes,
+- diagnostics come back identical to, and in the same order as, a
+  sequential run,
+- worker-verified theorems land in the ``check_proofs`` cache,
+- tracing keeps the proofs in the checking process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import abstract_syntax as ast  # noqa: E402
+import flags  # noqa: E402
+import proof_checker  # noqa: E402
+from lsp.query import check  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="--jobs needs the fork start method")
+
+
+_SOURCE = (
+    "theorem t1: true\n"
+    "proof\n"
+    "  .\n"
+    "end\n"
+    "\n"
+    "theorem t2: false\n"
+    "proof\n"
+    "  .\n"
+    "end\n"
+    "\n"
+    "theorem t3: true = true\n"
+    "proof\n"
+    "  reflexive\n"
+    "end\n"
+    "\n"
+    "theorem t4: all P:bool. if P then P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  ?\n"
+    "end\n"
+    "\n"
+    "theorem t5: all P:bool, Q:bool. if P and Q then Q\n"
+    "proof\n"
+    "  arbitrary P:bool, Q:bool\n"
+    "  suppose pq: P and Q\n"
+    "  pq\n"
+    "end\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    proof_checker.reset_stmt_cache()
+    monkeypatch.setattr(flags, "proof_jobs", 1)
+    yield
+    proof_checker.reset_stmt_cache()
+
+
+def _summary(diags) -> list[tuple[int, str]]:
+    return [(d.range.start.line, d.message) for d in diags]
+
+
+def test_parallel_diagnostics_match_sequential(monkeypatch) -> None:
+    sequential = check("test.pf", _SOURCE)
+    proof_checker.reset_stmt_cache()
+    monkeypatch.setattr(flags, "proof_jobs", 3)
+    parallel = check("test.pf", _SOURCE)
+    assert [line for line, _ in _summary(sequential)] == [8, 19]
+    assert _summary(parallel) == _summary(sequential)
+
+
+def test_proofs_are_checked_in_worker_processes(tmp_path, monkeypatch) -> None:
+    pids = tmp_path / "pids"
+    real_check_proofs = proof_checker.check_proofs
+
+    def recording(s, env):
+        with open(pids, "a", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}\n")
+        return real_check_proofs(s, env)
+
+    monkeypatch.setattr(proof_checker, "check_proofs", recording)
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    check("test.pf", _SOURCE)
+    assert set(pids.read_text().split()) - {str(os.getpid())}
+
+
+def test_tracing_keeps_proofs_in_process(tmp_path, monkeypatch) -> None:
+    pids = tmp_path / "pids"
+    real_check_proofs = proof_checker.check_proofs
+
+    def recording(s, env):
+        with open(pids, "a", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}\n")
+        return real_check_proofs(s, env)
+
+    monkeypatch.setattr(proof_checker, "check_proofs", recording)
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    traced = (
+        "union N { z  s(N) }\n"
+        "recursive dbl(N) -> N {\n"
+        "  dbl(z) = z\n"
+        "  dbl(s(n)) = s(s(dbl(n)))\n"
+        "}\n"
+        "trace dbl\n"
+        "\n" + _SOURCE
+    )
+    check("test.pf", traced)
+    assert set(pids.read_text().split()) == {str(os.getpid())}
+
+
+def test_worker_verdicts_are_cached(monkeypatch) -> None:
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    check("test.pf", _SOURCE)
+    stats = proof_checker.get_cache_stats()
+    assert stats["misses"].get("check_proofs") == 5
+    monkeypatch.setattr(flags, "proof_jobs", 1)
+    proof_checker._cache_stats["hits"].clear()
+    check("test.pf", _SOURCE)
+    # The three passing theorems are served from the cache.
+    assert proof_checker.get_cache_stats()["hits"].get("check_proofs") == 3
+
+
+# Imported modules: the ``Import`` arm queues each modified module's
+# proofs and checks the whole import tree in the pool, except for a
+# module that prints.
+
+_BITS = (
+    "union Bit { lo hi }\n"
+    "theorem bit_refl: all b:Bit. b = b\n"
+    "proof arbitrary b:Bit reflexive end\n"
+)
+
+_FLIP = (
+    "import Bits\n"
+    "fun flip(b : Bit) { switch b { case lo { hi } case hi { lo } } }\n"
+    "theorem flip_lo: flip(lo) = hi\n"
+    "proof evaluate end\n"
+)
+
+_BROKEN = (
+    "import Bits\n"
+    "theorem lo_hi: lo = hi\n"
+    "proof evaluate end\n"
+)
+
+
+_LOUD = (
+    "import Bits\n"
+    "import Flip\n"
+    "print flip(lo)\n"
+    "assert flip(hi) = lo\n"
+)
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        flags, "import_directories",
+        flags.import_directories | {str(tmp_path)})
+    for name, src in (("Bits", _BITS), ("Flip", _FLIP), ("Broken", _BROKEN),
+                      ("Loud", _LOUD)):
+        (tmp_path / f"{name}.pf").write_text(src, encoding="utf-8")
+    return tmp_path
+
+
+def test_imported_modules_are_checked_and_summarised(modules, monkeypatch) -> None:
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    assert check("test.pf", "import Flip\n") == []
+    assert (modules / "Bits.thm").is_file()
+    assert (modules / "Flip.thm").is_file()
+
+
+def test_failing_imported_module_reports_like_a_serial_run(
+        modules, tmp_path_factory, monkeypatch) -> None:
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    parallel = check("test.pf", "import Flip\nimport Broken\n")
+
+    serial_dir = tmp_path_factory.mktemp("serial")
+    for name in ("Bits", "Flip", "Broken"):
+        (serial_dir / f"{name}.pf").write_bytes(
+            (modules / f"{name}.pf").read_bytes())
+    monkeypatch.setattr(
+        flags, "import_directories",
+        (flags.import_directories - {str(modules)}) | {str(serial_dir)})
+    monkeypatch.setattr(flags, "proof_jobs", 1)
+    serial = check("test.pf", "import Flip\nimport Broken\n")
+    assert len(serial) == 1
+    assert [d.message.replace(str(serial_dir), "<dir>") for d in serial] \
+        == [d.message.replace(str(modules), "<dir>") for d in parallel]
+    assert sorted(p.name for p in serial_dir.glob("*.thm")) \
+        == sorted(p.name for p in modules.glob("*.thm"))
+
+
+def test_printing_module_is_checked_in_process(
+        modules, tmp_path, monkeypatch) -> None:
+    pids = tmp_path / "pids"
+    real_check_proofs = proof_checker.check_proofs
+
+    def recording(s, env):
+        if isinstance(s, (ast.Print, ast.Assert)):
+            with open(pids, "a", encoding="utf-8") as f:
+                f.write(f"{os.getpid()}\n")
+        return real_check_proofs(s, env)
+
+    monkeypatch.setattr(proof_checker, "check_proofs", recording)
+    monkeypatch.setattr(flags, "proof_jobs", 2)
+    assert check("test.pf", "import Loud\n") == []
+    assert pids.read_text().split() == [str(os.getpid())] * 2
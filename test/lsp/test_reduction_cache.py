@@ -0,0 +1,150 @@
+"""Memoised reductions of ground recursive calls
+(``abstract_syntax.reduction_cache``).
+
+What this file pins:
+
+- diagnostics are identical with the memo table on and off,
+- repeated ground calls are served from the table, and the hits are
+  reported by ``get_cache_stats`` under the ``reduce`` tag,
+- nothing is memoised when the table is disabled,
+- a hit still records the definitions it expanded, and type variables
+  that share a base name get separate entries.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import flags  # noqa: E402
+import proof_checker  # noqa: E402
+from checker_cache import get_cache_stats  # noqa: E402
+from lsp.query import check  # noqa: E402
+
+
+_SOURCE = (
+    "union N {\n"
+    "  z\n"
+    "  s(N)\n"
+    "}\n"
+    "\n"
+    "recursive dbl(N) -> N {\n"
+    "  dbl(z) = z\n"
+    "  dbl(s(n)) = s(s(dbl(n)))\n"
+    "}\n"
+    "\n"
+    "theorem d1: dbl(s(s(z))) = s(s(s(s(z))))\n"
+    "proof\n"
+    "  evaluate\n"
+    "end\n"
+    "\n"
+    "theorem d2: dbl(dbl(s(s(z)))) = dbl(s(s(s(s(z)))))\n"
+    "proof\n"
+    "  evaluate\n"
+    "end\n"
+    "\n"
+    "theorem d3: dbl(s(z)) = s(z)\n"
+    "proof\n"
+    "  evaluate\n"
+    "end\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    proof_checker.reset_stmt_cache()
+    monkeypatch.setattr(flags, "reduction_cache", True)
+    yield
+    proof_checker.reset_stmt_cache()
+
+
+def _summary(diags) -> list[tuple[int, str]]:
+    return [(d.range.start.line, d.message) for d in diags]
+
+
+def test_cached_diagnostics_match_uncached(monkeypatch) -> None:
+    cached = check("test.pf", _SOURCE)
+    proof_checker.reset_stmt_cache()
+    monkeypatch.setattr(flags, "reduction_cache", False)
+    uncached = check("test.pf", _SOURCE)
+    assert [line for line, _ in _summary(cached)] == [23]
+    assert _summary(cached) == _summary(uncached)
+
+
+def test_repeated_ground_calls_hit_the_table() -> None:
+    check("test.pf", _SOURCE)
+    stats = get_cache_stats()
+    assert stats["hits"]["reduce"] > 0
+    assert stats["misses"]["reduce"] > 0
+    assert stats["evictions"]["reduce"] == 0
+
+
+def test_disabled_table_records_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(flags, "reduction_cache", False)
+    check("test.pf", _SOURCE)
+    stats = get_cache_stats()
+    assert stats["hits"]["reduce"] == 0
+    assert stats["misses"]["reduce"] == 0
+
+
+_EXPAND_SOURCE = (
+    "union N {\n"
+    "  z\n"
+    "  s(N)\n"
+    "}\n"
+    "\n"
+    "recursive dbl(N) -> N {\n"
+    "  dbl(z) = z\n"
+    "  dbl(s(n)) = s(s(dbl(n)))\n"
+    "}\n"
+    "\n"
+    "theorem e1: dbl(s(z)) = s(s(dbl(z)))\n"
+    "proof\n"
+    "  expand 2*dbl.\n"
+    "end\n"
+    "\n"
+    "theorem e2: dbl(z) = z\n"
+    "proof\n"
+    "  expand dbl.\n"
+    "end\n"
+)
+
+
+def test_hit_counts_as_an_expansion() -> None:
+    # `dbl(z)` is first reduced while `dbl` was already expanded, and
+    # then served from the table to the `expand dbl` of `e2`.
+    assert _summary(check("test.pf", _EXPAND_SOURCE)) == []
+
+
+_GENERIC_SOURCE = (
+    "union L<T> {\n"
+    "  nil\n"
+    "  cons(T, L<T>)\n"
+    "}\n"
+    "\n"
+    "recursive app<T>(L<T>, L<T>) -> L<T> {\n"
+    "  app(nil, ys) = ys\n"
+    "  app(cons(x, xs), ys) = cons(x, app(xs, ys))\n"
+    "}\n"
+    "\n"
+    "theorem t1: all T:type. app(@nil<T>, @nil<T>) = @nil<T>\n"
+    "proof\n"
+    "  arbitrary T:type\n"
+    "  expand app.\n"
+    "end\n"
+    "\n"
+    "theorem t2: all U:type, T:type. app(@nil<T>, @nil<T>) = @nil<T>\n"
+    "proof\n"
+    "  arbitrary U:type, T:type\n"
+    "  expand app.\n"
+    "end\n"
+)
+
+
+def test_type_variables_with_one_base_name_do_not_share_entries() -> None:
+    assert _summary(check("test.pf", _GENERIC_SOURCE)) == []
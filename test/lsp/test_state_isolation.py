@@ -87,14 +87,14 @@ def test_same_prelude_reuses_snapshot():
     """Two ``check`` calls with the same (empty) prelude should share
     a single snapshot, not bootstrap twice."""
     reset_prelude_cache()
-    assert _library._prelude_snapshot is None
+    assert _library._prelude_context is None
 
     _diags(VALID_FILE)
-    snap_after_first = _library._prelude_snapshot
+    snap_after_first = _library._prelude_context
     assert snap_after_first is not None, "first call should populate snapshot"
 
     _diags(VALID_FILE)
-    assert _library._prelude_snapshot is snap_after_first, (
+    assert _library._prelude_context is snap_after_first, (
         "second call with same prelude should reuse the snapshot"
     )
 
@@ -103,14 +103,13 @@ def test_reset_prelude_cache_forces_rebootstrap():
     """``reset_prelude_cache`` should drop the snapshot so the next
     call bootstraps from scratch."""
     _diags(VALID_FILE)
-    assert _library._prelude_snapshot is not None
+    assert _library._prelude_context is not None
 
     reset_prelude_cache()
-    assert _library._prelude_snapshot is None
-    assert _library._prelude_key is None
+    assert _library._prelude_context is None
 
     _diags(VALID_FILE)
-    assert _library._prelude_snapshot is not None, (
+    assert _library._prelude_context is not None, (
         "after reset, the next call should rebootstrap and re-snapshot"
     )
 
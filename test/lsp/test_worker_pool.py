@@ -0,0 +1,141 @@
+"""``WorkerPool``: pre-forked workers that answer ``lsp.query`` calls
+for the MCP and LSP servers.
+
+What this file pins:
+
+- pooled answers match the in-process query functions,
+- queries really run in the workers, several at a time,
+- workers are recycled after ``max_requests`` queries,
+- a worker's exception is re-raised in the caller, and a query whose
+  worker died is answered in process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from lsp import query  # noqa: E402
+from lsp.worker_pool import WorkerPool  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="the pool needs the fork start method")
+
+
+VALID_FILE = REPO_ROOT / "test" / "should-validate" / "after.pf"
+ERROR_FILE = REPO_ROOT / "test" / "should-error" / "advice_and.pf"
+
+_HOLE = (
+    "theorem t: all P:bool. if P then P\n"
+    "proof\n"
+    "  arbitrary P:bool\n"
+    "  ?\n"
+    "end\n"
+)
+
+
+@pytest.fixture
+def make_pool():
+    pools: list[WorkerPool] = []
+
+    def make(size: int = 2, **kwargs) -> WorkerPool:
+        pools.append(WorkerPool(size, **kwargs))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def _recording(tmp_path, monkeypatch) -> Path:
+    """Make ``query.check`` append the pid it runs in to a file."""
+    pids = tmp_path / "pids"
+    real_check = query.check
+
+    def recording(*args, **kwargs):
+        with open(pids, "a", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}\n")
+        return real_check(*args, **kwargs)
+
+    monkeypatch.setattr(query, "check", recording)
+    return pids
+
+
+def test_answers_match_in_process_queries(make_pool) -> None:
+    pool = make_pool()
+    for path in (VALID_FILE, ERROR_FILE):
+        text = path.read_text()
+        assert pool.run("check", str(path), text) == query.check(str(path), text)
+    pos = query.Position(line=4, column=3)
+    goal = pool.run("goal_at", "hole.pf", _HOLE, pos)
+    assert goal is not None and goal == query.goal_at("hole.pf", _HOLE, pos)
+    assert pool.run("available_lemmas_at", "hole.pf", _HOLE, pos) == \
+        query.available_lemmas_at("hole.pf", _HOLE, pos)
+
+
+def test_queries_run_in_workers_concurrently(
+        tmp_path, monkeypatch, make_pool) -> None:
+    pids = _recording(tmp_path, monkeypatch)
+    pool = make_pool(2)
+    text = ERROR_FILE.read_text()
+    expected = query.check(str(ERROR_FILE), text)
+    pids.unlink()
+    results: list[object] = []
+
+    def ask() -> None:
+        results.append(pool.run("check", str(ERROR_FILE), text))
+
+    threads = [threading.Thread(target=ask) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [expected] * 6
+    seen = set(pids.read_text().split())
+    assert str(os.getpid()) not in seen and len(seen) == 2
+
+
+def test_workers_are_recycled(tmp_path, monkeypatch, make_pool) -> None:
+    pids = _recording(tmp_path, monkeypatch)
+    pool = make_pool(1, max_requests=2)
+    text = VALID_FILE.read_text()
+    for _ in range(5):
+        assert pool.run("check", str(VALID_FILE), text) == []
+    # Two queries per worker: the third worker answered the fifth.
+    assert len(set(pids.read_text().split())) == 3
+
+
+def test_worker_exceptions_are_reraised(monkeypatch, make_pool) -> None:
+    def failing(*args, **kwargs):
+        raise ValueError(f"failed in {os.getpid()}")
+
+    monkeypatch.setattr(query, "check", failing)
+    pool = make_pool(1)
+    with pytest.raises(ValueError, match="failed in") as exc:
+        pool.run("check", str(VALID_FILE), "")
+    assert str(os.getpid()) not in str(exc.value)
+    with pytest.raises(ValueError, match="not a pooled query"):
+        pool.run("list_symbols", str(VALID_FILE), "")
+
+
+def test_dead_worker_is_answered_in_process(monkeypatch, make_pool) -> None:
+    daemon = os.getpid()
+    real_check = query.check
+
+    def dying(*args, **kwargs):
+        if os.getpid() != daemon:
+            os._exit(1)
+        return real_check(*args, **kwargs)
+
+    monkeypatch.setattr(query, "check", dying)
+    pool = make_pool(1)
+    text = ERROR_FILE.read_text()
+    assert pool.run("check", str(ERROR_FILE), text) == \
+        real_check(str(ERROR_FILE), text)
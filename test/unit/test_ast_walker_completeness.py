@@ -162,3 +162,4 @@ def test_mark_walkers_agree_on_opaque_subterms(spec_name: str) -> None:
         find_mark(marked)
     assert exc.value.subject == subject
     assert remove_mark(marked) == ast.And(_meta(), None, [opaque, subject])
+
@@ -0,0 +1,96 @@
+"""The discrimination tree over ``auto`` rules (``AutoRewriteIndex``)."""
+
+from __future__ import annotations
+
+import pytest
+from lark.tree import Meta
+
+import abstract_syntax as ast
+from abstract_syntax import AutoRewriteIndex
+
+
+def _meta() -> Meta:
+    return Meta()
+
+
+def _var(name: str) -> ast.ResolvedVar:
+    return ast.ResolvedVar(_meta(), None, name)
+
+
+def _call(name: str, *args: ast.Term) -> ast.Call:
+    return ast.Call(_meta(), None, _var(name), list(args))
+
+
+def _rule(lhs: ast.Term, *variables: str) -> ast.AutoRewriteRule:
+    return ast.AutoRewriteRule(ast.mkEqual(_meta(), lhs, lhs),
+                               [_var(x) for x in variables], [], lhs, lhs)
+
+
+_ZERO_LEFT = _rule(_call("add.1", _var("zero.2"), _var("y.5")), "y.5")
+_SUC_LEFT = _rule(_call("add.1", _call("suc.3", _var("x.4")), _var("y.5")),
+                  "x.4", "y.5")
+_ZERO_RIGHT = _rule(_call("add.1", _var("x.4"), _var("zero.2")), "x.4")
+_RULES = [_ZERO_LEFT, _SUC_LEFT, _ZERO_RIGHT]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    ast.reset_auto_rewrite_stats()
+    yield
+    ast.reset_auto_rewrite_stats()
+
+
+def _index() -> AutoRewriteIndex:
+    return AutoRewriteIndex.build({"add": _RULES})
+
+
+def test_lookup_skips_rules_whose_arguments_cannot_match() -> None:
+    term = _call("add.1", _call("suc.3", _var("a.6")), _var("b.7"))
+    assert _index().candidates("add", term) == [_SUC_LEFT]
+    assert ast.get_auto_rewrite_stats() == {"candidates": 1, "pruned": 2}
+
+
+def test_lookup_keeps_declaration_order() -> None:
+    term = _call("add.1", _var("zero.2"), _var("zero.2"))
+    assert _index().candidates("add", term) == [_ZERO_LEFT, _ZERO_RIGHT]
+
+
+def test_nested_same_head_and_extra_arguments_disable_pruning() -> None:
+    nested = _call("add.1", _var("a.6"), _call("add.1", _var("b.7"), _var("c.8")))
+    assert _index().candidates("add", nested) == _RULES
+    wide = _call("add.1", _var("a.6"), _var("b.7"), _var("c.8"))
+    assert _index().candidates("add", wide) == _RULES
+
+
+def test_calls_and_bools_are_not_told_apart() -> None:
+    # The matcher's fallback reduces both sides, so a pattern call may
+    # become a Bool.
+    rule = _rule(_call("not.9", _call("le.10", _var("x.4"), _var("x.4"))), "x.4")
+    index = AutoRewriteIndex().insert("not", rule)
+    term = _call("not.9", ast.Bool(_meta(), None, True))
+    assert index.candidates("not", term) == [rule]
+
+
+def test_insert_leaves_the_old_index_unchanged() -> None:
+    old = AutoRewriteIndex.build({"add": [_ZERO_LEFT]})
+    new = old.insert("add", _ZERO_RIGHT)
+    term = _call("add.1", _var("zero.2"), _var("zero.2"))
+    assert old.candidates("add", term) == [_ZERO_LEFT]
+    assert new.candidates("add", term) == [_ZERO_LEFT, _ZERO_RIGHT]
+
+
+def test_env_candidates_fall_back_like_get_auto_rewrites() -> None:
+    fallback = _rule(_var("c.11"))
+    env = ast.Env({
+        "__auto__": ast.AutoEquationBinding(
+            location=_meta(),
+            module="M",
+            equations={"add": _RULES},
+            fallback_equations=[fallback],
+        )
+    })
+    term = _call("add.1", _call("suc.3", _var("a.6")), _var("b.7"))
+    assert env.get_auto_rewrite_candidates(term) == [_SUC_LEFT]
+    assert env.get_auto_rewrite_candidates(_call("mul.12", _var("a.6"))) \
+        == [fallback]
+    assert env.get_auto_rewrite_candidates(_var("a.6")) == [fallback]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+
+from lark.tree import Meta
+
+import abstract_syntax as ast
+from abstract_syntax import BindingMap
+
+
+def _meta() -> Meta:
+    return Meta()
+
+
+def test_binding_map_matches_dict_semantics() -> None:
+    """Random assignments and deletions, with enough bindings to fold
+    the delta into the base several times, agree with a plain dict on
+    contents and iteration order."""
+    rng = random.Random(7)
+    names = [f"n{i % 150}.{i}" for i in range(600)]
+    bindings = BindingMap()
+    expected: dict[str, object] = {}
+    for step in range(3000):
+        name = rng.choice(names)
+        if expected and rng.random() < 0.02:
+            victim = rng.choice(list(expected))
+            del bindings[victim]
+            del expected[victim]
+        else:
+            bindings[name] = step
+            expected[name] = step
+    assert list(bindings.items()) == list(expected.items())
+    assert len(bindings) == len(expected)
+    assert list(reversed(bindings)) == list(reversed(expected))
+    for base in {ast.base_name(n) for n in names}:
+        assert bindings.names_with_base(base) == tuple(
+            n for n in expected if ast.base_name(n) == base)
+
+
+def test_extended_maps_do_not_see_each_others_updates() -> None:
+    parent = BindingMap({f"x.{i}": i for i in range(100)})
+    left, right = parent.extend(), parent.extend()
+    for i in range(200):
+        left[f"l.{i}"] = i
+    right["x.3"] = "rebound"
+    assert "l.0" not in parent and "l.0" not in right
+    assert parent["x.3"] == 3 and left["x.3"] == 3
+    assert right["x.3"] == "rebound"
+    assert list(right)[3] == "x.3"
+    assert left.names_with_base("l") == tuple(f"l.{i}" for i in range(200))
+
+
+def test_env_overload_lookup_uses_the_base_name_index() -> None:
+    nat = ast.Var(_meta(), None, "Nat")
+    env = ast.Env().declare_module("M")
+    for name in ("+.1", "len.2", "+.3", "+.4"):
+        env = env.declare_term_var(_meta(), name, nat)
+    inner = env.declare_term_var(_meta(), "+.5", nat, local=True)
+    assert env.base_to_overloads("+") == ["+.1", "+.3", "+.4"]
+    assert inner.base_to_overloads("+") == ["+.1", "+.3", "+.4", "+.5"]
+    assert inner.base_to_unique("len") == "len.2"
+    assert env.base_to_unique("missing") is None
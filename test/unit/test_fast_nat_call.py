@@ -0,0 +1,61 @@
+"""Python-int arithmetic on Nat literals (``abstract_syntax.terms.fast_nat_call``).
+
+The shortcut stands in for the prelude's own ``lib/NatDefs.pf`` /
+``lib/NatDiv.pf`` operators only.  A user operator that shares one of
+their names, even in a file that shares the module's name, must be
+evaluated by its own definition.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+
+_CLASHING = """
+union Nat { zero  suc(Nat) }
+
+recursive operator ≤(Nat, Nat) -> bool {
+  operator ≤(zero, m) = false
+  operator ≤(suc(n), m) = n ≤ m
+}
+
+recursive operator ∸(Nat, Nat) -> Nat {
+  operator ∸(zero, m) = suc(zero)
+  operator ∸(suc(n), m) = n ∸ m
+}
+
+define one = suc(zero)
+define two = suc(suc(zero))
+"""
+
+
+def _run(tmp_path, body: str,
+         filename: str = "fast_nat_test.pf") -> subprocess.CompletedProcess:
+    pf = tmp_path / filename
+    pf.write_text(_CLASHING + body)
+    return subprocess.run(
+        [sys.executable, str(REPO_ROOT / "deduce.py"), "--no-stdlib",
+         "--suppress-theorems", str(pf)],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_user_operators_are_not_computed_as_python_ints(tmp_path) -> None:
+    result = _run(tmp_path, "print zero ≤ two\nprint zero ∸ two\n")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.splitlines()[:2] == ["false", "suc(zero)"]
+
+
+def test_assert_uses_the_user_operator(tmp_path) -> None:
+    result = _run(tmp_path, "assert one ≤ two\n")
+    assert result.returncode != 0
+    assert "assertion failed: one ≤ two" in result.stdout
+
+
+def test_a_user_file_named_like_the_prelude_is_not_the_prelude(
+        tmp_path) -> None:
+    result = _run(tmp_path, "print zero ≤ two\n", filename="NatDefs.pf")
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.splitlines()[0] == "false"
@@ -0,0 +1,73 @@
+"""Hash-consing of ground Nat/UInt values (``abstract_syntax.hashcons``)."""
+
+from __future__ import annotations
+
+import pytest
+from lark.tree import Meta
+
+import abstract_syntax as ast
+import flags
+from abstract_syntax import intToNat, intToUInt, is_interned
+
+_ZERO, _SUC = "zero.m_1", "suc.m_2"
+
+
+def _meta() -> Meta:
+    return Meta()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_table(monkeypatch):
+    monkeypatch.setattr(flags, "hash_consing", True)
+    ast.reset_interned_terms()
+    yield
+    ast.reset_interned_terms()
+
+
+def test_equal_literals_share_one_node() -> None:
+    five = intToNat(_meta(), 5, zname=_ZERO, sname=_SUC)
+    assert intToNat(_meta(), 5, zname=_ZERO, sname=_SUC) is five
+    assert intToNat(_meta(), 6, zname=_ZERO, sname=_SUC).args[0] is five
+    assert is_interned(five) and ast.interned_term_count() == 3
+    bz = intToUInt(_meta(), 12, "bzero.m_3", "dub_inc.m_4", "inc_dub.m_5")
+    assert intToUInt(_meta(), 12, "bzero.m_3", "dub_inc.m_4", "inc_dub.m_5") is bz
+
+
+def test_interned_equality_agrees_with_structural_equality() -> None:
+    three = intToNat(_meta(), 3, zname=_ZERO, sname=_SUC)
+    four = intToNat(_meta(), 4, zname=_ZERO, sname=_SUC)
+    flags.hash_consing = False
+    fresh_three = intToNat(_meta(), 3, zname=_ZERO, sname=_SUC)
+    assert not is_interned(fresh_three)
+    assert three == fresh_three and fresh_three == three
+    assert three != four and four != fresh_three
+
+
+def test_reduction_and_substitution_reuse_interned_values() -> None:
+    loc = _meta()
+    two = intToNat(loc, 2, zname=_ZERO, sname=_SUC)
+    suc = ast.ResolvedVar(loc, None, _SUC)
+    rebuilt = ast.Call(loc, None, suc, [two]).reduce(ast.Env())
+    assert rebuilt is intToNat(loc, 3, zname=_ZERO, sname=_SUC)
+    assert rebuilt.substitute({"x.1": two}) is rebuilt
+
+
+def test_disabled_hash_consing_builds_fresh_nodes() -> None:
+    flags.hash_consing = False
+    one = intToNat(_meta(), 1, zname=_ZERO, sname=_SUC)
+    assert intToNat(_meta(), 1, zname=_ZERO, sname=_SUC) is not one
+    assert ast.interned_term_count() == 0
+
+
+def test_source_literals_keep_their_own_locations() -> None:
+    first, second = _meta(), _meta()
+    suc = ast.ResolvedVar(first, None, _SUC)
+    zero = ast.ResolvedVar(first, None, _ZERO)
+    interned = intToNat(first, 3, zname=_ZERO, sname=_SUC)
+    written = ast.NatLit(second, None, suc, zero, 3)
+    assert written == interned and not is_interned(written)
+    peeled = written.peel(1)
+    assert peeled.location is second and not is_interned(peeled)
+    renamed = written.substitute({"x.1": interned})
+    assert renamed.location is second and not is_interned(renamed)
+    assert is_interned(interned.peel(1))
@@ -0,0 +1,90 @@
+"""The ``--lazy`` evaluation mode for ``print`` and ``assert``
+(``abstract_syntax.lazy_eval``).
+
+Each program is run through ``deduce.py`` with and without ``--lazy``;
+the two must print the same thing and agree on whether it is valid.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+_PRELUDE = """
+union N { z  s(N) }
+union L<T> { empty  node(T, L<T>) }
+
+recursive dbl(N) -> N {
+  dbl(z) = z
+  dbl(s(n)) = s(s(dbl(n)))
+}
+
+recursive upto(N) -> L<N> {
+  upto(z) = empty
+  upto(s(n)) = node(s(n), upto(n))
+}
+
+recursive first<T>(L<T>, N) -> L<T> {
+  first(empty, k) = empty
+  first(node(x, xs), k) =
+    switch k { case z { empty } case s(k') { node(x, first(xs, k')) } }
+}
+
+recursive len<T>(L<T>) -> N {
+  len(empty) = z
+  len(node(x, xs)) = s(len(xs))
+}
+
+define three = s(s(s(z)))
+"""
+
+
+def _run(tmp_path, body: str, *options: str) -> subprocess.CompletedProcess:
+    pf = tmp_path / "lazy_test.pf"
+    pf.write_text(_PRELUDE + body)
+    return subprocess.run(
+        [sys.executable, str(REPO_ROOT / "deduce.py"), "--no-stdlib",
+         "--suppress-theorems", *options, str(pf)],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+
+
+@pytest.mark.parametrize("body", [
+    "print first(upto(three), s(s(z)))\nprint upto(three)\nprint len(upto(three))\n",
+    "print fun x:N { node(x, empty) }\nprint (if three = z then upto(z) else upto(s(z)))\n",
+    "assert first(upto(three), s(z)) = node(three, empty)\n"
+    "assert upto(three) ≠ upto(s(three))\n"
+    "assert len(upto(dbl(three))) = dbl(three)\n",
+])
+def test_lazy_output_matches_strict(tmp_path, body: str) -> None:
+    strict = _run(tmp_path, body)
+    lazy = _run(tmp_path, body, "--lazy")
+    assert strict.returncode == 0, strict.stdout + strict.stderr
+    assert lazy.returncode == 0, lazy.stdout + lazy.stderr
+    assert lazy.stdout == strict.stdout
+
+
+@pytest.mark.parametrize("body", [
+    "assert upto(three) = upto(s(three))\n",
+    "assert first(upto(three), s(z)) ≠ node(three, empty)\n",
+])
+def test_lazy_failed_assert_matches_strict(tmp_path, body: str) -> None:
+    strict = _run(tmp_path, body)
+    lazy = _run(tmp_path, body, "--lazy")
+    assert strict.returncode != 0 and lazy.returncode != 0
+    assert lazy.stdout == strict.stdout
+
+
+def test_lazy_forces_only_what_is_observed(tmp_path) -> None:
+    # Strictly this builds all 2048 elements before taking two.
+    big = "dbl(" * 11 + "s(z)" + ")" * 11
+    lazy = _run(tmp_path,
+                f"assert len(first(upto({big}), s(s(z)))) = s(s(z))\n"
+                f"print len(first(upto({big}), s(z)))\n",
+                "--lazy")
+    assert lazy.returncode == 0, lazy.stdout + lazy.stderr
+    assert lazy.stdout.splitlines()[0] == "s(z)"
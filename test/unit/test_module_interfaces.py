@@ -0,0 +1,149 @@
+"""Binary ``.pfi`` module interfaces (``abstract_syntax.interfaces``).
+
+Importing a module writes an interface to the per-user interface cache;
+a later import with an empty ``uniquified_modules`` registry (i.e. a
+fresh process) loads the interface instead of parsing, and any edit to
+the module or to one of its dependencies forces a re-parse.  A cache
+that someone else can write to is never read.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from lark.tree import Meta
+
+import abstract_syntax
+import flags
+import rec_desc_parser
+from abstract_syntax import Import, UniquifyContext, uniquify_deduce
+from abstract_syntax.interfaces import interface_path
+
+_BASE = (
+    "union Bit { lo hi }\n"
+    "theorem bit_refl: all b:Bit. b = b\n"
+    "proof arbitrary b:Bit reflexive end\n"
+)
+
+_TOP = (
+    "import Base\n"
+    "fun flip(b : Bit) { switch b { case lo { hi } case hi { lo } } }\n"
+)
+
+
+@pytest.fixture
+def modules(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(flags, "module_interfaces", True)
+    monkeypatch.setattr(flags, "module_interface_dir", str(tmp_path / "cache"))
+    (tmp_path / "Base.pf").write_text(_BASE, encoding="utf-8")
+    (tmp_path / "Top.pf").write_text(_TOP, encoding="utf-8")
+    monkeypatch.setattr(flags, "import_directories", {str(tmp_path)})
+    rec_desc_parser.set_deduce_directory(str(Path(__file__).resolve().parents[2]))
+    rec_desc_parser.init_parser()
+    _forget_loaded_modules()
+    yield tmp_path
+    _forget_loaded_modules()
+
+
+def _forget_loaded_modules() -> None:
+    """What a fresh process looks like to ``Import`` resolution."""
+    abstract_syntax.uniquified_modules.clear()
+    abstract_syntax.module_interface_keys.clear()
+
+
+def _import_top() -> list:
+    out = uniquify_deduce([Import(Meta(), "Top")], UniquifyContext())
+    return out[0].ast
+
+
+def _count_parses(monkeypatch) -> list[str]:
+    parsed: list[str] = []
+    real_parse = rec_desc_parser.parse
+
+    def parse(src, *args, **kwargs):
+        parsed.append(rec_desc_parser.get_filename())
+        return real_parse(src, *args, **kwargs)
+
+    monkeypatch.setattr(rec_desc_parser, "parse", parse)
+    return parsed
+
+
+def test_import_writes_interfaces(modules: Path) -> None:
+    _import_top()
+    assert interface_path("Top", str(modules / "Top.pf")).is_file()
+    assert interface_path("Base", str(modules / "Base.pf")).is_file()
+    assert interface_path("Top", str(modules / "Top.pf")).parent \
+        == modules / "cache"
+    assert not list(modules.glob("*.pfi"))
+
+
+def test_shared_cache_is_not_read(modules: Path, monkeypatch) -> None:
+    _import_top()
+    _forget_loaded_modules()
+    os.chmod(modules / "cache", 0o777)
+    parsed = _count_parses(monkeypatch)
+    _import_top()
+    assert sorted(Path(p).name for p in parsed) == ["Base.pf", "Top.pf"]
+
+
+def test_interface_others_can_write_is_not_read(
+        modules: Path, monkeypatch) -> None:
+    _import_top()
+    _forget_loaded_modules()
+    os.chmod(interface_path("Base", str(modules / "Base.pf")), 0o666)
+    parsed = _count_parses(monkeypatch)
+    _import_top()
+    assert [Path(p).name for p in parsed] == ["Base.pf"]
+
+
+def test_interfaces_replace_parsing(modules: Path, monkeypatch) -> None:
+    first = _import_top()
+    _forget_loaded_modules()
+    parsed = _count_parses(monkeypatch)
+    second = _import_top()
+    assert parsed == []
+    assert [str(s) for s in second] == [str(s) for s in first]
+    # The nested ``import Base`` shares Base's registered statement list.
+    nested = next(s for s in second if isinstance(s, Import))
+    assert nested.ast is abstract_syntax.uniquified_modules["Base"]
+
+
+def test_editing_a_dependency_invalidates_importers(
+        modules: Path, monkeypatch) -> None:
+    _import_top()
+    _forget_loaded_modules()
+    (modules / "Base.pf").write_text(_BASE + "union Unit { unit }\n",
+                                     encoding="utf-8")
+    parsed = _count_parses(monkeypatch)
+    _import_top()
+    assert sorted(Path(p).name for p in parsed) == ["Base.pf", "Top.pf"]
+
+
+def test_module_names_do_not_depend_on_the_importer(modules: Path) -> None:
+    direct = uniquify_deduce([Import(Meta(), "Base")], UniquifyContext())
+    base_names = [str(s.name) for s in direct[0].ast]
+    _forget_loaded_modules()
+    _import_top()
+    assert [str(s.name) for s in abstract_syntax.uniquified_modules["Base"]] \
+        == base_names
+
+
+def test_disabled_interfaces_are_neither_read_nor_written(
+        modules: Path, monkeypatch) -> None:
+    monkeypatch.setattr(flags, "module_interfaces", False)
+    _import_top()
+    assert not interface_path("Top", str(modules / "Top.pf")).exists()
+
+
+def test_locations_follow_the_path_the_module_is_found_under(
+        modules: Path, monkeypatch) -> None:
+    _import_top()
+    _forget_loaded_modules()
+    alias = modules.parent / (modules.name + "-alias")
+    alias.symlink_to(modules)
+    monkeypatch.setattr(flags, "import_directories", {str(alias)})
+    parsed = _count_parses(monkeypatch)
+    _import_top()
+    assert parsed == []
+    base = abstract_syntax.uniquified_modules["Base"]
+    assert all(s.location.filename == str(alias / "Base.pf") for s in base)
@@ -0,0 +1,84 @@
+"""Compact ``Nat`` literals (``abstract_syntax.NatLit``)."""
+
+from __future__ import annotations
+
+import pytest
+from lark.tree import Meta
+
+import abstract_syntax as ast
+import flags
+from abstract_syntax import NatLit, intToNat, natToInt
+
+_ZERO, _SUC = "zero.m_1", "suc.m_2"
+
+
+def _meta() -> Meta:
+    return Meta()
+
+
+def _var(name: str) -> ast.ResolvedVar:
+    return ast.ResolvedVar(_meta(), None, name)
+
+
+def _nat(n: int) -> ast.Term:
+    return intToNat(_meta(), n, zname=_ZERO, sname=_SUC)
+
+
+def _chain(n: int) -> ast.Term:
+    term: ast.Term = _var(_ZERO)
+    for _ in range(n):
+        term = ast.Call(_meta(), None, _var(_SUC), [term])
+    return term
+
+
+@pytest.fixture(autouse=True)
+def _fresh_table(monkeypatch):
+    monkeypatch.setattr(flags, "hash_consing", True)
+    ast.reset_interned_terms()
+    yield
+    ast.reset_interned_terms()
+
+
+def test_large_literal_is_one_node() -> None:
+    big = _nat(10**6)
+    assert isinstance(big, NatLit) and big.value == 10**6
+    assert natToInt(big) == 10**6
+    assert ast.isNat(big) and ast.getZero(big) == _ZERO
+
+
+def test_args_peel_one_layer() -> None:
+    three = _nat(3)
+    assert three.args[0] is _nat(2)
+    assert _nat(1).args[0] is three.zero
+    with pytest.raises(ast.InternalError):
+        three.args = []
+
+
+def test_suc_pattern_matches_a_literal() -> None:
+    subst: dict[str, ast.Term] = {}
+    pattern = ast.PatternCons(_meta(), _var(_SUC), ["m.3"])
+    assert ast.is_match(pattern, _nat(4), subst)
+    assert subst["m.3"] is _nat(3)
+
+
+def test_prints_and_compares_like_the_unary_chain() -> None:
+    assert str(_nat(2)) == str(_chain(2))
+    assert _nat(3) == _chain(3) and _chain(3) == _nat(3)
+    assert _nat(3) != _nat(4)
+
+
+def test_suc_of_a_literal_extends_it() -> None:
+    four = ast.mkSuc(_meta(), _nat(3), sname=_SUC)
+    assert four is _nat(4)
+    assert ast.mkSuc(_meta(), _var(_ZERO), sname=_SUC) is _nat(1)
+
+
+def test_substitution_keeps_the_literal() -> None:
+    assert _nat(5).substitute({"x.1": _nat(2)}) is _nat(5)
+
+
+def test_auto_rules_that_cannot_match_skip_the_literal() -> None:
+    zero_rule = ast.Call(_meta(), None, _var("add.4"), [_var(_ZERO), _var("y.5")])
+    assert not ast.may_rewrite_nat_literal(zero_rule, [_var("y.5")], _nat(3))
+    suc_rule = ast.Call(_meta(), None, _var(_SUC), [_var("x.6")])
+    assert ast.may_rewrite_nat_literal(suc_rule, [_var("x.6")], _nat(3))
@@ -0,0 +1,155 @@
+"""Benchmark for the proof-checker environment (``abstract_syntax.env.Env``).
+
+Two parts:
+
+* **Micro** -- a synthetic environment the size of the loaded standard
+  library (a few thousand bindings, many overloaded base names), timing
+  the operations the checker performs most: extending the environment
+  the way a proof does (``arbitrary``/``suppose``/``define`` each add one
+  binding), resolving a base name to its overloads, and looking up the
+  type of a variable.
+
+* **Macro** -- warm in-process ``lsp.query.check`` runs over a handful of
+  ``lib/`` modules and ``test/should-validate`` files, i.e. what the MCP
+  server and the test harness pay per file once the prelude is loaded.
+
+Run::
+
+    python3 tools/env_benchmark.py            # micro + macro
+    python3 tools/env_benchmark.py --micro    # micro only
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.argv = [str(REPO_ROOT / "deduce.py")] + sys.argv[1:]
+
+from lark.tree import Meta  # noqa: E402
+
+from abstract_syntax import Env, ResolvedVar, Var  # noqa: E402
+
+# Roughly the shape of the environment after the full prelude: ~6000
+# bindings over ~2000 distinct base names (``+``, ``<``, ``length`` ...
+# are overloaded across Nat/UInt/Int/List).
+ENV_SIZE = 6000
+BASE_NAMES = 2000
+PROOF_DEPTH = 40    # bindings a single proof adds on top of the env
+PROOFS = 500
+LOOKUPS = 50_000
+
+MACRO_FIXTURES: tuple[str, ...] = (
+    "lib/NatAdd.pf",
+    "lib/IntDiv.pf",
+    "lib/UIntPowLog.pf",
+    "test/should-validate/IntTests.pf",
+    "test/should-validate/ListTests.pf",
+    "test/should-validate/UIntLogTests.pf",
+)
+
+RUNS = 3
+
+
+def _measure(fn: Callable[[], object], runs: int = RUNS) -> float:
+    times: list[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def _library_env() -> tuple[Env, list[str]]:
+    loc = Meta()  # type: ignore[no-untyped-call, unused-ignore]
+    env = Env().declare_module("Bench")
+    names: list[str] = []
+    for i in range(ENV_SIZE):
+        name = f"b{i % BASE_NAMES}.{i}"
+        names.append(name)
+        env = env.declare_term_var(loc, name, Var(loc, None, "Nat"))
+    return env, names
+
+
+def micro() -> None:
+    loc = Meta()  # type: ignore[no-untyped-call, unused-ignore]
+    nat = Var(loc, None, "Nat")
+    t0 = time.perf_counter()
+    env, names = _library_env()
+    build = time.perf_counter() - t0
+
+    def proofs() -> None:
+        for p in range(PROOFS):
+            local = env
+            for d in range(PROOF_DEPTH):
+                local = local.declare_term_var(loc, f"x.p{p}_{d}", nat,
+                                               local=True)
+
+    def overloads() -> None:
+        for i in range(LOOKUPS):
+            env.base_to_overloads(f"b{i % BASE_NAMES}")
+
+    variables = [ResolvedVar(loc, None, n) for n in names]
+
+    def lookups() -> None:
+        for i in range(LOOKUPS):
+            env.get_type_of_term_var(variables[i % ENV_SIZE])
+
+    print(f"environment: {ENV_SIZE} bindings, {BASE_NAMES} base names")
+    print(f"  build (one binding at a time)     {build * 1e3:9.1f} ms")
+    extend = _measure(proofs)
+    print(f"  extend x{PROOFS * PROOF_DEPTH:<7}                 "
+          f"{extend * 1e3:9.1f} ms  ({extend / (PROOFS * PROOF_DEPTH) * 1e6:.2f} us/op)")
+    over = _measure(overloads)
+    print(f"  base_to_overloads x{LOOKUPS:<7}        "
+          f"{over * 1e3:9.1f} ms  ({over / LOOKUPS * 1e6:.2f} us/op)")
+    look = _measure(lookups)
+    print(f"  get_type_of_term_var x{LOOKUPS:<7}     "
+          f"{look * 1e3:9.1f} ms  ({look / LOOKUPS * 1e6:.2f} us/op)")
+
+
+def macro() -> None:
+    from abstract_syntax import add_import_directory, init_import_directories
+    from flags import RECURSION_LIMIT, set_quiet_mode
+    from lsp.query import check
+
+    sys.setrecursionlimit(RECURSION_LIMIT)
+    set_quiet_mode(True)
+    init_import_directories()
+    add_import_directory(str(REPO_ROOT / "lib"))
+    add_import_directory(str(REPO_ROOT / "test" / "test-imports"))
+    prelude = tuple(sorted(p.stem for p in (REPO_ROOT / "lib").glob("*.pf")))
+
+    def run(path: Path) -> None:
+        diags = check(str(path), path.read_text(encoding="utf-8"),
+                      prelude=prelude)
+        if diags:
+            sys.stderr.write(f"[env_benchmark] {path.name}: "
+                             f"{len(diags)} diagnostic(s)\n")
+
+    fixtures = [REPO_ROOT / f for f in MACRO_FIXTURES]
+    t0 = time.perf_counter()
+    run(fixtures[0])
+    print(f"\nprelude bootstrap + first check    {time.perf_counter() - t0:9.2f} s")
+    total = 0.0
+    for path in fixtures:
+        warm = _measure(lambda: run(path))
+        total += warm
+        print(f"  {str(path.relative_to(REPO_ROOT)):<36} {warm:7.2f} s")
+    print(f"  {'total':<36} {total:7.2f} s")
+
+
+def main(argv: list[str]) -> int:
+    micro()
+    if "--micro" not in argv:
+        macro()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+"""Benchmark for the IR optimizer (``compiler/optimize.py``).
+
+Compiles each end-to-end fixture of ``test/compile`` at ``-O0`` and at
+``-O2``, builds both with the system C compiler, and times the
+binaries. Fixtures that are meant to panic at runtime are skipped.
+
+The fixtures are small, so many of them run in about a millisecond and
+their timings mostly measure process start-up; ``tail_calls.pf``, the
+``bench/`` workloads and the allowlisted programs are the interesting
+rows.
+
+Run::
+
+    python3 tools/opt_benchmark.py                 # lower/, prelude/ and bench/
+    python3 tools/opt_benchmark.py --allowlist     # plus compile-allowlist.txt
+    python3 tools/opt_benchmark.py --filter tail
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COMPILE_TESTS = REPO_ROOT / "test" / "compile"
+FIXTURE_DIRS = (COMPILE_TESTS / "lower", COMPILE_TESTS / "prelude",
+                COMPILE_TESTS / "bench")
+ALLOWLIST = REPO_ROOT / "test" / "compile-allowlist.txt"
+RUNTIME_DIR = REPO_ROOT / "compiler" / "runtime"
+LEVELS = ("-O0", "-O2")
+
+RUNS = 5
+
+
+def _fixtures(allowlist: bool) -> list[Path]:
+    out: list[Path] = []
+    for d in FIXTURE_DIRS:
+        out.extend(sorted(d.glob("*.pf")))
+    if allowlist:
+        for raw in ALLOWLIST.read_text().splitlines():
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                out.append(REPO_ROOT / line)
+    return [pf for pf in out
+            if "// expected-runtime-error:" not in pf.read_text()]
+
+
+def _needs_prelude(pf: Path) -> bool:
+    return any(line.strip().startswith(("import ", "public import "))
+               for line in pf.read_text().splitlines())
+
+
+def _build(pf: Path, level: str, cc: str, work: Path) -> Path:
+    c_path = work / f"{pf.stem}{level}.c"
+    bin_path = work / f"{pf.stem}{level}"
+    cmd = [sys.executable, str(REPO_ROOT / "deduce.py"),
+           "--suppress-theorems", "--quiet", "--compile", level,
+           "-o", str(c_path), str(pf)]
+    if not _needs_prelude(pf):
+        cmd.insert(2, "--no-stdlib")
+    subprocess.run(cmd, cwd=str(REPO_ROOT), check=True,
+                   capture_output=True, text=True)
+    subprocess.run([cc, "-O2", "-I", str(RUNTIME_DIR), "-o", str(bin_path),
+                    str(c_path), str(RUNTIME_DIR / "deduce.c")],
+                   check=True, capture_output=True, text=True)
+    return bin_path
+
+
+def _measure(bin_path: Path, runs: int) -> float:
+    times: list[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([str(bin_path)], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main(argv: list[str]) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--allowlist", action="store_true",
+                    help="also run the programs in test/compile-allowlist.txt")
+    ap.add_argument("--filter", default=None,
+                    help="only fixtures whose name contains this string")
+    ap.add_argument("--runs", type=int, default=RUNS)
+    args = ap.parse_args(argv)
+
+    cc = shutil.which("cc") or shutil.which("clang") or shutil.which("gcc")
+    if cc is None:
+        print("no C compiler (cc/clang/gcc) on PATH", file=sys.stderr)
+        return 1
+    fixtures = _fixtures(args.allowlist)
+    if args.filter:
+        fixtures = [f for f in fixtures if args.filter in f.name]
+
+    work = Path(tempfile.mkdtemp(prefix="deduce-opt-bench-"))
+    totals = dict.fromkeys(LEVELS, 0.0)
+    print(f"{'fixture':<36} {'-O0':>9} {'-O2':>9} {'speedup':>8}")
+    try:
+        for pf in fixtures:
+            times = {}
+            for level in LEVELS:
+                times[level] = _measure(_build(pf, level, cc, work), args.runs)
+                totals[level] += times[level]
+            print(f"  {str(pf.relative_to(REPO_ROOT / 'test')):<34} "
+                  f"{times['-O0'] * 1e3:7.2f}ms {times['-O2'] * 1e3:7.2f}ms "
+                  f"{times['-O0'] / times['-O2']:7.2f}x")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if totals["-O2"]:
+        print(f"  {'total':<34} {totals['-O0'] * 1e3:7.2f}ms "
+              f"{totals['-O2'] * 1e3:7.2f}ms "
+              f"{totals['-O0'] / totals['-O2']:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))